@@ -2,6 +2,8 @@
 Gradio UI for YouTube Transcriber Pro - Phase 1
 """
 
+import re
+import time
 from pathlib import Path
 
 import gradio as gr
@@ -10,10 +12,23 @@ from src.logger import setup_logger
 
 logger = setup_logger("app_gradio")
 
-from config import GRADIO_PORT, TRANSCRIPTS_DIR, VECTOR_DB_DIR, create_directories
+TRANSCRIPT_PAGE_SIZE = 50  # Management tab checkbox list
+
+from config import (
+    GRADIO_PORT,
+    PREFLIGHT_ENABLED,
+    TRANSCRIPTS_DIR,
+    VECTOR_DB_DIR,
+    create_directories,
+)
+from src.catalog import SORT_ORDERS, get_catalog
+from src.fingerprint import get_fingerprint_index
+from src.playlist import expand_urls
+from src.preflight import run_preflight
+from src.rate_limiter import get_rate_limiter
 from src.security import security_manager
 from src.transcriber import YouTubeTranscriber
-from src.utils import is_safe_path, parse_urls_input
+from src.utils import extract_video_id, is_collection_url, is_safe_path, parse_urls_input
 
 # ============================================================================
 # SECURITY AND AUTHENTICATION FUNCTIONS
@@ -133,8 +148,6 @@ def get_session_status(session_id: str) -> str:
     client_id = session["user_id"]
 
     # Calculate time remaining
-    import time
-
     time_active = time.time() - session["last_activity"]
     time_remaining = security_manager.auth.session_timeout - time_active
     minutes_remaining = int(time_remaining / 60)
@@ -249,15 +262,80 @@ def transcribe_videos(
     # Initialize transcriber
     transcriber = YouTubeTranscriber()
 
+    # Number of unique videos, unknown (None) while playlists/channels are still expanding
+    video_total = [None]
+
+    def expand_streaming(collection_urls):
+        """Expand playlists/channels as the videos are processed, then publish the total"""
+        video_ids = set()
+        for url in expand_urls(collection_urls, progress_callback):
+            video_ids.add(extract_video_id(url))
+            yield url
+        video_ids.discard(None)
+        video_total[0] = len(video_ids)
+
+    if any(is_collection_url(url) for url in urls):
+        progress(0, desc="📚 Expanding playlists/channels...")
+        if PREFLIGHT_ENABLED:
+            # Preflight needs the whole batch up front
+            urls = list(dict.fromkeys(expand_urls(urls)))
+        else:
+            # Videos start as soon as they are discovered (process_multiple_videos dedupes)
+            urls = expand_streaming(urls)
+
+    # Preflight: resolve durations before downloading (cost guard, ordering, ETA)
+    rejected = []
+    durations = []
+    if PREFLIGHT_ENABLED:
+        progress(0, desc="🔎 Resolving video metadata...")
+        preflight_report = run_preflight(urls)
+        urls = preflight_report["urls"]
+        rejected = preflight_report["rejected"]
+        duration_by_id = {
+            extract_video_id(url): preflight_report["metadata"].get(url, {}).get("duration") or 0
+            for url in urls
+        }
+        # Same order (and index numbering) as process_multiple_videos: valid, unique IDs
+        video_ids = dict.fromkeys(filter(None, map(extract_video_id, urls)))
+        durations = [duration_by_id[video_id] for video_id in video_ids]
+    total_audio = sum(durations)
+    if isinstance(urls, list):
+        video_total[0] = len(urls)
+
     # Progress tracking
     results = []
     status_messages = []
     current_video = [0]  # Usar lista para poder modificar en callback
     current_step = ["Iniciando..."]
+    finished_videos = [0]
+    start_time = time.time()
+    # Audio seconds of videos transcribed in this run, and of videos skipped or failed
+    # (those finish almost instantly, so they must not count towards the ETA rate)
+    transcribed_audio = [0]
+    other_audio = [0]
+    sequential_index = [0]
+
+    def video_duration(message: str) -> float:
+        """Preflight duration of the video a message is about"""
+        # Pipelined runs tag every message "[index] ..."; sequential runs announce each video
+        tagged = re.match(r"\[(\d+)\] ", message)
+        index = int(tagged.group(1)) if tagged else sequential_index[0]
+        return durations[index - 1] if 0 < index <= len(durations) else 0
 
     def progress_callback(message: str):
         status_messages.append(message)
 
+        announced = re.search(r"Processing (\d+)/", message)
+        if announced:
+            sequential_index[0] = int(announced.group(1))
+
+        if "✅ Completed" in message:
+            finished_videos[0] += 1
+            transcribed_audio[0] += video_duration(message)
+        elif "⏭️  Skipped" in message or "❌ Error" in message:
+            finished_videos[0] += 1
+            other_audio[0] += video_duration(message)
+
         # Detectar el paso actual
         if "PROCESSING VIDEO" in message:
             try:
@@ -276,8 +354,8 @@ def transcribe_videos(
             current_step[0] = "Completado"
 
         # Calcular porcentaje basado en videos completados y paso actual
-        completed = len(results)
-        total = len(urls)
+        completed = finished_videos[0]
+        total = video_total[0] or 0
 
         # Progreso base por videos completados
         base_progress = completed / total if total > 0 else 0
@@ -312,14 +390,29 @@ def transcribe_videos(
         else:
             emoji = "🔄"
 
-        # Mensaje más corto y claro
-        progress_msg = (
-            f"{emoji} {percentage}% | Video {current_video[0]}/{total} | {current_step[0]}"
-        )
-        progress(total_progress, desc=progress_msg)
+        # Mensaje más corto y claro (sin porcentaje mientras no se conoce el total)
+        position = f"Video {current_video[0]}/{total or '?'}"
+        if total:
+            progress_msg = f"{emoji} {percentage}% | {position} | {current_step[0]}"
+        else:
+            progress_msg = f"{emoji} {position} | {current_step[0]}"
+
+        # ETA a partir de la duración real de los videos transcritos (preflight)
+        done_audio = transcribed_audio[0]
+        if total_audio and done_audio:
+            elapsed = time.time() - start_time
+            remaining_audio = max(total_audio - done_audio - other_audio[0], 0)
+            eta_seconds = int(elapsed * remaining_audio / done_audio)
+            progress_msg += f" | ETA {eta_seconds // 60}m {eta_seconds % 60:02d}s"
+
+        # Total desconocido: Gradio muestra el contador sin barra de porcentaje
+        progress(total_progress if total else (completed, None), desc=progress_msg)
 
     # Process videos
-    results = transcriber.process_multiple_videos(urls, progress_callback, skip_existing)
+    results = transcriber.process_multiple_videos(
+        urls, progress_callback, skip_existing, preflight=False
+    )
+    results = results + rejected
 
     # Generate summary
     successful = [r for r in results if r.get("success") and not r.get("skipped")]
@@ -330,7 +423,25 @@ def transcribe_videos(
     summary += f"- ✅ **Newly transcribed**: {len(successful)}\n"
     summary += f"- ⏭️  **Skipped** (already exist): {len(skipped)}\n"
     summary += f"- ❌ **Failed**: {len(failed)}\n"
-    summary += f"- 📝 **Total**: {len(results)}\n\n"
+    summary += f"- 📝 **Total**: {len(results)}\n"
+
+    # Shared OpenAI budget (all sessions in this process)
+    whisper = get_rate_limiter().metrics()["whisper"]
+    if whisper["throttle_seconds"] or whisper["rate_limited"]:
+        headroom = whisper["request_headroom"]
+        headroom_str = f", {headroom:.0%} headroom" if headroom is not None else ""
+        summary += (
+            f"- 🚦 **Whisper throttling**: {whisper['throttle_seconds']:.0f}s, "
+            f"{whisper['rate_limited']} rate limits{headroom_str}\n"
+        )
+    transcript_cache = transcriber._transcript_cache()
+    if transcript_cache and transcript_cache.stats["hits"]:
+        cache_stats = transcript_cache.summary()
+        summary += (
+            f"- ♻️  **Transcript cache**: {cache_stats['hits']} hits "
+            f"({cache_stats['hit_rate']:.0%}), ${cache_stats['dollars_saved']:.2f} saved\n"
+        )
+    summary += "\n"
 
     if successful:
         summary += "### ✅ Newly Transcribed:\n"
@@ -362,11 +473,14 @@ def transcribe_videos(
             reset_rag_engine()
             rag = get_rag_engine()
 
-            def index_progress(msg):
-                summary += f"- {msg}\n"
-
-            rag.index_transcripts(progress_callback=index_progress)
+            index_messages = []
+            report = rag.index_transcripts(
+                progress_callback=index_messages.append,
+                batch_callback=lambda msg: progress(0.9, desc=msg),
+            )
 
+            summary += "".join(f"- {msg}\n" for msg in index_messages)
+            summary += f"\n{format_index_report(report)}\n"
             summary += "\n✅ **Indexing complete!** You can now use the Chat and Search tabs.\n"
         except Exception as e:
             logger.exception("Auto-indexing failed")
@@ -392,24 +506,28 @@ def transcribe_videos(
     )
 
 
-def list_transcript_files():
+def list_transcript_files(search: str = None, limit: int = None, offset: int = 0):
     """
-    List all transcript files in the output directory
+    List transcript files from the catalog, newest first
+
+    Args:
+        search: Optional title substring or video ID
+        limit: Maximum number of transcripts (None = all)
+        offset: Transcripts to skip, for pagination
 
     Returns:
-        List of file paths
+        List of file paths (JSON, then TXT, per transcript)
     """
     if not TRANSCRIPTS_DIR.exists():
         return []
 
     files = []
-    for ext in ["*.json", "*.txt"]:
-        files.extend(TRANSCRIPTS_DIR.glob(ext))
+    for entry in get_catalog(TRANSCRIPTS_DIR).query(search, limit=limit, offset=offset):
+        files.append(entry["json_path"])
+        if entry["txt_path"]:
+            files.append(entry["txt_path"])
 
-    # Sort by modification time (newest first)
-    files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-
-    return [str(f) for f in files]
+    return files
 
 
 def read_transcript_file(file_path: str):
@@ -438,11 +556,24 @@ def read_transcript_file(file_path: str):
         return f"Error reading file: {str(e)}"
 
 
-def index_transcripts_ui(progress=gr.Progress()):
+def format_index_report(report: dict) -> str:
+    """Markdown summary of RAGEngine.index_transcripts() chunk counts"""
+    return (
+        f"**{report['videos']} videos indexed** — "
+        f"➕ {report['added']} chunks added, "
+        f"♻️ {report['replaced']} replaced, "
+        f"⏭️ {report['skipped']} unchanged, "
+        f"🗑️ {report['removed']} removed · "
+        f"🧠 embedding cache: {report['cache_hits']} hits, {report['cache_misses']} misses"
+    )
+
+
+def index_transcripts_ui(full_rebuild: bool = False, progress=gr.Progress()):
     """
-    Index all transcripts for RAG
+    Index new and changed transcripts for RAG
 
     Args:
+        full_rebuild: Drop the vector store and embed every transcript again
         progress: Gradio progress tracker
 
     Returns:
@@ -462,11 +593,17 @@ def index_transcripts_ui(progress=gr.Progress()):
             return "❌ No transcripts found. Please transcribe some videos first."
 
         progress(0.5, desc=f"Indexing {len(transcripts)} transcripts...")
-        rag.index_transcripts(progress_callback=lambda msg: progress(0.7, desc=msg))
+        report = rag.index_transcripts(
+            progress_callback=lambda msg: progress(0.7, desc=msg), rebuild=full_rebuild
+        )
 
         progress(1.0, desc="Indexing complete!")
 
-        return f"✅ Successfully indexed {len(transcripts)} transcripts!\n\nYou can now use the Chat tab to ask questions."
+        mode = "Rebuilt the index" if full_rebuild else "Index updated"
+        return (
+            f"✅ {mode}: {format_index_report(report)}\n\n"
+            "You can now use the Chat tab to ask questions."
+        )
 
     except Exception as e:
         logger.exception("Error indexing transcripts (UI)")
@@ -602,31 +739,48 @@ def search_transcripts(query: str, k: int = 3, session_id: str = "", request: gr
         return f"❌ Error: {str(e)}"
 
 
-def get_transcript_list():
-    """Get list of transcripts for management"""
-    import json
+def get_transcript_list(search: str = "", sort: str = "newest", page: int = 1):
+    """
+    Get one page of transcripts for management, from the catalog
 
-    transcripts = []
-    for json_file in TRANSCRIPTS_DIR.glob("*.json"):
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+    Args:
+        search: Title substring or video ID ("" = all)
+        sort: One of SORT_ORDERS
+        page: 1-based page number (clamped to the available pages)
 
-            label = f"{data.get('title', 'Unknown')} ({data.get('video_id', 'N/A')})"
-            transcripts.append((label, str(json_file)))
-        except (OSError, json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"Could not read transcript {json_file}: {e}")
-            continue
+    Returns:
+        Tuple of (checkbox choices update, page info markdown)
+    """
+    catalog = get_catalog(TRANSCRIPTS_DIR)
+    search = (search or "").strip() or None
+    total = catalog.count(search)
+    pages = max(1, (total + TRANSCRIPT_PAGE_SIZE - 1) // TRANSCRIPT_PAGE_SIZE)
+    page = min(max(int(page or 1), 1), pages)
+    column, descending = SORT_ORDERS.get(sort, SORT_ORDERS["newest"])
+
+    transcripts = [
+        (f"{entry['title'] or 'Unknown'} ({entry['video_id']})", entry["json_path"])
+        for entry in catalog.query(
+            search,
+            column,
+            descending,
+            limit=TRANSCRIPT_PAGE_SIZE,
+            offset=(page - 1) * TRANSCRIPT_PAGE_SIZE,
+        )
+    ]
 
-    return transcripts
+    info = f"📄 Página {page}/{pages} · {total} transcripciones"
+    return gr.CheckboxGroup(choices=transcripts, value=[]), info
 
 
 def delete_selected_transcripts(selected_files):
-    """Delete selected transcript files"""
+    """Delete selected transcript files and their vectors (the list is refreshed by the caller)"""
     if not selected_files:
-        return "⚠️ No files selected", get_transcript_list()
+        return "⚠️ No files selected"
 
+    catalog = get_catalog()
     deleted = []
+    deleted_ids = []
     errors = []
 
     for file_path in selected_files:
@@ -640,6 +794,9 @@ def delete_selected_transcripts(selected_files):
 
             txt_path = json_path.with_suffix(".txt")
 
+            # The ID comes from the catalog or the file name, so corrupt files can be deleted too
+            video_id = catalog.video_id_at(json_path)
+
             # Delete JSON
             if json_path.exists():
                 json_path.unlink()
@@ -649,6 +806,12 @@ def delete_selected_transcripts(selected_files):
             if txt_path.exists() and is_safe_path(str(txt_path), TRANSCRIPTS_DIR):
                 txt_path.unlink()
 
+            # Same state as manage.py --delete: re-uploads linked to it are transcribed again
+            if video_id:
+                catalog.remove(video_id)
+                get_fingerprint_index().remove(video_id)
+                deleted_ids.append(video_id)
+
         except Exception as e:
             logger.exception(f"Error deleting transcript {json_path.name}")
             errors.append(f"{json_path.name}: {str(e)}")
@@ -665,9 +828,17 @@ def delete_selected_transcripts(selected_files):
         for error in errors:
             result += f"- {error}\n"
 
-    result += "\n⚠️ **Note**: You may need to re-index for RAG to reflect changes."
+    if deleted_ids:
+        try:
+            from src.rag_engine import delete_video_vectors
+
+            reclaimed = delete_video_vectors(deleted_ids)
+            result += f"\n🧹 **Vector DB**: {reclaimed} vectors removed from the RAG index"
+        except Exception as e:
+            logger.exception("Error removing deleted transcripts from the vector store")
+            result += f"\n⚠️ **Vector DB**: could not remove their vectors ({str(e)})"
 
-    return result, get_transcript_list()
+    return result
 
 
 def check_vector_db_status():
@@ -729,15 +900,16 @@ def clear_all_data():
         deleted_db = False
 
         # Delete all transcripts
-        for json_file in TRANSCRIPTS_DIR.glob("*.json"):
+        catalog = get_catalog(TRANSCRIPTS_DIR)
+        for entry in catalog.query():
             try:
-                txt_file = json_file.with_suffix(".txt")
-                json_file.unlink()
-                if txt_file.exists():
-                    txt_file.unlink()
+                for path in (entry["json_path"], entry["txt_path"]):
+                    if path:
+                        Path(path).unlink(missing_ok=True)
+                catalog.remove(entry["video_id"])
                 deleted_transcripts += 1
             except OSError as e:
-                logger.warning(f"Could not delete transcript {json_file}: {e}")
+                logger.warning(f"Could not delete transcript {entry['json_path']}: {e}")
 
         # Clear vector DB
         if VECTOR_DB_DIR.exists():
@@ -752,11 +924,11 @@ def clear_all_data():
         result += "🎉 **All data has been cleared!**\n\n"
         result += "You can start fresh by transcribing new videos."
 
-        return result, get_transcript_list()
+        return result
 
     except Exception as e:
         logger.exception("Error during cleanup")
-        return f"❌ Error during cleanup: {str(e)}", get_transcript_list()
+        return f"❌ Error during cleanup: {str(e)}"
 
 
 def create_ui():
@@ -915,8 +1087,12 @@ def create_ui():
                 2. Click "Index Transcripts" below
                 3. Wait for indexing to complete
                 4. Go to the "Chat" or "Search" tabs
+
+                Only new or changed transcripts are embedded again; chunks of deleted
+                transcripts are removed. Tick "Full rebuild" to re-embed everything.
                 """)
 
+                full_rebuild = gr.Checkbox(label="Full rebuild", value=False)
                 index_btn = gr.Button("🔄 Index Transcripts", variant="primary", size="lg")
                 index_status = gr.Markdown()
 
@@ -998,11 +1174,34 @@ def create_ui():
                     with gr.Column():
                         gr.Markdown("### 📁 Gestión de Transcripciones")
 
+                        with gr.Row():
+                            transcript_search = gr.Textbox(
+                                label="Buscar",
+                                placeholder="Título o Video ID",
+                                scale=2,
+                            )
+                            transcript_sort = gr.Dropdown(
+                                label="Ordenar por",
+                                choices=[
+                                    ("Más recientes", "newest"),
+                                    ("Más antiguas", "oldest"),
+                                    ("Título", "title"),
+                                    ("Más palabras", "words"),
+                                    ("Más largas", "duration"),
+                                ],
+                                value="newest",
+                                scale=1,
+                            )
+                            transcript_page = gr.Number(
+                                label="Página", value=1, minimum=1, precision=0, scale=1
+                            )
+
                         transcript_list = gr.CheckboxGroup(
                             label="Selecciona transcripciones para eliminar",
                             choices=[],
                             interactive=True,
                         )
+                        transcript_page_info = gr.Markdown()
 
                         with gr.Row():
                             refresh_transcripts_btn = gr.Button("🔄 Actualizar Lista", size="sm")
@@ -1112,7 +1311,7 @@ def create_ui():
         file_list.change(fn=lambda x: x if x else None, inputs=[file_list], outputs=[download_btn])
 
         # Event handlers - RAG Setup Tab
-        index_btn.click(fn=index_transcripts_ui, inputs=[], outputs=[index_status])
+        index_btn.click(fn=index_transcripts_ui, inputs=[full_rebuild], outputs=[index_status])
 
         # Event handlers - Chat Tab
         msg.submit(
@@ -1133,20 +1332,36 @@ def create_ui():
         )
 
         # Event handlers - Management Tab
-        refresh_transcripts_btn.click(fn=get_transcript_list, inputs=[], outputs=[transcript_list])
+        transcript_list_inputs = [transcript_search, transcript_sort, transcript_page]
+        transcript_list_outputs = [transcript_list, transcript_page_info]
+
+        refresh_transcripts_btn.click(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
+        )
+        transcript_search.submit(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
+        )
+        transcript_sort.change(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
+        )
+        transcript_page.change(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
+        )
 
         delete_selected_btn.click(
             fn=delete_selected_transcripts,
             inputs=[transcript_list],
-            outputs=[delete_status, transcript_list],
+            outputs=[delete_status],
+        ).then(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
         )
 
         check_db_btn.click(fn=check_vector_db_status, inputs=[], outputs=[db_info])
 
         clear_db_btn.click(fn=clear_vector_db, inputs=[], outputs=[db_status])
 
-        clear_all_btn.click(
-            fn=clear_all_data, inputs=[], outputs=[clear_all_status, transcript_list]
+        clear_all_btn.click(fn=clear_all_data, inputs=[], outputs=[clear_all_status]).then(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
         )
 
         # Event handlers - Security Dashboard Tab
@@ -1159,7 +1374,9 @@ def create_ui():
         )
 
         # Load transcript list on tab load and initialize security dashboard
-        app.load(fn=get_transcript_list, inputs=[], outputs=[transcript_list])
+        app.load(
+            fn=get_transcript_list, inputs=transcript_list_inputs, outputs=transcript_list_outputs
+        )
 
         # Initialize session status on load
         app.load(
@@ -23,20 +23,133 @@ WHISPER_MODEL = os.getenv("WHISPER_MODEL", "whisper-1")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
 CHAT_MODEL = os.getenv("CHAT_MODEL", "gpt-4-turbo-preview")
 
+# Transcription backend: "openai" (Whisper API) or "local" (faster-whisper on
+# the CPU, runs offline). Overridable per job (main.py --backend)
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai").lower()
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+LOCAL_WHISPER_THREADS = int(os.getenv("LOCAL_WHISPER_THREADS", "0"))  # 0 = all cores
+LOCAL_WHISPER_WORKERS = int(os.getenv("LOCAL_WHISPER_WORKERS", "1"))  # concurrent decodes
+LOCAL_WHISPER_BATCH_SIZE = int(os.getenv("LOCAL_WHISPER_BATCH_SIZE", "8"))  # VAD segments per batch
+
+# Embedding provider for the RAG index: "openai" (EMBEDDING_MODEL through the
+# API) or "local" (a small sentence-transformer on the CPU with ONNX Runtime,
+# runs offline). Vectors are tagged with provider and model; switching either
+# rebuilds the index on the next indexing run
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai").lower()
+LOCAL_EMBEDDING_MODEL = os.getenv(
+    "LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+LOCAL_EMBEDDING_THREADS = int(os.getenv("LOCAL_EMBEDDING_THREADS", "0"))  # 0 = all cores
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "64"))
+
 # Directory Configuration
 BASE_DIR = Path(__file__).parent
 TRANSCRIPTS_DIR = BASE_DIR / "transcripts"
 TEMP_AUDIO_DIR = BASE_DIR / "temp_audio"
 VECTOR_DB_DIR = BASE_DIR / "vector_db"
+CACHE_DIR = BASE_DIR / "cache"  # Persistent runtime state (stats, caches, indexes)
 
 # Transcription Configuration
 AUDIO_FORMAT = "mp3"
 AUDIO_QUALITY = "192"
+# Keep YouTube's native audio stream (webm/opus, m4a) when Whisper accepts it
+# instead of re-encoding everything to AUDIO_FORMAT
+AUDIO_PASSTHROUGH = os.getenv("AUDIO_PASSTHROUGH", "true").lower() == "true"
+WHISPER_SUPPORTED_FORMATS = (
+    "flac",
+    "m4a",
+    "mp3",
+    "mp4",
+    "mpeg",
+    "mpga",
+    "oga",
+    "ogg",
+    "wav",
+    "webm",
+)
+
+# Speech preparation stage (before the 25MB size check)
+# Downmix to mono, resample to 16 kHz and encode low-bitrate Opus so that most
+# hour-long videos fit in a single Whisper request
+AUDIO_PREPARE = os.getenv("AUDIO_PREPARE", "true").lower() == "true"
+PREPARE_SAMPLE_RATE = int(os.getenv("PREPARE_SAMPLE_RATE", "16000"))
+PREPARE_CHANNELS = 1
+PREPARE_CODEC = "libopus"
+PREPARE_BITRATE = os.getenv("PREPARE_BITRATE", "24k")
+PREPARE_FORMAT = "ogg"
+
+# Billed-minutes compression (part of speech preparation, off by default)
+# Silences longer than COMPRESS_MIN_SILENCE are cut down to COMPRESS_KEEP_SILENCE
+# on each side and the rest is sped up by COMPRESS_TEMPO (FFmpeg atempo, pitch
+# preserved). Whisper bills by duration; a time map converts offsets back to
+# the original timeline
+AUDIO_COMPRESS = os.getenv("AUDIO_COMPRESS", "false").lower() == "true"
+COMPRESS_TEMPO = float(os.getenv("COMPRESS_TEMPO", "1.5"))
+COMPRESS_MIN_SILENCE = float(os.getenv("COMPRESS_MIN_SILENCE", "1.0"))  # seconds
+COMPRESS_KEEP_SILENCE = 0.2  # seconds of silence kept on each side of a cut
+
+# Long-audio splitting
+# Cut chunks inside silent regions (FFmpeg silencedetect) instead of at fixed
+# offsets so chunk boundaries do not land mid-word
+SPLIT_ON_SILENCE = os.getenv("SPLIT_ON_SILENCE", "true").lower() == "true"
+SILENCE_NOISE_DB = float(os.getenv("SILENCE_NOISE_DB", "-35"))  # dB
+SILENCE_MIN_DURATION = float(os.getenv("SILENCE_MIN_DURATION", "0.3"))  # seconds
+SILENCE_MIN_CHUNK_FRACTION = 0.5  # a cut may move back at most half a chunk
+# Chunks of one video sent to Whisper at once (halves on 429, grows back on success)
+CHUNK_CONCURRENCY = int(os.getenv("CHUNK_CONCURRENCY", "3"))
+
+# Audio Cache
+# Downloaded audio is kept in TEMP_AUDIO_DIR/cache keyed by video_id and format,
+# so retries and --force re-transcriptions skip the download. Least recently
+# used files are evicted once the cache exceeds its disk budget
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "true").lower() == "true"
+AUDIO_CACHE_SUBDIR = "cache"
+AUDIO_CACHE_MAX_MB = int(os.getenv("AUDIO_CACHE_MAX_MB", "2048"))
+
+# Transcript Cache
+# Whisper results are kept in cache/whisper keyed by a hash of the audio sent
+# (per chunk), the backend, model and parameters, so the same audio is never
+# billed twice. Least recently used entries are evicted past the disk budget
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+TRANSCRIPT_CACHE_DIR = CACHE_DIR / "whisper"
+TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "256"))
+
+# Embedding Cache
+# Chunk embeddings are kept in cache/embeddings keyed by embedding model and a
+# hash of the normalised chunk text, so re-indexing unchanged text makes no
+# embedding calls. Vectors are stored as EMBEDDING_CACHE_DTYPE rows (float16
+# halves the disk use); least recently used rows are evicted past the budget
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_DIR = CACHE_DIR / "embeddings"
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "512"))
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+
+# Re-upload detection
+# An acoustic fingerprint of the first FINGERPRINT_SECONDS of each download is
+# matched against the transcripts already made; a match links the new video to
+# the existing transcript instead of calling Whisper
+FINGERPRINT_ENABLED = os.getenv("FINGERPRINT_ENABLED", "true").lower() == "true"
+FINGERPRINT_SECONDS = 64
+FINGERPRINT_MIN_SIMILARITY = float(os.getenv("FINGERPRINT_MIN_SIMILARITY", "0.9"))
+FINGERPRINT_DURATION_TOLERANCE = 0.02  # re-uploads may differ by up to 2% (at least 5 s)
+FINGERPRINT_INDEX_FILE = CACHE_DIR / "fingerprints.json"
+
+# Transcript catalog
+# Each transcripts directory keeps a SQLite index (unique by video ID) of the
+# transcripts saved in it, so duplicate checks do not parse every JSON file
+CATALOG_FILE_NAME = "catalog.db"
 
 # RAG Configuration (Phase 2)
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 TOP_K_RESULTS = 3
+# Chunks are embedded in requests of at most EMBEDDING_BATCH_TOKENS estimated
+# tokens (and EMBEDDING_BATCH_ITEMS inputs, the API maximum), with
+# EMBEDDING_CONCURRENCY requests in flight under the shared rate limiter
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "100000"))
+EMBEDDING_BATCH_ITEMS = 2048
 TEMPERATURE = 0.7
 
 # Gradio Configuration
@@ -47,6 +160,44 @@ GRADIO_SHARE = False
 MAX_RETRIES = 5  # Increased for rate limit handling
 RETRY_DELAY = 3  # seconds (will use exponential backoff for rate limits)
 
+# Shared OpenAI rate limiter
+# Starting request budgets per minute; refined at runtime from the
+# x-ratelimit-* response headers, and Retry-After pauses all callers
+# (RATE_LIMIT_ENABLED=false only turns off the budgets; Retry-After is still honoured)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+WHISPER_RPM = int(os.getenv("WHISPER_RPM", "50"))
+EMBEDDING_RPM = int(os.getenv("EMBEDDING_RPM", "3000"))
+CHAT_RPM = int(os.getenv("CHAT_RPM", "500"))
+
+# Download Strategy Learning
+# Success rates and latencies per yt-dlp strategy, persisted across runs
+DOWNLOAD_STATS_FILE = CACHE_DIR / "download_strategies.json"
+# How long a strategy known to be unavailable (e.g. browser not installed) is skipped
+STRATEGY_UNAVAILABLE_TTL = 24 * 3600  # seconds
+
+# Preflight (metadata before download)
+# Resolve title/duration for the whole batch without downloading, guard
+# against long/expensive videos and pick a processing order
+PREFLIGHT_ENABLED = os.getenv("PREFLIGHT_ENABLED", "false").lower() == "true"
+PREFLIGHT_WORKERS = int(os.getenv("PREFLIGHT_WORKERS", "8"))
+MAX_VIDEO_DURATION = int(os.getenv("MAX_VIDEO_DURATION", "0"))  # seconds, 0 = no limit
+MAX_VIDEO_COST = float(os.getenv("MAX_VIDEO_COST", "0"))  # USD, 0 = no limit
+PREFLIGHT_OVER_LIMIT = os.getenv("PREFLIGHT_OVER_LIMIT", "reject")  # "reject" or "defer"
+PREFLIGHT_ORDER = os.getenv("PREFLIGHT_ORDER", "input")  # "input", "shortest", "longest"
+WHISPER_COST_PER_MINUTE = 0.006  # USD
+
+# Batch Pipeline Configuration
+# When enabled, batches run download / convert / transcribe / save as separate
+# stages with their own worker pools instead of one video at a time
+PIPELINE_ENABLED = os.getenv("PIPELINE_ENABLED", "false").lower() == "true"
+PIPELINE_DOWNLOAD_WORKERS = int(os.getenv("PIPELINE_DOWNLOAD_WORKERS", "2"))
+PIPELINE_CONVERT_WORKERS = int(os.getenv("PIPELINE_CONVERT_WORKERS", "1"))
+PIPELINE_TRANSCRIBE_WORKERS = int(os.getenv("PIPELINE_TRANSCRIBE_WORKERS", "2"))
+PIPELINE_SAVE_WORKERS = int(os.getenv("PIPELINE_SAVE_WORKERS", "1"))
+PIPELINE_MAX_IN_FLIGHT = int(os.getenv("PIPELINE_MAX_IN_FLIGHT", "4"))  # videos admitted at once
+# Videos multiplexed on one event loop by AsyncYouTubeTranscriber.process_many_async
+ASYNC_MAX_VIDEOS = int(os.getenv("ASYNC_MAX_VIDEOS", "8"))
+
 
 def validate_config():
     """Validate configuration values for types and ranges."""
@@ -66,6 +217,98 @@ def validate_config():
         raise ValueError(f"MAX_RETRIES must be an int between 1 and 20, got {MAX_RETRIES!r}")
     if not isinstance(RETRY_DELAY, (int, float)) or not (0 <= RETRY_DELAY <= 60):
         raise ValueError(f"RETRY_DELAY must be a number between 0 and 60, got {RETRY_DELAY!r}")
+    for name in ("WHISPER_RPM", "EMBEDDING_RPM", "CHAT_RPM"):
+        value = globals()[name]
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"{name} must be an int >= 1, got {value!r}")
+    if PREFLIGHT_OVER_LIMIT not in ("reject", "defer"):
+        raise ValueError(
+            f"PREFLIGHT_OVER_LIMIT must be 'reject' or 'defer', got {PREFLIGHT_OVER_LIMIT!r}"
+        )
+    if PREFLIGHT_ORDER not in ("input", "shortest", "longest"):
+        raise ValueError(
+            f"PREFLIGHT_ORDER must be 'input', 'shortest' or 'longest', got {PREFLIGHT_ORDER!r}"
+        )
+    if TRANSCRIPTION_BACKEND not in ("openai", "local"):
+        raise ValueError(
+            f"TRANSCRIPTION_BACKEND must be 'openai' or 'local', got {TRANSCRIPTION_BACKEND!r}"
+        )
+    if EMBEDDING_PROVIDER not in ("openai", "local"):
+        raise ValueError(
+            f"EMBEDDING_PROVIDER must be 'openai' or 'local', got {EMBEDDING_PROVIDER!r}"
+        )
+    if not isinstance(LOCAL_EMBEDDING_THREADS, int) or LOCAL_EMBEDDING_THREADS < 0:
+        raise ValueError(
+            f"LOCAL_EMBEDDING_THREADS must be an int >= 0, got {LOCAL_EMBEDDING_THREADS!r}"
+        )
+    if not isinstance(LOCAL_EMBEDDING_BATCH_SIZE, int) or not (
+        1 <= LOCAL_EMBEDDING_BATCH_SIZE <= 1024
+    ):
+        raise ValueError(
+            f"LOCAL_EMBEDDING_BATCH_SIZE must be an int between 1 and 1024, "
+            f"got {LOCAL_EMBEDDING_BATCH_SIZE!r}"
+        )
+    if not isinstance(LOCAL_WHISPER_THREADS, int) or LOCAL_WHISPER_THREADS < 0:
+        raise ValueError(
+            f"LOCAL_WHISPER_THREADS must be an int >= 0, got {LOCAL_WHISPER_THREADS!r}"
+        )
+    if not isinstance(LOCAL_WHISPER_BATCH_SIZE, int) or not (1 <= LOCAL_WHISPER_BATCH_SIZE <= 64):
+        raise ValueError(
+            f"LOCAL_WHISPER_BATCH_SIZE must be an int between 1 and 64, "
+            f"got {LOCAL_WHISPER_BATCH_SIZE!r}"
+        )
+    if not isinstance(AUDIO_CACHE_MAX_MB, int) or AUDIO_CACHE_MAX_MB < 0:
+        raise ValueError(f"AUDIO_CACHE_MAX_MB must be an int >= 0, got {AUDIO_CACHE_MAX_MB!r}")
+    if not isinstance(COMPRESS_TEMPO, (int, float)) or not (1.0 <= COMPRESS_TEMPO <= 2.0):
+        raise ValueError(f"COMPRESS_TEMPO must be a number in [1.0, 2.0], got {COMPRESS_TEMPO!r}")
+    if not isinstance(COMPRESS_MIN_SILENCE, (int, float)) or (
+        COMPRESS_MIN_SILENCE <= 2 * COMPRESS_KEEP_SILENCE
+    ):
+        raise ValueError(
+            f"COMPRESS_MIN_SILENCE must be a number > {2 * COMPRESS_KEEP_SILENCE}, "
+            f"got {COMPRESS_MIN_SILENCE!r}"
+        )
+    if not isinstance(FINGERPRINT_MIN_SIMILARITY, (int, float)) or not (
+        0.5 < FINGERPRINT_MIN_SIMILARITY <= 1.0
+    ):
+        raise ValueError(
+            f"FINGERPRINT_MIN_SIMILARITY must be a number in (0.5, 1.0], "
+            f"got {FINGERPRINT_MIN_SIMILARITY!r}"
+        )
+    if not isinstance(TRANSCRIPT_CACHE_MAX_MB, int) or TRANSCRIPT_CACHE_MAX_MB < 0:
+        raise ValueError(
+            f"TRANSCRIPT_CACHE_MAX_MB must be an int >= 0, got {TRANSCRIPT_CACHE_MAX_MB!r}"
+        )
+    if not isinstance(EMBEDDING_CACHE_MAX_MB, int) or EMBEDDING_CACHE_MAX_MB < 0:
+        raise ValueError(
+            f"EMBEDDING_CACHE_MAX_MB must be an int >= 0, got {EMBEDDING_CACHE_MAX_MB!r}"
+        )
+    if EMBEDDING_CACHE_DTYPE not in ("float16", "float32"):
+        raise ValueError(
+            f"EMBEDDING_CACHE_DTYPE must be 'float16' or 'float32', got {EMBEDDING_CACHE_DTYPE!r}"
+        )
+    if not isinstance(EMBEDDING_BATCH_TOKENS, int) or not (
+        1000 <= EMBEDDING_BATCH_TOKENS <= 300000
+    ):
+        raise ValueError(
+            f"EMBEDDING_BATCH_TOKENS must be an int between 1000 and 300000, "
+            f"got {EMBEDDING_BATCH_TOKENS!r}"
+        )
+    for name in (
+        "PREFLIGHT_WORKERS",
+        "CHUNK_CONCURRENCY",
+        "EMBEDDING_CONCURRENCY",
+        "PIPELINE_DOWNLOAD_WORKERS",
+        "PIPELINE_CONVERT_WORKERS",
+        "PIPELINE_TRANSCRIBE_WORKERS",
+        "PIPELINE_SAVE_WORKERS",
+        "PIPELINE_MAX_IN_FLIGHT",
+        "ASYNC_MAX_VIDEOS",
+        "LOCAL_WHISPER_WORKERS",
+    ):
+        value = globals()[name]
+        if not isinstance(value, int) or not (1 <= value <= 32):
+            raise ValueError(f"{name} must be an int between 1 and 32, got {value!r}")
     _config_logger.debug("Configuration validated successfully")
 
 
@@ -74,6 +317,7 @@ def create_directories():
     TRANSCRIPTS_DIR.mkdir(exist_ok=True)
     TEMP_AUDIO_DIR.mkdir(exist_ok=True)
     VECTOR_DB_DIR.mkdir(exist_ok=True)
+    CACHE_DIR.mkdir(exist_ok=True)
 
     # Create .gitkeep files
     (TEMP_AUDIO_DIR / ".gitkeep").touch()
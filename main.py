@@ -7,7 +7,7 @@ from pathlib import Path
 
 from config import create_directories
 from src.transcriber import YouTubeTranscriber
-from src.utils import parse_urls_input, validate_url
+from src.utils import is_collection_url, parse_urls_input, validate_url
 
 
 def print_progress(message: str):
@@ -25,13 +25,15 @@ Examples:
   python main.py https://youtu.be/VIDEO_ID
   python main.py --file urls.txt
   python main.py URL1 URL2 URL3
+  python main.py --backend local https://youtu.be/VIDEO_ID
+  python main.py "https://www.youtube.com/playlist?list=PL..."
         """
     )
     
     parser.add_argument(
         'urls',
         nargs='*',
-        help='YouTube video URLs to transcribe'
+        help='YouTube video, playlist or channel URLs to transcribe'
     )
     
     parser.add_argument(
@@ -47,6 +49,24 @@ Examples:
         help='Force re-transcription even if video already exists'
     )
     
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Run download/convert/transcribe/save as concurrent stages (see PIPELINE_* settings)'
+    )
+    
+    parser.add_argument(
+        '--preflight',
+        action='store_true',
+        help='Resolve metadata first and apply MAX_VIDEO_DURATION / MAX_VIDEO_COST and PREFLIGHT_ORDER'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        choices=['openai', 'local'],
+        help='Transcription backend: Whisper API or local faster-whisper on CPU (default: TRANSCRIPTION_BACKEND)'
+    )
+    
     args = parser.parse_args()
     
     # Collect URLs
@@ -64,7 +84,7 @@ Examples:
     
     if args.urls:
         for url in args.urls:
-            if validate_url(url):
+            if validate_url(url) or is_collection_url(url):
                 urls.append(url)
             else:
                 print(f"⚠️  Warning: Invalid URL skipped: {url}")
@@ -90,7 +110,10 @@ Examples:
     results = transcriber.process_multiple_videos(
         urls, 
         progress_callback=print_progress,
-        skip_if_exists=skip_if_exists
+        skip_if_exists=skip_if_exists,
+        pipelined=True if args.pipeline else None,
+        preflight=True if args.preflight else None,
+        backend=args.backend
     )
     
     # Print summary
@@ -105,6 +128,18 @@ Examples:
     print(f"\n✅ Newly transcribed: {len(successful)}/{len(results)}")
     for result in successful:
         print(f"   - {result['title']} ({result['word_count']} words)")
+        prep = result.get('audio_prep', {})
+        if prep.get('prepared'):
+            print(
+                f"     🎙️  Audio: {prep['bytes_saved'] / (1024 * 1024):.1f}MB saved, "
+                f"Whisper requests {prep['chunks_before']} → {prep['chunks_after']}"
+            )
+        if prep.get('time_map'):
+            print(
+                f"     ⏩ Compressed: {prep['original_seconds'] / 60:.1f} → "
+                f"{prep['prepared_seconds'] / 60:.1f} min (x{prep['tempo']}), "
+                f"~${prep['cost_saved']:.4f} saved"
+            )
     
     if skipped:
         print(f"\n⏭️  Skipped (already exist): {len(skipped)}/{len(results)}")
@@ -2,19 +2,26 @@
 Management CLI for YouTube Transcriber Pro
 """
 
-import json
 import shutil
 import sys
 from pathlib import Path
 
 from config import TEMP_AUDIO_DIR, TRANSCRIPTS_DIR, VECTOR_DB_DIR
+from src.audio_cache import get_audio_cache
+from src.catalog import SORT_ORDERS, get_catalog
+from src.download_stats import DownloadStrategyStats
+from src.embedding_cache import get_embedding_cache
+from src.fingerprint import get_fingerprint_index
 from src.logger import setup_logger
+from src.transcript_cache import get_transcript_cache
 
 logger = setup_logger("manage")
 
+LIST_PAGE_SIZE = 20
 
-def list_transcripts():
-    """List all transcripts"""
+
+def list_transcripts(search: str = None, sort: str = "newest", page: int = 1):
+    """List transcripts from the catalog, one page at a time"""
     print("=" * 60)
     print("📁 TRANSCRIPCIONES DISPONIBLES")
     print("=" * 60)
@@ -24,63 +31,105 @@ def list_transcripts():
         print("⚠️  No hay transcripciones")
         return
 
-    json_files = list(TRANSCRIPTS_DIR.glob("*.json"))
+    catalog = get_catalog()
+    total = catalog.count(search)
 
-    if not json_files:
-        print("⚠️  No hay transcripciones")
+    if not total:
+        print("⚠️  No hay transcripciones" + (f" que coincidan con '{search}'" if search else ""))
         return
 
-    print(f"Total: {len(json_files)} transcripciones\n")
-
-    for i, json_file in enumerate(json_files, 1):
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+    pages = (total + LIST_PAGE_SIZE - 1) // LIST_PAGE_SIZE
+    page = min(max(page, 1), pages)
+    column, descending = SORT_ORDERS[sort]
+    entries = catalog.query(
+        search, column, descending, limit=LIST_PAGE_SIZE, offset=(page - 1) * LIST_PAGE_SIZE
+    )
+
+    print(f"Total: {total} transcripciones (página {page}/{pages})\n")
+
+    for i, entry in enumerate(entries, (page - 1) * LIST_PAGE_SIZE + 1):
+        json_file = Path(entry["json_path"])
+        print(f"{i}. {entry['title'] or 'Unknown'}")
+        print(f"   Video ID: {entry['video_id']}")
+        print(f"   Palabras: {entry['word_count']}")
+        print(f"   Fecha: {entry['timestamp'] or 'N/A'}")
+        print(f"   Archivos: {json_file.name}, {json_file.stem}.txt")
+        print()
 
-            print(f"{i}. {data.get('title', 'Unknown')}")
-            print(f"   Video ID: {data.get('video_id', 'N/A')}")
-            print(f"   Palabras: {data.get('word_count', 0)}")
-            print(f"   Fecha: {data.get('timestamp', 'N/A')}")
-            print(f"   Archivos: {json_file.name}, {json_file.stem}.txt")
-            print()
-        except Exception as e:
-            logger.exception(f"Error reading {json_file.name}")
-            print(f"{i}. Error leyendo {json_file.name}: {e}")
-            print()
+    if page < pages:
+        options = f" --search '{search}'" if search else ""
+        options += f" --sort {sort}" if sort != "newest" else ""
+        print(f"➡️  Siguiente página: python manage.py --list{options} --page {page + 1}")
 
 
 def delete_transcript(video_id: str):
     """Delete a transcript by video ID"""
     print(f"🔍 Buscando transcripción con Video ID: {video_id}")
 
-    found = False
-    for json_file in TRANSCRIPTS_DIR.glob("*.json"):
+    entry = get_catalog().remove(video_id)
+    if entry is None:
+        print(f"❌ No se encontró transcripción con Video ID: {video_id}")
+        return
+
+    # Delete files
+    for path in (entry["json_path"], entry["txt_path"]):
+        if not path:
+            continue
+        file = Path(path)
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if file.exists():
+                file.unlink()
+                print(f"✅ Eliminado: {file.name}")
+        except OSError as e:
+            logger.exception(f"Error deleting {file.name}")
+            print(f"❌ No se pudo eliminar {file.name}: {e}")
 
-            if data.get("video_id") == video_id:
-                found = True
-                title = data.get("title", "Unknown")
+    # Re-uploads linked to this transcript must be transcribed again
+    get_fingerprint_index().remove(video_id)
+
+    # Drop its chunks from the RAG index instead of re-indexing everything
+    try:
+        from src.rag_engine import delete_video_vectors
 
-                # Delete files
-                txt_file = json_file.with_suffix(".txt")
+        reclaimed = delete_video_vectors([video_id])
+        print(f"🧹 {reclaimed} vectores eliminados de la base de datos vectorial")
+    except Exception as e:
+        logger.exception("Error removing transcript vectors")
+        print(f"⚠️  No se pudieron eliminar sus vectores: {e}")
 
-                json_file.unlink()
-                print(f"✅ Eliminado: {json_file.name}")
+    print(f"\n✅ Transcripción eliminada: {entry['title'] or 'Unknown'}")
 
-                if txt_file.exists():
-                    txt_file.unlink()
-                    print(f"✅ Eliminado: {txt_file.name}")
 
-                print(f"\n✅ Transcripción eliminada: {title}")
-                break
-        except (OSError, json.JSONDecodeError) as e:
-            logger.exception(f"Error processing {json_file.name}")
-            continue
+def migrate_storage(dry_run: bool = False):
+    """Move NN_title transcript files to the sharded video ID layout"""
+    print(
+        f"📦 Migrando transcripciones de {TRANSCRIPTS_DIR}" + (" (simulación)" if dry_run else "")
+    )
+    print()
 
-    if not found:
-        print(f"❌ No se encontró transcripción con Video ID: {video_id}")
+    report = get_catalog().migrate_flat_layout(dry_run)
+
+    for old_name, new_path in report["moved"]:
+        print(f"{'➡️ ' if dry_run else '✅'} {old_name} → {new_path}")
+    for name in report["duplicates"]:
+        print(f"⚠️  Duplicado (se conserva la versión más reciente, este no se mueve): {name}")
+    for name in report["unreadable"]:
+        print(f"❌ Ilegible o sin Video ID: {name}")
+
+    print()
+    verb = "se moverían" if dry_run else "movidas"
+    print(f"📦 {len(report['moved'])} transcripciones {verb}")
+
+
+def rebuild_catalog():
+    """Rebuild the transcript catalog from the JSON files"""
+    print(f"🗂️  Reconstruyendo catálogo de {TRANSCRIPTS_DIR}...")
+
+    report = get_catalog().rebuild()
+
+    print(f"✅ {report['indexed']} videos catalogados ({report['files']} archivos JSON)")
+    if report["unreadable"]:
+        print(f"⚠️  {report['unreadable']} archivos ilegibles o sin Video ID (ver logs)")
 
 
 def check_vector_db():
@@ -142,7 +191,7 @@ def clear_temp_files():
 
     deleted = 0
     for file in TEMP_AUDIO_DIR.glob("*"):
-        if file.name != ".gitkeep":
+        if file.name != ".gitkeep" and file.is_file():
             try:
                 file.unlink()
                 deleted += 1
@@ -167,15 +216,16 @@ def clear_all():
 
     # Delete transcripts
     deleted_transcripts = 0
-    for json_file in TRANSCRIPTS_DIR.glob("*.json"):
+    catalog = get_catalog()
+    for entry in catalog.query():
         try:
-            txt_file = json_file.with_suffix(".txt")
-            json_file.unlink()
-            if txt_file.exists():
-                txt_file.unlink()
+            for path in (entry["json_path"], entry["txt_path"]):
+                if path:
+                    Path(path).unlink(missing_ok=True)
+            catalog.remove(entry["video_id"])
             deleted_transcripts += 1
         except OSError as e:
-            logger.warning(f"Could not delete transcript {json_file}: {e}")
+            logger.warning(f"Could not delete transcript {entry['json_path']}: {e}")
 
     print(f"✅ Eliminadas {deleted_transcripts} transcripciones")
 
@@ -197,21 +247,14 @@ def show_stats():
     print()
 
     # Transcripts
-    json_files = list(TRANSCRIPTS_DIR.glob("*.json"))
-    total_words = 0
-
-    for json_file in json_files:
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                total_words += data.get("word_count", 0)
-        except (OSError, json.JSONDecodeError) as e:
-            logger.warning(f"Could not read stats from {json_file}: {e}")
-
-    print(f"📝 Transcripciones: {len(json_files)}")
-    print(f"📊 Total de palabras: {total_words:,}")
-    if json_files:
-        print(f"📈 Promedio por video: {total_words // len(json_files):,} palabras")
+    totals = get_catalog().totals()
+
+    print(f"📝 Transcripciones: {totals['transcripts']}")
+    print(f"📊 Total de palabras: {totals['words']:,}")
+    if totals["transcripts"]:
+        print(f"📈 Promedio por video: {totals['words'] // totals['transcripts']:,} palabras")
+    if totals["seconds"]:
+        print(f"⏱️  Duración total: {totals['seconds'] / 3600:.1f} h")
     print()
 
     # Vector DB
@@ -223,8 +266,55 @@ def show_stats():
         print(f"🗄️  Vector DB: No inicializada")
     print()
 
+    # Download strategies
+    strategy_stats = DownloadStrategyStats().summary()
+    if strategy_stats:
+        print("📥 Estrategias de descarga (mejor primero):")
+        for entry in strategy_stats:
+            latency = entry["avg_latency"]
+            latency_str = f"{latency:.1f}s" if latency != float("inf") else "N/A"
+            print(
+                f"   - {entry['label']}: {entry['successes']} ok / {entry['failures']} fallos "
+                f"({entry['success_rate']:.0%}), latencia media {latency_str}"
+            )
+        print()
+
+    # Audio cache
+    cache = get_audio_cache(TEMP_AUDIO_DIR).summary()
+    print(
+        f"♻️  Caché de audio: {cache['files']} archivos, "
+        f"{cache['bytes'] / (1024 * 1024):.2f} / {cache['max_bytes'] / (1024 * 1024):.0f} MB"
+    )
+    print(
+        f"   Aciertos: {cache['hits']} / {cache['hits'] + cache['misses']} "
+        f"({cache['hit_rate']:.0%}), {cache['bytes_saved'] / (1024 * 1024):.2f} MB sin descargar, "
+        f"{cache['evictions']} expulsados"
+    )
+    whisper_cache = get_transcript_cache().summary()
+    print(
+        f"♻️  Caché de transcripciones: {whisper_cache['entries']} entradas, "
+        f"{whisper_cache['bytes'] / (1024 * 1024):.2f} / "
+        f"{whisper_cache['max_bytes'] / (1024 * 1024):.0f} MB"
+    )
+    print(
+        f"   Aciertos: {whisper_cache['hits']} / "
+        f"{whisper_cache['hits'] + whisper_cache['misses']} ({whisper_cache['hit_rate']:.0%}), "
+        f"{whisper_cache['audio_seconds_saved'] / 60:.1f} min de audio, "
+        f"${whisper_cache['dollars_saved']:.2f} ahorrados"
+    )
+    vectors = get_embedding_cache().summary()
+    print(
+        f"♻️  Caché de embeddings: {vectors['entries']} vectores, "
+        f"{vectors['bytes'] / (1024 * 1024):.2f} / {vectors['max_bytes'] / (1024 * 1024):.0f} MB"
+    )
+    print(
+        f"   Aciertos: {vectors['hits']} / {vectors['hits'] + vectors['misses']} "
+        f"({vectors['hit_rate']:.0%}), {vectors['evictions']} expulsados"
+    )
+    print()
+
     # Temp files
-    temp_files = [f for f in TEMP_AUDIO_DIR.glob("*") if f.name != ".gitkeep"]
+    temp_files = [f for f in TEMP_AUDIO_DIR.glob("*") if f.name != ".gitkeep" and f.is_file()]
     if temp_files:
         temp_size = sum(f.stat().st_size for f in temp_files) / (1024 * 1024)
         print(f"⚠️  Archivos temporales: {len(temp_files)} ({temp_size:.2f} MB)")
@@ -240,18 +330,30 @@ def main():
         print()
         print("Uso:")
         print("  python manage.py --list              # Listar transcripciones")
+        print("      [--search TEXTO] [--sort newest|oldest|title|words|duration] [--page N]")
         print("  python manage.py --delete VIDEO_ID   # Eliminar transcripción")
         print("  python manage.py --check-db          # Ver estado de Vector DB")
         print("  python manage.py --clear-db          # Limpiar Vector DB")
         print("  python manage.py --clean-temp        # Limpiar archivos temporales")
         print("  python manage.py --clear-all         # Eliminar TODO")
         print("  python manage.py --stats             # Ver estadísticas")
+        print("  python manage.py --rebuild-catalog   # Reconstruir catálogo de transcripciones")
+        print("  python manage.py --migrate-storage   # Mover archivos NN_titulo al nuevo formato")
+        print("      [--dry-run]")
         sys.exit(0)
 
     command = sys.argv[1]
 
     if command == "--list":
-        list_transcripts()
+        options = dict(zip(sys.argv[2::2], sys.argv[3::2]))
+        sort = options.get("--sort", "newest")
+        if sort not in SORT_ORDERS or not options.get("--page", "1").isdigit():
+            print(
+                "❌ Uso: python manage.py --list [--search TEXTO] "
+                f"[--sort {'|'.join(SORT_ORDERS)}] [--page N]"
+            )
+            sys.exit(1)
+        list_transcripts(options.get("--search"), sort, int(options.get("--page", "1")))
 
     elif command == "--delete":
         if len(sys.argv) < 3:
@@ -275,6 +377,12 @@ def main():
     elif command == "--stats":
         show_stats()
 
+    elif command == "--rebuild-catalog":
+        rebuild_catalog()
+
+    elif command == "--migrate-storage":
+        migrate_storage(dry_run="--dry-run" in sys.argv[2:])
+
     else:
         print(f"❌ Comando desconocido: {command}")
         print("Usa: python manage.py (sin argumentos) para ver ayuda")
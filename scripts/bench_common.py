@@ -0,0 +1,61 @@
+"""
+Shared helpers for the audio benchmark scripts
+"""
+
+import resource
+import subprocess
+import sys
+from pathlib import Path
+
+# Allow running as "python scripts/benchmark_x.py" from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.audio import ffmpeg_tool  # noqa: E402
+
+
+def child_cpu_seconds() -> float:
+    """CPU time (user + system) consumed so far by finished child processes"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def generate_sample(
+    output_path: Path, minutes: float, codec: str = "libopus", bitrate: str = "128k"
+) -> Path:
+    """
+    Generate a synthetic stereo 48 kHz clip resembling a YouTube audio stream
+
+    Args:
+        output_path: Destination file (extension selects the container)
+        minutes: Clip length in minutes
+        codec: FFmpeg audio encoder
+        bitrate: Target bitrate
+
+    Returns:
+        output_path
+    """
+    seconds = minutes * 60
+    subprocess.run(
+        [
+            ffmpeg_tool("ffmpeg"),
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=220:beep_factor=4:sample_rate=48000:duration={seconds}",
+            "-f",
+            "lavfi",
+            "-i",
+            f"anoisesrc=amplitude=0.05:sample_rate=48000:duration={seconds}",
+            "-filter_complex",
+            "amix=inputs=2,aformat=channel_layouts=stereo",
+            "-c:a",
+            codec,
+            "-b:a",
+            bitrate,
+            str(output_path),
+            "-y",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return output_path
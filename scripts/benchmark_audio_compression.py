@@ -0,0 +1,165 @@
+"""
+Benchmark: silence trimming + tempo compression, billed minutes vs. word error drift
+
+For every reference recording, prepares the audio as the transcriber would
+(plain speech preparation, then compression at each tempo) and reports bytes,
+billed minutes and Whisper cost. With --backend, each version is also
+transcribed and its word error rate (WER) is measured against the reference
+transcript (<stem>.txt next to the audio) or, without one, against the
+uncompressed transcript; the drift column is the WER increase over plain
+preparation.
+
+Usage:
+    python scripts/benchmark_audio_compression.py [reference_dir] [--tempos 1.0 1.25 1.5 2.0]
+        [--backend openai|local]
+
+Without a directory, synthetic clips with pauses are generated (sizes and
+durations only; they have no words to transcribe). Use short clips (< 25MB
+after preparation) for the openai backend.
+"""
+
+import argparse
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import bench_common  # noqa: F401  (puts the project root on sys.path)
+
+from config import COMPRESS_TEMPO, OPENAI_API_KEY, WHISPER_COST_PER_MINUTE
+from src.audio import ffmpeg_tool, prepare_for_speech, probe_duration
+from src.backends import create_backend
+
+AUDIO_EXTENSIONS = {".mp3", ".m4a", ".webm", ".ogg", ".opus", ".wav", ".flac"}
+
+
+def generate_paused_sample(output_path: Path, minutes: float) -> Path:
+    """Speech-like noise that pauses 3 s out of every 15 s"""
+    subprocess.run(
+        [
+            ffmpeg_tool("ffmpeg"),
+            "-f",
+            "lavfi",
+            "-i",
+            f"anoisesrc=c=pink:r=48000:d={minutes * 60}",
+            "-af",
+            "volume='if(gte(mod(t,15),12),0,0.5)':eval=frame",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "128k",
+            str(output_path),
+            "-y",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return output_path
+
+
+def words(text: str) -> list:
+    """Lowercase words without punctuation"""
+    return re.findall(r"\w+(?:'\w+)?", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length"""
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def prepare(source: Path, workdir: Path, tempo) -> dict:
+    """Prepare a copy of source; tempo None means plain speech preparation"""
+    label = "plain" if tempo is None else f"x{tempo}"
+    copy = workdir / f"{source.stem}_{label}{source.suffix}"
+    shutil.copy(source, copy)
+    report = prepare_for_speech(copy, compress=tempo is not None, tempo=tempo or 1.0)
+    return {
+        "label": label,
+        "path": report["path"],
+        "bytes": report["path"].stat().st_size,
+        "seconds": probe_duration(report["path"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("reference_dir", nargs="?", help="Audio files with optional <stem>.txt")
+    parser.add_argument("--tempos", type=float, nargs="+", default=[1.0, 1.25, COMPRESS_TEMPO])
+    parser.add_argument("--backend", choices=["openai", "local"], help="Also measure WER")
+    parser.add_argument("--minutes", type=float, default=5, help="Synthetic clip length")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="compress_bench_"))
+    if args.reference_dir:
+        sources = sorted(
+            p for p in Path(args.reference_dir).iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS
+        )
+    else:
+        sources = [generate_paused_sample(workdir / "synthetic.webm", args.minutes)]
+
+    backend = None
+    if args.backend:
+        from openai import OpenAI
+
+        backend = create_backend(args.backend, OpenAI(api_key=OPENAI_API_KEY))
+
+    variants = [None, *args.tempos]
+    totals = {
+        variant: {"bytes": 0, "seconds": 0.0, "errors": 0.0, "words": 0} for variant in variants
+    }
+    try:
+        for source in sources:
+            print(f"🎧 {source.name}")
+            reference_file = source.with_suffix(".txt")
+            reference = None
+            if reference_file.exists():
+                reference = reference_file.read_text(encoding="utf-8")
+
+            for variant in variants:
+                result = prepare(source, workdir, variant)
+                total = totals[variant]
+                total["bytes"] += result["bytes"]
+                total["seconds"] += result["seconds"]
+                if backend is not None:
+                    text = backend.transcribe(result["path"])
+                    if reference is None:
+                        reference = text  # the plain version runs first
+                    reference_words = len(words(reference))
+                    total["errors"] += word_error_rate(reference, text) * reference_words
+                    total["words"] += reference_words
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(
+        f"\n{'audio':>7} {'MB':>8} {'minutes':>8} {'cost $':>8} {'saved':>6} "
+        f"{'WER':>6} {'drift':>6}"
+    )
+    plain = totals[None]
+    plain_wer = plain["errors"] / plain["words"] if plain["words"] else None
+    for variant in variants:
+        total = totals[variant]
+        minutes = total["seconds"] / 60
+        saved = 1 - total["seconds"] / plain["seconds"] if plain["seconds"] else 0.0
+        wer = total["errors"] / total["words"] if total["words"] else None
+        print(
+            f"{'plain' if variant is None else f'x{variant}':>7} "
+            f"{total['bytes'] / (1024 * 1024):>8.2f} {minutes:>8.2f} "
+            f"{minutes * WHISPER_COST_PER_MINUTE:>8.4f} {saved:>6.0%} "
+            + (f"{wer:>6.1%} {wer - plain_wer:>+6.1%}" if wer is not None else "     -      -")
+        )
+
+
+if __name__ == "__main__":
+    main()
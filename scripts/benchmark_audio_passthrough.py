@@ -0,0 +1,101 @@
+"""
+Benchmark: native-codec passthrough vs. the legacy MP3 re-encode
+
+Compares CPU time and bytes uploaded to Whisper per audio minute.
+
+Usage:
+    python scripts/benchmark_audio_passthrough.py [audio files...] [--minutes N]
+
+Without files, synthetic webm/opus and m4a/aac clips shaped like YouTube
+audio streams are generated.
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from bench_common import child_cpu_seconds, generate_sample
+
+from config import AUDIO_FORMAT, AUDIO_QUALITY
+from src.audio import is_whisper_supported, probe_duration, transcode_audio
+
+
+def benchmark_file(source: Path, workdir: Path, duration: float) -> dict:
+    """Measure both paths for one native audio file"""
+    minutes = duration / 60
+
+    # Legacy path: always re-encode to AUDIO_FORMAT
+    legacy_input = workdir / f"legacy_{source.name}"
+    shutil.copy(source, legacy_input)
+    cpu_before = child_cpu_seconds()
+    wall_start = time.time()
+    legacy_output = transcode_audio(legacy_input)
+    legacy_wall = time.time() - wall_start
+    legacy_cpu = child_cpu_seconds() - cpu_before
+    legacy_bytes = legacy_output.stat().st_size
+
+    # Passthrough: no transcode when Whisper accepts the container
+    passthrough_cpu = 0.0
+    passthrough_bytes = source.stat().st_size
+    if not is_whisper_supported(source):
+        native_input = workdir / f"native_{source.name}"
+        shutil.copy(source, native_input)
+        cpu_before = child_cpu_seconds()
+        passthrough_bytes = transcode_audio(native_input).stat().st_size
+        passthrough_cpu = child_cpu_seconds() - cpu_before
+
+    return {
+        "file": source.name,
+        "minutes": minutes,
+        "legacy_cpu_per_min": legacy_cpu / minutes,
+        "legacy_wall": legacy_wall,
+        "legacy_mb_per_min": legacy_bytes / minutes / (1024 * 1024),
+        "passthrough_cpu_per_min": passthrough_cpu / minutes,
+        "passthrough_mb_per_min": passthrough_bytes / minutes / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Native audio files (webm, m4a, ...)")
+    parser.add_argument("--minutes", type=float, default=10, help="Synthetic clip length")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        samples = []
+
+        if args.files:
+            for name in args.files:
+                path = Path(name)
+                samples.append((path, probe_duration(path)))
+        else:
+            print(f"🎛️  Generating {args.minutes:g}-minute synthetic samples...")
+            for filename, codec in [("sample.webm", "libopus"), ("sample.m4a", "aac")]:
+                path = generate_sample(workdir / filename, args.minutes, codec=codec)
+                samples.append((path, args.minutes * 60))
+
+        print()
+        print(f"Legacy path: re-encode to {AUDIO_FORMAT} @ {AUDIO_QUALITY} kbps")
+        print()
+        header = (
+            f"{'file':<16} {'legacy CPU s/min':>17} {'pass CPU s/min':>15} "
+            f"{'legacy MB/min':>14} {'pass MB/min':>12} {'bytes saved':>12}"
+        )
+        print(header)
+        print("-" * len(header))
+
+        for path, duration in samples:
+            r = benchmark_file(path, workdir, duration)
+            saved = 1 - r["passthrough_mb_per_min"] / r["legacy_mb_per_min"]
+            print(
+                f"{r['file']:<16} {r['legacy_cpu_per_min']:>17.3f} "
+                f"{r['passthrough_cpu_per_min']:>15.3f} {r['legacy_mb_per_min']:>14.2f} "
+                f"{r['passthrough_mb_per_min']:>12.2f} {saved:>11.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
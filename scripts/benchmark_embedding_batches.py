@@ -0,0 +1,122 @@
+"""
+Benchmark: embedding throughput against a local stub of the embeddings API
+
+Starts an HTTP server that answers POST /v1/embeddings like the OpenAI API
+after a fixed round-trip latency plus a per-token cost, then embeds the same
+synthetic chunks with OpenAIBatchEmbeddings at several concurrency levels
+through the real OpenAI client and the shared rate limiter. The one-request-
+at-a-time row shows what serial batching costs; no real API calls are made.
+
+Usage:
+    python scripts/benchmark_embedding_batches.py [--chunks 5000] [--latency-ms 150]
+        [--concurrency 1 2 4 8] [--batch-tokens 20000]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bench_common  # noqa: F401  (puts the project root on sys.path)
+from openai import OpenAI
+
+from src.embeddings import OpenAIBatchEmbeddings, pack_batches
+from src.rate_limiter import RateLimitedResource, RateLimiter, estimate_tokens
+
+DIMENSIONS = 256
+
+
+def stub_handler(latency: float, seconds_per_token: float):
+    """Request handler class answering embeddings requests after a simulated delay"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            inputs = body["input"]
+            tokens = estimate_tokens(inputs)
+            time.sleep(latency + tokens * seconds_per_token)
+
+            payload = json.dumps(
+                {
+                    "object": "list",
+                    "model": body["model"],
+                    "data": [
+                        {"object": "embedding", "index": i, "embedding": [0.01] * DIMENSIONS}
+                        for i in range(len(inputs))
+                    ],
+                    "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def make_chunks(count: int, rng: random.Random) -> list:
+    """Chunks of 600-1000 characters, like RecursiveCharacterTextSplitter output"""
+    words = ["transcripción", "video", "modelo", "datos", "python", "audio", "charla", "ejemplo"]
+    chunks = []
+    for _ in range(count):
+        text = ""
+        target = rng.randint(600, 1000)
+        while len(text) < target:
+            text += rng.choice(words) + " "
+        chunks.append(text.strip())
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--us-per-token", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-tokens", type=int, default=20000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), stub_handler(args.latency_ms / 1000, args.us_per_token / 1e6)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OpenAI(
+        api_key="stub", base_url=f"http://127.0.0.1:{server.server_port}/v1", max_retries=0
+    )
+    resource = RateLimitedResource(client.embeddings, "embeddings", RateLimiter(enabled=False))
+
+    chunks = make_chunks(args.chunks, random.Random(7))
+    batches = pack_batches(chunks, max_tokens=args.batch_tokens)
+    print(
+        f"{len(chunks)} chunks, {estimate_tokens(chunks)} estimated tokens, "
+        f"{len(batches)} batches of <= {args.batch_tokens} tokens"
+    )
+    print(f"{'concurrency':>11} {'seconds':>8} {'chunks/s':>9} {'speedup':>8}")
+
+    baseline = None
+    for concurrency in args.concurrency:
+        embeddings = OpenAIBatchEmbeddings(
+            resource, model="stub", concurrency=concurrency, batch_tokens=args.batch_tokens
+        )
+        start = time.perf_counter()
+        vectors = embeddings.embed_documents(chunks)
+        elapsed = time.perf_counter() - start
+        assert len(vectors) == len(chunks)
+        baseline = baseline or elapsed
+        print(
+            f"{concurrency:>11} {elapsed:>8.2f} {len(chunks) / elapsed:>9.0f} "
+            f"{baseline / elapsed:>7.1f}x"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: fingerprint index lookup time as the library grows
+
+Fills a FingerprintIndex with random 128-bit fingerprints (random fingerprints
+behave like unrelated recordings), then times lookups of a fresh fingerprint
+(the usual miss) and of an indexed one with a few bits flipped (a re-upload),
+each with the 17 alignment probes compute_fingerprint() produces.
+
+Usage:
+    python scripts/benchmark_fingerprint_index.py [--sizes 1000 10000 100000] [--lookups 200]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import bench_common  # noqa: F401  (puts the project root on sys.path)
+
+from src.fingerprint import FINGERPRINT_BITS, FingerprintIndex
+
+
+def build(size: int, rng: random.Random) -> FingerprintIndex:
+    """Index of random fingerprints (in memory; saving each add would dominate)"""
+    index = FingerprintIndex(Path(tempfile.mkdtemp()) / "fingerprints.json")
+    for n in range(size):
+        index._insert(
+            f"vid{n:08d}",
+            {"fingerprint": f"{rng.getrandbits(FINGERPRINT_BITS):032x}", "duration": 600.0},
+        )
+    return index
+
+
+def reupload_probes(fingerprint: int, rng: random.Random) -> list:
+    """17 probes of a re-encode: the aligned one flips 4 bits, the others about 20"""
+    probes = []
+    for flips in [20] * 8 + [4] + [20] * 8:
+        probe = fingerprint
+        for bit in rng.sample(range(FINGERPRINT_BITS), flips):
+            probe ^= 1 << bit
+        probes.append(probe)
+    return probes
+
+
+def time_lookups(index: FingerprintIndex, queries: list) -> tuple:
+    """Mean lookup time in ms and number of matches"""
+    start = time.perf_counter()
+    matches = sum(index.lookup(probes, duration=600.0) is not None for probes in queries)
+    return (time.perf_counter() - start) / len(queries) * 1000, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'entries':>8} {'miss ms':>8} {'false +':>8} {'hit ms':>8} {'found':>8}")
+    for size in args.sizes:
+        index = build(size, rng)
+        misses = [
+            [rng.getrandbits(FINGERPRINT_BITS) for _ in range(17)] for _ in range(args.lookups)
+        ]
+        targets = rng.sample(sorted(index.fingerprints), min(args.lookups, size))
+        hits = [reupload_probes(index.fingerprints[video_id], rng) for video_id in targets]
+
+        miss_ms, false_positives = time_lookups(index, misses)
+        hit_ms, found = time_lookups(index, hits)
+        print(
+            f"{size:>8} {miss_ms:>8.3f} {false_positives:>8} {hit_ms:>8.3f} "
+            f"{found:>5}/{len(hits):<3}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: local CPU embedding provider, indexing throughput and query latency
+
+Loads the ONNX sentence-transformer used by EMBEDDING_PROVIDER=local, embeds
+synthetic transcript chunks at several batch sizes and times search queries
+on the warm process: new queries run the model, repeated ones are answered
+from the provider's query cache. The query embedding is what dominates a
+warm RAGEngine.search call; the Chroma lookup that follows is sub-millisecond
+at library scale.
+
+Usage:
+    python scripts/benchmark_local_embeddings.py [--chunks 512] [--batch-sizes 16 64]
+        [--queries 50] [--threads 0] [--model sentence-transformers/...]
+
+Needs fastembed (pip install fastembed); the first run downloads the model.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import bench_common  # noqa: F401  (puts the project root on sys.path)
+
+from config import LOCAL_EMBEDDING_MODEL
+from src.embeddings import LocalEmbeddings
+
+WORDS = ["transcripción", "video", "modelo", "datos", "python", "audio", "charla", "ejemplo"]
+
+
+def make_chunks(count: int, rng: random.Random) -> list:
+    """Chunks of 600-1000 characters, like RecursiveCharacterTextSplitter output"""
+    chunks = []
+    for _ in range(count):
+        text = ""
+        target = rng.randint(600, 1000)
+        while len(text) < target:
+            text += rng.choice(WORDS) + " "
+        chunks.append(text.strip())
+    return chunks
+
+
+def percentiles(samples: list) -> str:
+    """p50 / p95 of a list of seconds, in milliseconds"""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50 {statistics.median(ordered) * 1000:6.2f} ms   p95 {p95 * 1000:6.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=LOCAL_EMBEDDING_MODEL)
+    parser.add_argument("--chunks", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    chunks = make_chunks(args.chunks, rng)
+
+    embeddings = LocalEmbeddings(args.model, threads=args.threads)
+    start = time.perf_counter()
+    embeddings._load()
+    print(f"model load (cold): {time.perf_counter() - start:.2f}s")
+
+    print(f"{'batch size':>10} {'seconds':>8} {'chunks/s':>9}")
+    for batch_size in args.batch_sizes:
+        embeddings.batch_size = batch_size
+        start = time.perf_counter()
+        vectors = embeddings.embed_documents(chunks)
+        elapsed = time.perf_counter() - start
+        assert len(vectors) == len(chunks)
+        print(f"{batch_size:>10} {elapsed:>8.2f} {len(chunks) / elapsed:>9.0f}")
+
+    queries = [" ".join(rng.choices(WORDS, k=rng.randint(3, 8))) for _ in range(args.queries)]
+    embeddings.embed_query("warm up")
+    for label in ("new queries", "repeated queries"):
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            embeddings.embed_query(query)
+            samples.append(time.perf_counter() - start)
+        print(f"{label:>16}: {percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: local faster-whisper backend, real-time factor per CPU core
+
+Transcribes one speech recording with the local backend for every
+combination of thread count and batch size, excluding model load time, and
+reports the real-time factor (wall seconds per audio second) and the audio
+seconds decoded per wall second per core.
+
+Usage:
+    python scripts/benchmark_local_whisper.py speech.mp3 [--threads 1 2 4] [--batch-sizes 1 8]
+        [--model small] [--compute-type int8]
+
+Needs faster-whisper (pip install faster-whisper). Use real speech: on
+synthetic tones the VAD drops everything and the numbers mean nothing.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import bench_common  # noqa: F401  (puts the project root on sys.path)
+
+from config import LOCAL_WHISPER_COMPUTE_TYPE, LOCAL_WHISPER_MODEL
+from src.backends import LocalWhisperBackend
+
+
+def measure(source: Path, model: str, compute_type: str, threads: int, batch_size: int) -> dict:
+    """Load the model, then time one full transcription"""
+    backend = LocalWhisperBackend(model, compute_type, threads, 1, batch_size)
+    backend._load()
+
+    stats = {}
+    cpu_before = time.process_time()
+    wall_start = time.time()
+    text = backend.transcribe(source, stats)
+    wall = time.time() - wall_start
+    cpu = time.process_time() - cpu_before
+
+    audio = stats["audio_seconds"]
+    return {
+        "threads": threads,
+        "batch": batch_size,
+        "wall": wall,
+        "cpu": cpu,
+        "rtf": wall / audio,
+        "per_core": audio / wall / threads,
+        "words": len(text.split()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", help="Speech recording to transcribe")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--model", default=LOCAL_WHISPER_MODEL)
+    parser.add_argument("--compute-type", default=LOCAL_WHISPER_COMPUTE_TYPE)
+    args = parser.parse_args()
+
+    source = Path(args.file)
+    print(f"🧠 {args.model} ({args.compute_type}) on {source.name}\n")
+
+    results = [
+        measure(source, args.model, args.compute_type, threads, batch_size)
+        for threads in sorted(set(args.threads))
+        for batch_size in args.batch_sizes
+    ]
+
+    print(
+        f"{'threads':>7} {'batch':>5} {'wall s':>8} {'cpu s':>8} "
+        f"{'RTF':>7} {'x RT/core':>9} {'words':>6}"
+    )
+    for r in results:
+        print(
+            f"{r['threads']:>7} {r['batch']:>5} {r['wall']:>8.1f} {r['cpu']:>8.1f} "
+            f"{r['rtf']:>7.3f} {r['per_core']:>9.2f} {r['words']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: single-pass segmenter vs. the legacy one-process-per-chunk split
+
+The legacy split started one FFmpeg process per chunk with -ss after -i, so
+every chunk decoded the input from the beginning up to its start offset.
+
+Usage:
+    python scripts/benchmark_split_audio.py [audio file] [--minutes N] [--max-size-mb M]
+
+Without a file, a synthetic webm/opus clip shaped like a YouTube audio stream
+is generated (3 hours by default).
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from bench_common import child_cpu_seconds, generate_sample
+
+from src.audio import ffmpeg_tool, probe_duration, segment_audio
+
+
+def legacy_split(audio_path: Path, duration: float, max_size_mb: float) -> list:
+    """The previous _split_audio: even split, one FFmpeg run per chunk"""
+    file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+    num_chunks = int(file_size_mb / max_size_mb) + 1
+    chunk_duration = duration / num_chunks
+
+    chunks = []
+    for i in range(num_chunks):
+        chunk_path = audio_path.parent / f"legacy_chunk{i}{audio_path.suffix}"
+        subprocess.run(
+            [
+                ffmpeg_tool("ffmpeg"),
+                "-i",
+                str(audio_path),
+                "-ss",
+                str(i * chunk_duration),
+                "-t",
+                str(chunk_duration),
+                "-c",
+                "copy",
+                str(chunk_path),
+                "-y",
+            ],
+            capture_output=True,
+        )
+        chunks.append(chunk_path)
+    return chunks
+
+
+def measure(label: str, split) -> dict:
+    """Run one split function and collect wall time, CPU time and chunk sizes"""
+    cpu_before = child_cpu_seconds()
+    wall_start = time.time()
+    chunks = split()
+    wall = time.time() - wall_start
+    cpu = child_cpu_seconds() - cpu_before
+    sizes = [chunk.stat().st_size / (1024 * 1024) for chunk in chunks]
+    for chunk in chunks:
+        chunk.unlink()
+    return {"label": label, "wall": wall, "cpu": cpu, "chunks": len(sizes), "largest": max(sizes)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", nargs="?", help="Audio file to split")
+    parser.add_argument("--minutes", type=float, default=180, help="Synthetic clip length")
+    parser.add_argument("--max-size-mb", type=float, default=24, help="Chunk size limit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            source = Path(args.file)
+            duration = probe_duration(source)
+        else:
+            print(f"🎛️  Generating {args.minutes:g}-minute synthetic sample...")
+            source = generate_sample(Path(tmp) / "sample.webm", args.minutes)
+            duration = args.minutes * 60
+
+        size_mb = source.stat().st_size / (1024 * 1024)
+        print(f"📦 {source.name}: {duration / 3600:.2f} h, {size_mb:.1f} MB\n")
+
+        results = [
+            measure("legacy (per chunk)", lambda: legacy_split(source, duration, args.max_size_mb)),
+            measure(
+                "segment muxer",
+                lambda: segment_audio(source, args.max_size_mb, duration=duration),
+            ),
+        ]
+
+    print(f"{'method':<20} {'wall s':>8} {'cpu s':>8} {'chunks':>7} {'largest MB':>11}")
+    for r in results:
+        print(
+            f"{r['label']:<20} {r['wall']:>8.2f} {r['cpu']:>8.2f} "
+            f"{r['chunks']:>7} {r['largest']:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Asyncio FFmpeg helpers for YouTube Transcriber Pro
+
+Same stages as src/audio.py (the commands and result handling are shared),
+but FFmpeg runs through asyncio subprocesses so many videos can be prepared
+and split on one event loop. Cancelling a coroutine kills its FFmpeg process.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    AUDIO_COMPRESS,
+    COMPRESS_MIN_SILENCE,
+    COMPRESS_TEMPO,
+    PREPARE_BITRATE,
+    PREPARE_CHANNELS,
+    PREPARE_CODEC,
+    PREPARE_FORMAT,
+    PREPARE_SAMPLE_RATE,
+    SPLIT_ON_SILENCE,
+)
+from src.audio import (
+    SEGMENT_ATTEMPTS,
+    SEGMENT_SAFETY,
+    AudioChunk,
+    _segment_files,
+    collect_segments,
+    compress_filter,
+    ffmpeg_tool,
+    finish_speech_prep,
+    parse_ffmpeg_duration,
+    parse_silences,
+    plan_compression,
+    plan_cut_points,
+    probe_command,
+    segment_command,
+    silencedetect_command,
+    speech_command,
+    speech_output_path,
+)
+from src.logger import setup_logger
+
+logger = setup_logger("async_audio")
+
+
+async def run_ffmpeg_async(cmd: List[str]) -> Tuple[int, bytes, bytes]:
+    """
+    Run an FFmpeg command without blocking the event loop
+
+    Args:
+        cmd: Command line
+
+    Returns:
+        (return code, stdout, stderr)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    return process.returncode, stdout, stderr
+
+
+async def probe_duration_async(audio_path: Path, ffmpeg_location: Optional[str] = None) -> float:
+    """Async probe_duration (ffprobe, falling back to ffmpeg -i)"""
+    try:
+        _, stdout, _ = await run_ffmpeg_async(probe_command(audio_path, ffmpeg_location))
+        return float(stdout.decode().strip())
+    except FileNotFoundError:
+        _, _, stderr = await run_ffmpeg_async(
+            [ffmpeg_tool("ffmpeg", ffmpeg_location), "-i", str(audio_path)]
+        )
+        return parse_ffmpeg_duration(audio_path, stderr.decode(errors="replace"))
+
+
+async def detect_silences_async(
+    audio_path: Path, ffmpeg_location: Optional[str] = None
+) -> List[Tuple[float, float]]:
+    """Async detect_silences (empty list if detection failed)"""
+    returncode, _, stderr = await run_ffmpeg_async(
+        silencedetect_command(audio_path, ffmpeg_location)
+    )
+    if returncode != 0:
+        logger.warning(
+            f"⚠️  Silence detection failed, using fixed cut points: "
+            f"{stderr.decode(errors='replace')[-300:]}"
+        )
+        return []
+
+    silences = parse_silences(stderr.decode(errors="replace"))
+    logger.info(f"🔇 Found {len(silences)} silent regions in {audio_path.name}")
+    return silences
+
+
+async def prepare_for_speech_async(
+    audio_path: Path,
+    ffmpeg_location: Optional[str] = None,
+    sample_rate: int = PREPARE_SAMPLE_RATE,
+    channels: int = PREPARE_CHANNELS,
+    codec: str = PREPARE_CODEC,
+    bitrate: str = PREPARE_BITRATE,
+    audio_format: str = PREPARE_FORMAT,
+    compress: bool = AUDIO_COMPRESS,
+    tempo: float = COMPRESS_TEMPO,
+) -> Dict[str, Any]:
+    """Async prepare_for_speech; returns the same preparation report"""
+    time_map = None
+    if compress:
+        returncode, _, stderr = await run_ffmpeg_async(
+            silencedetect_command(audio_path, ffmpeg_location, min_duration=COMPRESS_MIN_SILENCE)
+        )
+        time_map = plan_compression(audio_path, returncode, stderr, tempo)
+
+    output_path = speech_output_path(audio_path, audio_format)
+    try:
+        returncode, _, stderr = await run_ffmpeg_async(
+            speech_command(
+                audio_path,
+                output_path,
+                ffmpeg_location,
+                sample_rate,
+                channels,
+                codec,
+                bitrate,
+                compress_filter(time_map) if time_map else None,
+            )
+        )
+    except asyncio.CancelledError:
+        output_path.unlink(missing_ok=True)
+        raise
+    return finish_speech_prep(audio_path, output_path, returncode, stderr, time_map)
+
+
+async def segment_audio_async(
+    audio_path: Path,
+    max_size_mb: float = 24,
+    ffmpeg_location: Optional[str] = None,
+    duration: Optional[float] = None,
+    on_silence: bool = SPLIT_ON_SILENCE,
+) -> List[AudioChunk]:
+    """
+    Async segment_audio: one FFmpeg segment-muxer pass, cut at silences
+
+    Partial chunk files are removed if the coroutine is cancelled.
+
+    Returns:
+        Chunk plan in playback order ([AudioChunk(audio_path)] if no split is needed)
+    """
+    size = audio_path.stat().st_size
+    max_bytes = int(max_size_mb * 1024 * 1024)
+    if size <= max_bytes:
+        return [AudioChunk(audio_path, 0.0, duration)]
+
+    if duration is None:
+        duration = await probe_duration_async(audio_path, ffmpeg_location)
+    segment_time = duration * max_bytes / size * SEGMENT_SAFETY
+    silences = await detect_silences_async(audio_path, ffmpeg_location) if on_silence else None
+
+    for stale in _segment_files(audio_path):
+        stale.unlink()
+
+    for _ in range(SEGMENT_ATTEMPTS):
+        cuts = plan_cut_points(duration, segment_time, silences)
+        logger.info(
+            f"✂️  Segmenting {audio_path.name} into {len(cuts) + 1} chunks "
+            f"(max {segment_time:.1f}s, one pass)"
+        )
+        try:
+            returncode, _, stderr = await run_ffmpeg_async(
+                segment_command(audio_path, cuts, ffmpeg_location)
+            )
+        except asyncio.CancelledError:
+            for partial in _segment_files(audio_path):
+                partial.unlink()
+            raise
+        chunks, largest = collect_segments(
+            audio_path, cuts, duration, max_bytes, returncode, stderr
+        )
+        if chunks is not None:
+            return chunks
+        segment_time *= max_bytes / largest * SEGMENT_SAFETY
+
+    raise RuntimeError(f"Could not split {audio_path.name} into chunks under {max_size_mb}MB")
@@ -0,0 +1,411 @@
+"""
+Asyncio transcription engine for YouTube Transcriber Pro
+
+AsyncYouTubeTranscriber runs the same download → prepare → split → transcribe
+→ save flow as YouTubeTranscriber, but Whisper calls go through AsyncOpenAI,
+FFmpeg runs as asyncio subprocesses and retries wait with asyncio.sleep, so
+many videos share one event loop instead of holding one thread each. yt-dlp
+and the local CPU backend have no async API and run in the default executor.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from openai import AsyncOpenAI
+
+from config import (
+    ASYNC_MAX_VIDEOS,
+    AUDIO_COMPRESS,
+    AUDIO_PREPARE,
+    CHUNK_CONCURRENCY,
+    MAX_RETRIES,
+    OPENAI_API_KEY,
+    RETRY_DELAY,
+)
+from src.async_audio import prepare_for_speech_async, segment_audio_async
+from src.audio import AudioChunk, prep_summary
+from src.backends import read_verbose_response
+from src.logger import setup_logger
+from src.rate_limiter import error_headers, is_rate_limit_error
+from src.segments import detected_language, map_segments, shift_segments
+from src.transcriber import YouTubeTranscriber
+from src.utils import cleanup_temp_files, extract_video_id
+
+logger = setup_logger("async_transcriber")
+
+
+class AsyncYouTubeTranscriber(YouTubeTranscriber):
+    """YouTubeTranscriber with coroutine versions of the processing methods"""
+
+    def __init__(self):
+        super().__init__()
+        self.async_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+    async def _prepare_audio_async(
+        self, audio_path: Path, progress_callback: Optional[Callable] = None
+    ) -> Dict[str, Any]:
+        """Async _prepare_audio (speech preparation stage)"""
+        if not (AUDIO_PREPARE or AUDIO_COMPRESS):
+            return {"path": audio_path, "prepared": False}
+
+        if progress_callback:
+            progress_callback(
+                "Trimming silences and speeding up audio..."
+                if AUDIO_COMPRESS
+                else "Preparing speech audio..."
+            )
+
+        return await prepare_for_speech_async(audio_path, YouTubeTranscriber._ffmpeg_location_cache)
+
+    async def _split_for_whisper_async(
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        backend: Optional[str] = None,
+    ) -> List[AudioChunk]:
+        """Async _split_for_whisper (a single chunk if the backend accepts the file)"""
+        max_file_mb = self._backend(backend).max_file_mb
+        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+        if max_file_mb is None or file_size_mb <= max_file_mb:
+            return [AudioChunk(audio_path)]
+
+        logger.warning("⚠️  File exceeds 25MB limit, splitting required")
+        if progress_callback:
+            progress_callback(f"Audio file is {file_size_mb:.2f}MB, splitting into chunks...")
+
+        chunks = await segment_audio_async(
+            audio_path, 24, YouTubeTranscriber._ffmpeg_location_cache
+        )
+
+        logger.info(f"📦 Processing {len(chunks)} chunks...")
+        if progress_callback:
+            progress_callback(f"Split into {len(chunks)} chunks, transcribing...")
+        return chunks
+
+    async def _transcribe_single_file_async(
+        self,
+        audio_path: Path,
+        stats: Optional[Dict[str, Any]] = None,
+        backend: Optional[str] = None,
+    ) -> str:
+        """
+        Transcribe one file with AsyncOpenAI (or the local backend in the executor)
+
+        Args:
+            audio_path: Path to audio file
+            stats: Filled with latency, retries, rate_limited, segments and
+                language (see YouTubeTranscriber._transcribe_single_file)
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
+
+        Returns:
+            Transcription text
+        """
+        if self._backend(backend).name != "openai":
+            return await asyncio.to_thread(
+                self._transcribe_single_file, audio_path, None, stats, None, backend
+            )
+
+        if stats is None:
+            stats = {}
+        engine = self._backend(backend)
+        stats.update(
+            {
+                "latency": None,
+                "retries": 0,
+                "rate_limited": 0,
+                "backend": engine.name,
+                "cached": False,
+            }
+        )
+
+        cache_key, cached = await asyncio.to_thread(self._cached_transcript, audio_path, engine)
+        if cached is not None:
+            stats.update({"latency": 0.0, "cached": True})
+            stats.update(await asyncio.to_thread(self._transcript_cache().timing, cache_key))
+            return cached
+
+        audio_bytes = await asyncio.to_thread(audio_path.read_bytes)
+        logger.info(
+            f"🎤 Transcribing file: {audio_path.name} ({len(audio_bytes) / (1024 * 1024):.2f}MB)"
+        )
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                start_time = time.time()
+                await self.rate_limiter.acquire_async("whisper")
+                transcriptions = self.async_client.audio.transcriptions
+                raw_response = await transcriptions.with_raw_response.create(
+                    model=engine.model,
+                    file=(audio_path.name, audio_bytes),
+                    response_format="verbose_json",
+                )
+                self.rate_limiter.update("whisper", raw_response.headers)
+                transcript = read_verbose_response(await raw_response.parse(), stats)
+
+                stats["latency"] = round(time.time() - start_time, 2)
+                await asyncio.to_thread(
+                    self._store_transcript, cache_key, audio_path, engine, transcript, stats
+                )
+                logger.info(f"✅ Transcription complete in {stats['latency']:.1f}s")
+                return transcript
+
+            except Exception as e:
+                logger.exception(f"Attempt {attempt + 1} failed")
+                if attempt == MAX_RETRIES - 1:
+                    logger.error(f"❌ Transcription failed after {MAX_RETRIES} attempts")
+                    raise Exception(f"Transcription failed after {MAX_RETRIES} attempts: {str(e)}")
+
+                stats["retries"] += 1
+                if is_rate_limit_error(e):
+                    stats["rate_limited"] += 1
+                    # The next acquire_async waits out the shared pause
+                    self.rate_limiter.on_rate_limit(
+                        "whisper", error_headers(e), fallback=RETRY_DELAY * (2**attempt) * 2
+                    )
+                else:
+                    logger.info(f"⏳ Waiting {RETRY_DELAY}s before retry...")
+                    await asyncio.sleep(RETRY_DELAY)
+
+    async def _transcribe_chunks_async(
+        self,
+        chunks: List[AudioChunk],
+        progress_callback: Optional[Callable] = None,
+        chunk_reports: Optional[List[Dict[str, Any]]] = None,
+        backend: Optional[str] = None,
+        segments: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Transcribe a chunk plan concurrently (up to CHUNK_CONCURRENCY calls)
+
+        Chunk files are removed when done, on failure and on cancellation.
+        Segments are shifted by their chunk start, as in _transcribe_chunks.
+
+        Returns:
+            Transcription text, chunks joined in playback order
+        """
+        if len(chunks) == 1:
+            stats = {}
+            transcript = await self._transcribe_single_file_async(chunks[0].path, stats, backend)
+            chunk_segments = stats.pop("segments", [])
+            if segments is not None:
+                segments.extend(shift_segments(chunk_segments, chunks[0].start))
+            if chunk_reports is not None:
+                chunk_reports.append({**chunks[0].to_dict(), **stats})
+            return transcript
+
+        semaphore = asyncio.Semaphore(CHUNK_CONCURRENCY)
+        reports = [chunk.to_dict() for chunk in chunks]
+        chunk_segments: List[List[Dict[str, Any]]] = [[] for _ in chunks]
+        done = 0
+
+        async def transcribe(position: int, chunk: AudioChunk) -> str:
+            nonlocal done
+            async with semaphore:
+                stats = {}
+                text = await self._transcribe_single_file_async(chunk.path, stats, backend)
+                chunk_segments[position] = shift_segments(stats.pop("segments", []), chunk.start)
+                reports[position].update(stats)
+            chunk.path.unlink()
+            done += 1
+            if progress_callback:
+                progress_callback(f"Transcribed chunk {done}/{len(chunks)}")
+            return text
+
+        if progress_callback:
+            progress_callback(
+                f"Transcribing {len(chunks)} chunks (up to {CHUNK_CONCURRENCY} at a time)..."
+            )
+
+        tasks = [
+            asyncio.ensure_future(transcribe(position, chunk))
+            for position, chunk in enumerate(chunks)
+        ]
+        try:
+            transcripts = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for chunk in chunks:
+                if chunk.path.exists():
+                    chunk.path.unlink()
+
+        if chunk_reports is not None:
+            chunk_reports.extend(reports)
+        if segments is not None:
+            for timed in chunk_segments:
+                segments.extend(timed)
+
+        full_transcript = " ".join(transcripts)
+        logger.info(f"✅ All chunks combined: {len(full_transcript.split())} total words")
+        if progress_callback:
+            progress_callback("All chunks transcribed and combined!")
+        return full_transcript
+
+    async def transcribe_audio_async(
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        chunk_reports: Optional[List[Dict[str, Any]]] = None,
+        backend: Optional[str] = None,
+        segments: Optional[List[Dict[str, Any]]] = None,
+    ) -> str:
+        """Async transcribe_audio: split if needed, then transcribe every chunk"""
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        chunks = await self._split_for_whisper_async(audio_path, progress_callback, backend)
+        return await self._transcribe_chunks_async(
+            chunks, progress_callback, chunk_reports, backend, segments
+        )
+
+    async def process_video_async(
+        self,
+        url: str,
+        index: int = 1,
+        progress_callback: Optional[Callable] = None,
+        skip_if_exists: bool = True,
+        backend: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Process a single video: download, transcribe, and save
+
+        Same result dictionary as process_video. If the task is cancelled, the
+        temporary audio is removed and CancelledError propagates; a download
+        already running in the executor finishes in the background (its file
+        stays in the audio cache for the next run).
+
+        Args:
+            url: YouTube video URL
+            index: File index number
+            progress_callback: Optional callback for progress updates
+            skip_if_exists: Skip if video already transcribed (default: True)
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
+
+        Returns:
+            Dictionary with processing results
+        """
+        logger.info(f"🎬 PROCESSING VIDEO #{index} (async)")
+        audio_paths: List[Path] = []
+
+        try:
+            video_id = extract_video_id(url)
+            if not video_id:
+                raise ValueError("Invalid YouTube URL")
+
+            if skip_if_exists:
+                skipped = await asyncio.to_thread(
+                    self._skip_result_if_exists, video_id, progress_callback
+                )
+                if skipped:
+                    return skipped
+
+            if progress_callback:
+                progress_callback(f"Processing video {index}: {video_id}")
+
+            audio_path, title = await asyncio.to_thread(self.download_audio, url, progress_callback)
+            audio_paths.append(audio_path)
+
+            fingerprint, linked = await asyncio.to_thread(
+                self._match_reupload, video_id, audio_path, progress_callback, skip_if_exists
+            )
+            if linked:
+                return linked
+
+            prep = await self._prepare_audio_async(audio_path, progress_callback)
+            audio_path = prep["path"]
+            audio_paths.append(audio_path)
+
+            chunk_reports = []
+            segments = []
+            transcript_text = await self.transcribe_audio_async(
+                audio_path, progress_callback, chunk_reports, backend, segments
+            )
+
+            return await asyncio.to_thread(
+                self._save_video_result,
+                url,
+                video_id,
+                index,
+                title,
+                transcript_text,
+                audio_path,
+                progress_callback,
+                {"audio_prep": prep_summary(prep), "chunks": chunk_reports},
+                fingerprint,
+                map_segments(segments, prep.get("time_map")),
+                detected_language(chunk_reports),
+            )
+
+        except asyncio.CancelledError:
+            logger.warning(f"🛑 VIDEO #{index} CANCELLED")
+            for path in audio_paths:
+                path.unlink(missing_ok=True)
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ VIDEO #{index} FAILED: {str(e)}")
+            for path in audio_paths:
+                path.unlink(missing_ok=True)
+
+            if progress_callback:
+                progress_callback(f"❌ Error: {str(e)}")
+
+            return {"success": False, "error": str(e), "url": url}
+
+    async def process_many_async(
+        self,
+        urls: Iterable[str],
+        progress_callback: Optional[Callable] = None,
+        skip_if_exists: bool = True,
+        max_concurrency: int = ASYNC_MAX_VIDEOS,
+        backend: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process many videos concurrently on the running event loop
+
+        Playlist/channel URLs are expanded and duplicates dropped as in
+        process_multiple_videos. Cancelling the call cancels every video
+        still in flight.
+
+        Args:
+            urls: YouTube video, playlist or channel URLs
+            progress_callback: Optional callback for progress updates
+            skip_if_exists: Skip videos that are already transcribed
+            max_concurrency: Videos in flight at once
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
+
+        Returns:
+            List of processing results, in input order
+        """
+        duplicate_urls: List[str] = []
+        unique_urls = await asyncio.to_thread(
+            lambda: list(self._unique_video_urls(urls, duplicate_urls, progress_callback))
+        )
+        logger.info(
+            f"📊 Processing {len(unique_urls)} unique videos "
+            f"(up to {max_concurrency} at a time, async)"
+        )
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(index: int, url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_video_async(
+                    url, index, progress_callback, skip_if_exists, backend
+                )
+
+        results = list(await asyncio.gather(*(run(i, url) for i, url in enumerate(unique_urls, 1))))
+
+        cleanup_temp_files(self.temp_dir)
+
+        transcribed = [r for r in results if r.get("success") and not r.get("skipped")]
+        skipped = [r for r in results if r.get("success") and r.get("skipped")]
+        failed = [r for r in results if not r.get("success")]
+        logger.info(
+            f"📊 Async batch done: {len(transcribed)} transcribed, {len(skipped)} skipped, "
+            f"{len(failed)} failed, {len(duplicate_urls)} duplicates removed"
+        )
+        return results
@@ -0,0 +1,834 @@
+"""
+FFmpeg audio helpers for YouTube Transcriber Pro
+"""
+
+import bisect
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    AUDIO_COMPRESS,
+    AUDIO_FORMAT,
+    AUDIO_QUALITY,
+    COMPRESS_KEEP_SILENCE,
+    COMPRESS_MIN_SILENCE,
+    COMPRESS_TEMPO,
+    PREPARE_BITRATE,
+    PREPARE_CHANNELS,
+    PREPARE_CODEC,
+    PREPARE_FORMAT,
+    PREPARE_SAMPLE_RATE,
+    SILENCE_MIN_CHUNK_FRACTION,
+    SILENCE_MIN_DURATION,
+    SILENCE_NOISE_DB,
+    SPLIT_ON_SILENCE,
+    WHISPER_COST_PER_MINUTE,
+    WHISPER_SUPPORTED_FORMATS,
+)
+from src.logger import setup_logger
+
+logger = setup_logger("audio")
+
+SEGMENT_SAFETY = 0.95  # segment_time margin below the size-derived ideal
+SEGMENT_ATTEMPTS = 3
+COMPRESS_MAX_CUTS = 500  # keeps the aselect expression well under Windows' 32K command line
+# Reproducible encodes: no encoder version tags and a fixed Ogg stream serial (random by
+# default), so the same input always yields the same bytes and the transcript cache can hit
+BITEXACT_FLAGS = ["-fflags", "+bitexact", "-flags:a", "+bitexact", "-serial_offset", "0"]
+
+
+def ffmpeg_tool(name: str, ffmpeg_location: Optional[str] = None) -> str:
+    """
+    Resolve the path of an FFmpeg executable (ffmpeg, ffprobe)
+
+    Args:
+        name: Executable name without extension
+        ffmpeg_location: Directory found by YouTubeTranscriber._find_ffmpeg
+
+    Returns:
+        Full path if ffmpeg_location is a directory, otherwise the bare name (from PATH)
+    """
+    # Detectar si estamos en Windows o Linux
+    executable = f"{name}.exe" if os.name == "nt" else name
+
+    if ffmpeg_location and Path(ffmpeg_location).is_dir():
+        return str(Path(ffmpeg_location) / executable)
+    return executable
+
+
+def is_whisper_supported(audio_path: Path) -> bool:
+    """
+    Check if Whisper accepts this container as-is
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        True if the file extension is one Whisper accepts
+    """
+    return audio_path.suffix.lower().lstrip(".") in WHISPER_SUPPORTED_FORMATS
+
+
+def probe_command(audio_path: Path, ffmpeg_location: Optional[str] = None) -> List[str]:
+    """ffprobe command printing the container duration in seconds"""
+    return [
+        ffmpeg_tool("ffprobe", ffmpeg_location),
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        str(audio_path),
+    ]
+
+
+def parse_ffmpeg_duration(audio_path: Path, stderr: str) -> float:
+    """Duration from the "Duration: H:M:S" line that ffmpeg -i prints"""
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", stderr)
+    if not match:
+        raise RuntimeError(f"Could not determine duration of {audio_path.name}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def probe_duration(audio_path: Path, ffmpeg_location: Optional[str] = None) -> float:
+    """
+    Get audio duration in seconds using ffprobe
+
+    Falls back to the "Duration:" line of ffmpeg -i when ffprobe is not installed.
+
+    Args:
+        audio_path: Path to audio file
+        ffmpeg_location: Directory containing the FFmpeg executables
+
+    Returns:
+        Duration in seconds
+    """
+    try:
+        result = subprocess.run(
+            probe_command(audio_path, ffmpeg_location), capture_output=True, text=True
+        )
+        return float(result.stdout.strip())
+    except FileNotFoundError:
+        result = subprocess.run(
+            [ffmpeg_tool("ffmpeg", ffmpeg_location), "-i", str(audio_path)],
+            capture_output=True,
+            text=True,
+        )
+        return parse_ffmpeg_duration(audio_path, result.stderr)
+
+
+def transcode_audio(
+    audio_path: Path,
+    ffmpeg_location: Optional[str] = None,
+    audio_format: str = AUDIO_FORMAT,
+    audio_quality: str = AUDIO_QUALITY,
+) -> Path:
+    """
+    Transcode audio into a Whisper-compatible format (legacy MP3 path)
+
+    Args:
+        audio_path: Source audio file (removed after a successful transcode)
+        ffmpeg_location: Directory containing the FFmpeg executables
+        audio_format: Target container/codec extension
+        audio_quality: Target bitrate in kbps
+
+    Returns:
+        Path to the transcoded file
+    """
+    output_path = audio_path.with_suffix(f".{audio_format}")
+    logger.info(f"🔄 Transcoding {audio_path.name} → {output_path.name}")
+
+    result = subprocess.run(
+        [
+            ffmpeg_tool("ffmpeg", ffmpeg_location),
+            "-i",
+            str(audio_path),
+            "-vn",
+            "-b:a",
+            f"{audio_quality}k",
+            *BITEXACT_FLAGS,
+            str(output_path),
+            "-y",
+        ],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"FFmpeg transcode failed for {audio_path.name}: "
+            f"{result.stderr.decode(errors='replace')[-500:]}"
+        )
+
+    if output_path != audio_path:
+        audio_path.unlink()
+    return output_path
+
+
+class AudioChunk:
+    """One piece of a split audio file and its position in the original"""
+
+    def __init__(self, path: Path, start: float = 0.0, end: Optional[float] = None, index: int = 0):
+        """
+        Args:
+            path: Chunk audio file
+            start: Offset of the chunk in the original audio, in seconds
+            end: End offset in seconds (None if the duration was never probed)
+            index: Position of the chunk in playback order
+        """
+        self.path = path
+        self.start = start
+        self.end = end
+        self.index = index
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Chunk length in seconds (None if end is unknown)"""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable plan entry, for result dictionaries"""
+        return {"index": self.index, "start": self.start, "end": self.end}
+
+    def __repr__(self) -> str:
+        return f"AudioChunk({self.path.name!r}, start={self.start:.2f}, end={self.end})"
+
+
+def silencedetect_command(
+    audio_path: Path,
+    ffmpeg_location: Optional[str] = None,
+    noise_db: float = SILENCE_NOISE_DB,
+    min_duration: float = SILENCE_MIN_DURATION,
+) -> List[str]:
+    """FFmpeg command that decodes audio_path once through silencedetect"""
+    return [
+        ffmpeg_tool("ffmpeg", ffmpeg_location),
+        "-hide_banner",
+        "-nostats",
+        "-i",
+        str(audio_path),
+        "-vn",
+        "-af",
+        f"silencedetect=noise={noise_db}dB:d={min_duration}",
+        "-f",
+        "null",
+        "-",
+    ]
+
+
+def parse_silences(stderr: str, duration: Optional[float] = None) -> List[Tuple[float, float]]:
+    """
+    Parse silencedetect log lines
+
+    Args:
+        stderr: FFmpeg stderr output
+        duration: Audio duration; if given, a silence still open at the end of
+            the file ends there (otherwise it is dropped)
+
+    Returns:
+        (start, end) pairs in seconds, in order
+    """
+    silences = []
+    silence_start = None
+    for line in stderr.splitlines():
+        start_match = re.search(r"silence_start: (-?[\d.]+)", line)
+        if start_match:
+            silence_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = re.search(r"silence_end: ([\d.]+)", line)
+        if end_match and silence_start is not None:
+            silences.append((silence_start, float(end_match.group(1))))
+            silence_start = None
+    if silence_start is not None and duration is not None and silence_start < duration:
+        silences.append((silence_start, duration))
+    return silences
+
+
+def detect_silences(
+    audio_path: Path,
+    ffmpeg_location: Optional[str] = None,
+    noise_db: float = SILENCE_NOISE_DB,
+    min_duration: float = SILENCE_MIN_DURATION,
+) -> List[Tuple[float, float]]:
+    """
+    Find low-energy regions with FFmpeg silencedetect
+
+    Args:
+        audio_path: Audio file to scan (decoded once)
+        ffmpeg_location: Directory containing the FFmpeg executables
+        noise_db: Level below which audio counts as silence, in dB
+        min_duration: Minimum silence length in seconds
+
+    Returns:
+        (start, end) pairs in seconds, in order (empty if detection failed)
+    """
+    result = subprocess.run(
+        silencedetect_command(audio_path, ffmpeg_location, noise_db, min_duration),
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        logger.warning(
+            f"⚠️  Silence detection failed, using fixed cut points: "
+            f"{result.stderr.decode(errors='replace')[-300:]}"
+        )
+        return []
+
+    silences = parse_silences(result.stderr.decode(errors="replace"))
+    logger.info(f"🔇 Found {len(silences)} silent regions in {audio_path.name}")
+    return silences
+
+
+def plan_cut_points(
+    duration: float,
+    segment_time: float,
+    silences: Optional[List[Tuple[float, float]]] = None,
+    min_fraction: float = SILENCE_MIN_CHUNK_FRACTION,
+) -> List[float]:
+    """
+    Choose where to cut so that no chunk is longer than segment_time
+
+    Without silences, cuts fall every segment_time seconds. With silences,
+    each cut moves back to the middle of the latest silent region that still
+    leaves the chunk at least min_fraction * segment_time long; if there is
+    none in that window, the fixed cut is used.
+
+    Args:
+        duration: Audio duration in seconds
+        segment_time: Maximum chunk length in seconds
+        silences: (start, end) pairs from detect_silences
+        min_fraction: Shortest chunk allowed when moving a cut, as a fraction
+            of segment_time
+
+    Returns:
+        Cut offsets in seconds, ascending (empty if no split is needed)
+    """
+    midpoints = [(start + end) / 2 for start, end in silences or []]
+
+    cuts = []
+    cursor = 0.0
+    while duration - cursor > segment_time:
+        limit = cursor + segment_time
+        earliest = cursor + segment_time * min_fraction
+        candidates = [point for point in midpoints if earliest <= point <= limit]
+        cursor = max(candidates) if candidates else limit
+        cuts.append(cursor)
+    return cuts
+
+
+def _segment_files(audio_path: Path) -> List[Path]:
+    """Chunk files written by segment_audio for audio_path, in order"""
+    return sorted(
+        audio_path.parent.glob(f"{audio_path.stem}_chunk[0-9][0-9][0-9]{audio_path.suffix}")
+    )
+
+
+def segment_command(
+    audio_path: Path, cuts: List[float], ffmpeg_location: Optional[str] = None
+) -> List[str]:
+    """FFmpeg segment-muxer command cutting audio_path at the given offsets"""
+    pattern = audio_path.with_name(f"{audio_path.stem}_chunk%03d{audio_path.suffix}")
+    return [
+        ffmpeg_tool("ffmpeg", ffmpeg_location),
+        "-i",
+        str(audio_path),
+        "-map",
+        "0:a",
+        "-c",
+        "copy",
+        "-f",
+        "segment",
+        "-segment_times",
+        ",".join(f"{cut:.3f}" for cut in cuts),
+        "-reset_timestamps",
+        "1",
+        *BITEXACT_FLAGS,
+        str(pattern),
+        "-y",
+    ]
+
+
+def collect_segments(
+    audio_path: Path,
+    cuts: List[float],
+    duration: float,
+    max_bytes: int,
+    returncode: int,
+    stderr: bytes,
+) -> Tuple[Optional[List[AudioChunk]], int]:
+    """
+    Turn the files of one segment_command run into a chunk plan
+
+    Args:
+        audio_path: Audio file that was split
+        cuts: Cut offsets passed to segment_command
+        duration: Audio duration in seconds
+        max_bytes: Size limit per chunk
+        returncode: FFmpeg exit code
+        stderr: FFmpeg stderr output
+
+    Returns:
+        (chunk plan, largest chunk size); the plan is None (and the files are
+        removed) if a chunk exceeded max_bytes
+    """
+    paths = _segment_files(audio_path)
+    if returncode != 0 or not paths:
+        for path in paths:
+            path.unlink()
+        raise RuntimeError(
+            f"FFmpeg segmenting failed for {audio_path.name}: "
+            f"{stderr.decode(errors='replace')[-500:]}"
+        )
+
+    largest = max(path.stat().st_size for path in paths)
+    if largest <= max_bytes:
+        bounds = [0.0, *cuts, duration]
+        planned = len(bounds) - 1
+        chunks = [
+            AudioChunk(path, bounds[i], bounds[i + 1], i) for i, path in enumerate(paths[:planned])
+        ]
+        # A trailing segment past the last bound (rounding at the end of the stream) is not
+        # part of the plan, so nobody else would clean it up
+        for path in paths[planned:]:
+            path.unlink()
+        return chunks, largest
+
+    logger.info(f"ℹ️  Largest chunk is {largest / (1024 * 1024):.2f}MB, re-segmenting shorter")
+    for path in paths:
+        path.unlink()
+    return None, largest
+
+
+def segment_audio(
+    audio_path: Path,
+    max_size_mb: float = 24,
+    ffmpeg_location: Optional[str] = None,
+    duration: Optional[float] = None,
+    on_silence: bool = SPLIT_ON_SILENCE,
+) -> List[AudioChunk]:
+    """
+    Split audio into size-bounded chunks with a single FFmpeg pass
+
+    The segment muxer stream-copies the input once and cuts at the planned
+    offsets, so the cost is linear in the file length no matter how many
+    chunks are produced. The maximum chunk length is derived from the
+    average bitrate; if a VBR stretch still pushes a chunk over the limit
+    the split is re-planned with a proportionally shorter length.
+
+    Args:
+        audio_path: Audio file to split (left in place)
+        max_size_mb: Maximum size per chunk in MB
+        ffmpeg_location: Directory containing the FFmpeg executables
+        duration: Audio duration in seconds (probed if None)
+        on_silence: Move cuts into silent regions (detect_silences) so they
+            do not land mid-word
+
+    Returns:
+        Chunk plan in playback order ([AudioChunk(audio_path)] if no split is needed)
+    """
+    size = audio_path.stat().st_size
+    max_bytes = int(max_size_mb * 1024 * 1024)
+    if size <= max_bytes:
+        return [AudioChunk(audio_path, 0.0, duration)]
+
+    if duration is None:
+        duration = probe_duration(audio_path, ffmpeg_location)
+    segment_time = duration * max_bytes / size * SEGMENT_SAFETY
+    silences = detect_silences(audio_path, ffmpeg_location) if on_silence else None
+
+    for stale in _segment_files(audio_path):
+        stale.unlink()
+
+    for _ in range(SEGMENT_ATTEMPTS):
+        cuts = plan_cut_points(duration, segment_time, silences)
+        logger.info(
+            f"✂️  Segmenting {audio_path.name} into {len(cuts) + 1} chunks "
+            f"(max {segment_time:.1f}s, one pass)"
+        )
+        result = subprocess.run(
+            segment_command(audio_path, cuts, ffmpeg_location), capture_output=True
+        )
+        chunks, largest = collect_segments(
+            audio_path, cuts, duration, max_bytes, result.returncode, result.stderr
+        )
+        if chunks is not None:
+            return chunks
+        segment_time *= max_bytes / largest * SEGMENT_SAFETY
+
+    raise RuntimeError(f"Could not split {audio_path.name} into chunks under {max_size_mb}MB")
+
+
+def estimate_chunk_count(size_bytes: int, max_size_mb: float = 24) -> int:
+    """
+    Number of Whisper requests a file of this size needs (mirrors _split_audio)
+
+    Args:
+        size_bytes: Audio file size in bytes
+        max_size_mb: Maximum size per chunk in MB
+
+    Returns:
+        Chunk count (1 if no split is needed)
+    """
+    size_mb = size_bytes / (1024 * 1024)
+    if size_mb <= 25:
+        return 1
+    return int(size_mb / max_size_mb) + 1
+
+
+class TimeMap:
+    """
+    Maps offsets in compressed audio back to the original timeline
+
+    Compressed audio is the kept (start, end) segments of the original played
+    back to back, sped up by tempo.
+    """
+
+    def __init__(self, segments: List[Tuple[float, float]], tempo: float, duration: float):
+        """
+        Args:
+            segments: Kept (start, end) regions of the original, in seconds, in order
+            tempo: Playback speed factor applied after cutting
+            duration: Original audio duration in seconds
+        """
+        self.segments = [(float(start), float(end)) for start, end in segments]
+        self.tempo = tempo
+        self.duration = duration
+
+        # Offset of each segment in the compressed audio
+        self.starts = []
+        position = 0.0
+        for start, end in self.segments:
+            self.starts.append(position)
+            position += (end - start) / tempo
+        self.compressed_duration = position
+
+    def to_original(self, offset: float) -> float:
+        """
+        Convert an offset in the compressed audio to the original timeline
+
+        Args:
+            offset: Seconds from the start of the compressed audio
+
+        Returns:
+            Seconds from the start of the original audio
+        """
+        if not self.segments:
+            return offset
+        position = max(0, bisect.bisect_right(self.starts, offset) - 1)
+        start, end = self.segments[position]
+        return min(end, start + max(0.0, offset - self.starts[position]) * self.tempo)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form, for result dictionaries"""
+        return {
+            "tempo": self.tempo,
+            "duration": self.duration,
+            "segments": [[round(start, 3), round(end, 3)] for start, end in self.segments],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TimeMap":
+        """Rebuild a time map saved with to_dict"""
+        segments = [tuple(segment) for segment in data["segments"]]
+        return cls(segments, data["tempo"], data["duration"])
+
+    def __repr__(self) -> str:
+        return (
+            f"TimeMap({len(self.segments)} segments, x{self.tempo}, "
+            f"{self.duration:.1f}s -> {self.compressed_duration:.1f}s)"
+        )
+
+
+def speech_segments(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    min_silence: float = COMPRESS_MIN_SILENCE,
+    keep: float = COMPRESS_KEEP_SILENCE,
+    max_cuts: int = COMPRESS_MAX_CUTS,
+) -> List[Tuple[float, float]]:
+    """
+    Regions to keep when cutting long silences out of the audio
+
+    Args:
+        duration: Audio duration in seconds
+        silences: (start, end) pairs from silencedetect
+        min_silence: Only silences at least this long are cut
+        keep: Silence left on each side of a cut, so words are not clipped
+        max_cuts: Cut only the longest silences beyond this many
+
+    Returns:
+        (start, end) pairs in seconds, in order
+    """
+    cuts = [(start + keep, end - keep) for start, end in silences if end - start >= min_silence]
+    if len(cuts) > max_cuts:
+        cuts = sorted(sorted(cuts, key=lambda cut: cut[0] - cut[1])[:max_cuts])
+
+    segments = []
+    cursor = 0.0
+    for cut_start, cut_end in cuts:
+        if cut_start > cursor:
+            segments.append((cursor, min(cut_start, duration)))
+        cursor = max(cursor, cut_end)
+    if cursor < duration:
+        segments.append((cursor, duration))
+    return segments
+
+
+def plan_compression(
+    audio_path: Path,
+    returncode: int,
+    stderr: bytes,
+    tempo: float = COMPRESS_TEMPO,
+) -> Optional[TimeMap]:
+    """
+    Build the time map of the compressed audio from a silencedetect pass
+
+    Args:
+        audio_path: Audio file that was scanned
+        returncode: FFmpeg exit code of silencedetect_command(min_duration=COMPRESS_MIN_SILENCE)
+        stderr: FFmpeg stderr output
+        tempo: Playback speed factor
+
+    Returns:
+        TimeMap, or None if the scan failed (the audio is then prepared uncompressed)
+    """
+    log = stderr.decode(errors="replace")
+    try:
+        if returncode != 0:
+            raise RuntimeError(log[-300:])
+        duration = parse_ffmpeg_duration(audio_path, log)
+    except RuntimeError as e:
+        logger.warning(f"⚠️  Silence scan failed, audio will not be compressed: {e}")
+        return None
+
+    segments = speech_segments(duration, parse_silences(log, duration))
+    logger.info(
+        f"⏩ Cutting {len(segments) - 1} long silences and speeding up x{tempo} "
+        f"in {audio_path.name}"
+    )
+    return TimeMap(segments, tempo, duration)
+
+
+def compress_filter(time_map: TimeMap) -> Optional[str]:
+    """
+    FFmpeg audio filter that keeps the time map segments and applies its tempo
+
+    Args:
+        time_map: Plan from plan_compression
+
+    Returns:
+        Filtergraph for -af, or None if nothing would change
+    """
+    filters = []
+    if time_map.segments != [(0.0, time_map.duration)]:
+        selected = "+".join(f"between(t,{start:.3f},{end:.3f})" for start, end in time_map.segments)
+        filters += [f"aselect='{selected}'", "asetpts=N/SR/TB"]
+    if time_map.tempo != 1.0:
+        filters.append(f"atempo={time_map.tempo}")
+    return ",".join(filters) or None
+
+
+def speech_output_path(audio_path: Path, audio_format: str = PREPARE_FORMAT) -> Path:
+    """Where prepare_for_speech writes the prepared audio"""
+    return audio_path.with_name(f"{audio_path.stem}_speech.{audio_format}")
+
+
+def speech_command(
+    audio_path: Path,
+    output_path: Path,
+    ffmpeg_location: Optional[str] = None,
+    sample_rate: int = PREPARE_SAMPLE_RATE,
+    channels: int = PREPARE_CHANNELS,
+    codec: str = PREPARE_CODEC,
+    bitrate: str = PREPARE_BITRATE,
+    filters: Optional[str] = None,
+) -> List[str]:
+    """FFmpeg command for the speech preparation stage (filters: optional -af filtergraph)"""
+    logger.info(f"🎙️  Preparing speech audio: {channels}ch, {sample_rate} Hz, {codec} @ {bitrate}")
+    return [
+        ffmpeg_tool("ffmpeg", ffmpeg_location),
+        "-i",
+        str(audio_path),
+        "-vn",
+        *(["-af", filters] if filters else []),
+        "-ac",
+        str(channels),
+        "-ar",
+        str(sample_rate),
+        "-c:a",
+        codec,
+        "-b:a",
+        bitrate,
+        *BITEXACT_FLAGS,
+        str(output_path),
+        "-y",
+    ]
+
+
+def finish_speech_prep(
+    audio_path: Path,
+    output_path: Path,
+    returncode: int,
+    stderr: bytes,
+    time_map: Optional[TimeMap] = None,
+) -> Dict[str, Any]:
+    """
+    Keep the prepared file only if FFmpeg succeeded and it is smaller
+
+    Compressed audio is kept if it is shorter even when it is not smaller,
+    since Whisper bills by duration.
+
+    Args:
+        audio_path: Original audio file
+        output_path: File written by speech_command
+        returncode: FFmpeg exit code
+        stderr: FFmpeg stderr output
+        time_map: Compression plan the file was written with, if any
+
+    Returns:
+        Preparation report (see prepare_for_speech)
+    """
+    original_bytes = audio_path.stat().st_size
+    report = {
+        "path": audio_path,
+        "prepared": False,
+        "original_bytes": original_bytes,
+        "prepared_bytes": original_bytes,
+        "bytes_saved": 0,
+        "chunks_before": estimate_chunk_count(original_bytes),
+        "chunks_after": estimate_chunk_count(original_bytes),
+    }
+
+    if returncode != 0 or not output_path.exists():
+        logger.warning(
+            f"⚠️  Speech preparation failed, keeping original audio: "
+            f"{stderr.decode(errors='replace')[-300:]}"
+        )
+        if output_path.exists():
+            output_path.unlink()
+        return report
+
+    prepared_bytes = output_path.stat().st_size
+    shorter = time_map is not None and time_map.compressed_duration < time_map.duration
+    if prepared_bytes >= original_bytes and not shorter:
+        logger.info("ℹ️  Prepared audio is not smaller, keeping original")
+        output_path.unlink()
+        return report
+
+    audio_path.unlink()
+    report.update(
+        {
+            "path": output_path,
+            "prepared": True,
+            "prepared_bytes": prepared_bytes,
+            "bytes_saved": original_bytes - prepared_bytes,
+            "chunks_after": estimate_chunk_count(prepared_bytes),
+        }
+    )
+
+    logger.info(
+        f"✅ Prepared audio: {original_bytes / (1024 * 1024):.2f}MB → "
+        f"{prepared_bytes / (1024 * 1024):.2f}MB, chunks "
+        f"{report['chunks_before']} → {report['chunks_after']}"
+    )
+
+    if time_map is not None:
+        seconds_saved = time_map.duration - time_map.compressed_duration
+        report.update(
+            {
+                "bytes_saved": max(0, original_bytes - prepared_bytes),
+                "tempo": time_map.tempo,
+                "original_seconds": round(time_map.duration, 2),
+                "prepared_seconds": round(time_map.compressed_duration, 2),
+                "seconds_saved": round(seconds_saved, 2),
+                "cost_saved": round(seconds_saved / 60 * WHISPER_COST_PER_MINUTE, 4),
+                "time_map": time_map,
+            }
+        )
+        logger.info(
+            f"⏩ Compressed audio: {time_map.duration / 60:.1f} → "
+            f"{time_map.compressed_duration / 60:.1f} min "
+            f"(-{seconds_saved / time_map.duration:.0%}, ~${report['cost_saved']:.4f} saved)"
+        )
+    return report
+
+
+def prepare_for_speech(
+    audio_path: Path,
+    ffmpeg_location: Optional[str] = None,
+    sample_rate: int = PREPARE_SAMPLE_RATE,
+    channels: int = PREPARE_CHANNELS,
+    codec: str = PREPARE_CODEC,
+    bitrate: str = PREPARE_BITRATE,
+    audio_format: str = PREPARE_FORMAT,
+    compress: bool = AUDIO_COMPRESS,
+    tempo: float = COMPRESS_TEMPO,
+) -> Dict[str, Any]:
+    """
+    Re-encode audio as speech-grade mono low-bitrate audio for Whisper
+
+    The prepared file replaces the original only if it is smaller; on any
+    FFmpeg error the original is kept. With compress, a silencedetect pass
+    first plans which long silences to cut, and the re-encode also cuts them
+    and speeds the audio up by tempo.
+
+    Args:
+        audio_path: Downloaded audio file
+        ffmpeg_location: Directory containing the FFmpeg executables
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count
+        codec: FFmpeg audio encoder
+        bitrate: Target bitrate (e.g. "24k")
+        audio_format: Output container extension
+        compress: Cut long silences and apply tempo
+        tempo: Playback speed factor when compressing
+
+    Returns:
+        Dictionary with the audio path to use, bytes before/after/saved and the
+        Whisper chunk count before and after preparation; compressed audio also
+        reports seconds and cost saved and its "time_map"
+    """
+    time_map = None
+    if compress:
+        scan = subprocess.run(
+            silencedetect_command(audio_path, ffmpeg_location, min_duration=COMPRESS_MIN_SILENCE),
+            capture_output=True,
+        )
+        time_map = plan_compression(audio_path, scan.returncode, scan.stderr, tempo)
+
+    output_path = speech_output_path(audio_path, audio_format)
+    result = subprocess.run(
+        speech_command(
+            audio_path,
+            output_path,
+            ffmpeg_location,
+            sample_rate,
+            channels,
+            codec,
+            bitrate,
+            compress_filter(time_map) if time_map else None,
+        ),
+        capture_output=True,
+    )
+    return finish_speech_prep(audio_path, output_path, result.returncode, result.stderr, time_map)
+
+
+def prep_summary(prep: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Serializable part of a preparation report, for result dictionaries
+
+    Args:
+        prep: Report returned by prepare_for_speech
+
+    Returns:
+        The report without its "path" entry, with the time map as a dict
+    """
+    return {
+        key: value.to_dict() if isinstance(value, TimeMap) else value
+        for key, value in prep.items()
+        if key != "path"
+    }
@@ -0,0 +1,219 @@
+"""
+Content-addressed audio cache for YouTube Transcriber Pro
+
+Keeps downloaded audio in TEMP_AUDIO_DIR/cache keyed by video_id and format so
+that a failed transcription or a forced re-transcription does not download
+the same video again. The cache has a disk budget; least recently used files
+are evicted first.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import AUDIO_CACHE_MAX_MB, AUDIO_CACHE_SUBDIR, TEMP_AUDIO_DIR
+from src.logger import setup_logger
+
+logger = setup_logger("audio_cache")
+
+INDEX_FILE = "index.json"
+
+
+def _link_or_copy(source: Path, target: Path):
+    """Hard-link source to target (same filesystem), copying as a fallback"""
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class AudioCache:
+    """Thread-safe LRU cache of downloaded audio with a JSON index"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = AUDIO_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.index_file = self.cache_dir / INDEX_FILE
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"hits": 0, "misses": 0, "bytes_saved": 0, "evictions": 0}
+        self._load()
+
+    @staticmethod
+    def key(video_id: str, audio_format: str) -> str:
+        """Cache key for a video in a given container format"""
+        return f"{video_id}.{audio_format.lower().lstrip('.')}"
+
+    def _load(self):
+        """Load the index, dropping entries whose file has disappeared"""
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read audio cache index {self.index_file}: {e}")
+            return
+
+        self.stats.update(data.get("stats", {}))
+        for key, entry in data.get("entries", {}).items():
+            if (self.cache_dir / key).exists():
+                self.entries[key] = entry
+
+    def _save(self):
+        """Persist the index atomically (caller must hold the lock)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries, "stats": self.stats}, f, indent=2)
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.warning(f"Could not save audio cache index {self.index_file}: {e}")
+
+    def total_bytes(self) -> int:
+        """Disk usage of the cached audio"""
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def get(
+        self, video_id: str, formats: Iterable[str], target_dir: Path
+    ) -> Optional[Tuple[Path, str]]:
+        """
+        Look up cached audio and place a working copy in target_dir
+
+        The working copy is a hard link where possible, so later pipeline
+        stages can delete it without touching the cached file.
+
+        Args:
+            video_id: YouTube video ID
+            formats: Acceptable container formats, in order of preference
+            target_dir: Directory for the working copy
+
+        Returns:
+            (path to the working copy, video title) or None on a miss
+        """
+        with self.lock:
+            for audio_format in formats:
+                key = self.key(video_id, audio_format)
+                entry = self.entries.get(key)
+                if entry is None:
+                    continue
+
+                cached_path = self.cache_dir / key
+                if not cached_path.exists():
+                    del self.entries[key]
+                    continue
+
+                target = Path(target_dir) / key
+                try:
+                    _link_or_copy(cached_path, target)
+                except OSError as e:
+                    logger.warning(f"Could not reuse cached audio {cached_path}: {e}")
+                    continue
+
+                entry["last_access"] = time.time()
+                self.stats["hits"] += 1
+                self.stats["bytes_saved"] += entry["bytes"]
+                self._save()
+                logger.info(
+                    f"♻️  Audio cache hit: {key} "
+                    f"({entry['bytes'] / (1024 * 1024):.2f}MB not downloaded)"
+                )
+                return target, entry.get("title") or "Unknown"
+
+            self.stats["misses"] += 1
+            self._save()
+            return None
+
+    def put(self, video_id: str, audio_path: Path, title: Optional[str] = None):
+        """
+        Add a downloaded file to the cache and evict down to the disk budget
+
+        Args:
+            video_id: YouTube video ID
+            audio_path: Downloaded audio (left in place)
+            title: Video title, returned on later hits
+        """
+        size = audio_path.stat().st_size
+        if size > self.max_bytes:
+            logger.info(f"ℹ️  {audio_path.name} is larger than the audio cache budget, not cached")
+            return
+
+        key = self.key(video_id, audio_path.suffix)
+        with self.lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                _link_or_copy(audio_path, self.cache_dir / key)
+            except OSError as e:
+                logger.warning(f"Could not cache audio {audio_path}: {e}")
+                return
+
+            now = time.time()
+            self.entries[key] = {
+                "video_id": video_id,
+                "bytes": size,
+                "title": title,
+                "created": now,
+                "last_access": now,
+            }
+            self._evict(keep=key)
+            self._save()
+
+    def _evict(self, keep: Optional[str] = None):
+        """Remove least recently used files until within budget (caller holds the lock)"""
+        total = self.total_bytes()
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                (self.cache_dir / key).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not evict cached audio {key}: {e}")
+                continue
+            total -= self.entries.pop(key)["bytes"]
+            self.stats["evictions"] += 1
+            logger.info(f"🗑️  Evicted {key} from audio cache")
+
+    def summary(self) -> Dict[str, Any]:
+        """Cache usage and hit statistics for display"""
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "files": len(self.entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "bytes_saved": self.stats["bytes_saved"],
+                "evictions": self.stats["evictions"],
+            }
+
+
+_audio_caches: Dict[Path, AudioCache] = {}
+_audio_caches_lock = threading.Lock()
+
+
+def get_audio_cache(temp_dir: Path = TEMP_AUDIO_DIR) -> AudioCache:
+    """
+    Get the shared audio cache living under a temp audio directory
+
+    Args:
+        temp_dir: Temporary audio directory (the cache is its AUDIO_CACHE_SUBDIR)
+
+    Returns:
+        One AudioCache instance per directory
+    """
+    cache_dir = Path(temp_dir) / AUDIO_CACHE_SUBDIR
+    with _audio_caches_lock:
+        if cache_dir not in _audio_caches:
+            _audio_caches[cache_dir] = AudioCache(cache_dir)
+        return _audio_caches[cache_dir]
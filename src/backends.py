@@ -0,0 +1,265 @@
+"""
+Speech-to-text backends for YouTube Transcriber Pro
+
+A backend turns one audio file into text. "openai" sends the file to the
+Whisper API through the shared rate limiter; "local" decodes it on the CPU
+with faster-whisper (CTranslate2, int8 by default), needs no network and has
+no upload size limit. The backend is chosen per job with the backend
+argument of process_video / process_multiple_videos (default:
+TRANSCRIPTION_BACKEND).
+"""
+
+import os
+import threading
+import time
+import types
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import (
+    LOCAL_WHISPER_BATCH_SIZE,
+    LOCAL_WHISPER_COMPUTE_TYPE,
+    LOCAL_WHISPER_MODEL,
+    LOCAL_WHISPER_THREADS,
+    LOCAL_WHISPER_WORKERS,
+    TRANSCRIPTION_BACKEND,
+    WHISPER_MODEL,
+)
+from src.logger import setup_logger
+from src.rate_limiter import RateLimiter, get_rate_limiter
+from src.segments import parse_segments
+
+logger = setup_logger("backends")
+
+BACKENDS = ("openai", "local")
+
+
+def read_verbose_response(response: Any, stats: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Text of a verbose_json Whisper response; segments and language go to stats
+
+    Args:
+        response: Parsed response (SDK object or dict; a plain string is
+            returned as-is, without timing)
+        stats: Filled with segments, language and audio_seconds
+
+    Returns:
+        Transcription text
+    """
+    if isinstance(response, str):
+        return response
+    if isinstance(response, dict):
+        response = types.SimpleNamespace(**response)
+
+    if stats is not None:
+        stats["segments"] = parse_segments(getattr(response, "segments", None))
+        stats["language"] = getattr(response, "language", None)
+        if getattr(response, "duration", None) is not None:
+            stats["audio_seconds"] = round(float(response.duration), 2)
+    return response.text.strip()
+
+
+class TranscriptionBackend(ABC):
+    """Interface of a speech-to-text engine"""
+
+    name = ""
+    label = ""
+    max_file_mb: Optional[float] = None  # per-request size limit (None = any size)
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """Backend, model and parameters that affect the output (transcript cache key)"""
+
+    @abstractmethod
+    def transcribe(self, audio_path: Path, stats: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Transcribe one audio file
+
+        Args:
+            audio_path: Audio file (at most max_file_mb)
+            stats: Optional dict the backend fills with segments ([{"start",
+                "end", "text"}], seconds into audio_path), language and extra metrics
+
+        Returns:
+            Transcription text
+        """
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Whisper API backend; every call goes through the shared rate limiter"""
+
+    name = "openai"
+    label = "Whisper API"
+    max_file_mb = 25
+
+    def __init__(
+        self,
+        client: Any,
+        rate_limiter: Optional[RateLimiter] = None,
+        model: str = WHISPER_MODEL,
+    ):
+        """
+        Args:
+            client: OpenAI client
+            rate_limiter: Limiter shared with the other OpenAI callers
+            model: Whisper model name
+        """
+        self.client = client
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.model = model
+
+    def fingerprint(self) -> str:
+        return f"openai|{self.model}|verbose_json"
+
+    def transcribe(self, audio_path: Path, stats: Optional[Dict[str, Any]] = None) -> str:
+        self.rate_limiter.acquire("whisper")
+        with open(audio_path, "rb") as audio_file:
+            raw_response = self.client.audio.transcriptions.with_raw_response.create(
+                model=self.model, file=audio_file, response_format="verbose_json"
+            )
+        self.rate_limiter.update("whisper", raw_response.headers)
+        return read_verbose_response(raw_response.parse(), stats)
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    faster-whisper on the CPU
+
+    The model is loaded on first use and shared by every caller; with
+    num_workers > 1 that many files decode at once. With batch_size > 1 the
+    audio is cut into voice-activity segments that are decoded in batches.
+    """
+
+    name = "local"
+    label = "local Whisper"
+    max_file_mb = None
+
+    def __init__(
+        self,
+        model_size: str = LOCAL_WHISPER_MODEL,
+        compute_type: str = LOCAL_WHISPER_COMPUTE_TYPE,
+        cpu_threads: int = LOCAL_WHISPER_THREADS,
+        num_workers: int = LOCAL_WHISPER_WORKERS,
+        batch_size: int = LOCAL_WHISPER_BATCH_SIZE,
+    ):
+        """
+        Args:
+            model_size: faster-whisper model name or path (e.g. "small", "large-v3")
+            compute_type: CTranslate2 compute type ("int8", "int8_float32", "float32")
+            cpu_threads: Decoding threads per worker (0 = all cores)
+            num_workers: Files that can be decoded concurrently
+            batch_size: VAD segments decoded per batch (1 = sequential decoding)
+
+        Raises:
+            RuntimeError: If faster-whisper is not installed
+        """
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            raise RuntimeError("The local backend needs faster-whisper: pip install faster-whisper")
+
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads or os.cpu_count() or 1
+        self.num_workers = max(1, num_workers)
+        self.batch_size = max(1, batch_size)
+        self._model = None
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    def fingerprint(self) -> str:
+        return f"local|{self.model_size}|{self.compute_type}|batch{self.batch_size}|vad"
+
+    def _load(self):
+        """Load the model once (first call pays the download/load time)"""
+        with self._lock:
+            if self._model is None:
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+                start_time = time.time()
+                logger.info(
+                    f"🧠 Loading local Whisper model {self.model_size} "
+                    f"({self.compute_type}, {self.cpu_threads} threads)"
+                )
+                self._model = WhisperModel(
+                    self.model_size,
+                    device="cpu",
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers,
+                )
+                if self.batch_size > 1:
+                    self._pipeline = BatchedInferencePipeline(model=self._model)
+                logger.info(f"✅ Local model loaded in {time.time() - start_time:.1f}s")
+            return self._model, self._pipeline
+
+    def transcribe(self, audio_path: Path, stats: Optional[Dict[str, Any]] = None) -> str:
+        model, pipeline = self._load()
+        start_time = time.time()
+
+        if pipeline is not None:
+            segments, info = pipeline.transcribe(str(audio_path), batch_size=self.batch_size)
+        else:
+            segments, info = model.transcribe(str(audio_path), vad_filter=True)
+        # segments is lazy: decoding happens while it is consumed
+        segments = parse_segments(segments)
+        text = " ".join(segment["text"] for segment in segments)
+
+        elapsed = time.time() - start_time
+        rtf = elapsed / info.duration if info.duration else None
+        if stats is not None:
+            stats.update(
+                {
+                    "audio_seconds": round(info.duration, 2),
+                    "rtf": round(rtf, 4) if rtf is not None else None,
+                    "language": info.language,
+                    "segments": segments,
+                }
+            )
+        if rtf is not None:
+            logger.info(
+                f"⚡ Local decode: {info.duration:.0f}s of audio in {elapsed:.1f}s "
+                f"(RTF {rtf:.3f}, {self.cpu_threads} threads)"
+            )
+        return text
+
+
+_local_backend: Optional[LocalWhisperBackend] = None
+_local_backend_lock = threading.Lock()
+
+
+def get_local_backend() -> LocalWhisperBackend:
+    """Get the shared local backend (one loaded model per process)"""
+    global _local_backend
+    with _local_backend_lock:
+        if _local_backend is None:
+            _local_backend = LocalWhisperBackend()
+        return _local_backend
+
+
+def create_backend(
+    name: Optional[str] = None,
+    client: Any = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> TranscriptionBackend:
+    """
+    Resolve a backend name to a backend instance
+
+    Args:
+        name: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
+        client: OpenAI client (openai backend only)
+        rate_limiter: Shared rate limiter (openai backend only)
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    name = (name or TRANSCRIPTION_BACKEND).lower()
+    if name == "openai":
+        return OpenAIWhisperBackend(client, rate_limiter)
+    if name == "local":
+        return get_local_backend()
+    raise ValueError(f"Unknown transcription backend {name!r}, expected one of {BACKENDS}")
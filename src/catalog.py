@@ -0,0 +1,539 @@
+"""
+Transcript storage layout and catalog for YouTube Transcriber Pro
+
+Transcripts are stored by video ID, sharded by its first characters:
+
+    transcripts/dq/dQw4w9WgXcQ.542.json
+    transcripts/dq/dQw4w9WgXcQ.542.txt
+
+so the files of a video are a path computation away and re-runs overwrite
+the same files instead of adding NN_title copies. YouTube IDs are
+case-sensitive but NTFS and APFS are not, so IDs with uppercase letters get
+a hex mask of their uppercase positions (case_tag) in the file name, and
+shards are lowercase: IDs differing only in case never share a file. Older flat NN_title files
+are still read, and migrate_flat_layout() moves them into place
+(python manage.py --migrate-storage).
+
+Every transcripts directory also keeps a SQLite catalog (catalog.db) with one
+row per video: title, file paths, word count, timestamp, duration, language
+and status. save_transcript() updates it in the same transaction that writes
+the files, so listings (sorted, filtered, paginated) never read a transcript
+body. A catalog created for a directory that already holds transcripts is
+filled from the files; rebuild() re-reads them on demand
+(python manage.py --rebuild-catalog).
+"""
+
+import itertools
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import CATALOG_FILE_NAME, TRANSCRIPTS_DIR
+from src.logger import setup_logger
+
+logger = setup_logger("catalog")
+
+STATUS_COMPLETE = "complete"
+
+# Transcript files live in <directory>/<first SHARD_LENGTH characters of the ID, lowercased>/
+SHARD_LENGTH = 2
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Columns query() can sort by
+SORT_COLUMNS = {"timestamp", "title", "word_count", "duration", "video_id"}
+
+# Named orders for listings: name -> (column, descending)
+SORT_ORDERS = {
+    "newest": ("timestamp", True),
+    "oldest": ("timestamp", False),
+    "title": ("title", False),
+    "words": ("word_count", True),
+    "duration": ("duration", True),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT NOT NULL,
+    title TEXT,
+    json_path TEXT NOT NULL,
+    txt_path TEXT,
+    word_count INTEGER NOT NULL DEFAULT 0,
+    timestamp TEXT,
+    duration REAL,
+    language TEXT,
+    status TEXT NOT NULL DEFAULT 'complete'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transcripts_video_id ON transcripts (video_id);
+CREATE INDEX IF NOT EXISTS idx_transcripts_timestamp ON transcripts (timestamp);
+CREATE INDEX IF NOT EXISTS idx_transcripts_title ON transcripts (title COLLATE NOCASE);
+"""
+
+UPSERT = """
+INSERT INTO transcripts
+    (video_id, title, json_path, txt_path, word_count, timestamp, duration, language, status)
+VALUES
+    (:video_id, :title, :json_path, :txt_path, :word_count, :timestamp, :duration, :language,
+     :status)
+ON CONFLICT (video_id) DO UPDATE SET
+    title = excluded.title,
+    json_path = excluded.json_path,
+    txt_path = excluded.txt_path,
+    word_count = excluded.word_count,
+    timestamp = excluded.timestamp,
+    duration = excluded.duration,
+    language = excluded.language,
+    status = excluded.status
+"""
+
+
+def transcript_paths(directory: Path, video_id: str) -> tuple[Path, Path]:
+    """
+    Where the transcript of a video is stored
+
+    Args:
+        directory: Transcripts directory
+        video_id: YouTube video ID
+
+    Returns:
+        Tuple of (json_path, txt_path)
+
+    Raises:
+        ValueError: If the video ID cannot be used as a file name
+    """
+    if not VIDEO_ID_PATTERN.match(video_id or ""):
+        raise ValueError(f"Invalid video ID for a transcript file name: {video_id!r}")
+    tag = case_tag(video_id)
+    stem = f"{video_id}.{tag}" if tag else video_id
+    shard = Path(directory) / video_id[:SHARD_LENGTH].lower()
+    return shard / f"{stem}.json", shard / f"{stem}.txt"
+
+
+def case_tag(video_id: str) -> str:
+    """Hex mask of the uppercase positions of a video ID ("" if it has none)"""
+    mask = sum(1 << i for i, char in enumerate(video_id) if char.isupper())
+    return f"{mask:x}" if mask else ""
+
+
+def video_id_from_path(json_path: Path) -> Optional[str]:
+    """
+    Video ID of a sharded transcript file, from its name alone
+
+    The case is restored from the case tag, so this also works when a
+    case-insensitive filesystem reports the name in another case.
+
+    Args:
+        json_path: Transcript file at a transcript_paths() location
+
+    Returns:
+        The video ID, or None for names outside the sharded layout
+    """
+    json_path = Path(json_path)
+    video_id, _, tag = json_path.stem.partition(".")
+    if not VIDEO_ID_PATTERN.match(video_id) or (tag and not re.fullmatch(r"[0-9a-f]+", tag)):
+        return None
+    if json_path.parent.name.lower() != video_id[:SHARD_LENGTH].lower():
+        return None
+    mask = int(tag, 16) if tag else 0
+    return "".join(
+        char.upper() if mask >> i & 1 else char.lower() for i, char in enumerate(video_id)
+    )
+
+
+def transcript_files(directory: Path) -> Iterator[Path]:
+    """JSON transcripts in a directory: sharded ones and flat files of the old NN_title layout"""
+    directory = Path(directory)
+    return itertools.chain(directory.glob("*/*.json"), directory.glob("*.json"))
+
+
+class TranscriptCatalog:
+    """Thread-safe SQLite index of the transcripts saved in one directory"""
+
+    def __init__(self, directory: Path = TRANSCRIPTS_DIR, db_file: Optional[Path] = None):
+        self.directory = Path(directory).resolve()
+        self.db_file = Path(db_file) if db_file else self.directory / CATALOG_FILE_NAME
+        self.lock = threading.RLock()
+        # Directory state the catalog reflects; the first listing of a process rescans
+        self.synced_state: Optional[int] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        created = not self.db_file.exists()
+        self.connection = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+        if created and any(transcript_files(self.directory)):
+            logger.info(f"🗂️  New catalog for {self.directory}, indexing existing transcripts")
+            self.rebuild()
+
+    def _relative(self, path: Optional[Path]) -> Optional[str]:
+        """Path as stored in the catalog (relative to the directory when inside it)"""
+        if path is None:
+            return None
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.directory).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _row(self, data: Dict[str, Any], json_path: Path, txt_path: Optional[Path]):
+        return {
+            "video_id": data["video_id"],
+            "title": data.get("title"),
+            "json_path": self._relative(json_path),
+            "txt_path": self._relative(txt_path),
+            "word_count": data.get("word_count") or 0,
+            "timestamp": data.get("timestamp"),
+            "duration": data.get("duration"),
+            "language": data.get("language"),
+            "status": STATUS_COMPLETE,
+        }
+
+    def _entry(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Catalog row as a dictionary with absolute file paths"""
+        entry = dict(row)
+        entry["json_path"] = str(self.directory / entry["json_path"])
+        if entry["txt_path"]:
+            entry["txt_path"] = str(self.directory / entry["txt_path"])
+        return entry
+
+    def _directory_state(self) -> Optional[int]:
+        """Latest mtime of the directory and its shards (changes when any file is added/removed)"""
+        try:
+            latest = self.directory.stat().st_mtime_ns
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        latest = max(latest, entry.stat().st_mtime_ns)
+            return latest
+        except OSError:
+            return None
+
+    def _mark_synced(self):
+        """Remember the directory state after a committed write (caller holds the lock)"""
+        # Read after the commit: SQLite's journal file changes the directory too
+        self.synced_state = self._directory_state()
+
+    @contextmanager
+    def saving(self, data: Dict[str, Any], json_path: Path, txt_path: Optional[Path]):
+        """
+        Catalog a transcript in the transaction that writes its files
+
+        The row is committed only if the body (writing the files) succeeds.
+
+        Args:
+            data: Transcript data (needs "video_id")
+            json_path: JSON file being written
+            txt_path: TXT file being written
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute(UPSERT, self._row(data, json_path, txt_path))
+                yield
+            self._mark_synced()
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the transcript of a video
+
+        One indexed query; a transcript file that appeared at the video's
+        path without going through save_transcript() is cataloged on the way.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Catalog entry (absolute json_path/txt_path) or None if not transcribed
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM transcripts WHERE video_id = ? AND status = ?",
+                (video_id, STATUS_COMPLETE),
+            ).fetchone()
+
+            if row is not None and not (self.directory / row["json_path"]).exists():
+                logger.info(f"🗂️  Transcript of {video_id} is gone, dropping it from the catalog")
+                with self.connection:
+                    self.connection.execute(
+                        "DELETE FROM transcripts WHERE video_id = ?", (video_id,)
+                    )
+                row = None
+
+            if row is None:
+                try:
+                    json_path, _ = transcript_paths(self.directory, video_id)
+                except ValueError:
+                    return None
+                if not json_path.exists():
+                    return None
+                with self.connection:
+                    self._index_file(json_path)
+                row = self.connection.execute(
+                    "SELECT * FROM transcripts WHERE video_id = ?", (video_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+            entry = self._entry(row)
+            if entry["txt_path"] and not Path(entry["txt_path"]).exists():
+                entry["txt_path"] = None
+            return entry
+
+    def video_id_at(self, json_path: Path) -> Optional[str]:
+        """
+        Video cataloged from a transcript file, without reading the file
+
+        Args:
+            json_path: Transcript JSON file
+
+        Returns:
+            Its video ID, from the catalog or the file name, or None if unknown
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT video_id FROM transcripts WHERE json_path = ?", (self._relative(json_path),)
+            ).fetchone()
+        return row[0] if row else video_id_from_path(json_path)
+
+    def remove(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Drop a video from the catalog (its files are left to the caller)
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            The removed entry or None if the video was not cataloged
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM transcripts WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self.connection:
+                self.connection.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+            self._mark_synced()
+            return self._entry(row)
+
+    @staticmethod
+    def _where(search: Optional[str]) -> tuple[str, list]:
+        """WHERE clause matching a title substring or an exact video ID"""
+        if not search:
+            return "", []
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "WHERE title LIKE ? ESCAPE '\\' OR video_id = ?", [f"%{escaped}%", search]
+
+    def query(
+        self,
+        search: Optional[str] = None,
+        sort: str = "timestamp",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        List cataloged transcripts without reading any transcript file
+
+        Args:
+            search: Case-insensitive title substring or exact video ID (None = all)
+            sort: One of SORT_COLUMNS
+            descending: Sort order (missing values always come last)
+            limit: Page size (None = no limit)
+            offset: Rows to skip, for pagination
+
+        Returns:
+            Catalog entries with absolute json_path/txt_path
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort!r}, expected one of {sorted(SORT_COLUMNS)}")
+        where, params = self._where(search)
+        collate = " COLLATE NOCASE" if sort == "title" else ""
+        order = f"{sort} IS NULL, {sort}{collate} {'DESC' if descending else 'ASC'}, video_id"
+        sql = f"SELECT * FROM transcripts {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+
+        with self.lock:
+            self._sync_if_changed()
+            return [self._entry(row) for row in self.connection.execute(sql, params)]
+
+    def count(self, search: Optional[str] = None) -> int:
+        """Number of cataloged transcripts (matching search, see query())"""
+        where, params = self._where(search)
+        with self.lock:
+            self._sync_if_changed()
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM transcripts {where}", params
+            ).fetchone()[0]
+
+    def totals(self) -> Dict[str, Any]:
+        """
+        Library totals for statistics
+
+        Returns:
+            {"transcripts", "words", "seconds"} (seconds only counts known durations)
+        """
+        with self.lock:
+            self._sync_if_changed()
+            row = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(word_count), 0), COALESCE(SUM(duration), 0) "
+                "FROM transcripts"
+            ).fetchone()
+        return {"transcripts": row[0], "words": row[1], "seconds": row[2]}
+
+    def _read_transcript(self, json_file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠️  Could not read {json_file.name}: {e}")
+            return None
+        if not isinstance(data, dict) or not data.get("video_id"):
+            logger.warning(f"⚠️  {json_file.name} has no video_id, not cataloged")
+            return None
+        return data
+
+    def _is_newer(self, json_file: Path, video_id: str) -> bool:
+        """True unless the video is already cataloged from a more recent file"""
+        row = self.connection.execute(
+            "SELECT json_path FROM transcripts WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        if row is None:
+            return True
+        current = self.directory / row[0]
+        try:
+            return json_file.stat().st_mtime >= current.stat().st_mtime
+        except OSError:
+            return True
+
+    def _index_file(self, json_file: Path) -> bool:
+        """Catalog one JSON transcript unless a newer file has the video (in a transaction)"""
+        data = self._read_transcript(json_file)
+        if data is None:
+            return False
+        if not self._is_newer(json_file, data["video_id"]):
+            return True
+        txt_file = json_file.with_suffix(".txt")
+        self.connection.execute(
+            UPSERT, self._row(data, json_file, txt_file if txt_file.exists() else None)
+        )
+        return True
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Re-create the catalog from the JSON transcripts in the directory
+
+        When several files hold the same video, the most recently written wins.
+
+        Returns:
+            {"files": JSON files read, "indexed": videos cataloged, "unreadable": files skipped}
+        """
+        files = list(transcript_files(self.directory))
+        unreadable = 0
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM transcripts")
+                for json_file in files:
+                    if not self._index_file(json_file):
+                        unreadable += 1
+            self._mark_synced()
+        report = {"files": len(files), "indexed": self.count(), "unreadable": unreadable}
+        logger.info(
+            f"🗂️  Catalog rebuilt: {report['indexed']} videos from {report['files']} files "
+            f"({report['unreadable']} unreadable)"
+        )
+        return report
+
+    def _sync_if_changed(self):
+        """
+        Pick up transcripts added or removed outside save_transcript (caller holds the lock)
+
+        Only runs when the directory or one of its shards changed since the
+        catalog last wrote to it, and only parses JSON files it does not know yet.
+        """
+        if self.synced_state is not None and self.synced_state == self._directory_state():
+            return
+
+        known = {row[0] for row in self.connection.execute("SELECT json_path FROM transcripts")}
+        with self.connection:
+            added = 0
+            for json_file in transcript_files(self.directory):
+                relative = self._relative(json_file)
+                if relative in known:
+                    known.discard(relative)
+                elif self._index_file(json_file):
+                    added += 1
+            for json_path in known:
+                self.connection.execute("DELETE FROM transcripts WHERE json_path = ?", (json_path,))
+        self._mark_synced()
+        if added or known:
+            logger.info(f"🗂️  Catalog synced: {added} added, {len(known)} removed")
+
+    def migrate_flat_layout(self, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Move NN_title.json/.txt files of the old flat layout to their sharded paths
+
+        When several flat files (or a flat file and an already sharded one) hold
+        the same video, the most recently written is kept in place and the
+        others are left untouched and reported as duplicates.
+
+        Args:
+            dry_run: Only report what would be moved
+
+        Returns:
+            {"moved": [(old name, new relative path)], "duplicates": [names],
+            "unreadable": [names]}
+        """
+        report = {"moved": [], "duplicates": [], "unreadable": []}
+        newest: Dict[str, Path] = {}
+        for json_file in sorted(self.directory.glob("*.json"), key=lambda f: f.stat().st_mtime):
+            data = self._read_transcript(json_file)
+            if data is None or not VIDEO_ID_PATTERN.match(data["video_id"]):
+                report["unreadable"].append(json_file.name)
+                continue
+            if data["video_id"] in newest:
+                report["duplicates"].append(newest[data["video_id"]].name)
+            newest[data["video_id"]] = json_file
+
+        for video_id, json_file in newest.items():
+            json_path, txt_path = transcript_paths(self.directory, video_id)
+            if json_path.exists() and json_path.stat().st_mtime >= json_file.stat().st_mtime:
+                report["duplicates"].append(json_file.name)
+                continue
+            report["moved"].append((json_file.name, self._relative(json_path)))
+            if dry_run:
+                continue
+            json_path.parent.mkdir(exist_ok=True)
+            txt_file = json_file.with_suffix(".txt")
+            if txt_file.exists():
+                os.replace(txt_file, txt_path)
+            os.replace(json_file, json_path)
+
+        if report["moved"] and not dry_run:
+            logger.info(f"📦 Migrated {len(report['moved'])} transcripts to the sharded layout")
+            self.rebuild()
+        return report
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+_catalogs: Dict[Path, TranscriptCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(directory: Path = TRANSCRIPTS_DIR) -> TranscriptCatalog:
+    """Get the process-wide catalog of a transcripts directory"""
+    directory = Path(directory).resolve()
+    with _catalogs_lock:
+        if directory not in _catalogs:
+            _catalogs[directory] = TranscriptCatalog(directory)
+        return _catalogs[directory]
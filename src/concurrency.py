@@ -0,0 +1,74 @@
+"""
+Adaptive concurrency limit for API calls
+
+Lets several requests run at once and backs off when the API answers with a
+rate-limit error: the limit halves on every 429 and grows back by one after
+a run of successful calls (additive increase, multiplicative decrease).
+"""
+
+import threading
+
+from src.logger import setup_logger
+
+logger = setup_logger("concurrency")
+
+
+class AdaptiveConcurrency:
+    """Thread-safe AIMD concurrency limiter, used as a context manager"""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_after: int = 2):
+        """
+        Args:
+            max_limit: Starting (and highest) number of concurrent calls
+            min_limit: Lowest limit reached by backing off
+            increase_after: Consecutive successes needed to raise the limit by one
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.increase_after = max(1, increase_after)
+        self.limit = self.max_limit
+        self.active = 0
+        self.rate_limits = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a slot is free under the current limit"""
+        with self._condition:
+            while self.active >= self.limit:
+                self._condition.wait()
+            self.active += 1
+
+    def release(self):
+        """Free a slot"""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def on_rate_limit(self):
+        """Halve the limit after a 429"""
+        with self._condition:
+            self.rate_limits += 1
+            self._successes = 0
+            new_limit = max(self.min_limit, self.limit // 2)
+            if new_limit < self.limit:
+                logger.warning(f"🚦 Rate limited: concurrency {self.limit} → {new_limit}")
+                self.limit = new_limit
+
+    def on_success(self):
+        """Count a successful call and raise the limit after enough of them"""
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                logger.info(f"📈 Concurrency raised to {self.limit}")
+                self._condition.notify_all()
@@ -0,0 +1,155 @@
+"""
+Learned success cache for yt-dlp download strategies
+
+Records per-strategy success rates and latencies across runs so that
+download_audio can try the strategy that actually works on this host first.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import DOWNLOAD_STATS_FILE, STRATEGY_UNAVAILABLE_TTL
+from src.logger import setup_logger
+
+logger = setup_logger("download_stats")
+
+
+class DownloadStrategyStats:
+    """Thread-safe, JSON-persisted statistics for download strategies"""
+
+    def __init__(
+        self,
+        stats_file: Path = DOWNLOAD_STATS_FILE,
+        unavailable_ttl: float = STRATEGY_UNAVAILABLE_TTL,
+    ):
+        self.stats_file = Path(stats_file)
+        self.unavailable_ttl = unavailable_ttl
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load persisted stats, ignoring a missing or corrupt file"""
+        if not self.stats_file.exists():
+            return {}
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read download stats {self.stats_file}: {e}")
+            return {}
+
+    def _save(self):
+        """Persist stats atomically (caller must hold the lock)"""
+        try:
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.stats_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.stats, f, indent=2)
+            os.replace(tmp_file, self.stats_file)
+        except OSError as e:
+            logger.warning(f"Could not save download stats {self.stats_file}: {e}")
+
+    def _entry(self, label: str) -> Dict[str, Any]:
+        return self.stats.setdefault(
+            label,
+            {
+                "successes": 0,
+                "failures": 0,
+                "total_latency": 0.0,
+                "last_success": None,
+                "unavailable_until": 0,
+            },
+        )
+
+    def success_rate(self, label: str) -> float:
+        """Smoothed success rate; untried strategies score 0.5"""
+        entry = self.stats.get(label, {})
+        successes = entry.get("successes", 0)
+        attempts = successes + entry.get("failures", 0)
+        return (successes + 1) / (attempts + 2)
+
+    def avg_latency(self, label: str) -> float:
+        """Average latency of successful downloads (inf if never succeeded)"""
+        entry = self.stats.get(label, {})
+        successes = entry.get("successes", 0)
+        if not successes:
+            return float("inf")
+        return entry.get("total_latency", 0.0) / successes
+
+    def is_unavailable(self, label: str) -> bool:
+        """True while a strategy is known to be unusable on this host"""
+        with self.lock:
+            return self.stats.get(label, {}).get("unavailable_until", 0) > time.time()
+
+    def order(self, strategies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort strategies by observed success rate, then latency
+
+        Args:
+            strategies: Strategy dicts with a "label" key, in default order
+
+        Returns:
+            New list, best strategy first (ties keep the default order)
+        """
+        with self.lock:
+            return sorted(
+                strategies,
+                key=lambda s: (-self.success_rate(s["label"]), self.avg_latency(s["label"])),
+            )
+
+    def record_success(self, label: str, latency: float):
+        """Record a successful download"""
+        with self.lock:
+            entry = self._entry(label)
+            entry["successes"] += 1
+            entry["total_latency"] += latency
+            entry["last_success"] = time.time()
+            entry["unavailable_until"] = 0
+            self._save()
+
+    def record_failure(self, label: str):
+        """Record a failed download attempt"""
+        with self.lock:
+            self._entry(label)["failures"] += 1
+            self._save()
+
+    def mark_unavailable(self, label: str):
+        """Skip a strategy (without backoff) until the TTL expires"""
+        with self.lock:
+            self._entry(label)["unavailable_until"] = time.time() + self.unavailable_ttl
+            self._save()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-strategy stats for display, best first"""
+        with self.lock:
+            labels = sorted(
+                self.stats,
+                key=lambda label: (-self.success_rate(label), self.avg_latency(label)),
+            )
+            return [
+                {
+                    "label": label,
+                    "successes": self.stats[label].get("successes", 0),
+                    "failures": self.stats[label].get("failures", 0),
+                    "success_rate": self.success_rate(label),
+                    "avg_latency": self.avg_latency(label),
+                }
+                for label in labels
+            ]
+
+
+# Module-level singleton cache
+_download_stats_instance: Optional[DownloadStrategyStats] = None
+
+
+def get_download_stats() -> DownloadStrategyStats:
+    """Return the process-wide DownloadStrategyStats singleton."""
+    global _download_stats_instance
+    if _download_stats_instance is None:
+        _download_stats_instance = DownloadStrategyStats()
+    return _download_stats_instance
@@ -0,0 +1,300 @@
+"""
+Persistent embedding cache for the RAG index
+
+Vectors are keyed by a hash of the embedding model and the normalised chunk
+text (Unicode NFC, whitespace collapsed), so re-indexing a library whose text
+has not changed never calls the embeddings API again. Each model gets one
+flat binary file of fixed-size rows (float16 by default, see
+EMBEDDING_CACHE_DTYPE) that is read through a memory map; a JSON index maps
+keys to row numbers. Rows freed by LRU eviction are reused, and a file that is
+mostly free rows is compacted.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_DTYPE, EMBEDDING_CACHE_MAX_MB
+from src.logger import setup_logger
+
+logger = setup_logger("embedding_cache")
+
+INDEX_FILE = "index.json"
+COMPACT_MIN_ROWS = 1024  # compact only files with at least this many free rows ...
+COMPACT_FREE_RATIO = 0.5  # ... making up at least half of the file
+
+
+def normalize_text(text: str) -> str:
+    """Text form used for cache keys: NFC with runs of whitespace collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache of embedding vectors in per-model memory-mapped files"""
+
+    def __init__(
+        self,
+        cache_dir: Path = EMBEDDING_CACHE_DIR,
+        max_bytes: int = EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+        dtype: str = EMBEDDING_CACHE_DTYPE,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self.index_file = self.cache_dir / INDEX_FILE
+        self.lock = threading.Lock()
+        # key -> {"model", "row", "last_access"}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # model -> {"file", "dim", "dtype", "rows"}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.free: Dict[str, List[int]] = {}
+        self.maps: Dict[str, np.memmap] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._load()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key of one chunk embedded by one model"""
+        return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _load(self):
+        """Load the index, dropping entries whose rows are missing from the data file"""
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read embedding cache index {self.index_file}: {e}")
+            return
+
+        self.stats.update(data.get("stats", {}))
+        for model, info in data.get("models", {}).items():
+            path = self.cache_dir / info["file"]
+            row_bytes = info["dim"] * np.dtype(info["dtype"]).itemsize
+            stored_rows = path.stat().st_size // row_bytes if path.exists() else 0
+            info["rows"] = min(info["rows"], stored_rows)
+            self.models[model] = info
+
+        used: Dict[str, set] = {model: set() for model in self.models}
+        for key, entry in data.get("entries", {}).items():
+            info = self.models.get(entry["model"])
+            if info is not None and entry["row"] < info["rows"]:
+                self.entries[key] = entry
+                used[entry["model"]].add(entry["row"])
+        for model, info in self.models.items():
+            self.free[model] = sorted(set(range(info["rows"])) - used[model], reverse=True)
+
+    def _save(self):
+        """Persist the index atomically (caller must hold the lock)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"models": self.models, "entries": self.entries, "stats": self.stats}, f)
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.warning(f"Could not save embedding cache index {self.index_file}: {e}")
+
+    def _row_bytes(self, model: str) -> int:
+        info = self.models[model]
+        return info["dim"] * np.dtype(info["dtype"]).itemsize
+
+    def _map(self, model: str) -> np.memmap:
+        """Memory map of a model's data file, re-opened when the file has grown"""
+        info = self.models[model]
+        mapped = self.maps.get(model)
+        if mapped is None or mapped.shape[0] != info["rows"]:
+            mapped = np.memmap(
+                self.cache_dir / info["file"],
+                dtype=info["dtype"],
+                mode="r+",
+                shape=(info["rows"], info["dim"]),
+            )
+            self.maps[model] = mapped
+        return mapped
+
+    def total_bytes(self) -> int:
+        """Size of the cached vectors (rows in use)"""
+        return sum(self._row_bytes(entry["model"]) for entry in self.entries.values())
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up the embeddings of several chunks
+
+        Args:
+            model: Embedding model name
+            texts: Chunk texts
+
+        Returns:
+            One float32 vector per text, None for misses
+        """
+        now = time.time()
+        vectors: List[Optional[np.ndarray]] = []
+        with self.lock:
+            for text in texts:
+                entry = self.entries.get(self.key(model, text))
+                if entry is None:
+                    vectors.append(None)
+                    continue
+                entry["last_access"] = now
+                vectors.append(np.array(self._map(model)[entry["row"]], dtype=np.float32))
+
+            hits = sum(vector is not None for vector in vectors)
+            self.stats["hits"] += hits
+            self.stats["misses"] += len(vectors) - hits
+            if texts:
+                self._save()
+        return vectors
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Store the embeddings of several chunks and evict down to the disk budget
+
+        Args:
+            model: Embedding model name
+            texts: Chunk texts
+            vectors: Their embeddings, in the same order
+        """
+        if not texts or self.max_bytes <= 0:
+            return
+        array = np.asarray(vectors, dtype=np.float32)
+
+        with self.lock:
+            info = self.models.get(model)
+            if info is None:
+                slug = re.sub(r"[^A-Za-z0-9_.-]", "_", model)
+                info = {
+                    "file": f"{slug}.{self.dtype.name}",
+                    "dim": array.shape[1],
+                    "dtype": self.dtype.name,
+                    "rows": 0,
+                }
+                self.models[model] = info
+                self.free[model] = []
+            elif array.shape[1] != info["dim"]:
+                logger.warning(
+                    f"Not caching {model} embeddings of size {array.shape[1]} "
+                    f"(cached ones have {info['dim']})"
+                )
+                return
+
+            keys = [self.key(model, text) for text in texts]
+            incoming = len(set(keys) - self.entries.keys()) * self._row_bytes(model)
+            # Make room first, so new vectors reuse the freed rows instead of growing the file
+            self._evict(keep=set(keys), budget=self.max_bytes - incoming)
+
+            assigned: Dict[str, int] = {}
+            for key in keys:
+                if key in assigned:
+                    continue
+                if key in self.entries:
+                    assigned[key] = self.entries[key]["row"]
+                elif self.free[model]:
+                    assigned[key] = self.free[model].pop()
+                else:
+                    assigned[key] = info["rows"]
+                    info["rows"] += 1
+            rows = [assigned[key] for key in keys]
+
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                path = self.cache_dir / info["file"]
+                with open(path, "ab") as f:
+                    f.truncate(info["rows"] * self._row_bytes(model))
+                mapped = self._map(model)
+                mapped[rows] = array.astype(info["dtype"])
+                mapped.flush()
+            except OSError as e:
+                logger.warning(f"Could not cache {len(texts)} {model} embeddings: {e}")
+                return
+
+            now = time.time()
+            for key, row in assigned.items():
+                self.entries[key] = {"model": model, "row": row, "last_access": now}
+            self._compact_if_sparse()
+            self._save()
+
+    def _evict(self, keep: set, budget: int):
+        """Free least recently used rows until within budget (caller holds the lock)"""
+        total = self.total_bytes()
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_access"]):
+            if total <= budget:
+                break
+            if key in keep:
+                continue
+            entry = self.entries.pop(key)
+            self.free[entry["model"]].append(entry["row"])
+            total -= self._row_bytes(entry["model"])
+            self.stats["evictions"] += 1
+
+    def _compact_if_sparse(self):
+        """Compact data files that are mostly free rows (caller holds the lock)"""
+        for model, free in self.free.items():
+            rows = self.models[model]["rows"]
+            if len(free) >= COMPACT_MIN_ROWS and len(free) >= COMPACT_FREE_RATIO * rows:
+                self._compact(model)
+
+    def _compact(self, model: str):
+        """Rewrite a model's data file without its free rows (caller holds the lock)"""
+        info = self.models[model]
+        live = sorted(
+            (entry["row"], key) for key, entry in self.entries.items() if entry["model"] == model
+        )
+        path = self.cache_dir / info["file"]
+        tmp_file = path.with_suffix(".tmp")
+        source = self._map(model)
+        try:
+            compacted = np.memmap(
+                tmp_file, dtype=info["dtype"], mode="w+", shape=(max(len(live), 1), info["dim"])
+            )
+            if live:
+                compacted[: len(live)] = source[[row for row, _ in live]]
+            compacted.flush()
+            del compacted
+            self.maps.pop(model, None)
+            os.replace(tmp_file, path)
+        except OSError as e:
+            logger.warning(f"Could not compact embedding cache {path}: {e}")
+            return
+
+        for new_row, (_, key) in enumerate(live):
+            self.entries[key]["row"] = new_row
+        info["rows"] = max(len(live), 1)
+        self.free[model] = [0] if not live else []
+        logger.info(f"🗜️ Compacted {model} embedding cache to {len(live)} rows")
+
+    def summary(self) -> Dict[str, Any]:
+        """Cache usage and hit rate for display"""
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "evictions": self.stats["evictions"],
+            }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache"""
+    global _embedding_cache
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache()
+        return _embedding_cache
@@ -0,0 +1,293 @@
+"""
+Embedding providers for the RAG index
+
+"openai" sends chunks to the embeddings API. OpenAIBatchEmbeddings replaces
+LangChain's serial batching: chunks are packed into requests by estimated
+token count (EMBEDDING_BATCH_TOKENS, at most EMBEDDING_BATCH_ITEMS inputs),
+EMBEDDING_CONCURRENCY requests are in flight at once and every request goes
+through the process-wide rate limiter. A request that hits a rate limit is
+retried as is (the limiter holds it back until the window reopens); one that
+fails for any other reason is retried one chunk at a time, so a single bad
+input cannot sink the rest of its batch.
+
+"local" runs a small sentence-transformer on the CPU with ONNX Runtime
+(fastembed), needs no network and answers a warm query in milliseconds.
+
+Vectors from different providers or models live in different spaces;
+embedding_tag() names the space so the index is never mixed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence
+
+from langchain.embeddings.base import Embeddings
+
+from config import (
+    EMBEDDING_BATCH_ITEMS,
+    EMBEDDING_BATCH_TOKENS,
+    EMBEDDING_CONCURRENCY,
+    EMBEDDING_MODEL,
+    EMBEDDING_PROVIDER,
+    LOCAL_EMBEDDING_BATCH_SIZE,
+    LOCAL_EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_THREADS,
+    MAX_RETRIES,
+)
+from src.logger import setup_logger
+from src.rate_limiter import RateLimitedResource, estimate_tokens, is_rate_limit_error
+
+logger = setup_logger("embeddings")
+
+PROVIDERS = ("openai", "local")
+QUERY_CACHE_SIZE = 256  # recent query vectors kept by the local provider
+
+
+def embedding_tag(provider: Optional[str] = None) -> str:
+    """
+    Provider and model that produce the vectors, e.g. "openai:text-embedding-ada-002"
+
+    Args:
+        provider: "openai" or "local" (default: EMBEDDING_PROVIDER)
+    """
+    provider = (provider or EMBEDDING_PROVIDER).lower()
+    model = LOCAL_EMBEDDING_MODEL if provider == "local" else EMBEDDING_MODEL
+    return f"{provider}:{model}"
+
+
+def pack_batches(
+    texts: Sequence[str],
+    max_tokens: int = EMBEDDING_BATCH_TOKENS,
+    max_items: int = EMBEDDING_BATCH_ITEMS,
+) -> List[List[int]]:
+    """
+    Group texts into requests, in order, under a token and an input budget
+
+    Args:
+        texts: Texts to embed
+        max_tokens: Estimated tokens per request (a longer text gets a request of its own)
+        max_items: Inputs per request
+
+    Returns:
+        Lists of indices into texts, one per request
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    tokens = 0
+    for i, text in enumerate(texts):
+        size = estimate_tokens(text)
+        if current and (tokens + size > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(i)
+        tokens += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+class OpenAIBatchEmbeddings(Embeddings):
+    """Embeddings API requests sent as concurrent token-budgeted batches"""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        client: Any,
+        model: str = EMBEDDING_MODEL,
+        concurrency: int = EMBEDDING_CONCURRENCY,
+        batch_tokens: int = EMBEDDING_BATCH_TOKENS,
+        max_retries: int = MAX_RETRIES,
+    ):
+        """
+        Args:
+            client: OpenAI embeddings resource, normally wrapped in RateLimitedResource
+            model: Embedding model
+            concurrency: Requests in flight at once
+            batch_tokens: Estimated tokens per request
+            max_retries: Attempts per request when rate limited
+        """
+        self.client = client
+        self.model = model
+        self.concurrency = concurrency
+        self.batch_tokens = batch_tokens
+        self.max_retries = max_retries
+        # Set by RAGEngine.index_transcripts for per-batch progress messages
+        self.progress_callback: Optional[Callable[[str], None]] = None
+
+    def _create(self, texts: List[str]) -> List[List[float]]:
+        """One embeddings request, repeated while it is rate limited"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = self.client.create(
+                    model=self.model, input=texts, encoding_format="float"
+                )
+                return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    f"⏳ Embedding batch of {len(texts)} chunks rate limited "
+                    f"(attempt {attempt}/{self.max_retries})"
+                )
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch, falling back to one request per chunk if the batch fails"""
+        try:
+            return self._create(texts)
+        except Exception as e:
+            if len(texts) == 1:
+                raise
+            logger.warning(
+                f"⚠️ Embedding batch of {len(texts)} chunks failed ({e}), retrying one by one"
+            )
+            return [self._create([text])[0] for text in texts]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        batches = pack_batches(texts, self.batch_tokens)
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.concurrency, len(batches))), thread_name_prefix="embed"
+        ) as executor:
+            futures = {
+                executor.submit(self._embed_batch, [texts[i] for i in batch]): batch
+                for batch in batches
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    batch = futures[future]
+                    for i, vector in zip(batch, future.result()):
+                        vectors[i] = vector
+                    if self.progress_callback:
+                        self.progress_callback(
+                            f"🧠 Embedded batch {done}/{len(batches)} ({len(batch)} chunks)"
+                        )
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._create([text])[0]
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    Sentence-transformer on the CPU (ONNX Runtime through fastembed)
+
+    The model is loaded on first use and shared by every caller. Documents are
+    embedded batch_size at a time; recent query vectors are kept, so repeating
+    a search does not run the model again.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model: str = LOCAL_EMBEDDING_MODEL,
+        threads: int = LOCAL_EMBEDDING_THREADS,
+        batch_size: int = LOCAL_EMBEDDING_BATCH_SIZE,
+    ):
+        """
+        Args:
+            model: fastembed model name (a sentence-transformers model exported to ONNX)
+            threads: ONNX Runtime threads (0 = all cores)
+            batch_size: Chunks per inference batch
+
+        Raises:
+            RuntimeError: If fastembed is not installed
+        """
+        try:
+            import fastembed  # noqa: F401
+        except ImportError:
+            raise RuntimeError(
+                "The local embedding provider needs fastembed: pip install fastembed"
+            )
+
+        self.model = model
+        self.threads = threads or None
+        self.batch_size = max(1, batch_size)
+        self.progress_callback: Optional[Callable[[str], None]] = None
+        self._model = None
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Load the model once (first call pays the download/load time)"""
+        with self._lock:
+            if self._model is None:
+                from fastembed import TextEmbedding
+
+                start_time = time.time()
+                logger.info(f"🧠 Loading local embedding model {self.model}")
+                self._model = TextEmbedding(model_name=self.model, threads=self.threads)
+                logger.info(f"✅ Local embedding model loaded in {time.time() - start_time:.1f}s")
+            return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        model = self._load()
+        vectors: List[List[float]] = []
+        batches = (len(texts) + self.batch_size - 1) // self.batch_size
+        for n, start in enumerate(range(0, len(texts), self.batch_size), 1):
+            end = start + self.batch_size
+            batch = texts[start:end]
+            vectors.extend(
+                vector.tolist() for vector in model.embed(batch, batch_size=self.batch_size)
+            )
+            if self.progress_callback:
+                self.progress_callback(f"🧠 Embedded batch {n}/{batches} ({len(batch)} chunks)")
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._queries.get(text)
+            if vector is not None:
+                self._queries.move_to_end(text)
+                return vector
+
+        vector = next(iter(self._load().query_embed([text]))).tolist()
+        with self._lock:
+            self._queries[text] = vector
+            if len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return vector
+
+
+_local_embeddings: Optional[LocalEmbeddings] = None
+_local_embeddings_lock = threading.Lock()
+
+
+def get_local_embeddings() -> LocalEmbeddings:
+    """Get the shared local provider (one loaded model per process)"""
+    global _local_embeddings
+    with _local_embeddings_lock:
+        if _local_embeddings is None:
+            _local_embeddings = LocalEmbeddings()
+        return _local_embeddings
+
+
+def create_embeddings(provider: Optional[str] = None, client: Any = None) -> Embeddings:
+    """
+    Resolve a provider name to an embeddings instance
+
+    Args:
+        provider: "openai" or "local" (default: EMBEDDING_PROVIDER)
+        client: OpenAI client (openai provider only)
+
+    Returns:
+        Embeddings instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    provider = (provider or EMBEDDING_PROVIDER).lower()
+    if provider == "openai":
+        return OpenAIBatchEmbeddings(RateLimitedResource(client.embeddings, "embeddings"))
+    if provider == "local":
+        return get_local_embeddings()
+    raise ValueError(f"Unknown embedding provider {provider!r}, expected one of {PROVIDERS}")
@@ -0,0 +1,391 @@
+"""
+Acoustic fingerprints for re-upload detection
+
+The first FINGERPRINT_SECONDS of a download are decoded to 8 kHz mono, split
+into 16 log-spaced bands between 200 Hz and 3.8 kHz and averaged into
+overlapping 2-second windows. Each band is normalised over time (so volume
+and EQ changes cancel out) and the resulting envelope is projected onto 128
+fixed random hyperplanes, giving a 128-bit fingerprint whose Hamming
+distance tracks how different two recordings are. Re-encodes of the same
+audio land within a few bits; unrelated audio differs in about half of them.
+
+The fingerprint is stored one second into the audio; lookups probe every
+frame offset between 0 and 2 seconds so small lead-in differences still
+align. FingerprintIndex splits each fingerprint into 5 bands of 25 bits and
+keeps a hash table per band, so a lookup only compares the entries that share
+a band with a probe (multi-index hashing) instead of the whole index. Any
+probe within 4 bits of a stored fingerprint shares at least one band with it,
+and 25-bit keys keep unrelated buckets empty well past 100k videos.
+
+The index is a JSON snapshot plus an append-only journal of changes since the
+snapshot, so adding a video writes one line instead of the whole file; the
+journal is folded into the snapshot every JOURNAL_COMPACT_EVERY changes.
+"""
+
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import (
+    FINGERPRINT_DURATION_TOLERANCE,
+    FINGERPRINT_INDEX_FILE,
+    FINGERPRINT_MIN_SIMILARITY,
+    FINGERPRINT_SECONDS,
+)
+from src.audio import ffmpeg_tool
+from src.logger import setup_logger
+
+logger = setup_logger("fingerprint")
+
+SAMPLE_RATE = 8000
+FRAME_SIZE = 1024  # 128 ms frames, no overlap
+FRAMES_PER_SECOND = SAMPLE_RATE / FRAME_SIZE
+BAND_EDGES = np.geomspace(200, 3800, 17)
+WINDOW_SECONDS = 2.0
+LEAD_SECONDS = 1.0  # stored fingerprint starts here; probes cover 0 .. 2 * LEAD_SECONDS
+MIN_SECONDS = 16
+FINGERPRINT_BITS = 128
+INDEX_BANDS = 5
+BAND_BITS = FINGERPRINT_BITS // INDEX_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+JOURNAL_COMPACT_EVERY = 1000
+
+_band_filters = np.array(
+    [
+        (freqs >= low) & (freqs < high)
+        for freqs in [np.fft.rfftfreq(FRAME_SIZE, 1 / SAMPLE_RATE)]
+        for low, high in zip(BAND_EDGES[:-1], BAND_EDGES[1:])
+    ],
+    dtype=np.float32,
+)
+# Fixed seed: fingerprints must stay comparable across runs and machines
+_projection = (
+    np.random.default_rng(20240607)
+    .standard_normal((FINGERPRINT_BITS, FINGERPRINT_SECONDS * len(_band_filters)))
+    .astype(np.float32)
+)
+
+
+def decode_prefix(
+    audio_path: Path, seconds: float, ffmpeg_location: Optional[str] = None
+) -> np.ndarray:
+    """
+    Decode the start of an audio file to 8 kHz mono samples
+
+    Args:
+        audio_path: Audio file
+        seconds: Length to decode
+        ffmpeg_location: Directory containing the FFmpeg executables
+
+    Returns:
+        float32 samples (empty if decoding failed)
+    """
+    result = subprocess.run(
+        [
+            ffmpeg_tool("ffmpeg", ffmpeg_location),
+            "-v",
+            "error",
+            "-i",
+            str(audio_path),
+            "-t",
+            str(seconds),
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(SAMPLE_RATE),
+            "-f",
+            "s16le",
+            "-",
+        ],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        logger.warning(
+            f"⚠️  Could not decode {audio_path.name} for fingerprinting: "
+            f"{result.stderr.decode(errors='replace')[-300:]}"
+        )
+        return np.zeros(0, dtype=np.float32)
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32)
+
+
+def band_energies(samples: np.ndarray) -> np.ndarray:
+    """Log energy per frame and band, shape (frames, bands)"""
+    frames = len(samples) // FRAME_SIZE
+    windowed = samples[: frames * FRAME_SIZE].reshape(frames, FRAME_SIZE) * np.hanning(FRAME_SIZE)
+    power = np.abs(np.fft.rfft(windowed, axis=1)) ** 2
+    return np.log(power @ _band_filters.T + 1e-6)
+
+
+def fingerprint_at(energies: np.ndarray, start_frame: int) -> int:
+    """
+    128-bit fingerprint of FINGERPRINT_SECONDS of band energies
+
+    Args:
+        energies: band_energies() output
+        start_frame: First frame of the fingerprinted span
+
+    Returns:
+        Fingerprint as an int
+    """
+    rows = np.zeros((FINGERPRINT_SECONDS, energies.shape[1]), dtype=np.float32)
+    for second in range(FINGERPRINT_SECONDS):
+        first = start_frame + int(round(second * FRAMES_PER_SECOND))
+        last = start_frame + int(round((second + WINDOW_SECONDS) * FRAMES_PER_SECOND))
+        if last <= len(energies):
+            rows[second] = energies[first:last].mean(axis=0)
+    rows = (rows - rows.mean(axis=0)) / (rows.std(axis=0) + 1e-6)
+
+    bits = (_projection @ rows.ravel()) > 0
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def compute_fingerprint(
+    audio_path: Path, ffmpeg_location: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Fingerprint the start of an audio file
+
+    Args:
+        audio_path: Downloaded audio file
+        ffmpeg_location: Directory containing the FFmpeg executables
+
+    Returns:
+        {"fingerprint": int stored in the index, "probes": ints to look up},
+        or None if the audio is too short or could not be decoded
+    """
+    samples = decode_prefix(
+        audio_path, FINGERPRINT_SECONDS + WINDOW_SECONDS + 2 * LEAD_SECONDS, ffmpeg_location
+    )
+    if len(samples) < MIN_SECONDS * SAMPLE_RATE:
+        return None
+
+    energies = band_energies(samples)
+    lead_frames = int(round(LEAD_SECONDS * FRAMES_PER_SECOND))
+    return {
+        "fingerprint": fingerprint_at(energies, lead_frames),
+        "probes": [fingerprint_at(energies, frame) for frame in range(2 * lead_frames + 1)],
+    }
+
+
+def similarity(a: int, b: int) -> float:
+    """Fraction of equal bits between two fingerprints"""
+    return 1 - (a ^ b).bit_count() / FINGERPRINT_BITS
+
+
+def _bands(fingerprint: int) -> List[int]:
+    return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(INDEX_BANDS)]
+
+
+class FingerprintIndex:
+    """Thread-safe fingerprint index of transcribed videos, persisted as JSON plus a journal"""
+
+    def __init__(
+        self,
+        index_file: Path = FINGERPRINT_INDEX_FILE,
+        min_similarity: float = FINGERPRINT_MIN_SIMILARITY,
+    ):
+        self.index_file = Path(index_file)
+        self.journal_file = self.index_file.with_suffix(".journal")
+        self.min_similarity = min_similarity
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.aliases: Dict[str, str] = {}
+        self.fingerprints: Dict[str, int] = {}
+        self.tables: List[Dict[int, List[str]]] = [{} for _ in range(INDEX_BANDS)]
+        self.journal_length = 0
+        self._load()
+
+    def _load(self):
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read fingerprint index {self.index_file}: {e}")
+                data = {}
+            self.aliases = data.get("aliases", {})
+            for video_id, entry in data.get("entries", {}).items():
+                self._insert(video_id, entry)
+
+        if not self.journal_file.exists():
+            return
+        torn = False
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A crash mid-append leaves a torn line
+                        torn = True
+                        continue
+                    self.journal_length += 1
+        except OSError as e:
+            logger.warning(f"Could not read fingerprint journal {self.journal_file}: {e}")
+        if torn:
+            # Compact now so the next append doesn't land on the torn line
+            self._save()
+
+    def _save(self):
+        """Write a snapshot atomically and clear the journal (caller must hold the lock)"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries, "aliases": self.aliases}, f)
+            os.replace(tmp_file, self.index_file)
+            # Replaying changes already in the snapshot is harmless, so a crash
+            # before this unlink loses nothing
+            self.journal_file.unlink(missing_ok=True)
+            self.journal_length = 0
+        except OSError as e:
+            logger.warning(f"Could not save fingerprint index {self.index_file}: {e}")
+
+    def _record(self, change: Dict[str, Any]):
+        """Apply a change and append it to the journal (caller must hold the lock)"""
+        self._apply(change)
+        try:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(change) + "\n")
+            self.journal_length += 1
+        except OSError as e:
+            logger.warning(f"Could not write fingerprint journal {self.journal_file}: {e}")
+            self._save()
+            return
+        if self.journal_length >= JOURNAL_COMPACT_EVERY:
+            self._save()
+
+    def _apply(self, change: Dict[str, Any]):
+        """Apply one journal change to the in-memory index"""
+        video_id = change["video_id"]
+        if change["op"] == "add":
+            self._insert(video_id, change["entry"])
+            self.aliases.pop(video_id, None)
+        elif change["op"] == "alias":
+            self.aliases[video_id] = change["canonical"]
+        elif change["op"] == "remove":
+            if video_id in self.fingerprints:
+                self._remove(video_id)
+            self.aliases = {
+                alias: canonical
+                for alias, canonical in self.aliases.items()
+                if video_id not in (alias, canonical)
+            }
+
+    def _insert(self, video_id: str, entry: Dict[str, Any]):
+        """Add an entry to the in-memory tables (caller holds the lock or is loading)"""
+        if video_id in self.fingerprints:
+            self._remove(video_id)
+        fingerprint = int(entry["fingerprint"], 16)
+        self.entries[video_id] = entry
+        self.fingerprints[video_id] = fingerprint
+        for table, value in zip(self.tables, _bands(fingerprint)):
+            table.setdefault(value, []).append(video_id)
+
+    def _remove(self, video_id: str):
+        fingerprint = self.fingerprints.pop(video_id)
+        del self.entries[video_id]
+        for table, value in zip(self.tables, _bands(fingerprint)):
+            bucket = table.get(value, [])
+            if video_id in bucket:
+                bucket.remove(video_id)
+            if not bucket:
+                table.pop(value, None)
+
+    def add(
+        self,
+        video_id: str,
+        fingerprint: int,
+        duration: Optional[float] = None,
+        title: Optional[str] = None,
+    ):
+        """
+        Record the fingerprint of a freshly transcribed video
+
+        Args:
+            video_id: YouTube video ID of the transcript
+            fingerprint: compute_fingerprint()["fingerprint"]
+            duration: Audio duration in seconds (matches must have a similar length)
+            title: Video title, for messages
+        """
+        entry = {"fingerprint": f"{fingerprint:032x}", "duration": duration, "title": title}
+        with self.lock:
+            self._record({"op": "add", "video_id": video_id, "entry": entry})
+
+    def add_alias(self, video_id: str, canonical_id: str):
+        """Remember that video_id is a re-upload of canonical_id"""
+        with self.lock:
+            self._record({"op": "alias", "video_id": video_id, "canonical": canonical_id})
+
+    def alias_of(self, video_id: str) -> Optional[str]:
+        """Video whose transcript covers video_id, if it was linked as a re-upload"""
+        with self.lock:
+            return self.aliases.get(video_id)
+
+    def remove(self, video_id: str):
+        """Forget a video (and every re-upload linked to it)"""
+        with self.lock:
+            self._record({"op": "remove", "video_id": video_id})
+
+    def lookup(
+        self,
+        probes: List[int],
+        duration: Optional[float] = None,
+        exclude: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find an indexed video that sounds like the probed audio
+
+        Args:
+            probes: compute_fingerprint()["probes"]
+            duration: Audio duration in seconds; candidates whose length differs
+                by more than FINGERPRINT_DURATION_TOLERANCE are ignored
+            exclude: Video ID that must not match itself
+
+        Returns:
+            {"video_id", "similarity", "title"} of the best match at or above
+            min_similarity, or None
+        """
+        with self.lock:
+            # Fewest differing bits between each candidate and a probe that found it
+            distances: Dict[str, int] = {}
+            for probe in probes:
+                for table, value in zip(self.tables, _bands(probe)):
+                    for video_id in table.get(value, ()):
+                        distance = (probe ^ self.fingerprints[video_id]).bit_count()
+                        if distance < distances.get(video_id, FINGERPRINT_BITS + 1):
+                            distances[video_id] = distance
+            distances.pop(exclude, None)
+
+            best = None
+            for video_id, distance in distances.items():
+                score = 1 - distance / FINGERPRINT_BITS
+                if score < self.min_similarity or (best and score <= best["similarity"]):
+                    continue
+                entry = self.entries[video_id]
+                if duration and entry.get("duration"):
+                    tolerance = max(5.0, FINGERPRINT_DURATION_TOLERANCE * entry["duration"])
+                    if abs(duration - entry["duration"]) > tolerance:
+                        continue
+                best = {"video_id": video_id, "similarity": score, "title": entry.get("title")}
+            return best
+
+
+_fingerprint_index: Optional[FingerprintIndex] = None
+_fingerprint_index_lock = threading.Lock()
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    """Get the process-wide fingerprint index"""
+    global _fingerprint_index
+    with _fingerprint_index_lock:
+        if _fingerprint_index is None:
+            _fingerprint_index = FingerprintIndex()
+        return _fingerprint_index
@@ -0,0 +1,240 @@
+"""
+Pipelined batch engine for YouTube Transcriber Pro
+
+Runs download, FFmpeg conversion, Whisper transcription and saving as
+separate stages, each with its own bounded worker pool, so that video N+1
+downloads while video N is being transcribed.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from config import (
+    PIPELINE_CONVERT_WORKERS,
+    PIPELINE_DOWNLOAD_WORKERS,
+    PIPELINE_MAX_IN_FLIGHT,
+    PIPELINE_SAVE_WORKERS,
+    PIPELINE_TRANSCRIBE_WORKERS,
+)
+from src.audio import AudioChunk, TimeMap, prep_summary
+from src.logger import setup_logger
+from src.segments import detected_language, map_segments
+from src.utils import extract_video_id
+
+if TYPE_CHECKING:
+    from src.transcriber import YouTubeTranscriber
+
+logger = setup_logger("pipeline")
+
+STAGES = ("download", "convert", "transcribe", "save")
+
+
+class _Job:
+    """State of one video moving through the pipeline"""
+
+    def __init__(self, index: int, url: str, video_id: str):
+        self.index = index
+        self.url = url
+        self.video_id = video_id
+        self.audio_path: Optional[Path] = None
+        self.title: Optional[str] = None
+        self.chunks: List[AudioChunk] = []
+        self.transcript: Optional[str] = None
+        self.extra: Dict[str, Any] = {}
+        self.fingerprint: Optional[Dict[str, Any]] = None
+        self.time_map: Optional[TimeMap] = None
+        self.segments: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.done = threading.Event()
+
+
+class BatchPipeline:
+    """Stage-parallel batch processor built on top of YouTubeTranscriber"""
+
+    def __init__(
+        self,
+        transcriber: "YouTubeTranscriber",
+        workers: Optional[Dict[str, int]] = None,
+        max_in_flight: int = PIPELINE_MAX_IN_FLIGHT,
+        backend: Optional[str] = None,
+    ):
+        """
+        Args:
+            transcriber: Transcriber whose stage methods do the actual work
+            workers: Optional per-stage worker counts overriding config
+            max_in_flight: Maximum videos admitted to the pipeline at once
+                (bounds temp disk usage while downloads run ahead)
+            backend: Transcription backend for every video ("openai" or "local")
+        """
+        self.transcriber = transcriber
+        self.workers = {
+            "download": PIPELINE_DOWNLOAD_WORKERS,
+            "convert": PIPELINE_CONVERT_WORKERS,
+            "transcribe": PIPELINE_TRANSCRIBE_WORKERS,
+            "save": PIPELINE_SAVE_WORKERS,
+        }
+        if workers:
+            self.workers.update(workers)
+        self.max_in_flight = max_in_flight
+        self.backend = backend
+
+        self._callback_lock = threading.Lock()
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._slots: Optional[threading.Semaphore] = None
+        self._link_reuploads = True
+
+    def run(
+        self,
+        urls: Iterable[str],
+        progress_callback: Optional[Callable] = None,
+        skip_if_exists: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process videos through the stage pipeline
+
+        Args:
+            urls: Unique YouTube video URLs (consumed lazily)
+            progress_callback: Optional callback for progress updates
+            skip_if_exists: Skip videos that are already transcribed
+
+        Returns:
+            List of processing results, in input order
+        """
+        logger.info(
+            "🚀 Pipeline workers: "
+            + ", ".join(f"{stage}={self.workers[stage]}" for stage in STAGES)
+        )
+
+        self._slots = threading.Semaphore(max(1, self.max_in_flight))
+        self._link_reuploads = skip_if_exists
+        self._executors = {
+            stage: ThreadPoolExecutor(
+                max_workers=max(1, self.workers[stage]), thread_name_prefix=f"pipeline-{stage}"
+            )
+            for stage in STAGES
+        }
+
+        jobs: List[_Job] = []
+        try:
+            for index, url in enumerate(urls, 1):
+                video_id = extract_video_id(url)
+                job = _Job(index, url, video_id)
+                jobs.append(job)
+
+                if not video_id:
+                    self._finish(
+                        job, {"success": False, "error": "Invalid YouTube URL", "url": url}
+                    )
+                    continue
+
+                if skip_if_exists:
+                    callback = self._job_callback(job, progress_callback)
+                    skipped = self.transcriber._skip_result_if_exists(video_id, callback)
+                    if skipped:
+                        job.result = skipped
+                        job.done.set()
+                        continue
+
+                # Wait for a free slot before admitting the next video
+                self._slots.acquire()
+                self._submit("download", job, progress_callback)
+
+            for job in jobs:
+                job.done.wait()
+        finally:
+            for executor in self._executors.values():
+                executor.shutdown(wait=True)
+            self._executors = {}
+
+        return [job.result for job in jobs]
+
+    def _job_callback(self, job: _Job, progress_callback: Optional[Callable]) -> Optional[Callable]:
+        """Serialize and tag progress messages coming from worker threads"""
+        if not progress_callback:
+            return None
+
+        def callback(message: str):
+            with self._callback_lock:
+                progress_callback(f"[{job.index}] {message}")
+
+        return callback
+
+    def _submit(self, stage: str, job: _Job, progress_callback: Optional[Callable]):
+        """Queue a job on the worker pool of the given stage"""
+        self._executors[stage].submit(self._run_stage, stage, job, progress_callback)
+
+    def _run_stage(self, stage: str, job: _Job, progress_callback: Optional[Callable]):
+        """Run one stage for a job and hand it to the next stage"""
+        callback = self._job_callback(job, progress_callback)
+        transcriber = self.transcriber
+
+        try:
+            if stage == "download":
+                logger.info(f"⬇️  [{job.index}] Download stage: {job.video_id}")
+                if callback:
+                    callback(f"Processing video {job.index}: {job.video_id}")
+                job.audio_path, job.title = transcriber.download_audio(job.url, callback)
+            elif stage == "convert":
+                if not job.audio_path.exists():
+                    raise FileNotFoundError(f"Audio file not found: {job.audio_path}")
+                job.fingerprint, linked = transcriber._match_reupload(
+                    job.video_id, job.audio_path, callback, link=self._link_reuploads
+                )
+                if linked:
+                    self._finish(job, linked, release=True)
+                    return
+                prep = transcriber._prepare_audio(job.audio_path, callback)
+                job.audio_path = prep["path"]
+                job.time_map = prep.get("time_map")
+                job.extra["audio_prep"] = prep_summary(prep)
+                job.chunks = transcriber._split_for_whisper(job.audio_path, callback, self.backend)
+            elif stage == "transcribe":
+                chunk_reports = []
+                job.transcript = transcriber._transcribe_chunks(
+                    job.chunks, callback, chunk_reports, self.backend, job.segments
+                )
+                job.extra["chunks"] = chunk_reports
+            elif stage == "save":
+                result = transcriber._save_video_result(
+                    job.url,
+                    job.video_id,
+                    job.index,
+                    job.title,
+                    job.transcript,
+                    job.audio_path,
+                    callback,
+                    extra=job.extra,
+                    fingerprint=job.fingerprint,
+                    segments=map_segments(job.segments, job.time_map),
+                    language=detected_language(job.extra["chunks"]),
+                )
+                self._finish(job, result, release=True)
+                return
+        except Exception as e:
+            logger.error(f"❌ VIDEO #{job.index} FAILED in {stage} stage: {e}")
+            if callback:
+                callback(f"❌ Error: {str(e)}")
+            self._cleanup(job)
+            self._finish(job, {"success": False, "error": str(e), "url": job.url}, release=True)
+            return
+
+        next_stage = STAGES[STAGES.index(stage) + 1]
+        self._submit(next_stage, job, progress_callback)
+
+    def _cleanup(self, job: _Job):
+        """Remove temporary audio left behind by a failed job"""
+        for path in [job.audio_path, *(chunk.path for chunk in job.chunks)]:
+            try:
+                if path and path.exists():
+                    path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not delete {path}: {e}")
+
+    def _finish(self, job: _Job, result: Dict[str, Any], release: bool = False):
+        """Record a job result and free its pipeline slot"""
+        job.result = result
+        if release:
+            self._slots.release()
+        job.done.set()
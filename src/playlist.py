@@ -0,0 +1,224 @@
+"""
+Playlist and channel ingestion for YouTube Transcriber Pro
+
+Expands playlist / channel URLs lazily with yt-dlp flat extraction so video
+URLs can stream into the batch pipeline as they are discovered. Discovered
+IDs are checkpointed per collection: a later run yields them straight away,
+then walks the flat listing again (positions shift whenever a video is added
+or removed, so entries are matched by ID, not index) and only yields IDs it
+has not seen. A finished expansion is re-checked for new uploads by walking
+until the first known ID, and walked in full again once FULL_WALK_EVERY has
+passed, which also catches videos added anywhere else in the list.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import yt_dlp
+
+from config import CACHE_DIR
+from src.logger import setup_logger
+from src.utils import extract_video_id, is_collection_url, normalize_collection_url
+
+logger = setup_logger("playlist")
+
+EXPANSION_CACHE_DIR = CACHE_DIR / "expansions"
+CHECKPOINT_EVERY = 50  # discovered IDs between checkpoint writes
+FULL_WALK_EVERY = 24 * 3600  # seconds before a finished expansion is walked in full again
+
+
+def video_url(video_id: str) -> str:
+    """Canonical watch URL for a video ID"""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+class ExpansionCheckpoint:
+    """Discovered video IDs of one playlist/channel, persisted as JSON"""
+
+    def __init__(self, url: str, cache_dir: Path = EXPANSION_CACHE_DIR):
+        self.url = url
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        self.path = Path(cache_dir) / f"{key}.json"
+        self.video_ids: List[str] = []
+        self.complete = False
+        self.walked = 0.0  # when the last full walk finished
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.video_ids = list(data.get("video_ids", []))
+            self.complete = bool(data.get("complete", False))
+            self.walked = float(data.get("walked", 0.0))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable expansion checkpoint {self.path}: {e}")
+
+    def save(self):
+        """Persist discovered IDs atomically"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "url": self.url,
+                        "video_ids": self.video_ids,
+                        "complete": self.complete,
+                        "walked": self.walked,
+                        "updated": time.time(),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save expansion checkpoint {self.path}: {e}")
+
+
+def _iter_entries(entries: Any) -> Iterator[Dict[str, Any]]:
+    """Iterate yt-dlp playlist entries without forcing every page to load"""
+    if entries is None:
+        return
+    if hasattr(entries, "getpage"):
+        # PagedList: fetch one page at a time
+        for page_number in itertools.count():
+            page = entries.getpage(page_number)
+            if not page:
+                return
+            yield from page
+    else:
+        yield from entries
+
+
+def _flat_video_ids(ydl: yt_dlp.YoutubeDL, url: str, depth: int = 0) -> Iterator[str]:
+    """Yield video IDs of a playlist/channel, recursing into channel tabs"""
+    info = ydl.extract_info(url, download=False, process=False)
+
+    if info.get("_type") not in ("playlist", "multi_video"):
+        if info.get("id"):
+            yield info["id"]
+        return
+
+    for entry in _iter_entries(info.get("entries")):
+        if not entry:
+            continue
+        ie_key = entry.get("ie_key") or ""
+        if ie_key == "Youtube" or (not ie_key and entry.get("_type") != "playlist"):
+            if entry.get("id"):
+                yield entry["id"]
+        elif depth < 2 and entry.get("url"):
+            # Nested playlist (e.g. a channel tab) - expand it lazily too
+            yield from _flat_video_ids(ydl, entry["url"], depth + 1)
+
+
+def expand_collection(
+    url: str,
+    progress_callback: Optional[Callable] = None,
+    cache_dir: Path = EXPANSION_CACHE_DIR,
+) -> Iterator[str]:
+    """
+    Lazily expand a playlist or channel URL into watch URLs
+
+    IDs found by an earlier (possibly interrupted) run are yielded first from
+    the checkpoint; the network walk then yields only IDs not seen before.
+    For a finished expansion the walk stops at the first known ID (new
+    uploads are listed first), unless FULL_WALK_EVERY has passed.
+
+    Args:
+        url: Playlist or channel URL
+        progress_callback: Optional callback for progress updates
+        cache_dir: Directory for expansion checkpoints
+
+    Yields:
+        Watch URLs: checkpointed videos, then newly discovered ones in playlist order
+    """
+    url = normalize_collection_url(url)
+    checkpoint = ExpansionCheckpoint(url, cache_dir)
+    known = set(checkpoint.video_ids)
+
+    for video_id in checkpoint.video_ids:
+        yield video_url(video_id)
+
+    recheck = checkpoint.complete and time.time() - checkpoint.walked < FULL_WALK_EVERY
+    if recheck:
+        logger.info(
+            f"📚 {url}: {len(checkpoint.video_ids)} videos (from checkpoint), "
+            "checking for new uploads"
+        )
+    elif checkpoint.video_ids:
+        logger.info(f"📚 Resuming expansion of {url} after {len(checkpoint.video_ids)} videos")
+    else:
+        logger.info(f"📚 Expanding {url}...")
+    if progress_callback:
+        progress_callback(f"📚 Expanding playlist/channel: {url}")
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+        "skip_download": True,
+    }
+
+    found = 0
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            for video_id in _flat_video_ids(ydl, url):
+                if video_id in known:
+                    if recheck:
+                        break
+                    continue
+                known.add(video_id)
+                checkpoint.video_ids.append(video_id)
+                found += 1
+                if found % CHECKPOINT_EVERY == 0:
+                    checkpoint.save()
+                yield video_url(video_id)
+        if not recheck:
+            checkpoint.walked = time.time()
+        checkpoint.complete = True
+    except Exception as e:
+        if not recheck:
+            raise
+        # The checkpointed list is still complete as of its last walk
+        logger.warning(f"⚠️  Could not check {url} for new uploads: {str(e)[:200]}")
+    finally:
+        # Also runs if the consumer stops early or the walk fails midway
+        checkpoint.save()
+
+    logger.info(f"📚 {url}: {found} new videos, {len(checkpoint.video_ids)} in total")
+
+
+def expand_urls(
+    urls: Iterable[str],
+    progress_callback: Optional[Callable] = None,
+    cache_dir: Path = EXPANSION_CACHE_DIR,
+) -> Iterator[str]:
+    """
+    Stream video URLs, expanding any playlist/channel URLs in place
+
+    Args:
+        urls: Mixed video and playlist/channel URLs
+        progress_callback: Optional callback for progress updates
+        cache_dir: Directory for expansion checkpoints
+
+    Yields:
+        Video URLs in input order
+    """
+    for url in urls:
+        if extract_video_id(url) is None and is_collection_url(url):
+            try:
+                yield from expand_collection(url, progress_callback, cache_dir)
+            except Exception as e:
+                logger.error(f"❌ Could not expand {url}: {str(e)[:200]}")
+                if progress_callback:
+                    progress_callback(f"⚠️  Could not expand {url}: {e}")
+        else:
+            yield url
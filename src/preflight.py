@@ -0,0 +1,226 @@
+"""
+Metadata-first preflight for batches
+
+Resolves title and duration for every URL concurrently without downloading
+audio, caches the metadata per video_id, applies the duration / estimated
+cost guard and orders the batch before any bandwidth is spent.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yt_dlp
+
+from config import (
+    CACHE_DIR,
+    MAX_VIDEO_COST,
+    MAX_VIDEO_DURATION,
+    PREFLIGHT_ORDER,
+    PREFLIGHT_OVER_LIMIT,
+    PREFLIGHT_WORKERS,
+    WHISPER_COST_PER_MINUTE,
+)
+from src.logger import setup_logger
+from src.utils import extract_video_id
+
+logger = setup_logger("preflight")
+
+METADATA_CACHE_DIR = CACHE_DIR / "metadata"
+
+
+def estimate_cost(duration: Optional[float]) -> float:
+    """
+    Estimate Whisper cost for a video
+
+    Args:
+        duration: Duration in seconds (None if unknown)
+
+    Returns:
+        Estimated cost in USD (0.0 if the duration is unknown)
+    """
+    if not duration:
+        return 0.0
+    return duration / 60 * WHISPER_COST_PER_MINUTE
+
+
+class MetadataCache:
+    """Per-video_id JSON cache of yt-dlp metadata"""
+
+    def __init__(self, cache_dir: Path = METADATA_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, video_id: str) -> Path:
+        return self.cache_dir / f"{video_id}.json"
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return cached metadata or None"""
+        path = self._path(video_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Ignoring unreadable metadata cache {path}: {e}")
+            return None
+
+    def put(self, metadata: Dict[str, Any]):
+        """Store metadata for metadata["video_id"]"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(metadata["video_id"])
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache metadata for {metadata.get('video_id')}: {e}")
+
+
+def fetch_metadata(url: str, cache: Optional[MetadataCache] = None) -> Dict[str, Any]:
+    """
+    Resolve metadata for one video without downloading it
+
+    Args:
+        url: YouTube video URL
+        cache: Optional metadata cache (checked first, filled on success)
+
+    Returns:
+        Dictionary with video_id, url, title, duration (None if unknown) and
+        an "error" key if extraction failed
+    """
+    video_id = extract_video_id(url)
+    if cache and video_id:
+        cached = cache.get(video_id)
+        if cached:
+            return {**cached, "url": url, "cached": True}
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "extractor_args": {"youtube": {"player_client": ["android", "ios", "web"]}},
+    }
+
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except Exception as e:
+        logger.warning(f"⚠️  Preflight could not resolve {url}: {str(e)[:200]}")
+        return {"video_id": video_id, "url": url, "title": None, "duration": None, "error": str(e)}
+
+    metadata = {
+        "video_id": info.get("id") or video_id,
+        "url": url,
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "channel": info.get("channel") or info.get("uploader"),
+        "fetched_at": time.time(),
+    }
+    if cache and metadata["video_id"]:
+        cache.put(metadata)
+    return metadata
+
+
+def run_preflight(
+    urls: List[str],
+    progress_callback: Optional[Callable] = None,
+    max_duration: Optional[float] = MAX_VIDEO_DURATION,
+    max_cost: Optional[float] = MAX_VIDEO_COST,
+    over_limit: str = PREFLIGHT_OVER_LIMIT,
+    order: str = PREFLIGHT_ORDER,
+    max_workers: int = PREFLIGHT_WORKERS,
+    cache: Optional[MetadataCache] = None,
+) -> Dict[str, Any]:
+    """
+    Resolve metadata for a batch and decide what to process, in which order
+
+    Args:
+        urls: Unique YouTube video URLs
+        progress_callback: Optional callback for progress updates
+        max_duration: Maximum video duration in seconds (None/0 = no limit)
+        max_cost: Maximum estimated Whisper cost per video in USD (None/0 = no limit)
+        over_limit: "reject" drops videos over a limit, "defer" moves them to the end
+        order: "input", "shortest" (shortest first) or "longest" (longest first)
+        max_workers: Concurrent metadata requests
+        cache: Metadata cache (default: METADATA_CACHE_DIR)
+
+    Returns:
+        Dictionary with "urls" (ordered, to process), "rejected" (failed result
+        dicts), "metadata" (by url), "total_duration" and "estimated_cost"
+    """
+    if cache is None:
+        cache = MetadataCache()
+
+    if progress_callback:
+        progress_callback(f"🔎 Preflight: resolving metadata for {len(urls)} videos...")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        metadata_list = list(executor.map(lambda url: fetch_metadata(url, cache), urls))
+
+    accepted = []
+    deferred = []
+    rejected = []
+
+    for metadata in metadata_list:
+        duration = metadata.get("duration")
+        cost = estimate_cost(duration)
+        metadata["estimated_cost"] = cost
+
+        reason = None
+        if max_duration and duration and duration > max_duration:
+            reason = f"duration {duration // 60}m exceeds limit of {int(max_duration) // 60}m"
+        elif max_cost and cost > max_cost:
+            reason = f"estimated cost ${cost:.2f} exceeds limit of ${max_cost:.2f}"
+
+        if reason is None:
+            accepted.append(metadata)
+        elif over_limit == "defer":
+            logger.info(f"⏸️  Deferred {metadata['url']}: {reason}")
+            deferred.append(metadata)
+        else:
+            logger.warning(f"🚫 Rejected {metadata['url']}: {reason}")
+            rejected.append(
+                {
+                    "success": False,
+                    "rejected": True,
+                    "url": metadata["url"],
+                    "video_id": metadata.get("video_id"),
+                    "title": metadata.get("title"),
+                    "error": f"Rejected by preflight: {reason}",
+                }
+            )
+
+    if order in ("shortest", "longest"):
+        # Unknown durations always go last
+        reverse = order == "longest"
+        known = [m for m in accepted if m.get("duration")]
+        unknown = [m for m in accepted if not m.get("duration")]
+        known.sort(key=lambda m: m["duration"], reverse=reverse)
+        accepted = known + unknown
+
+    scheduled = accepted + deferred
+    total_duration = sum(m.get("duration") or 0 for m in scheduled)
+    estimated_cost = sum(m["estimated_cost"] for m in scheduled)
+
+    logger.info(
+        f"🔎 Preflight: {len(scheduled)} to process, {len(rejected)} rejected, "
+        f"{total_duration / 60:.1f} min of audio, est. ${estimated_cost:.2f}"
+    )
+    if progress_callback:
+        progress_callback(
+            f"🔎 Preflight: {len(scheduled)} videos, {total_duration / 60:.1f} min of audio, "
+            f"est. ${estimated_cost:.2f}"
+        )
+
+    return {
+        "urls": [m["url"] for m in scheduled],
+        "rejected": rejected,
+        "metadata": {m["url"]: m for m in metadata_list},
+        "total_duration": total_duration,
+        "estimated_cost": estimated_cost,
+    }
@@ -4,17 +4,26 @@ Handles embeddings, vector storage, and conversational chat
 """
 
 import json
+import shutil
+import threading
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 from langchain.chains import ConversationalRetrievalChain
 from langchain.chat_models import ChatOpenAI
-from langchain.embeddings import OpenAIEmbeddings
+from langchain.embeddings.base import Embeddings
 from langchain.memory import ConversationBufferMemory
 from langchain.prompts import PromptTemplate
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.vectorstores import Chroma
+from openai import OpenAI
 
+from src.catalog import transcript_files
+from src.embedding_cache import EmbeddingCache, get_embedding_cache
+from src.embeddings import create_embeddings, embedding_tag
 from src.logger import setup_logger
+from src.rate_limiter import RateLimitedResource
+from src.vector_index import chunk_ids, content_hash, get_index_manifest
 
 logger = setup_logger("rag_engine")
 
@@ -22,7 +31,7 @@ from config import (
     CHAT_MODEL,
     CHUNK_OVERLAP,
     CHUNK_SIZE,
-    EMBEDDING_MODEL,
+    EMBEDDING_CACHE_ENABLED,
     OPENAI_API_KEY,
     TEMPERATURE,
     TOP_K_RESULTS,
@@ -30,15 +39,62 @@ from config import (
     VECTOR_DB_DIR,
 )
 
+# One indexing run at a time: runs read and update the same manifest and store
+_index_lock = threading.Lock()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings that answer previously embedded chunks from the embedding cache"""
+
+    def __init__(self, embeddings: Embeddings, model: str, cache: Optional[EmbeddingCache]):
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.cache is None:
+            self.misses += len(texts)
+            return self.embeddings.embed_documents(texts)
+
+        vectors = self.cache.get_many(self.model, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fresh = self.embeddings.embed_documents([texts[i] for i in missing])
+            self.cache.put_many(self.model, [texts[i] for i in missing], fresh)
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return [vector.tolist() if isinstance(vector, np.ndarray) else vector for vector in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
 
 class RAGEngine:
     """RAG engine for semantic search and chat over transcripts"""
 
     def __init__(self):
-        self.embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL, openai_api_key=OPENAI_API_KEY)
+        # Embedding and chat calls go through the process-wide rate limiter
+        client = OpenAI(api_key=OPENAI_API_KEY)
+        # EMBEDDING_PROVIDER picks the embedding backend (OpenAI batches or a local CPU
+        # model); its "<provider>:<model>" tag keys the embedding cache and the manifest
+        self.embedding_tag = embedding_tag()
+        # Chunks embedded before (same provider and model, same text) come from the cache
+        self.embeddings = CachedEmbeddings(
+            create_embeddings(client=client),
+            self.embedding_tag,
+            get_embedding_cache() if EMBEDDING_CACHE_ENABLED else None,
+        )
 
         self.llm = ChatOpenAI(
-            model=CHAT_MODEL, temperature=TEMPERATURE, openai_api_key=OPENAI_API_KEY
+            model=CHAT_MODEL,
+            temperature=TEMPERATURE,
+            openai_api_key=OPENAI_API_KEY,
+            client=RateLimitedResource(client.chat.completions, "chat"),
         )
 
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -58,7 +114,7 @@ class RAGEngine:
         if not TRANSCRIPTS_DIR.exists():
             return transcripts
 
-        for json_file in TRANSCRIPTS_DIR.glob("*.json"):
+        for json_file in transcript_files(TRANSCRIPTS_DIR):
             try:
                 with open(json_file, "r", encoding="utf-8") as f:
                     data = json.load(f)
@@ -68,63 +124,211 @@ class RAGEngine:
 
         return transcripts
 
-    def index_transcripts(self, progress_callback: Optional[callable] = None):
-        """Create vector embeddings and index all transcripts"""
-        # IMPORTANTE: Limpiar Vector DB existente primero
-        import shutil
-
-        if VECTOR_DB_DIR.exists():
-            if progress_callback:
-                progress_callback("🗑️ Limpiando Vector DB anterior...")
-            shutil.rmtree(VECTOR_DB_DIR)
-            VECTOR_DB_DIR.mkdir(parents=True, exist_ok=True)
-
-        transcripts = self.load_transcripts()
-
-        if not transcripts:
-            raise ValueError("No transcripts found to index")
+    def _split_transcript(self, transcript: Dict[str, Any]):
+        """Chunk texts, metadatas and IDs of one transcript"""
+        chunks = self.text_splitter.split_text(transcript["transcript"])
+        metadatas = [
+            {
+                "video_id": transcript["video_id"],
+                "title": transcript["title"],
+                "url": transcript["url"],
+                "chunk_index": i,
+                "total_chunks": len(chunks),
+                "embedding": self.embedding_tag,
+            }
+            for i in range(len(chunks))
+        ]
+        return chunks, metadatas, chunk_ids(transcript["video_id"], 0, len(chunks))
+
+    def index_transcripts(
+        self,
+        progress_callback: Optional[callable] = None,
+        rebuild: bool = False,
+        batch_callback: Optional[callable] = None,
+    ) -> Dict[str, int]:
+        """
+        Bring the vector store up to date with the transcripts on disk
 
-        documents = []
-        metadatas = []
+        Only new or changed transcripts are embedded; their chunks are upserted
+        under deterministic IDs and chunks of deleted transcripts are dropped.
+        The store is rebuilt from scratch when asked to, when it has no manifest
+        (unknown contents) or when it was built with another embedding provider
+        or model.
 
-        for transcript in transcripts:
-            # Split transcript into chunks
-            chunks = self.text_splitter.split_text(transcript["transcript"])
+        Args:
+            progress_callback: Optional callback for progress messages
+            rebuild: Drop the existing vector store and embed everything again
+            batch_callback: Optional callback for per-batch embedding progress
+                (defaults to progress_callback)
 
-            for i, chunk in enumerate(chunks):
-                documents.append(chunk)
-                metadatas.append(
-                    {
-                        "video_id": transcript["video_id"],
-                        "title": transcript["title"],
-                        "url": transcript["url"],
-                        "chunk_index": i,
-                        "total_chunks": len(chunks),
-                    }
+        Returns:
+            Chunk counts {"added", "replaced", "skipped", "removed"}, the
+            number of indexed "videos" and the embedding cache "cache_hits" and
+            "cache_misses" of this run
+        """
+        with _index_lock:
+            transcripts = self.load_transcripts()
+
+            if not transcripts:
+                raise ValueError("No transcripts found to index")
+
+            manifest = get_index_manifest()
+            manifest.reload()
+            rebuild = rebuild or not manifest.is_compatible(self.embedding_tag)
+
+            if rebuild and VECTOR_DB_DIR.exists():
+                # IMPORTANTE: Limpiar Vector DB existente primero
+                if progress_callback:
+                    progress_callback("🗑️ Limpiando Vector DB anterior...")
+                shutil.rmtree(VECTOR_DB_DIR)
+                VECTOR_DB_DIR.mkdir(parents=True, exist_ok=True)
+
+            report = {"added": 0, "replaced": 0, "skipped": 0, "removed": 0}
+            documents, metadatas, ids, stale_ids = [], [], [], []
+            indexed = {}
+            seen = set()
+
+            for transcript in transcripts:
+                video_id = transcript["video_id"]
+                if video_id in seen:
+                    continue
+                seen.add(video_id)
+
+                digest = content_hash(transcript)
+                previous = None if rebuild else manifest.get(video_id)
+                if previous and previous["hash"] == digest:
+                    report["skipped"] += previous["chunks"]
+                    continue
+
+                chunks, chunk_metadatas, new_ids = self._split_transcript(transcript)
+                documents.extend(chunks)
+                metadatas.extend(chunk_metadatas)
+                ids.extend(new_ids)
+                indexed[video_id] = {
+                    "hash": digest,
+                    "chunks": len(chunks),
+                    "title": transcript["title"],
+                }
+
+                if previous:
+                    report["replaced"] += len(chunks)
+                    # Upserts overwrite the first chunks; drop the tail of a longer old version
+                    stale_ids.extend(chunk_ids(video_id, len(chunks), previous["chunks"]))
+                    message = f"Re-indexed: {transcript['title']}"
+                else:
+                    report["added"] += len(chunks)
+                    message = f"Indexed: {transcript['title']}"
+                if progress_callback:
+                    progress_callback(message)
+
+            removed = [] if rebuild else [v for v in manifest.video_ids() if v not in seen]
+            for video_id in removed:
+                stale_ids.extend(chunk_ids(video_id, 0, manifest.get(video_id)["chunks"]))
+            report["removed"] = len(stale_ids)
+
+            hits, misses = self.embeddings.hits, self.embeddings.misses
+            self.embeddings.embeddings.progress_callback = batch_callback or progress_callback
+            try:
+                if rebuild:
+                    self.vector_store = Chroma.from_texts(
+                        texts=documents,
+                        embedding=self.embeddings,
+                        metadatas=metadatas,
+                        ids=ids,
+                        persist_directory=str(VECTOR_DB_DIR),
+                    )
+                else:
+                    self.vector_store = Chroma(
+                        persist_directory=str(VECTOR_DB_DIR), embedding_function=self.embeddings
+                    )
+                    if stale_ids:
+                        self.vector_store.delete(ids=stale_ids)
+                    if documents:
+                        self.vector_store.add_texts(texts=documents, metadatas=metadatas, ids=ids)
+            finally:
+                self.embeddings.embeddings.progress_callback = None
+
+            manifest.commit(indexed, removed, self.embedding_tag, reset=rebuild)
+            self.conversation_chain = None
+
+            report["videos"] = len(seen)
+            report["cache_hits"] = self.embeddings.hits - hits
+            report["cache_misses"] = self.embeddings.misses - misses
+            logger.info(f"🧠 Indexed with {self.embedding_tag}")
+            if progress_callback:
+                source = "locally" if self.embeddings.embeddings.name == "local" else "via API"
+                progress_callback(
+                    f"🧠 Embedding cache: {report['cache_hits']} hits, "
+                    f"{report['cache_misses']} misses (embedded {source})"
+                )
+                progress_callback(
+                    f"✅ Indexed {report['videos']} videos: {report['added']} chunks added, "
+                    f"{report['replaced']} replaced, {report['skipped']} unchanged, "
+                    f"{report['removed']} removed"
                 )
+            return report
 
-            if progress_callback:
-                progress_callback(f"Indexed: {transcript['title']}")
-
-        # Create vector store
-        self.vector_store = Chroma.from_texts(
-            texts=documents,
-            embedding=self.embeddings,
-            metadatas=metadatas,
-            persist_directory=str(VECTOR_DB_DIR),
-        )
+    def delete_videos(self, video_ids: List[str]) -> int:
+        """
+        Remove every chunk of the given videos from the vector store
 
-        if progress_callback:
-            progress_callback(f"✅ Indexed {len(transcripts)} videos, {len(documents)} chunks")
+        The chunks are looked up by their video_id metadata and deleted in one
+        call, under the same lock as indexing. Chroma applies the delete
+        atomically, so searches running meanwhile see either all of a video's
+        chunks or none of them.
 
-    def load_vector_store(self):
-        """Load existing vector store"""
+        Args:
+            video_ids: YouTube video IDs whose transcripts were deleted
+
+        Returns:
+            Number of vectors removed
+        """
+        video_ids = list(video_ids)
+        if not video_ids:
+            return 0
+
+        with _index_lock:
+            manifest = get_index_manifest()
+            manifest.reload()
+            compatible = manifest.is_compatible(self.embedding_tag)
+            if compatible and not any(manifest.get(v) for v in video_ids):
+                return 0
+
+            # Deleting embeds nothing, so a store built with another provider can be cleaned too
+            store = self.vector_store or self._open_store()
+            where = {"video_id": {"$in": video_ids}}
+            ids = store.get(where=where, include=[])["ids"]
+            if ids:
+                store.delete(ids=ids)
+            manifest.remove(video_ids)
+
+        logger.info(f"🗑️ Removed {len(ids)} vectors of {len(video_ids)} videos from the index")
+        return len(ids)
+
+    def _open_store(self):
+        """Open the persisted vector store"""
         if not VECTOR_DB_DIR.exists() or not any(VECTOR_DB_DIR.iterdir()):
             raise ValueError("Vector store not found. Please index transcripts first.")
+        return Chroma(persist_directory=str(VECTOR_DB_DIR), embedding_function=self.embeddings)
 
-        self.vector_store = Chroma(
-            persist_directory=str(VECTOR_DB_DIR), embedding_function=self.embeddings
-        )
+    def load_vector_store(self):
+        """
+        Load existing vector store
+
+        Raises:
+            ValueError: If there is no store, or it holds vectors of another
+                embedding provider or model (queries would be compared
+                against vectors from a different space)
+        """
+        manifest = get_index_manifest()
+        manifest.reload()
+        if manifest.embedding and manifest.embedding != self.embedding_tag:
+            raise ValueError(
+                f"Vector store was built with {manifest.embedding}, not {self.embedding_tag}. "
+                "Please rebuild the index."
+            )
+
+        self.vector_store = self._open_store()
 
     def setup_conversation_chain(self):
         """Setup conversational retrieval chain"""
@@ -241,6 +445,13 @@ def get_rag_engine() -> RAGEngine:
     return _rag_engine_instance
 
 
+def delete_video_vectors(video_ids: List[str]) -> int:
+    """Remove deleted videos from the vector store, if one exists (returns vectors removed)"""
+    if not VECTOR_DB_DIR.exists() or not any(VECTOR_DB_DIR.iterdir()):
+        return 0
+    return get_rag_engine().delete_videos(video_ids)
+
+
 def reset_rag_engine() -> None:
     """Reset the cached RAGEngine (e.g. after re-indexing)."""
     global _rag_engine_instance
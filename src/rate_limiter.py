@@ -0,0 +1,364 @@
+"""
+Process-wide rate limiter for OpenAI calls
+
+Whisper, embedding and chat requests share one limiter per process, so that
+concurrent batches and Gradio sessions draw from the same budget instead of
+all running into 429s together. Each API has a request bucket and a token
+bucket paced as token buckets; both are re-synchronised from the
+x-ratelimit-* response headers, and Retry-After pauses every caller of that
+API until it expires.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from config import CHAT_RPM, EMBEDDING_RPM, RATE_LIMIT_ENABLED, WHISPER_RPM
+from src.logger import setup_logger
+
+logger = setup_logger("rate_limiter")
+
+WINDOW = 60.0  # OpenAI limits are expressed per minute
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an x-ratelimit-reset-* duration ("1s", "6m0s", "20ms", "1h2m3.5s")
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        matched = True
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    if not matched:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return total
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    """Case-insensitive header lookup that tolerates headers=None"""
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.title())
+    return value
+
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Retry-After in seconds (retry-after-ms preferred), or None"""
+    milliseconds = _header(headers, "retry-after-ms")
+    if milliseconds:
+        try:
+            return float(milliseconds) / 1000
+        except ValueError:
+            pass
+    seconds = _header(headers, "retry-after")
+    if seconds:
+        try:
+            return float(seconds)
+        except ValueError:
+            return None
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at capacity per WINDOW"""
+
+    def __init__(self, capacity: Optional[float]):
+        """
+        Args:
+            capacity: Bucket size per minute (None = unlimited)
+        """
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.capacity is None:
+            return
+        rate = self.capacity / WINDOW
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount tokens are available"""
+        if self.capacity is None:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * WINDOW / self.capacity
+
+    def take(self, amount: float):
+        """Remove tokens (the caller already waited for them)"""
+        if self.capacity is not None:
+            self.tokens -= min(amount, self.capacity)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], now: float):
+        """Adopt the server's view of the limit and remaining budget"""
+        if limit:
+            if self.capacity is None:
+                self.tokens = limit
+            self.capacity = limit
+        if remaining is not None and self.capacity is not None:
+            self._refill(now)
+            self.tokens = min(self.tokens, remaining)
+
+    def headroom(self) -> Optional[float]:
+        """Fraction of the bucket currently available (None if unlimited)"""
+        if self.capacity is None:
+            return None
+        self._refill(time.monotonic())
+        return max(0.0, self.tokens) / self.capacity
+
+
+class _ApiState:
+    """Buckets and counters for one API"""
+
+    def __init__(self, requests_per_minute: Optional[float]):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(None)  # learned from x-ratelimit-limit-tokens
+        self.blocked_until = 0.0
+        self.throttle_seconds = 0.0
+        self.calls = 0
+        self.rate_limited = 0
+
+
+class RateLimiter:
+    """Thread-safe limiter shared by every OpenAI caller in the process"""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[Dict[str, float]] = None,
+        enabled: bool = RATE_LIMIT_ENABLED,
+    ):
+        """
+        Args:
+            requests_per_minute: Starting request budget per API (refined from headers)
+            enabled: When False, requests are not budgeted; pauses the server asked
+                for (Retry-After, exhausted window) are still waited out, so
+                retries after a 429 do not fire back-to-back
+        """
+        limits = {"whisper": WHISPER_RPM, "embeddings": EMBEDDING_RPM, "chat": CHAT_RPM}
+        if requests_per_minute:
+            limits.update(requests_per_minute)
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.apis: Dict[str, _ApiState] = {api: _ApiState(rpm) for api, rpm in limits.items()}
+
+    def _state(self, api: str) -> _ApiState:
+        if api not in self.apis:
+            self.apis[api] = _ApiState(None)
+        return self.apis[api]
+
+    def _try_acquire(self, api: str, tokens: float, waited: float) -> float:
+        """Take a slot if the budget allows; otherwise return the seconds to wait"""
+        with self.lock:
+            state = self._state(api)
+            now = time.monotonic()
+            delay = state.blocked_until - now
+            if self.enabled:
+                delay = max(
+                    delay,
+                    state.requests.wait_time(1, now),
+                    state.tokens.wait_time(tokens, now),
+                )
+            if delay <= 0:
+                state.requests.take(1)
+                state.tokens.take(tokens)
+                state.calls += 1
+                state.throttle_seconds += waited
+            return delay
+
+    def acquire(self, api: str, tokens: float = 0):
+        """
+        Wait until a request (and its estimated tokens) fits the budget
+
+        Args:
+            api: "whisper", "embeddings" or "chat"
+            tokens: Estimated tokens the request will consume
+        """
+        waited = 0.0
+        while True:
+            delay = self._try_acquire(api, tokens, waited)
+            if delay <= 0:
+                return
+            if waited == 0:
+                logger.info(f"🚦 Throttling {api} request for {delay:.1f}s")
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, api: str, tokens: float = 0):
+        """Same as acquire, but waits with asyncio.sleep instead of blocking the loop"""
+        waited = 0.0
+        while True:
+            delay = self._try_acquire(api, tokens, waited)
+            if delay <= 0:
+                return
+            if waited == 0:
+                logger.info(f"🚦 Throttling {api} request for {delay:.1f}s")
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def update(self, api: str, headers: Optional[Mapping[str, str]]):
+        """
+        Re-synchronise the buckets from x-ratelimit-* response headers
+
+        Args:
+            api: API the response belongs to
+            headers: Response headers (None is ignored)
+        """
+        if not headers:
+            return
+
+        def number(name: str) -> Optional[float]:
+            value = _header(headers, name)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        with self.lock:
+            state = self._state(api)
+            now = time.monotonic()
+            state.requests.sync(
+                number("x-ratelimit-limit-requests"),
+                number("x-ratelimit-remaining-requests"),
+                now,
+            )
+            state.tokens.sync(
+                number("x-ratelimit-limit-tokens"),
+                number("x-ratelimit-remaining-tokens"),
+                now,
+            )
+
+            # Nothing left: hold every caller until the server says the window resets
+            if number("x-ratelimit-remaining-requests") == 0:
+                reset = parse_reset(_header(headers, "x-ratelimit-reset-requests"))
+                if reset:
+                    state.blocked_until = max(state.blocked_until, now + reset)
+
+    def on_rate_limit(
+        self, api: str, headers: Optional[Mapping[str, str]] = None, fallback: float = 1.0
+    ) -> float:
+        """
+        Record a 429 and pause the API for Retry-After (or fallback) seconds
+
+        Args:
+            api: API that answered 429
+            headers: Headers of the 429 response, if available
+            fallback: Pause used when the response carries no Retry-After
+
+        Returns:
+            Seconds every caller of this API will now wait
+        """
+        self.update(api, headers)
+        delay = retry_after_seconds(headers)
+        if delay is None:
+            delay = parse_reset(_header(headers, "x-ratelimit-reset-requests")) or fallback
+
+        with self.lock:
+            state = self._state(api)
+            state.rate_limited += 1
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        logger.warning(f"🚦 {api} rate limited, pausing all {api} requests for {delay:.1f}s")
+        return delay
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-API headroom (fraction of budget available), throttle time and counters"""
+        with self.lock:
+            now = time.monotonic()
+            return {
+                api: {
+                    "request_headroom": state.requests.headroom(),
+                    "token_headroom": state.tokens.headroom(),
+                    "throttle_seconds": round(state.throttle_seconds, 2),
+                    "blocked_for": round(max(0.0, state.blocked_until - now), 2),
+                    "calls": state.calls,
+                    "rate_limited": state.rate_limited,
+                }
+                for api, state in self.apis.items()
+            }
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HTTP 429 errors from the OpenAI SDK (or messages that mention one)"""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error)
+    return "429" in message or "rate limit" in message.lower()
+
+
+def error_headers(error: Exception) -> Optional[Mapping[str, str]]:
+    """Response headers attached to an OpenAI SDK error, if any"""
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None)
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Rough token estimate (4 characters per token) for embedding/chat inputs"""
+    if isinstance(payload, str):
+        return len(payload) // 4 + 1
+    if isinstance(payload, dict):
+        return sum(estimate_tokens(value) for value in payload.values())
+    if isinstance(payload, (list, tuple)):
+        return sum(estimate_tokens(item) for item in payload)
+    return 0
+
+
+class RateLimitedResource:
+    """
+    Wraps an OpenAI SDK resource (embeddings, chat.completions) so that every
+    create() call goes through the shared limiter and feeds it the response
+    headers. Used as the client of the LangChain OpenAI wrappers.
+    """
+
+    def __init__(self, resource: Any, api: str, limiter: Optional[RateLimiter] = None):
+        self.resource = resource
+        self.api = api
+        self.limiter = limiter or get_rate_limiter()
+
+    def create(self, **kwargs) -> Any:
+        tokens = estimate_tokens(kwargs.get("input") or kwargs.get("messages"))
+        tokens += kwargs.get("max_tokens") or 0
+        self.limiter.acquire(self.api, tokens)
+        try:
+            raw = self.resource.with_raw_response.create(**kwargs)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.limiter.on_rate_limit(self.api, error_headers(e))
+            raise
+        self.limiter.update(self.api, raw.headers)
+        return raw.parse()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resource, name)
+
+
+# Global instance
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
@@ -0,0 +1,136 @@
+"""
+Segment timing for YouTube Transcriber Pro
+
+Backends return Whisper segments as {"start", "end", "text"} dicts. Saved
+transcripts keep them in columnar form next to the transcript text:
+
+    "segments": {"start": [0.0, 4.2, ...], "end": [4.2, 9.8, ...], "offset": [0, 57, ...]}
+
+where offset[i] is the position of segment i in the "transcript" string, so
+the text is stored only once and segment i is
+transcript[offset[i]:offset[i + 1]].
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.audio import TimeMap
+
+
+def _field(segment: Any, name: str) -> Any:
+    """Read a segment field from an SDK object or a dict"""
+    if isinstance(segment, dict):
+        return segment.get(name)
+    return getattr(segment, name, None)
+
+
+def parse_segments(segments: Optional[Iterable[Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize backend segments (SDK objects or dicts) to plain dicts
+
+    Args:
+        segments: Segments from a Whisper response or faster-whisper
+
+    Returns:
+        [{"start", "end", "text"}] with times in seconds rounded to 10 ms
+    """
+    return [
+        {
+            "start": round(float(_field(segment, "start")), 2),
+            "end": round(float(_field(segment, "end")), 2),
+            "text": (_field(segment, "text") or "").strip(),
+        }
+        for segment in segments or []
+    ]
+
+
+def shift_segments(segments: List[Dict[str, Any]], offset: float) -> List[Dict[str, Any]]:
+    """Move segments of a chunk to the timeline of the whole file"""
+    if not offset:
+        return segments
+    return [
+        {
+            **segment,
+            "start": round(segment["start"] + offset, 2),
+            "end": round(segment["end"] + offset, 2),
+        }
+        for segment in segments
+    ]
+
+
+def map_segments(
+    segments: List[Dict[str, Any]], time_map: Optional[TimeMap]
+) -> List[Dict[str, Any]]:
+    """
+    Convert segment times from compressed audio back to the original video
+
+    Args:
+        segments: Segments timed against the prepared audio
+        time_map: Compression plan from the speech preparation report (None = no change)
+
+    Returns:
+        Segments timed against the original audio
+    """
+    if time_map is None:
+        return segments
+    return [
+        {
+            **segment,
+            "start": round(time_map.to_original(segment["start"]), 2),
+            "end": round(time_map.to_original(segment["end"]), 2),
+        }
+        for segment in segments
+    ]
+
+
+def segment_columns(transcript: str, segments: List[Dict[str, Any]]) -> Dict[str, List]:
+    """
+    Columnar form of segments for the saved transcript
+
+    Args:
+        transcript: Full transcript text the segments belong to
+        segments: Segments in playback order
+
+    Returns:
+        {"start": [...], "end": [...], "offset": [...]} (offsets into transcript)
+    """
+    columns = {"start": [], "end": [], "offset": []}
+    cursor = 0
+    for segment in segments:
+        position = transcript.find(segment["text"], cursor) if segment["text"] else -1
+        if position < 0:
+            position = cursor
+        else:
+            cursor = position + len(segment["text"])
+        columns["start"].append(segment["start"])
+        columns["end"].append(segment["end"])
+        columns["offset"].append(position)
+    return columns
+
+
+def load_segments(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rebuild segments from a saved transcript
+
+    Args:
+        data: Transcript JSON data
+
+    Returns:
+        [{"start", "end", "text"}] (empty for transcripts saved without timing)
+    """
+    columns = data.get("segments")
+    if not columns:
+        return []
+    transcript = data.get("transcript", "")
+    offsets = columns["offset"]
+    ends = offsets[1:] + [len(transcript)]
+    return [
+        {"start": start, "end": end, "text": transcript[first:last].strip()}
+        for start, end, first, last in zip(columns["start"], columns["end"], offsets, ends)
+    ]
+
+
+def detected_language(chunk_reports: List[Dict[str, Any]]) -> Optional[str]:
+    """Language reported for most chunks (None if no backend reported one)"""
+    languages = Counter(report["language"] for report in chunk_reports if report.get("language"))
+    return languages.most_common(1)[0][0] if languages else None
@@ -2,36 +2,66 @@
 Core transcription engine for YouTube Transcriber Pro
 """
 
-import os
 import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
 
 import yt_dlp
 from openai import OpenAI
 
+from src.audio import (
+    AudioChunk,
+    is_whisper_supported,
+    prep_summary,
+    prepare_for_speech,
+    probe_duration,
+    segment_audio,
+    transcode_audio,
+)
+from src.download_stats import get_download_stats
 from src.logger import setup_logger
 
 # Setup logger
 logger = setup_logger("transcriber")
 
 from config import (
+    AUDIO_CACHE_ENABLED,
+    AUDIO_COMPRESS,
     AUDIO_FORMAT,
+    AUDIO_PASSTHROUGH,
+    AUDIO_PREPARE,
     AUDIO_QUALITY,
+    CHUNK_CONCURRENCY,
+    FINGERPRINT_ENABLED,
     MAX_RETRIES,
     OPENAI_API_KEY,
+    PIPELINE_ENABLED,
+    PREFLIGHT_ENABLED,
     RETRY_DELAY,
     TEMP_AUDIO_DIR,
+    TRANSCRIPT_CACHE_ENABLED,
     TRANSCRIPTS_DIR,
-    WHISPER_MODEL,
+    WHISPER_SUPPORTED_FORMATS,
 )
+from src.audio_cache import AudioCache, get_audio_cache
+from src.backends import TranscriptionBackend, create_backend
+from src.catalog import get_catalog
+from src.concurrency import AdaptiveConcurrency
+from src.fingerprint import FingerprintIndex, compute_fingerprint, get_fingerprint_index
+from src.pipeline import BatchPipeline
+from src.playlist import expand_urls
+from src.preflight import run_preflight
+from src.rate_limiter import error_headers, get_rate_limiter, is_rate_limit_error
+from src.segments import detected_language, map_segments, segment_columns, shift_segments
+from src.transcript_cache import TranscriptCache, get_transcript_cache, hash_audio
 from src.utils import (
     cleanup_temp_files,
     count_words,
     extract_video_id,
     format_timestamp,
-    sanitize_filename,
     save_transcript,
 )
 
@@ -42,10 +72,29 @@ class YouTubeTranscriber:
     # Cache para la ubicación de FFmpeg
     _ffmpeg_location_cache = None
 
+    # Estrategias de descarga (orden por defecto; se reordenan según éxito observado)
+    # Orden inicial: primero sin cookies (para servidores), luego con cookies (para local)
+    DOWNLOAD_STRATEGIES = [
+        # Estrategia 1: Sin cookies, solo headers avanzados (mejor para servidores)
+        {"remove_cookies": True, "label": "Advanced headers (no cookies)"},
+        # Estrategia 2: Con socket de retardo (para evitar throttling)
+        {"remove_cookies": True, "socket_timeout": 30, "label": "Extended timeout"},
+        # Estrategia 3: Modo básico sin opciones avanzadas
+        {"remove_cookies": True, "basic_mode": True, "label": "Basic mode"},
+        # Estrategia 4: Con cookies de archivo local si existe
+        {"cookiesfile": True, "label": "Local cookies file"},
+        # Estrategia 5: Con cookies de Chrome (solo funciona si Chrome está instalado)
+        {"cookiesfrombrowser": ("chrome",), "label": "Chrome cookies"},
+        # Estrategia 6: Con cookies de Firefox (solo funciona si Firefox está instalado)
+        {"cookiesfrombrowser": ("firefox",), "label": "Firefox cookies"},
+    ]
+
     def __init__(self):
         self.client = OpenAI(api_key=OPENAI_API_KEY)
         self.temp_dir = TEMP_AUDIO_DIR
         self.output_dir = TRANSCRIPTS_DIR
+        self.download_stats = get_download_stats()
+        self.rate_limiter = get_rate_limiter()
 
         # Encontrar FFmpeg una sola vez al inicializar
         if YouTubeTranscriber._ffmpeg_location_cache is None:
@@ -111,7 +160,10 @@ class YouTubeTranscriber:
         return None
 
     def download_audio(
-        self, url: str, progress_callback: Optional[Callable] = None
+        self,
+        url: str,
+        progress_callback: Optional[Callable] = None,
+        passthrough: Optional[bool] = None,
     ) -> Optional[Path]:
         """
         Download audio from YouTube video
@@ -119,10 +171,15 @@ class YouTubeTranscriber:
         Args:
             url: YouTube video URL
             progress_callback: Optional callback for progress updates
+            passthrough: Keep the native audio container when Whisper accepts it
+                (default: AUDIO_PASSTHROUGH); False always re-encodes to AUDIO_FORMAT
 
         Returns:
             Path to downloaded audio file or None if failed
         """
+        if passthrough is None:
+            passthrough = AUDIO_PASSTHROUGH
+
         logger.info(f"📥 Starting download for URL: {url}")
 
         video_id = extract_video_id(url)
@@ -131,17 +188,21 @@ class YouTubeTranscriber:
             raise ValueError(f"Invalid YouTube URL: {url}")
 
         logger.info(f"🎬 Video ID extracted: {video_id}")
+
+        # Reuse audio kept from an earlier (failed or forced) run
+        audio_cache = self._audio_cache()
+        if audio_cache:
+            formats = WHISPER_SUPPORTED_FORMATS if passthrough else (AUDIO_FORMAT,)
+            cached = audio_cache.get(video_id, formats, self.temp_dir)
+            if cached:
+                if progress_callback:
+                    progress_callback(f"Using cached audio: {cached[1]}")
+                return cached
+
         output_path = self.temp_dir / f"{video_id}.{AUDIO_FORMAT}"
 
         ydl_opts = {
             "format": "bestaudio/best",
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": AUDIO_FORMAT,
-                    "preferredquality": AUDIO_QUALITY,
-                }
-            ],
             "outtmpl": str(self.temp_dir / f"{video_id}.%(ext)s"),
             "quiet": True,
             "no_warnings": True,
@@ -169,6 +230,15 @@ class YouTubeTranscriber:
             },
         }
 
+        if not passthrough:
+            ydl_opts["postprocessors"] = [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": AUDIO_FORMAT,
+                    "preferredquality": AUDIO_QUALITY,
+                }
+            ]
+
         if progress_callback:
 
             def progress_hook(d):
@@ -179,31 +249,38 @@ class YouTubeTranscriber:
 
             ydl_opts["progress_hooks"] = [progress_hook]
 
-        # Intentar múltiples estrategias de descarga
-        # Orden optimizado: primero sin cookies (para servidores), luego con cookies (para local)
-        strategies = [
-            # Estrategia 1: Sin cookies, solo headers avanzados (mejor para servidores)
-            {"remove_cookies": True, "label": "Advanced headers (no cookies)"},
-            # Estrategia 2: Con socket de retardo (para evitar throttling)
-            {"remove_cookies": True, "socket_timeout": 30, "label": "Extended timeout"},
-            # Estrategia 3: Modo básico sin opciones avanzadas
-            {"remove_cookies": True, "basic_mode": True, "label": "Basic mode"},
-            # Estrategia 4: Con cookies de archivo local si existe
-            {"cookiesfile": True, "label": "Local cookies file"},
-            # Estrategia 5: Con cookies de Chrome (solo funciona si Chrome está instalado)
-            {"cookiesfrombrowser": ("chrome",), "label": "Chrome cookies"},
-            # Estrategia 6: Con cookies de Firefox (solo funciona si Firefox está instalado)
-            {"cookiesfrombrowser": ("firefox",), "label": "Firefox cookies"},
-        ]
+        # Intentar múltiples estrategias de descarga, la que mejor funciona primero
+        stats = self.download_stats
+        strategies = stats.order(self.DOWNLOAD_STRATEGIES)
+        logger.info("📈 Strategy order: " + " → ".join(s["label"] for s in strategies))
 
         last_error = None
         first_real_error = None  # Guardar el primer error que no sea de cookies
+        real_failures = 0
 
         for i, strategy in enumerate(strategies, 1):
+            label = strategy["label"]
+
+            # Sin archivo de cookies la estrategia no se puede usar: saltar sin esperar.
+            # Se comprueba en cada ejecución (sin marcarla como no disponible) para que
+            # un archivo recién exportado se use de inmediato
+            cookies_file = Path.home() / ".youtube_cookies.txt"
+            if strategy.get("cookiesfile"):
+                if not cookies_file.exists():
+                    logger.info("ℹ️  No local cookies file found, skipping")
+                    continue
+            elif stats.is_unavailable(label):
+                logger.info(f"⏭️  Strategy {i} ({label}) skipped (known unavailable)")
+                continue
+
+            # Backoff exponencial solo después de fallos reales
+            if real_failures:
+                delay = min(RETRY_DELAY * (2 ** (real_failures - 1)), 30)  # Max 30 segundos
+                logger.info(f"⏳ Waiting {delay}s before next strategy...")
+                time.sleep(delay)
+
             try:
-                logger.info(
-                    f"🔧 Strategy {i}/{len(strategies)} ({strategy.get('label', 'Unknown')})"
-                )
+                logger.info(f"🔧 Strategy {i}/{len(strategies)} ({label})")
 
                 # Aplicar estrategia actual
                 current_opts = ydl_opts.copy()
@@ -225,18 +302,14 @@ class YouTubeTranscriber:
 
                 # Agregar cookies de archivo si existe
                 if strategy.get("cookiesfile"):
-                    cookies_file = Path.home() / ".youtube_cookies.txt"
-                    if cookies_file.exists():
-                        current_opts["cookiesfile"] = str(cookies_file)
-                        logger.info(f"📖 Using cookies file: {cookies_file}")
-                    else:
-                        logger.info("ℹ️  No local cookies file found, skipping")
-                        continue
+                    current_opts["cookiesfile"] = str(cookies_file)
+                    logger.info(f"📖 Using cookies file: {cookies_file}")
 
                 # Agregar cookies si la estrategia lo especifica
                 if "cookiesfrombrowser" in strategy:
                     current_opts["cookiesfrombrowser"] = strategy["cookiesfrombrowser"]
 
+                start_time = time.time()
                 with yt_dlp.YoutubeDL(current_opts) as ydl:
                     logger.info("⬇️  Downloading video metadata...")
                     info = ydl.extract_info(url, download=True)
@@ -246,175 +319,329 @@ class YouTubeTranscriber:
                     logger.info(f"✅ Download complete: {title}")
                     logger.info(f"⏱️  Duration: {duration // 60}m {duration % 60}s")
 
+                    if passthrough:
+                        output_path = self._resolve_native_audio(video_id, info)
+
                     file_size_mb = output_path.stat().st_size / (1024 * 1024)
                     logger.info(f"📦 Audio file size: {file_size_mb:.2f}MB")
 
-                    if progress_callback:
-                        progress_callback(f"Downloaded: {title}")
+                stats.record_success(label, time.time() - start_time)
+
+                if audio_cache:
+                    audio_cache.put(video_id, output_path, title)
+
+                if progress_callback:
+                    progress_callback(f"Downloaded: {title}")
 
-                    return output_path, title
+                return output_path, title
 
             except Exception as e:
                 last_error = str(e)
 
-                # Si el error es de cookies no encontradas, skip silenciosamente
+                # Si el error es de cookies no encontradas, skip sin esperar
                 is_cookie_error = (
                     "could not find" in last_error.lower() and "cookies" in last_error.lower()
                 )
 
                 if is_cookie_error:
                     logger.info(f"⏭️  Strategy {i} skipped (browser not available)")
+                    stats.mark_unavailable(label)
                 else:
                     # Guardar el primer error real (no de cookies)
                     if not first_real_error:
                         first_real_error = last_error
+                    real_failures += 1
+                    stats.record_failure(label)
                     logger.warning(f"⚠️  Strategy {i}/{len(strategies)} failed: {last_error[:200]}")
 
-                if i < len(strategies):
-                    # Backoff exponencial: esperar más entre intentos
-                    delay = min(RETRY_DELAY * (2 ** (i - 1)), 30)  # Max 30 segundos
-                    logger.info(f"⏳ Waiting {delay}s before next strategy...")
-                    time.sleep(delay)
-                    logger.info(f"🔄 Trying strategy {i + 1}...")
-                    continue  # Intentar siguiente estrategia
-                else:
-                    # Todas las estrategias fallaron
-                    logger.error(f"❌ All {len(strategies)} strategies failed after retries")
-
-                    # Usar el primer error real, no el de cookies
-                    error_to_show = first_real_error or last_error
-
-                    # Mensaje más útil si es detección de bot
-                    if "bot" in error_to_show.lower() or "sign in" in error_to_show.lower():
-                        error_msg = (
-                            f"YouTube is blocking this video (bot detection). "
-                            f"This video may require authentication or may be age-restricted.\n\n"
-                            f"💡 Solutions:\n"
-                            f"1. Try a different video\n"
-                            f"2. Wait a few minutes and retry\n"
-                            f"3. Set YouTube cookies file at ~/.youtube_cookies.txt\n"
-                            f"\nTechnical: {error_to_show}"
-                        )
-                        raise Exception(error_msg)
-                    else:
-                        raise Exception(
-                            f"Failed to download audio after {len(strategies)} attempts. Error: {error_to_show}"
-                        )
+        # Todas las estrategias fallaron
+        logger.error(f"❌ All {len(strategies)} strategies failed after retries")
+
+        # Usar el primer error real, no el de cookies
+        error_to_show = first_real_error or last_error or "no download strategy available"
+
+        # Mensaje más útil si es detección de bot
+        if "bot" in error_to_show.lower() or "sign in" in error_to_show.lower():
+            error_msg = (
+                f"YouTube is blocking this video (bot detection). "
+                f"This video may require authentication or may be age-restricted.\n\n"
+                f"💡 Solutions:\n"
+                f"1. Try a different video\n"
+                f"2. Wait a few minutes and retry\n"
+                f"3. Set YouTube cookies file at ~/.youtube_cookies.txt\n"
+                f"\nTechnical: {error_to_show}"
+            )
+            raise Exception(error_msg)
+        else:
+            raise Exception(
+                f"Failed to download audio after {len(strategies)} attempts. Error: {error_to_show}"
+            )
 
-    def _split_audio(self, audio_path: Path, max_size_mb: float = 24) -> list[Path]:
+    def _audio_cache(self) -> Optional[AudioCache]:
+        """Audio cache under the current temp dir (None if AUDIO_CACHE_ENABLED is off)"""
+        if not AUDIO_CACHE_ENABLED:
+            return None
+        return get_audio_cache(self.temp_dir)
+
+    def _backend(self, backend: Optional[str] = None) -> TranscriptionBackend:
+        """Speech-to-text backend for a job ("openai" or "local", default: TRANSCRIPTION_BACKEND)"""
+        return create_backend(backend, self.client, self.rate_limiter)
+
+    def _transcript_cache(self) -> Optional[TranscriptCache]:
+        """Transcription result cache (None if TRANSCRIPT_CACHE_ENABLED is off)"""
+        if not TRANSCRIPT_CACHE_ENABLED:
+            return None
+        return get_transcript_cache()
+
+    def _cached_transcript(
+        self, audio_path: Path, engine: TranscriptionBackend
+    ) -> tuple[Optional[str], Optional[str]]:
         """
-        Split audio file into chunks if it's too large
+        Look up the transcription of identical audio done earlier with the same backend
 
         Args:
-            audio_path: Path to audio file
-            max_size_mb: Maximum size per chunk in MB
+            audio_path: Audio file about to be transcribed
+            engine: Backend that would transcribe it
 
         Returns:
-            List of audio chunk paths
+            (cache key, cached text); the key is None when the cache is disabled
+            and the text is None on a miss
         """
-        import subprocess
+        cache = self._transcript_cache()
+        if cache is None:
+            return None, None
+        key = cache.key(hash_audio(audio_path), engine.fingerprint())
+        return key, cache.get(key)
 
-        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-        logger.info(f"📊 Audio file size: {file_size_mb:.2f}MB")
+    def _store_transcript(
+        self,
+        cache_key: Optional[str],
+        audio_path: Path,
+        engine: TranscriptionBackend,
+        transcript: str,
+        stats: Dict[str, Any],
+    ):
+        """Add a fresh transcription to the cache (no-op when the cache is disabled)"""
+        cache = self._transcript_cache()
+        if cache is None or cache_key is None:
+            return
+        audio_seconds = stats.get("audio_seconds")
+        if audio_seconds is None:
+            try:
+                audio_seconds = probe_duration(
+                    audio_path, YouTubeTranscriber._ffmpeg_location_cache
+                )
+            except Exception as e:
+                logger.debug(f"Could not probe {audio_path.name} for the transcript cache: {e}")
+        cache.put(
+            cache_key,
+            transcript,
+            engine.name,
+            audio_seconds,
+            stats.get("segments"),
+            stats.get("language"),
+        )
 
-        if file_size_mb <= max_size_mb:
-            logger.info("✅ File size OK, no splitting needed")
-            return [audio_path]
-
-        # Calculate number of chunks needed
-        num_chunks = int(file_size_mb / max_size_mb) + 1
-        logger.info(f"✂️  Splitting audio into {num_chunks} chunks...")
-
-        # Get audio duration using ffprobe
-        # Detectar si estamos en Windows o Linux
-        ffprobe_name = "ffprobe.exe" if os.name == "nt" else "ffprobe"
-
-        # Si ffmpeg_location es un directorio, agregar el nombre del ejecutable
-        if (
-            YouTubeTranscriber._ffmpeg_location_cache
-            and Path(YouTubeTranscriber._ffmpeg_location_cache).is_dir()
-        ):
-            ffprobe_path = Path(YouTubeTranscriber._ffmpeg_location_cache) / ffprobe_name
-        else:
-            # Si no es un directorio, usar solo el nombre (está en PATH)
-            ffprobe_path = ffprobe_name
-
-        result = subprocess.run(
-            [
-                str(ffprobe_path),
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(audio_path),
-            ],
-            capture_output=True,
-            text=True,
+    def _fingerprint_index(self) -> Optional[FingerprintIndex]:
+        """Re-upload fingerprint index (None if FINGERPRINT_ENABLED is off)"""
+        if not FINGERPRINT_ENABLED:
+            return None
+        return get_fingerprint_index()
+
+    def _match_reupload(
+        self,
+        video_id: str,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        link: bool = True,
+    ) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Fingerprint a download and link it to an existing transcript of the same audio
+
+        Args:
+            video_id: YouTube video ID of the download
+            audio_path: Downloaded audio file
+            progress_callback: Optional callback for progress updates
+            link: Look for a matching transcript (False only fingerprints, e.g. with --force)
+
+        Returns:
+            (fingerprint, linked result); the fingerprint is None when disabled or
+            the audio could not be fingerprinted, and the result is None unless the
+            download is a re-upload of a video whose transcript still exists
+        """
+        index = self._fingerprint_index()
+        if index is None:
+            return None, None
+
+        try:
+            ffmpeg_location = YouTubeTranscriber._ffmpeg_location_cache
+            fingerprint = compute_fingerprint(audio_path, ffmpeg_location)
+            if fingerprint is None:
+                return None, None
+            fingerprint["duration"] = probe_duration(audio_path, ffmpeg_location)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not fingerprint {audio_path.name}: {e}")
+            return None, None
+
+        if not link:
+            return fingerprint, None
+
+        match = index.lookup(fingerprint["probes"], fingerprint["duration"], exclude=video_id)
+        if not match:
+            return fingerprint, None
+        existing = self._check_if_already_transcribed(match["video_id"])
+        if not existing:
+            logger.info(f"🔗 Audio matches {match['video_id']} but its transcript is gone")
+            return fingerprint, None
+
+        index.add_alias(video_id, match["video_id"])
+        logger.info(
+            f"🔗 Re-upload of {match['video_id']} ({match['similarity']:.0%} similar), "
+            f"reusing {Path(existing['json_path']).name}"
         )
+        if audio_path.exists():
+            audio_path.unlink()
+        if progress_callback:
+            progress_callback(
+                f"⏭️  Skipped: {existing['title']} (re-upload of {match['video_id']})"
+            )
 
-        duration = float(result.stdout.strip())
-        chunk_duration = duration / num_chunks
+        return fingerprint, {
+            "success": True,
+            "skipped": True,
+            "video_id": video_id,
+            "duplicate_of": match["video_id"],
+            "similarity": round(match["similarity"], 3),
+            "title": existing["title"],
+            "json_path": existing["json_path"],
+            "txt_path": existing["txt_path"],
+            "word_count": existing["word_count"],
+            "message": f"Re-upload of {match['video_id']}, already transcribed",
+        }
 
-        # Split audio into chunks
-        chunks = []
+    def _resolve_native_audio(self, video_id: str, info: Dict[str, Any]) -> Path:
+        """
+        Locate the file yt-dlp wrote in passthrough mode, transcoding only if needed
+
+        Args:
+            video_id: YouTube video ID
+            info: Info dict returned by extract_info
 
-        # Detectar si estamos en Windows o Linux para ffmpeg
-        ffmpeg_name = "ffmpeg.exe" if os.name == "nt" else "ffmpeg"
+        Returns:
+            Path to a Whisper-compatible audio file
+        """
+        audio_path = None
+        for download in info.get("requested_downloads") or []:
+            if download.get("filepath") and Path(download["filepath"]).exists():
+                audio_path = Path(download["filepath"])
+                break
+
+        if audio_path is None:
+            candidates = [
+                f for f in self.temp_dir.glob(f"{video_id}.*") if f.suffix not in (".part", ".ytdl")
+            ]
+            if not candidates:
+                raise FileNotFoundError(f"Downloaded audio not found for {video_id}")
+            audio_path = candidates[0]
+
+        if is_whisper_supported(audio_path):
+            logger.info(f"🎧 Keeping native audio container: {audio_path.suffix}")
+            return audio_path
+
+        logger.info(f"🔄 Container {audio_path.suffix} not accepted by Whisper, transcoding")
+        return transcode_audio(audio_path, YouTubeTranscriber._ffmpeg_location_cache)
+
+    def _prepare_audio(
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        prepare: Optional[bool] = None,
+        compress: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the speech preparation stage (mono, 16 kHz, low-bitrate Opus)
 
-        # Si ffmpeg_location es un directorio, agregar el nombre del ejecutable
-        if (
-            YouTubeTranscriber._ffmpeg_location_cache
-            and Path(YouTubeTranscriber._ffmpeg_location_cache).is_dir()
-        ):
-            ffmpeg_path = Path(YouTubeTranscriber._ffmpeg_location_cache) / ffmpeg_name
-        else:
-            # Si no es un directorio, usar solo el nombre (está en PATH)
-            ffmpeg_path = ffmpeg_name
+        Args:
+            audio_path: Downloaded audio file
+            progress_callback: Optional callback for progress updates
+            prepare: Enable the stage (default: AUDIO_PREPARE)
+            compress: Also cut long silences and speed up speech (default:
+                AUDIO_COMPRESS; enables the stage)
 
-        for i in range(num_chunks):
-            start_time = i * chunk_duration
-            chunk_path = audio_path.parent / f"{audio_path.stem}_chunk{i}{audio_path.suffix}"
+        Returns:
+            Preparation report from prepare_for_speech ("path" is the audio to use,
+            "time_map" maps compressed offsets back to the original)
+        """
+        if prepare is None:
+            prepare = AUDIO_PREPARE
+        if compress is None:
+            compress = AUDIO_COMPRESS
 
-            logger.info(
-                f"✂️  Creating chunk {i+1}/{num_chunks} (start: {start_time:.1f}s, duration: {chunk_duration:.1f}s)"
-            )
+        if not (prepare or compress):
+            return {"path": audio_path, "prepared": False}
 
-            subprocess.run(
-                [
-                    str(ffmpeg_path),
-                    "-i",
-                    str(audio_path),
-                    "-ss",
-                    str(start_time),
-                    "-t",
-                    str(chunk_duration),
-                    "-c",
-                    "copy",
-                    str(chunk_path),
-                    "-y",
-                ],
-                capture_output=True,
+        if progress_callback:
+            progress_callback(
+                "Trimming silences and speeding up audio..."
+                if compress
+                else "Preparing speech audio..."
             )
 
-            chunk_size_mb = chunk_path.stat().st_size / (1024 * 1024)
-            logger.info(f"✅ Chunk {i+1} created: {chunk_size_mb:.2f}MB")
+        return prepare_for_speech(
+            audio_path, YouTubeTranscriber._ffmpeg_location_cache, compress=compress
+        )
 
-            chunks.append(chunk_path)
+    def _split_audio(self, audio_path: Path, max_size_mb: float = 24) -> list[AudioChunk]:
+        """
+        Split audio file into chunks if it's too large
+
+        Args:
+            audio_path: Path to audio file
+            max_size_mb: Maximum size per chunk in MB
+
+        Returns:
+            Chunk plan (paths with start/end offsets in the original audio)
+        """
+        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+        logger.info(f"📊 Audio file size: {file_size_mb:.2f}MB")
+
+        if file_size_mb <= max_size_mb:
+            logger.info("✅ File size OK, no splitting needed")
+            return [AudioChunk(audio_path)]
+
+        # One FFmpeg pass; every chunk stays under max_size_mb, cuts land in silences
+        start_time = time.time()
+        chunks = segment_audio(audio_path, max_size_mb, YouTubeTranscriber._ffmpeg_location_cache)
+
+        for chunk in chunks:
+            chunk_size_mb = chunk.path.stat().st_size / (1024 * 1024)
+            logger.info(
+                f"✅ Chunk {chunk.index + 1} created: {chunk_size_mb:.2f}MB "
+                f"({chunk.start:.1f}s - {chunk.end:.1f}s)"
+            )
 
-        logger.info(f"✅ All {num_chunks} chunks created successfully")
+        logger.info(
+            f"✅ All {len(chunks)} chunks created successfully in {time.time() - start_time:.1f}s"
+        )
         return chunks
 
     def transcribe_audio(
-        self, audio_path: Path, progress_callback: Optional[Callable] = None
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        chunk_reports: Optional[list[Dict[str, Any]]] = None,
+        backend: Optional[str] = None,
+        segments: Optional[list[Dict[str, Any]]] = None,
     ) -> str:
         """
-        Transcribe audio file using OpenAI Whisper
+        Transcribe audio file using OpenAI Whisper or the local backend
 
         Args:
             audio_path: Path to audio file
             progress_callback: Optional callback for progress updates
+            chunk_reports: Filled with per-chunk latency/retry reports
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
+            segments: Filled with the timed segments, in seconds into audio_path
 
         Returns:
             Transcription text
@@ -422,86 +649,225 @@ class YouTubeTranscriber:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
+        chunks = self._split_for_whisper(audio_path, progress_callback, backend)
+        return self._transcribe_chunks(chunks, progress_callback, chunk_reports, backend, segments)
+
+    def _split_for_whisper(
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        backend: Optional[str] = None,
+    ) -> list[AudioChunk]:
+        """
+        Split audio into Whisper-sized chunks (FFmpeg stage)
+
+        Args:
+            audio_path: Path to audio file
+            progress_callback: Optional callback for progress updates
+            backend: Backend the chunks are for (the local backend takes any size)
+
+        Returns:
+            Chunk plan to transcribe (a single chunk if no split is needed)
+        """
+        max_file_mb = self._backend(backend).max_file_mb
+        if max_file_mb is None:
+            return [AudioChunk(audio_path)]
+
         # Check file size (Whisper API limit is 25MB)
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
 
-        if file_size_mb > 25:
-            logger.warning(f"⚠️  File exceeds 25MB limit, splitting required")
-            if progress_callback:
-                progress_callback(f"Audio file is {file_size_mb:.2f}MB, splitting into chunks...")
+        if file_size_mb <= max_file_mb:
+            return [AudioChunk(audio_path)]
 
-            # Split audio into chunks
-            chunks = self._split_audio(audio_path)
+        logger.warning("⚠️  File exceeds 25MB limit, splitting required")
+        if progress_callback:
+            progress_callback(f"Audio file is {file_size_mb:.2f}MB, splitting into chunks...")
 
-            logger.info(f"📦 Processing {len(chunks)} chunks...")
-            if progress_callback:
-                progress_callback(f"Split into {len(chunks)} chunks, transcribing...")
+        # Split audio into chunks
+        chunks = self._split_audio(audio_path)
 
-            # Transcribe each chunk
-            transcripts = []
-            for i, chunk_path in enumerate(chunks, 1):
-                logger.info(f"🎯 Processing chunk {i}/{len(chunks)}")
-                if progress_callback:
-                    progress_callback(f"Transcribing chunk {i}/{len(chunks)}...")
+        logger.info(f"📦 Processing {len(chunks)} chunks...")
+        if progress_callback:
+            progress_callback(f"Split into {len(chunks)} chunks, transcribing...")
 
-                chunk_transcript = self._transcribe_single_file(chunk_path, progress_callback)
-                transcripts.append(chunk_transcript)
+        return chunks
 
-                # Clean up chunk
-                logger.info(f"🗑️  Cleaning up chunk {i}")
-                chunk_path.unlink()
+    def _transcribe_chunks(
+        self,
+        chunks: list[AudioChunk],
+        progress_callback: Optional[Callable] = None,
+        chunk_reports: Optional[list[Dict[str, Any]]] = None,
+        backend: Optional[str] = None,
+        segments: Optional[list[Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Transcribe a list of chunks produced by _split_for_whisper and join them
 
-                # Rate limiting: Wait between chunks to avoid 429 errors
-                if i < len(chunks):
-                    wait_time = 5  # seconds
-                    logger.info(f"⏳ Waiting {wait_time}s before next chunk (rate limiting)...")
-                    if progress_callback:
-                        progress_callback(f"Waiting {wait_time}s to avoid rate limits...")
-                    time.sleep(wait_time)
+        Chunks are sent to Whisper concurrently, up to CHUNK_CONCURRENCY at a
+        time; the limit halves whenever Whisper answers 429 and grows back
+        after successful calls.
 
-            # Combine transcripts
-            full_transcript = " ".join(transcripts)
-            total_words = len(full_transcript.split())
+        Args:
+            chunks: Chunk plan in playback order
+            progress_callback: Optional callback for progress updates
+            chunk_reports: Filled with one report per chunk (start/end, latency,
+                retries, rate limits, language), in playback order
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
+            segments: Filled with the timed segments of every chunk, shifted by
+                the chunk start so they are relative to the unsplit audio
 
-            logger.info(f"✅ All chunks combined: {total_words} total words")
-            if progress_callback:
-                progress_callback("All chunks transcribed and combined!")
+        Returns:
+            Transcription text
+        """
+        if len(chunks) == 1:
+            stats = {}
+            transcript = self._transcribe_single_file(
+                chunks[0].path, progress_callback, stats, backend=backend
+            )
+            chunk_segments = stats.pop("segments", [])
+            if segments is not None:
+                segments.extend(shift_segments(chunk_segments, chunks[0].start))
+            if chunk_reports is not None:
+                chunk_reports.append({**chunks[0].to_dict(), **stats})
+            return transcript
+
+        limiter = AdaptiveConcurrency(CHUNK_CONCURRENCY)
+        transcripts: list[Optional[str]] = [None] * len(chunks)
+        reports: list[Dict[str, Any]] = [chunk.to_dict() for chunk in chunks]
+        chunk_segments: list[list[Dict[str, Any]]] = [[] for _ in chunks]
+        done = [0]
+        done_lock = threading.Lock()
+
+        def transcribe(position: int, chunk: AudioChunk):
+            with limiter:
+                logger.info(
+                    f"🎯 Processing chunk {position + 1}/{len(chunks)} "
+                    f"(concurrency {limiter.limit})"
+                )
+                stats = {}
+                transcripts[position] = self._transcribe_single_file(
+                    chunk.path, None, stats, limiter, backend
+                )
+                chunk_segments[position] = shift_segments(stats.pop("segments", []), chunk.start)
+                reports[position].update(stats)
 
-            return full_transcript
-        else:
-            return self._transcribe_single_file(audio_path, progress_callback)
+            # Clean up chunk
+            logger.info(f"🗑️  Cleaning up chunk {position + 1}")
+            chunk.path.unlink()
+
+            with done_lock:
+                done[0] += 1
+                if progress_callback:
+                    progress_callback(f"Transcribed chunk {done[0]}/{len(chunks)}")
+
+        if progress_callback:
+            progress_callback(
+                f"Transcribing {len(chunks)} chunks (up to {limiter.max_limit} at a time)..."
+            )
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(limiter.max_limit, len(chunks)), thread_name_prefix="chunk"
+            ) as executor:
+                futures = [
+                    executor.submit(transcribe, position, chunk)
+                    for position, chunk in enumerate(chunks)
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+        finally:
+            for chunk in chunks:
+                if chunk.path.exists():
+                    chunk.path.unlink()
+
+        if chunk_reports is not None:
+            chunk_reports.extend(reports)
+        if segments is not None:
+            for timed in chunk_segments:
+                segments.extend(timed)
+
+        # Combine transcripts
+        full_transcript = " ".join(transcripts)
+        total_words = len(full_transcript.split())
+
+        logger.info(
+            f"✅ All chunks combined: {total_words} total words "
+            f"({limiter.rate_limits} rate limits, final concurrency {limiter.limit})"
+        )
+        if progress_callback:
+            progress_callback("All chunks transcribed and combined!")
+
+        return full_transcript
 
     def _transcribe_single_file(
-        self, audio_path: Path, progress_callback: Optional[Callable] = None
+        self,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        limiter: Optional[AdaptiveConcurrency] = None,
+        backend: Optional[str] = None,
     ) -> str:
         """
-        Transcribe a single audio file (must be under 25MB)
+        Transcribe a single audio file (must be under 25MB for the Whisper API)
 
         Args:
             audio_path: Path to audio file
             progress_callback: Optional callback for progress updates
+            stats: Filled with latency (seconds of the successful call), retries,
+                rate_limited (number of 429 answers), cached (answered from the
+                transcript cache), segments and language, plus backend metrics
+                (the local backend adds audio_seconds and rtf)
+            limiter: Concurrency limiter told about 429s and successes
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
 
         Returns:
             Transcription text
         """
+        if stats is None:
+            stats = {}
+        engine = self._backend(backend)
+        stats.update(
+            {
+                "latency": None,
+                "retries": 0,
+                "rate_limited": 0,
+                "backend": engine.name,
+                "cached": False,
+            }
+        )
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
         logger.info(f"🎤 Transcribing file: {audio_path.name} ({file_size_mb:.2f}MB)")
 
+        # Identical audio already transcribed with the same backend and model
+        cache_key, cached = self._cached_transcript(audio_path, engine)
+        if cached is not None:
+            stats.update({"latency": 0.0, "cached": True})
+            stats.update(self._transcript_cache().timing(cache_key))
+            if progress_callback:
+                progress_callback("Using cached transcription")
+            return cached
+
         if progress_callback:
-            progress_callback("Transcribing with Whisper API...")
+            progress_callback(f"Transcribing with {engine.label}...")
 
         for attempt in range(MAX_RETRIES):
             try:
-                logger.info(f"🔄 Attempt {attempt + 1}/{MAX_RETRIES} - Calling Whisper API...")
+                logger.info(f"🔄 Attempt {attempt + 1}/{MAX_RETRIES} - Calling {engine.label}...")
                 start_time = time.time()
 
-                with open(audio_path, "rb") as audio_file:
-                    transcript = self.client.audio.transcriptions.create(
-                        model=WHISPER_MODEL, file=audio_file, response_format="text"
-                    )
+                transcript = engine.transcribe(audio_path, stats)
 
                 elapsed_time = time.time() - start_time
                 word_count = len(transcript.split())
+                stats["latency"] = round(elapsed_time, 2)
+                if limiter:
+                    limiter.on_success()
+                self._store_transcript(cache_key, audio_path, engine, transcript, stats)
 
                 logger.info(f"✅ Transcription complete in {elapsed_time:.1f}s")
                 logger.info(f"📝 Words transcribed: {word_count}")
@@ -512,26 +878,32 @@ class YouTubeTranscriber:
                 return transcript
 
             except Exception as e:
-                error_str = str(e)
                 logger.exception(f"Attempt {attempt + 1} failed")
 
                 # Check if it's a rate limit error (429)
-                is_rate_limit = "429" in error_str or "rate limit" in error_str.lower()
+                is_rate_limit = is_rate_limit_error(e)
+                wait_time = RETRY_DELAY
+                if is_rate_limit:
+                    stats["rate_limited"] += 1
+                    if limiter:
+                        limiter.on_rate_limit()
+                    # Retry-After from the response, exponential backoff without one;
+                    # the shared limiter holds every Whisper caller until it expires
+                    wait_time = self.rate_limiter.on_rate_limit(
+                        "whisper", error_headers(e), fallback=RETRY_DELAY * (2**attempt) * 2
+                    )
 
                 if attempt < MAX_RETRIES - 1:
-                    # Use exponential backoff for rate limits
+                    stats["retries"] += 1
                     if is_rate_limit:
-                        wait_time = RETRY_DELAY * (2**attempt) * 2  # Double wait for rate limits
-                        logger.warning(f"🚦 Rate limit detected! Waiting {wait_time}s...")
+                        logger.warning(f"🚦 Rate limit detected! Waiting {wait_time:.1f}s...")
                         if progress_callback:
-                            progress_callback(f"Rate limit - waiting {wait_time}s...")
+                            progress_callback(f"Rate limit - waiting {wait_time:.0f}s...")
                     else:
-                        wait_time = RETRY_DELAY
                         logger.info(f"⏳ Waiting {wait_time}s before retry...")
                         if progress_callback:
                             progress_callback(f"Retry {attempt + 1}/{MAX_RETRIES}...")
-
-                    time.sleep(wait_time)
+                        time.sleep(wait_time)
                 else:
                     logger.error(f"❌ Transcription failed after {MAX_RETRIES} attempts")
                     raise Exception(f"Transcription failed after {MAX_RETRIES} attempts: {str(e)}")
@@ -546,31 +918,192 @@ class YouTubeTranscriber:
         Returns:
             Dictionary with existing transcript info or None if not found
         """
-        import json
+        entry = get_catalog(self.output_dir).get(video_id)
+        if entry is None:
+            return None
+
+        return {
+            "video_id": video_id,
+            "title": entry["title"] or "Unknown",
+            "json_path": entry["json_path"],
+            "txt_path": entry["txt_path"],
+            "word_count": entry["word_count"],
+            "timestamp": entry["timestamp"] or "Unknown",
+        }
 
-        # Search for existing transcripts with this video_id
-        for json_file in self.output_dir.glob("*.json"):
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                if data.get("video_id") == video_id:
-                    # Found existing transcript
-                    txt_file = json_file.with_suffix(".txt")
-
-                    return {
-                        "video_id": video_id,
-                        "title": data.get("title", "Unknown"),
-                        "json_path": str(json_file),
-                        "txt_path": str(txt_file) if txt_file.exists() else None,
-                        "word_count": data.get("word_count", 0),
-                        "timestamp": data.get("timestamp", "Unknown"),
-                    }
-            except Exception as e:
-                logger.debug(f"Error reading {json_file}: {e}")
-                continue
+    def _skip_result_if_exists(
+        self, video_id: str, progress_callback: Optional[Callable] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the "skipped" result for a video that is already transcribed
 
-        return None
+        Args:
+            video_id: YouTube video ID
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            Skipped result dictionary or None if the video is new
+        """
+        logger.info("🔍 Checking for existing transcript...")
+        existing = self._check_if_already_transcribed(video_id)
+        duplicate_of = None
+
+        if not existing:
+            # A re-upload linked earlier by its fingerprint shares the original's transcript
+            index = self._fingerprint_index()
+            duplicate_of = index.alias_of(video_id) if index else None
+            if duplicate_of:
+                existing = self._check_if_already_transcribed(duplicate_of)
+
+        if not existing:
+            logger.info("✅ No existing transcript found, proceeding...")
+            return None
+
+        logger.info("=" * 80)
+        logger.info("⏭️  VIDEO ALREADY TRANSCRIBED - SKIPPING")
+        logger.info(f"📄 Title: {existing['title']}")
+        logger.info(f"📅 Transcribed: {existing['timestamp']}")
+        logger.info(f"📁 JSON: {existing['json_path']}")
+        if existing["txt_path"]:
+            logger.info(f"📁 TXT: {existing['txt_path']}")
+        logger.info("=" * 80)
+
+        if progress_callback:
+            reason = f"re-upload of {duplicate_of}" if duplicate_of else "already transcribed"
+            progress_callback(f"⏭️  Skipped: {existing['title']} ({reason})")
+
+        result = {
+            "success": True,
+            "skipped": True,
+            "video_id": video_id,
+            "title": existing["title"],
+            "json_path": existing["json_path"],
+            "txt_path": existing["txt_path"],
+            "word_count": existing["word_count"],
+            "message": "Video already transcribed",
+        }
+        if duplicate_of:
+            result["duplicate_of"] = duplicate_of
+        return result
+
+    def _video_duration(
+        self,
+        audio_path: Path,
+        extra: Optional[Dict[str, Any]] = None,
+        fingerprint: Optional[Dict[str, Any]] = None,
+    ) -> Optional[float]:
+        """
+        Duration of the original video, for the catalog
+
+        Args:
+            audio_path: Audio that was transcribed (prepared, maybe compressed)
+            extra: Per-stage reports (a compressed "audio_prep" knows the original length)
+            fingerprint: _match_reupload() fingerprint (probed on the download)
+
+        Returns:
+            Seconds, or None if the audio could not be probed
+        """
+        prep = (extra or {}).get("audio_prep") or {}
+        if prep.get("original_seconds"):
+            return prep["original_seconds"]
+        if fingerprint and fingerprint.get("duration"):
+            return round(fingerprint["duration"], 2)
+        try:
+            return round(probe_duration(audio_path, YouTubeTranscriber._ffmpeg_location_cache), 2)
+        except Exception as e:
+            logger.debug(f"Could not probe {audio_path.name} for the catalog: {e}")
+            return None
+
+    def _save_video_result(
+        self,
+        url: str,
+        video_id: str,
+        index: int,
+        title: str,
+        transcript_text: str,
+        audio_path: Path,
+        progress_callback: Optional[Callable] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        fingerprint: Optional[Dict[str, Any]] = None,
+        segments: Optional[list[Dict[str, Any]]] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Save a finished transcript and remove its temporary audio
+
+        Args:
+            url: YouTube video URL
+            video_id: YouTube video ID
+            index: File index number
+            title: Video title
+            transcript_text: Transcription text
+            audio_path: Downloaded audio file to clean up
+            progress_callback: Optional callback for progress updates
+            extra: Optional per-stage reports merged into the result
+            fingerprint: _match_reupload() fingerprint, indexed once the transcript is saved
+            segments: Timed segments on the original video timeline (stored columnar)
+            language: Language detected by the backend
+
+        Returns:
+            Dictionary with processing results
+        """
+        # Prepare data
+        data = {
+            "video_id": video_id,
+            "url": url,
+            "title": title,
+            "language": language,
+            "transcript": transcript_text,
+            "timestamp": format_timestamp(),
+            "index": index,
+            "word_count": count_words(transcript_text),
+            "duration": self._video_duration(audio_path, extra, fingerprint),
+        }
+        if segments:
+            data["segments"] = segment_columns(transcript_text, segments)
+
+        # Save files
+        logger.info("💾 Saving transcript files...")
+        if progress_callback:
+            progress_callback("Saving transcript files...")
+
+        json_path, txt_path = save_transcript(data, self.output_dir)
+
+        logger.info(f"✅ JSON saved: {json_path.name}")
+        logger.info(f"✅ TXT saved: {txt_path.name}")
+
+        fingerprints = self._fingerprint_index()
+        if fingerprints is not None and fingerprint is not None:
+            fingerprints.add(
+                video_id, fingerprint["fingerprint"], fingerprint.get("duration"), title
+            )
+
+        # Cleanup temp audio
+        if audio_path.exists():
+            logger.info("🗑️  Cleaning up temporary audio file...")
+            audio_path.unlink()
+
+        logger.info("=" * 80)
+        logger.info(f"✅ VIDEO #{index} COMPLETED SUCCESSFULLY")
+        logger.info(f"📊 Total words: {data['word_count']}")
+        logger.info("=" * 80)
+
+        if progress_callback:
+            progress_callback(f"✅ Completed: {title}")
+
+        result = {
+            "success": True,
+            "video_id": video_id,
+            "title": title,
+            "json_path": str(json_path),
+            "txt_path": str(txt_path),
+            "word_count": data["word_count"],
+            "language": language,
+            "segment_count": len(segments or []),
+        }
+        if extra:
+            result.update(extra)
+        return result
 
     def process_video(
         self,
@@ -578,6 +1111,7 @@ class YouTubeTranscriber:
         index: int = 1,
         progress_callback: Optional[Callable] = None,
         skip_if_exists: bool = True,
+        backend: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Process a single video: download, transcribe, and save
@@ -587,6 +1121,7 @@ class YouTubeTranscriber:
             index: File index number
             progress_callback: Optional callback for progress updates
             skip_if_exists: Skip if video already transcribed (default: True)
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
 
         Returns:
             Dictionary with processing results
@@ -607,34 +1142,9 @@ class YouTubeTranscriber:
 
             # Check if already transcribed
             if skip_if_exists:
-                logger.info("🔍 Checking for existing transcript...")
-                existing = self._check_if_already_transcribed(video_id)
-
-                if existing:
-                    logger.info("=" * 80)
-                    logger.info(f"⏭️  VIDEO ALREADY TRANSCRIBED - SKIPPING")
-                    logger.info(f"📄 Title: {existing['title']}")
-                    logger.info(f"📅 Transcribed: {existing['timestamp']}")
-                    logger.info(f"📁 JSON: {existing['json_path']}")
-                    if existing["txt_path"]:
-                        logger.info(f"📁 TXT: {existing['txt_path']}")
-                    logger.info("=" * 80)
-
-                    if progress_callback:
-                        progress_callback(f"⏭️  Skipped: {existing['title']} (already transcribed)")
-
-                    return {
-                        "success": True,
-                        "skipped": True,
-                        "video_id": video_id,
-                        "title": existing["title"],
-                        "json_path": existing["json_path"],
-                        "txt_path": existing["txt_path"],
-                        "word_count": existing["word_count"],
-                        "message": "Video already transcribed",
-                    }
-                else:
-                    logger.info("✅ No existing transcript found, proceeding...")
+                skipped = self._skip_result_if_exists(video_id, progress_callback)
+                if skipped:
+                    return skipped
 
             if progress_callback:
                 progress_callback(f"Processing video {index}: {video_id}")
@@ -642,52 +1152,37 @@ class YouTubeTranscriber:
             # Download audio
             audio_path, title = self.download_audio(url, progress_callback)
 
-            # Transcribe
-            transcript_text = self.transcribe_audio(audio_path, progress_callback)
-
-            # Prepare data
-            data = {
-                "video_id": video_id,
-                "url": url,
-                "title": title,
-                "language": None,  # Whisper auto-detects but doesn't return it in text mode
-                "transcript": transcript_text,
-                "timestamp": format_timestamp(),
-                "index": index,
-                "word_count": count_words(transcript_text),
-            }
-
-            # Save files
-            logger.info("💾 Saving transcript files...")
-            if progress_callback:
-                progress_callback("Saving transcript files...")
-
-            json_path, txt_path = save_transcript(data, self.output_dir, index)
-
-            logger.info(f"✅ JSON saved: {json_path.name}")
-            logger.info(f"✅ TXT saved: {txt_path.name}")
+            # Link re-uploads of already transcribed audio instead of transcribing again
+            fingerprint, linked = self._match_reupload(
+                video_id, audio_path, progress_callback, link=skip_if_exists
+            )
+            if linked:
+                return linked
 
-            # Cleanup temp audio
-            if audio_path.exists():
-                logger.info("🗑️  Cleaning up temporary audio file...")
-                audio_path.unlink()
+            # Prepare speech audio (shrinks the file before the 25MB check)
+            prep = self._prepare_audio(audio_path, progress_callback)
+            audio_path = prep["path"]
 
-            logger.info("=" * 80)
-            logger.info(f"✅ VIDEO #{index} COMPLETED SUCCESSFULLY")
-            logger.info(f"📊 Total words: {data['word_count']}")
-            logger.info("=" * 80)
+            # Transcribe
+            chunk_reports = []
+            segments = []
+            transcript_text = self.transcribe_audio(
+                audio_path, progress_callback, chunk_reports, backend, segments
+            )
 
-            if progress_callback:
-                progress_callback(f"✅ Completed: {title}")
-
-            return {
-                "success": True,
-                "video_id": video_id,
-                "title": title,
-                "json_path": str(json_path),
-                "txt_path": str(txt_path),
-                "word_count": data["word_count"],
-            }
+            return self._save_video_result(
+                url,
+                video_id,
+                index,
+                title,
+                transcript_text,
+                audio_path,
+                progress_callback,
+                extra={"audio_prep": prep_summary(prep), "chunks": chunk_reports},
+                fingerprint=fingerprint,
+                segments=map_segments(segments, prep.get("time_map")),
+                language=detected_language(chunk_reports),
+            )
 
         except Exception as e:
             logger.error("=" * 80)
@@ -700,31 +1195,26 @@ class YouTubeTranscriber:
 
             return {"success": False, "error": str(e), "url": url}
 
-    def process_multiple_videos(
+    def _unique_video_urls(
         self,
-        urls: list[str],
+        urls: Iterable[str],
+        duplicate_urls: list[str],
         progress_callback: Optional[Callable] = None,
-        skip_if_exists: bool = True,
-    ) -> list[Dict[str, Any]]:
+    ) -> Iterator[str]:
         """
-        Process multiple videos sequentially
+        Expand playlist/channel URLs and drop duplicate or invalid video URLs
 
         Args:
-            urls: List of YouTube video URLs
+            urls: Video, playlist or channel URLs
+            duplicate_urls: Filled with the duplicate URLs that were dropped
             progress_callback: Optional callback for progress updates
-            skip_if_exists: Skip videos that are already transcribed
 
-        Returns:
-            List of processing results
+        Yields:
+            Unique video URLs, as they are discovered
         """
-        results = []
-
-        # Check for duplicates in the input list
         seen_video_ids = set()
-        unique_urls = []
-        duplicate_urls = []
 
-        for url in urls:
+        for url in expand_urls(urls, progress_callback):
             video_id = extract_video_id(url)
             if video_id:
                 if video_id in seen_video_ids:
@@ -732,25 +1222,83 @@ class YouTubeTranscriber:
                     logger.warning(f"⚠️  Duplicate URL in list: {url} (Video ID: {video_id})")
                 else:
                     seen_video_ids.add(video_id)
-                    unique_urls.append(url)
+                    yield url
             else:
                 logger.warning(f"⚠️  Invalid URL skipped: {url}")
 
-        if duplicate_urls:
-            logger.info(f"🔍 Found {len(duplicate_urls)} duplicate URLs in input list (removed)")
+    def process_multiple_videos(
+        self,
+        urls: Iterable[str],
+        progress_callback: Optional[Callable] = None,
+        skip_if_exists: bool = True,
+        pipelined: Optional[bool] = None,
+        preflight: Optional[bool] = None,
+        backend: Optional[str] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Process multiple videos, sequentially or through the stage pipeline
 
-        logger.info(f"📊 Processing {len(unique_urls)} unique videos")
+        Args:
+            urls: YouTube video, playlist or channel URLs
+            progress_callback: Optional callback for progress updates
+            skip_if_exists: Skip videos that are already transcribed
+            pipelined: Use the concurrent BatchPipeline (default: PIPELINE_ENABLED);
+                False falls back to calling process_video one URL at a time
+            preflight: Resolve metadata first and apply the duration/cost guard and
+                PREFLIGHT_ORDER scheduling (default: PREFLIGHT_ENABLED)
+            backend: "openai" or "local" (default: TRANSCRIPTION_BACKEND)
 
-        for i, url in enumerate(unique_urls, 1):
-            if progress_callback:
-                progress_callback(f"\n{'='*60}\nProcessing {i}/{len(unique_urls)}\n{'='*60}")
+        Returns:
+            List of processing results, in processing order, followed by any
+            videos rejected by preflight
+        """
+        if pipelined is None:
+            pipelined = PIPELINE_ENABLED
+        if preflight is None:
+            preflight = PREFLIGHT_ENABLED
+
+        results = []
+        duplicate_urls = []
 
-            result = self.process_video(url, i, progress_callback, skip_if_exists)
-            results.append(result)
+        # Playlists/channels expand lazily; duplicates are dropped as they stream in
+        unique_urls = self._unique_video_urls(urls, duplicate_urls, progress_callback)
+
+        rejected = []
+        if preflight:
+            # Preflight needs the whole batch up front
+            unique_urls = list(unique_urls)
+            if unique_urls:
+                report = run_preflight(unique_urls, progress_callback)
+                unique_urls = report["urls"]
+                rejected = report["rejected"]
+
+        if isinstance(unique_urls, list):
+            logger.info(f"📊 Processing {len(unique_urls)} unique videos")
+            total = str(len(unique_urls))
+        else:
+            logger.info("📊 Processing videos as they are discovered")
+            total = "?"
 
-            # Small delay between videos (rate limiting)
-            if i < len(unique_urls):
-                time.sleep(2)
+        if pipelined:
+            results = BatchPipeline(self, backend=backend).run(
+                unique_urls, progress_callback, skip_if_exists
+            )
+        else:
+            for i, url in enumerate(unique_urls, 1):
+                # Small delay between videos (rate limiting)
+                if i > 1:
+                    time.sleep(2)
+
+                if progress_callback:
+                    progress_callback(f"\n{'='*60}\nProcessing {i}/{total}\n{'='*60}")
+
+                result = self.process_video(url, i, progress_callback, skip_if_exists, backend)
+                results.append(result)
+
+        if duplicate_urls:
+            logger.info(f"🔍 Found {len(duplicate_urls)} duplicate URLs in input list (removed)")
+
+        results.extend(rejected)
 
         # Final cleanup
         cleanup_temp_files(self.temp_dir)
@@ -772,6 +1320,25 @@ class YouTubeTranscriber:
         if duplicate_urls:
             logger.info(f"🔍 Duplicates removed from input: {len(duplicate_urls)}")
 
+        if rejected:
+            logger.info(f"🚫 Rejected by preflight: {len(rejected)}")
+
+        transcript_cache = self._transcript_cache()
+        if transcript_cache and transcript_cache.stats["hits"]:
+            cache_stats = transcript_cache.summary()
+            logger.info(
+                f"♻️  Transcript cache: {cache_stats['hits']} hits "
+                f"({cache_stats['hit_rate']:.0%}), "
+                f"${cache_stats['dollars_saved']:.2f} saved (all runs)"
+            )
+
+        whisper = self.rate_limiter.metrics()["whisper"]
+        if whisper["throttle_seconds"] or whisper["rate_limited"]:
+            logger.info(
+                f"🚦 Whisper throttled {whisper['throttle_seconds']:.1f}s, "
+                f"{whisper['rate_limited']} rate limits (process-wide)"
+            )
+
         logger.info("=" * 80)
 
         return results
@@ -0,0 +1,263 @@
+"""
+Content-addressed transcription cache for YouTube Transcriber Pro
+
+Whisper results are stored in cache/whisper keyed by a hash of the audio
+bytes sent to the backend (one entry per chunk) together with the backend,
+model and request parameters; segment timing and the detected language are
+kept beside the text. Re-transcribing the same audio through --force,
+another URL form or a re-upload returns the stored text instead of paying for
+the call again. The cache has a disk budget; least recently used entries are
+evicted first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB, WHISPER_COST_PER_MINUTE
+from src.logger import setup_logger
+
+logger = setup_logger("transcript_cache")
+
+INDEX_FILE = "index.json"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_audio(audio_path: Path) -> str:
+    """SHA-256 of an audio file, read in 1MB blocks"""
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """Thread-safe LRU cache of transcription results with a JSON index"""
+
+    def __init__(
+        self,
+        cache_dir: Path = TRANSCRIPT_CACHE_DIR,
+        max_bytes: int = TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.index_file = self.cache_dir / INDEX_FILE
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "audio_seconds_saved": 0.0,
+            "dollars_saved": 0.0,
+            "evictions": 0,
+        }
+        self._load()
+
+    @staticmethod
+    def key(audio_hash: str, fingerprint: str) -> str:
+        """
+        Cache key for one audio file under one backend configuration
+
+        Args:
+            audio_hash: hash_audio() of the bytes sent to the backend
+            fingerprint: Backend, model and parameters (TranscriptionBackend.fingerprint)
+
+        Returns:
+            Hex digest
+        """
+        return hashlib.sha256(f"{audio_hash}|{fingerprint}".encode()).hexdigest()
+
+    def _load(self):
+        """Load the index, dropping entries whose text file has disappeared"""
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read transcript cache index {self.index_file}: {e}")
+            return
+
+        self.stats.update(data.get("stats", {}))
+        for key, entry in data.get("entries", {}).items():
+            if self._text_path(key).exists():
+                self.entries[key] = entry
+
+    def _save(self):
+        """Persist the index atomically (caller must hold the lock)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries, "stats": self.stats}, f, indent=2)
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.warning(f"Could not save transcript cache index {self.index_file}: {e}")
+
+    def _text_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.txt"
+
+    def _segments_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.segments.json"
+
+    def total_bytes(self) -> int:
+        """Disk usage of the cached transcripts"""
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached transcription
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            Transcription text or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            text = None
+            if entry is not None:
+                try:
+                    text = self._text_path(key).read_text(encoding="utf-8")
+                except OSError:
+                    del self.entries[key]
+
+            if text is None:
+                self.stats["misses"] += 1
+                self._save()
+                return None
+
+            seconds = entry.get("audio_seconds") or 0.0
+            entry["last_access"] = time.time()
+            self.stats["hits"] += 1
+            self.stats["audio_seconds_saved"] += seconds
+            if entry.get("backend") == "openai":
+                self.stats["dollars_saved"] += seconds / 60 * WHISPER_COST_PER_MINUTE
+            self._save()
+
+        logger.info(f"♻️  Transcript cache hit: {seconds:.0f}s of audio not sent to Whisper")
+        return text
+
+    def timing(self, key: str) -> Dict[str, Any]:
+        """
+        Segments and language stored with a cached transcription
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            {"segments": [...], "language": ...}, or {} if none were stored
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or not entry.get("segments"):
+                return {}
+            try:
+                with open(self._segments_path(key), "r", encoding="utf-8") as f:
+                    segments = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return {}
+            return {"segments": segments, "language": entry.get("language")}
+
+    def put(
+        self,
+        key: str,
+        text: str,
+        backend: str,
+        audio_seconds: Optional[float] = None,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        language: Optional[str] = None,
+    ):
+        """
+        Store a transcription and evict down to the disk budget
+
+        Args:
+            key: Cache key from key()
+            text: Transcription text
+            backend: Backend name ("openai" hits count towards dollars saved)
+            audio_seconds: Audio duration, for the savings statistics
+            segments: Segment timing returned with the text
+            language: Detected language
+        """
+        data = text.encode("utf-8")
+        segment_data = json.dumps(segments, ensure_ascii=False).encode("utf-8") if segments else b""
+        size = len(data) + len(segment_data)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                for path, content in [
+                    (self._text_path(key), data),
+                    (self._segments_path(key), segment_data),
+                ]:
+                    if not content:
+                        continue
+                    tmp_file = path.with_suffix(".tmp")
+                    tmp_file.write_bytes(content)
+                    os.replace(tmp_file, path)
+            except OSError as e:
+                logger.warning(f"Could not cache transcript {key}: {e}")
+                return
+
+            now = time.time()
+            self.entries[key] = {
+                "bytes": size,
+                "backend": backend,
+                "audio_seconds": audio_seconds,
+                "language": language,
+                "segments": bool(segments),
+                "created": now,
+                "last_access": now,
+            }
+            self._evict(keep=key)
+            self._save()
+
+    def _evict(self, keep: Optional[str] = None):
+        """Remove least recently used entries until within budget (caller holds the lock)"""
+        total = self.total_bytes()
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._text_path(key).unlink(missing_ok=True)
+            self._segments_path(key).unlink(missing_ok=True)
+            total -= self.entries.pop(key)["bytes"]
+            self.stats["evictions"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Cache usage, hit rate and savings for display"""
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "audio_seconds_saved": round(self.stats["audio_seconds_saved"], 1),
+                "dollars_saved": round(self.stats["dollars_saved"], 4),
+                "evictions": self.stats["evictions"],
+            }
+
+
+_transcript_cache: Optional[TranscriptCache] = None
+_transcript_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Get the process-wide transcription cache"""
+    global _transcript_cache
+    with _transcript_cache_lock:
+        if _transcript_cache is None:
+            _transcript_cache = TranscriptCache()
+        return _transcript_cache
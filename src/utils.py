@@ -5,10 +5,12 @@ Utility functions for YouTube Transcriber Pro
 import json
 import os
 import re
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.catalog import get_catalog, transcript_paths
 from src.logger import setup_logger
 
 logger = setup_logger("utils")
@@ -37,6 +39,56 @@ def extract_video_id(url: str) -> Optional[str]:
     return None
 
 
+COLLECTION_PATTERNS = [
+    r"youtube\.com\/playlist\?(?:.*&)?list=([^&\n?#]+)",
+    r"youtube\.com\/(@[^\/&\n?#]+)",
+    r"youtube\.com\/channel\/([^\/&\n?#]+)",
+    r"youtube\.com\/(?:c|user)\/([^\/&\n?#]+)",
+]
+
+
+CHANNEL_ROOT_PATTERN = (
+    r"(https?:\/\/(?:www\.|m\.)?youtube\.com\/"
+    r"(?:@[^\/?#]+|channel\/[^\/?#]+|(?:c|user)\/[^\/?#]+))"
+    r"(\/[^?#]*)?"
+)
+
+
+def is_collection_url(url: str) -> bool:
+    """
+    Check if URL is a YouTube playlist or channel
+
+    Args:
+        url: URL to check
+
+    Returns:
+        True if the URL points to a playlist or channel
+    """
+    return any(re.search(pattern, url) for pattern in COLLECTION_PATTERNS)
+
+
+def normalize_collection_url(url: str) -> str:
+    """
+    Normalize a playlist/channel URL for expansion
+
+    Channel URLs without a tab are pointed at their "videos" tab so that
+    expansion walks uploads instead of the channel home page.
+
+    Args:
+        url: Playlist or channel URL
+
+    Returns:
+        Normalized URL
+    """
+    url = url.strip()
+    if "/playlist" in url:
+        return url
+    match = re.match(CHANNEL_ROOT_PATTERN, url)
+    if match and not (match.group(2) or "").strip("/"):
+        return f"{match.group(1)}/videos"
+    return url
+
+
 def sanitize_filename(filename: str, max_length: int = 100) -> str:
     """
     Sanitize filename by removing invalid characters
@@ -58,38 +110,54 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     return filename
 
 
-def save_transcript(data: Dict[str, Any], output_dir: Path, index: int) -> tuple[Path, Path]:
+def _write_atomic(path: Path, content: str):
+    """
+    Write a text file through a temporary file and a rename
+
+    Readers never see half a file, and concurrent writers of the same path
+    each use their own temporary file (the last rename wins).
     """
-    Save transcript in JSON and TXT formats
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def save_transcript(data: Dict[str, Any], output_dir: Path) -> tuple[Path, Path]:
+    """
+    Save transcript in JSON and TXT formats and record it in the directory catalog
+
+    Files are stored by video ID (see src.catalog.transcript_paths), so saving
+    a video again replaces its files. The catalog row and the files are
+    committed together: if writing a file fails, the catalog is left as it was.
 
     Args:
-        data: Transcript data dictionary
+        data: Transcript data dictionary (needs "video_id")
         output_dir: Output directory path
-        index: File index number
 
     Returns:
         Tuple of (json_path, txt_path)
     """
-    # Create safe filename
-    title = sanitize_filename(data.get("title", "untitled"))
-    base_filename = f"{index:02d}_{title}"
-
-    # Save JSON
-    json_path = output_dir / f"{base_filename}.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-    # Save TXT
-    txt_path = output_dir / f"{base_filename}.txt"
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(f"Title: {data.get('title', 'N/A')}\n")
-        f.write(f"URL: {data.get('url', 'N/A')}\n")
-        f.write(f"Video ID: {data.get('video_id', 'N/A')}\n")
-        f.write(f"Language: {data.get('language', 'N/A')}\n")
-        f.write(f"Timestamp: {data.get('timestamp', 'N/A')}\n")
-        f.write(f"Word Count: {data.get('word_count', 0)}\n")
-        f.write("\n" + "=" * 80 + "\n\n")
-        f.write(data.get("transcript", ""))
+    json_path, txt_path = transcript_paths(output_dir, data.get("video_id"))
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+
+    header = (
+        f"Title: {data.get('title', 'N/A')}\n"
+        f"URL: {data.get('url', 'N/A')}\n"
+        f"Video ID: {data.get('video_id', 'N/A')}\n"
+        f"Language: {data.get('language', 'N/A')}\n"
+        f"Timestamp: {data.get('timestamp', 'N/A')}\n"
+        f"Word Count: {data.get('word_count', 0)}\n"
+        "\n" + "=" * 80 + "\n\n"
+    )
+
+    with get_catalog(output_dir).saving(data, json_path, txt_path):
+        _write_atomic(json_path, json.dumps(data, indent=2, ensure_ascii=False))
+        _write_atomic(txt_path, header + data.get("transcript", ""))
 
     return json_path, txt_path
 
@@ -107,8 +175,8 @@ def cleanup_temp_files(temp_dir: Path, keep_recent: int = 0):
 
     files = sorted(temp_dir.glob("*"), key=os.path.getmtime, reverse=True)
 
-    # Skip .gitkeep
-    files = [f for f in files if f.name != ".gitkeep"]
+    # Skip .gitkeep and subdirectories (the audio cache lives in one)
+    files = [f for f in files if f.name != ".gitkeep" and f.is_file()]
 
     # Delete old files
     for file in files[keep_recent:]:
@@ -177,18 +245,21 @@ def parse_urls_input(urls_text: str) -> list[str]:
     """
     Parse URLs from text input (one per line)
 
+    Playlist and channel URLs are kept as-is; they are expanded lazily
+    when the batch runs (see src.playlist.expand_urls).
+
     Args:
         urls_text: Text containing URLs
 
     Returns:
-        List of valid URLs
+        List of valid video, playlist or channel URLs
     """
     lines = urls_text.strip().split("\n")
     urls = []
 
     for line in lines:
         line = line.strip()
-        if line and validate_url(line):
+        if line and (validate_url(line) or is_collection_url(line)):
             urls.append(line)
 
     return urls
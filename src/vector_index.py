@@ -0,0 +1,148 @@
+"""
+Manifest of the transcripts held in the vector store
+
+Every indexed video is recorded with a content hash (transcript text, title,
+URL and the chunking settings) and the number of chunks it was split into.
+Chunks get deterministic IDs (``<video_id>:<chunk_index>``), so re-indexing
+only has to embed videos whose hash changed, upsert their chunks over the old
+ones and delete the tail left behind when a transcript got shorter. The
+manifest lives inside VECTOR_DB_DIR, so clearing the vector store clears it
+too. It also records the embedding provider and model (embedding_tag()), so
+vectors from a different embedding space are never added to the store.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import CHUNK_OVERLAP, CHUNK_SIZE, VECTOR_DB_DIR
+from src.logger import setup_logger
+
+logger = setup_logger("vector_index")
+
+MANIFEST_FILE_NAME = "index_manifest.json"
+
+
+def content_hash(transcript: Dict[str, Any]) -> str:
+    """Hash of everything that ends up in a video's chunks and their metadata"""
+    digest = hashlib.sha256()
+    for part in (
+        f"{CHUNK_SIZE}/{CHUNK_OVERLAP}",
+        transcript.get("title") or "",
+        transcript.get("url") or "",
+        transcript.get("transcript") or "",
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def chunk_ids(video_id: str, start: int, stop: int) -> List[str]:
+    """Vector store IDs of chunks start..stop-1 of a video"""
+    return [f"{video_id}:{i}" for i in range(start, stop)]
+
+
+class IndexManifest:
+    """Thread-safe record of the videos in the vector store, persisted as JSON"""
+
+    def __init__(self, manifest_file: Path = VECTOR_DB_DIR / MANIFEST_FILE_NAME):
+        self.manifest_file = Path(manifest_file)
+        self.lock = threading.Lock()
+        # "<provider>:<model>" of the vectors in the store
+        self.embedding: Optional[str] = None
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self.reload()
+
+    def reload(self):
+        """Re-read the manifest (it disappears whenever the vector store is cleared)"""
+        with self.lock:
+            self.embedding = None
+            self.videos = {}
+            if not self.manifest_file.exists():
+                return
+            try:
+                with open(self.manifest_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Could not read index manifest {self.manifest_file}: {e}")
+                return
+            # Manifests written before providers were pluggable only name an OpenAI model
+            legacy_model = data.get("embedding_model")
+            self.embedding = data.get("embedding") or (legacy_model and f"openai:{legacy_model}")
+            self.videos = data.get("videos", {})
+
+    def _save(self):
+        """Persist the manifest atomically (caller must hold the lock)"""
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.manifest_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"embedding": self.embedding, "videos": self.videos}, f)
+            os.replace(tmp_file, self.manifest_file)
+        except OSError as e:
+            logger.warning(f"Could not save index manifest {self.manifest_file}: {e}")
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of an indexed video ({"hash", "chunks", "title", "indexed_at"})"""
+        with self.lock:
+            return self.videos.get(video_id)
+
+    def video_ids(self) -> List[str]:
+        with self.lock:
+            return list(self.videos)
+
+    def is_compatible(self, embedding: str) -> bool:
+        """Whether the store can be updated in place (known contents, same embedding space)"""
+        with self.lock:
+            return bool(self.videos) and self.embedding == embedding
+
+    def commit(
+        self,
+        indexed: Dict[str, Dict[str, Any]],
+        removed: List[str],
+        embedding: str,
+        reset: bool = False,
+    ):
+        """
+        Record the outcome of an indexing run
+
+        Args:
+            indexed: video_id -> {"hash", "chunks", "title"} of videos (re-)embedded
+            removed: Video IDs whose chunks were deleted from the store
+            embedding: embedding_tag() of the vectors written
+            reset: The store was rebuilt from scratch; forget everything else
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            if reset:
+                self.videos = {}
+            self.embedding = embedding
+            for video_id in removed:
+                self.videos.pop(video_id, None)
+            for video_id, entry in indexed.items():
+                self.videos[video_id] = {**entry, "indexed_at": now}
+            self._save()
+
+    def remove(self, video_ids: List[str]):
+        """Forget videos whose chunks were deleted from the store"""
+        with self.lock:
+            for video_id in video_ids:
+                self.videos.pop(video_id, None)
+            self._save()
+
+
+_index_manifest: Optional[IndexManifest] = None
+_index_manifest_lock = threading.Lock()
+
+
+def get_index_manifest() -> IndexManifest:
+    """Get the process-wide vector store manifest"""
+    global _index_manifest
+    with _index_manifest_lock:
+        if _index_manifest is None:
+            _index_manifest = IndexManifest()
+        return _index_manifest
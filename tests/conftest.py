@@ -14,6 +14,46 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key-for-testing")
 
 
+@pytest.fixture(autouse=True)
+def isolated_transcript_cache(monkeypatch, tmp_path):
+    """Keep Whisper results cached by one test from answering another"""
+    from src import transcript_cache
+
+    cache = transcript_cache.TranscriptCache(tmp_path / "whisper_cache")
+    monkeypatch.setattr(transcript_cache, "_transcript_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_fingerprint_index(monkeypatch, tmp_path):
+    """Keep fingerprints indexed by one test from linking videos in another"""
+    from src import fingerprint
+
+    index = fingerprint.FingerprintIndex(tmp_path / "fingerprints.json")
+    monkeypatch.setattr(fingerprint, "_fingerprint_index", index)
+    return index
+
+
+@pytest.fixture(autouse=True)
+def isolated_index_manifest(monkeypatch, tmp_path):
+    """Keep videos indexed by one test from looking unchanged in another"""
+    from src import vector_index
+
+    manifest = vector_index.IndexManifest(tmp_path / "vector_db" / "index_manifest.json")
+    monkeypatch.setattr(vector_index, "_index_manifest", manifest)
+    return manifest
+
+
+@pytest.fixture(autouse=True)
+def isolated_embedding_cache(monkeypatch, tmp_path):
+    """Keep vectors cached by one test from answering another"""
+    from src import embedding_cache
+
+    cache = embedding_cache.EmbeddingCache(tmp_path / "embedding_cache")
+    monkeypatch.setattr(embedding_cache, "_embedding_cache", cache)
+    return cache
+
+
 @pytest.fixture
 def sample_transcript_data():
     """Sample transcript data for testing"""
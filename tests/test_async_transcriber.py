@@ -0,0 +1,216 @@
+"""
+Unit tests for the asyncio transcriber
+"""
+
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.async_audio import run_ffmpeg_async
+from src.async_transcriber import AsyncYouTubeTranscriber
+from src.audio import AudioChunk
+from src.rate_limiter import RateLimiter
+
+
+class RateLimitError(Exception):
+    status_code = 429
+    response = MagicMock(headers={"retry-after-ms": "1"})
+
+
+@pytest.fixture
+def transcriber(tmp_path):
+    with patch("src.transcriber.OpenAI"), patch("src.async_transcriber.AsyncOpenAI"):
+        transcriber = AsyncYouTubeTranscriber()
+    transcriber.rate_limiter = RateLimiter(enabled=False)
+    transcriber.temp_dir = tmp_path
+    return transcriber
+
+
+def _whisper(transcriber, create):
+    """Route async Whisper calls to the coroutine create(), wrapped like a raw response"""
+
+    async def raw_create(**kwargs):
+        text = await create(**kwargs)
+        return MagicMock(headers={}, parse=AsyncMock(return_value=text))
+
+    transcriber.async_client.audio.transcriptions.with_raw_response.create = raw_create
+
+
+@pytest.fixture
+def chunks(tmp_path):
+    chunks = []
+    for i in range(4):
+        path = tmp_path / f"vid_chunk{i:03d}.mp3"
+        path.write_bytes(path.stem.encode())
+        chunks.append(AudioChunk(path, i * 100.0, (i + 1) * 100.0, i))
+    return chunks
+
+
+class TestAsyncChunks:
+    """Tests for concurrent chunk transcription on the event loop"""
+
+    def test_chunks_run_concurrently_and_keep_order(self, transcriber, chunks):
+        active = [0]
+        peak = [0]
+
+        async def create(model, file, response_format):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.02 * (4 - int(file[0][-5])))
+            active[0] -= 1
+            return file[1].decode()
+
+        _whisper(transcriber, create)
+        reports = []
+
+        with patch("src.async_transcriber.CHUNK_CONCURRENCY", 2):
+            text = asyncio.run(transcriber._transcribe_chunks_async(chunks, None, reports))
+
+        assert text == "vid_chunk000 vid_chunk001 vid_chunk002 vid_chunk003"
+        assert peak[0] == 2
+        assert [report["start"] for report in reports] == [0.0, 100.0, 200.0, 300.0]
+        assert not any(chunk.path.exists() for chunk in chunks)
+
+    def test_rate_limit_is_retried_and_reported(self, transcriber, chunks):
+        calls = []
+
+        async def create(model, file, response_format):
+            calls.append(file[0])
+            if len(calls) == 1:
+                raise RateLimitError("429 Too Many Requests")
+            return "ok"
+
+        _whisper(transcriber, create)
+        stats = {}
+
+        text = asyncio.run(transcriber._transcribe_single_file_async(chunks[0].path, stats))
+
+        assert text == "ok"
+        assert stats["retries"] == 1
+        assert stats["rate_limited"] == 1
+        assert transcriber.rate_limiter.metrics()["whisper"]["rate_limited"] == 1
+
+    def test_rate_limit_retry_waits_with_limiter_disabled(self, transcriber, chunks):
+        """RATE_LIMIT_ENABLED=false still waits out Retry-After before retrying"""
+        calls = []
+
+        class SlowDown(RateLimitError):
+            response = MagicMock(headers={"retry-after-ms": "100"})
+
+        async def create(model, file, response_format):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise SlowDown("429 Too Many Requests")
+            return "ok"
+
+        _whisper(transcriber, create)
+
+        asyncio.run(transcriber._transcribe_single_file_async(chunks[0].path, {}))
+
+        assert calls[1] - calls[0] >= 0.1
+
+    def test_failed_chunk_removes_remaining_chunks(self, transcriber, chunks):
+        async def create(model, file, response_format):
+            if file[0].endswith("1.mp3"):
+                raise ValueError("boom")
+            await asyncio.sleep(1)
+            return "never"
+
+        _whisper(transcriber, create)
+
+        with patch("src.async_transcriber.MAX_RETRIES", 1):
+            with pytest.raises(Exception, match="boom"):
+                asyncio.run(transcriber._transcribe_chunks_async(chunks))
+
+        assert not any(chunk.path.exists() for chunk in chunks)
+
+
+class TestProcessManyAsync:
+    """Tests for multiplexing videos on one event loop"""
+
+    def test_results_in_input_order_with_bounded_concurrency(self, transcriber):
+        urls = [f"https://youtu.be/vid{i:08d}" for i in range(6)]
+        active = [0]
+        peak = [0]
+
+        async def fake_process(
+            url, index, progress_callback=None, skip_if_exists=True, backend=None
+        ):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01 * (6 - index))
+            active[0] -= 1
+            return {"success": True, "url": url, "index": index}
+
+        transcriber.process_video_async = fake_process
+        results = asyncio.run(transcriber.process_many_async(urls + [urls[0]], max_concurrency=3))
+
+        assert [r["url"] for r in results] == urls
+        assert [r["index"] for r in results] == [1, 2, 3, 4, 5, 6]
+        assert peak[0] == 3
+
+    def test_cancelling_a_video_removes_its_audio(self, transcriber, tmp_path):
+        audio_path = tmp_path / "vid00000001.ogg"
+        audio_path.write_bytes(b"audio")
+        transcriber.download_audio = MagicMock(return_value=(audio_path, "Title"))
+        transcriber._skip_result_if_exists = MagicMock(return_value=None)
+        started = None
+
+        async def hang(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        transcriber.transcribe_audio_async = hang
+
+        async def run():
+            nonlocal started
+            started = asyncio.Event()
+            task = asyncio.create_task(
+                transcriber.process_video_async("https://youtu.be/vid00000001")
+            )
+            await started.wait()
+            task.cancel()
+            await task
+
+        with patch("src.async_transcriber.AUDIO_PREPARE", False):
+            with pytest.raises(asyncio.CancelledError):
+                asyncio.run(run())
+
+        assert not audio_path.exists()
+
+
+class TestRunFfmpegAsync:
+    """Tests for the asyncio subprocess runner"""
+
+    def test_returns_output(self):
+        cmd = [sys.executable, "-c", "import sys; sys.stderr.write('log'); print('out')"]
+        returncode, stdout, stderr = asyncio.run(run_ffmpeg_async(cmd))
+        assert returncode == 0
+        assert stdout.strip() == b"out"
+        assert stderr == b"log"
+
+    def test_cancel_kills_process(self):
+        processes = []
+        create = asyncio.create_subprocess_exec
+
+        async def spy(*args, **kwargs):
+            process = await create(*args, **kwargs)
+            processes.append(process)
+            return process
+
+        async def run():
+            task = asyncio.create_task(
+                run_ffmpeg_async([sys.executable, "-c", "import time; time.sleep(30)"])
+            )
+            await asyncio.sleep(0.3)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with patch("src.async_audio.asyncio.create_subprocess_exec", spy):
+            asyncio.run(run())
+
+        assert processes[0].returncode is not None
@@ -0,0 +1,436 @@
+"""
+Unit tests for FFmpeg audio helpers
+"""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.audio import (
+    TimeMap,
+    compress_filter,
+    detect_silences,
+    estimate_chunk_count,
+    ffmpeg_tool,
+    is_whisper_supported,
+    parse_silences,
+    plan_cut_points,
+    prep_summary,
+    prepare_for_speech,
+    probe_duration,
+    segment_audio,
+    speech_segments,
+    transcode_audio,
+)
+from src.transcriber import YouTubeTranscriber
+
+
+class TestFfmpegTool:
+    """Tests for ffmpeg_tool function"""
+
+    def test_directory_location(self, tmp_path):
+        result = ffmpeg_tool("ffprobe", str(tmp_path))
+        assert Path(result).parent == tmp_path
+        assert Path(result).stem == "ffprobe"
+
+    def test_falls_back_to_path(self):
+        assert ffmpeg_tool("ffmpeg", None).startswith("ffmpeg")
+
+
+class TestIsWhisperSupported:
+    """Tests for is_whisper_supported function"""
+
+    @pytest.mark.parametrize("name", ["a.webm", "a.m4a", "a.MP3", "a.ogg"])
+    def test_native_containers(self, name):
+        assert is_whisper_supported(Path(name)) is True
+
+    @pytest.mark.parametrize("name", ["a.opus", "a.mka", "a.aac"])
+    def test_needs_transcode(self, name):
+        assert is_whisper_supported(Path(name)) is False
+
+
+class TestTranscodeAudio:
+    """Tests for transcode_audio function"""
+
+    @patch("src.audio.subprocess.run")
+    def test_replaces_source(self, mock_run, tmp_path):
+        source = tmp_path / "vid.opus"
+        source.write_bytes(b"opus")
+        mock_run.return_value = MagicMock(returncode=0)
+
+        result = transcode_audio(source, audio_format="mp3", audio_quality="64")
+
+        assert result == tmp_path / "vid.mp3"
+        assert not source.exists()
+        assert "64k" in mock_run.call_args[0][0]
+
+    @patch("src.audio.subprocess.run")
+    def test_failure_raises(self, mock_run, tmp_path):
+        source = tmp_path / "vid.opus"
+        source.write_bytes(b"opus")
+        mock_run.return_value = MagicMock(returncode=1, stderr=b"boom")
+
+        with pytest.raises(RuntimeError, match="transcode failed"):
+            transcode_audio(source)
+        assert source.exists()
+
+
+class TestPrepareForSpeech:
+    """Tests for the speech preparation stage"""
+
+    MB = 1024 * 1024
+
+    def _fake_ffmpeg(self, output_size):
+        def run(cmd, **kwargs):
+            Path(cmd[-2]).write_bytes(b"0" * output_size)
+            return MagicMock(returncode=0, stderr=b"")
+
+        return run
+
+    def test_estimate_chunk_count(self):
+        assert estimate_chunk_count(10 * self.MB) == 1
+        assert estimate_chunk_count(25 * self.MB) == 1
+        assert estimate_chunk_count(80 * self.MB) == 4
+
+    @patch("src.audio.subprocess.run")
+    def test_replaces_original_and_reports_savings(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * (60 * self.MB))
+        mock_run.side_effect = self._fake_ffmpeg(11 * self.MB)
+
+        report = prepare_for_speech(source)
+
+        assert report["prepared"] is True
+        assert report["path"] == tmp_path / "vid_speech.ogg"
+        assert report["bytes_saved"] == 49 * self.MB
+        assert (report["chunks_before"], report["chunks_after"]) == (3, 1)
+        assert not source.exists()
+        cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("-ac") + 1] == "1"
+        assert cmd[cmd.index("-ar") + 1] == "16000"
+
+    @patch("src.audio.subprocess.run")
+    def test_keeps_original_when_not_smaller(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * 100)
+        mock_run.side_effect = self._fake_ffmpeg(200)
+
+        report = prepare_for_speech(source)
+
+        assert report["prepared"] is False
+        assert report["path"] == source
+        assert not (tmp_path / "vid_speech.ogg").exists()
+
+    @patch("src.audio.subprocess.run")
+    def test_ffmpeg_failure_keeps_original(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * 100)
+        mock_run.return_value = MagicMock(returncode=1, stderr=b"bad input")
+
+        report = prepare_for_speech(source)
+
+        assert report["path"] == source
+        assert report["bytes_saved"] == 0
+
+
+class TestCompression:
+    """Tests for silence trimming and tempo compression"""
+
+    def test_long_silences_are_cut_with_padding(self):
+        silences = [(0.0, 0.5), (10.0, 13.0), (20.0, 20.4), (28.0, 30.0)]
+
+        segments = speech_segments(30.0, silences, min_silence=1.0, keep=0.2)
+
+        assert segments == [(0.0, 10.2), (12.8, 28.2), (29.8, 30.0)]
+
+    def test_only_longest_silences_beyond_max_cuts(self):
+        silences = [(10.0, 11.0), (20.0, 25.0), (30.0, 32.0)]
+
+        segments = speech_segments(40.0, silences, min_silence=1.0, keep=0.0, max_cuts=2)
+
+        assert segments == [(0.0, 20.0), (25.0, 30.0), (32.0, 40.0)]
+
+    def test_time_map_round_trip(self):
+        time_map = TimeMap([(0.0, 10.0), (13.0, 28.0)], tempo=1.5, duration=30.0)
+
+        assert time_map.compressed_duration == pytest.approx(50 / 3)
+        assert time_map.to_original(3.0) == pytest.approx(4.5)
+        # 10 s of audio at x1.5 end at 6.67 s; the next second is 1.5 s past the cut
+        assert time_map.to_original(10 / 1.5 + 1.0) == pytest.approx(14.5)
+        assert time_map.to_original(100.0) == 28.0
+        assert TimeMap.from_dict(time_map.to_dict()).segments == time_map.segments
+
+    def test_compress_filter(self):
+        cut = TimeMap([(0.0, 10.0), (13.0, 30.0)], tempo=1.25, duration=30.0)
+        tempo_only = TimeMap([(0.0, 30.0)], tempo=1.5, duration=30.0)
+
+        assert compress_filter(cut) == (
+            "aselect='between(t,0.000,10.000)+between(t,13.000,30.000)',"
+            "asetpts=N/SR/TB,atempo=1.25"
+        )
+        assert compress_filter(tempo_only) == "atempo=1.5"
+        assert compress_filter(TimeMap([(0.0, 30.0)], tempo=1.0, duration=30.0)) is None
+
+    def test_trailing_silence_ends_at_duration(self):
+        stderr = "[silencedetect @ 0x1] silence_start: 55.5\n"
+
+        assert parse_silences(stderr) == []
+        assert parse_silences(stderr, duration=60.0) == [(55.5, 60.0)]
+
+    @patch("src.audio.subprocess.run")
+    def test_prepare_compressed_reports_billed_savings(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * 100)
+        scan = MagicMock(
+            returncode=0,
+            stderr=(
+                b"  Duration: 00:10:00.00, start: 0.000000\n"
+                b"[silencedetect @ 0x1] silence_start: 100\n"
+                b"[silencedetect @ 0x1] silence_end: 160 | silence_duration: 60\n"
+            ),
+        )
+
+        def encode(cmd, **kwargs):
+            Path(cmd[-2]).write_bytes(b"0" * 150)  # bigger, but much shorter
+            return MagicMock(returncode=0, stderr=b"")
+
+        mock_run.side_effect = lambda cmd, **kwargs: scan if "null" in cmd else encode(cmd)
+
+        report = prepare_for_speech(source, compress=True, tempo=1.5)
+
+        assert report["prepared"] is True
+        assert report["time_map"].segments == [(0.0, 100.2), (159.8, 600.0)]
+        assert report["prepared_seconds"] == pytest.approx((600 - 59.6) / 1.5, abs=0.01)
+        assert report["cost_saved"] > 0
+        encode_cmd = mock_run.call_args[0][0]
+        assert "atempo=1.5" in encode_cmd[encode_cmd.index("-af") + 1]
+        assert prep_summary(report)["time_map"]["tempo"] == 1.5
+
+    @patch("src.audio.subprocess.run")
+    def test_failed_scan_prepares_uncompressed(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * 100)
+
+        def run(cmd, **kwargs):
+            if "null" in cmd:
+                return MagicMock(returncode=1, stderr=b"bad input")
+            Path(cmd[-2]).write_bytes(b"0" * 50)
+            return MagicMock(returncode=0, stderr=b"")
+
+        mock_run.side_effect = run
+
+        report = prepare_for_speech(source, compress=True)
+
+        assert report["prepared"] is True
+        assert "time_map" not in report
+        assert "-af" not in mock_run.call_args[0][0]
+
+
+class TestProbeDuration:
+    """Tests for probe_duration function"""
+
+    @patch("src.audio.subprocess.run")
+    def test_falls_back_to_ffmpeg_without_ffprobe(self, mock_run, tmp_path):
+        mock_run.side_effect = [
+            FileNotFoundError("ffprobe"),
+            MagicMock(returncode=1, stderr="  Duration: 01:02:03.50, start: 0.000000"),
+        ]
+
+        assert probe_duration(tmp_path / "a.webm") == 3723.5
+
+
+class TestPlanCutPoints:
+    """Tests for plan_cut_points function"""
+
+    def test_fixed_cuts_without_silences(self):
+        assert plan_cut_points(250, 100) == [100, 200]
+
+    def test_no_cut_when_short_enough(self):
+        assert plan_cut_points(90, 100) == []
+
+    def test_cuts_move_into_latest_silence(self):
+        silences = [(40, 41), (80, 82), (95, 97), (170, 171)]
+
+        cuts = plan_cut_points(250, 100, silences)
+
+        assert cuts == [96, 170.5]
+        assert all(b - a <= 100 for a, b in zip([0, *cuts], [*cuts, 250]))
+
+    def test_silence_too_early_is_ignored(self):
+        assert plan_cut_points(150, 100, [(10, 12)]) == [100]
+
+
+class TestDetectSilences:
+    """Tests for detect_silences function"""
+
+    @patch("src.audio.subprocess.run")
+    def test_parses_silencedetect_output(self, mock_run, tmp_path):
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stderr=(
+                b"[silencedetect @ 0x1] silence_start: -0.01\n"
+                b"[silencedetect @ 0x1] silence_end: 1.5 | silence_duration: 1.51\n"
+                b"[silencedetect @ 0x1] silence_start: 62.25\n"
+                b"[silencedetect @ 0x1] silence_end: 63 | silence_duration: 0.75\n"
+            ),
+        )
+
+        assert detect_silences(tmp_path / "a.webm") == [(0.0, 1.5), (62.25, 63.0)]
+        assert "silencedetect=noise=" in " ".join(mock_run.call_args[0][0])
+
+    @patch("src.audio.subprocess.run")
+    def test_failure_returns_no_silences(self, mock_run, tmp_path):
+        mock_run.return_value = MagicMock(returncode=1, stderr=b"boom")
+
+        assert detect_silences(tmp_path / "a.webm") == []
+
+
+class TestSegmentAudio:
+    """Tests for the single-pass segmenter"""
+
+    MB = 1024 * 1024
+
+    def _fake_segmenter(self, chunk_sizes):
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            sizes = chunk_sizes[len(calls) - 1]
+            pattern = cmd[-2]
+            for i, size in enumerate(sizes):
+                Path(pattern % i).write_bytes(b"0" * size)
+            return MagicMock(returncode=0, stderr=b"")
+
+        return run, calls
+
+    @staticmethod
+    def _cuts(cmd):
+        return [float(cut) for cut in cmd[cmd.index("-segment_times") + 1].split(",")]
+
+    def test_small_file_is_not_split(self, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * 100)
+
+        chunks = segment_audio(source, max_size_mb=1)
+
+        assert [chunk.path for chunk in chunks] == [source]
+        assert chunks[0].start == 0.0
+
+    @patch("src.audio.subprocess.run")
+    def test_single_pass_with_size_derived_cuts(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * (50 * self.MB))
+        mock_run.side_effect, calls = self._fake_segmenter([[20 * self.MB] * 2 + [10 * self.MB]])
+
+        chunks = segment_audio(source, max_size_mb=24, duration=3000, on_silence=False)
+
+        assert [chunk.path.name for chunk in chunks] == [
+            "vid_chunk000.webm",
+            "vid_chunk001.webm",
+            "vid_chunk002.webm",
+        ]
+        assert len(calls) == 1
+        assert calls[0][calls[0].index("-f") + 1] == "segment"
+        segment_time = 3000 * 24 / 50 * 0.95
+        assert self._cuts(calls[0]) == pytest.approx([segment_time, 2 * segment_time], abs=1e-3)
+        assert chunks[0].start == 0.0
+        assert chunks[1].start == chunks[0].end
+        assert chunks[-1].end == 3000
+
+    @patch("src.audio.detect_silences")
+    @patch("src.audio.subprocess.run")
+    def test_cuts_follow_silences(self, mock_run, mock_silences, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * (50 * self.MB))
+        mock_silences.return_value = [(1200, 1202)]
+        mock_run.side_effect, calls = self._fake_segmenter([[20 * self.MB] * 2 + [10 * self.MB]])
+
+        chunks = segment_audio(source, max_size_mb=24, duration=3000)
+
+        assert self._cuts(calls[0])[0] == pytest.approx(1201)
+        assert chunks[0].end == pytest.approx(1201)
+
+    @patch("src.audio.subprocess.run")
+    def test_oversized_chunk_triggers_shorter_segments(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * (50 * self.MB))
+        mock_run.side_effect, calls = self._fake_segmenter(
+            [[30 * self.MB, 20 * self.MB, 1], [20 * self.MB] * 2 + [10 * self.MB]]
+        )
+
+        chunks = segment_audio(source, max_size_mb=24, duration=3000, on_silence=False)
+
+        assert len(calls) == 2
+        assert self._cuts(calls[1])[0] < self._cuts(calls[0])[0]
+        assert len(chunks) == 3
+
+    @patch("src.audio.subprocess.run")
+    def test_extra_segments_are_removed(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * (50 * self.MB))
+        mock_run.side_effect, calls = self._fake_segmenter([[20 * self.MB] * 3 + [1]])
+
+        chunks = segment_audio(source, max_size_mb=24, duration=3000, on_silence=False)
+
+        assert len(chunks) == 3
+        assert not (tmp_path / "vid_chunk003.webm").exists()
+
+    @patch("src.audio.subprocess.run")
+    def test_ffmpeg_failure_raises(self, mock_run, tmp_path):
+        source = tmp_path / "vid.webm"
+        source.write_bytes(b"0" * (50 * self.MB))
+        mock_run.return_value = MagicMock(returncode=1, stderr=b"boom")
+
+        with pytest.raises(RuntimeError, match="segmenting failed"):
+            segment_audio(source, max_size_mb=24, duration=3000, on_silence=False)
+
+
+class TestPassthroughDownload:
+    """Tests for download_audio passthrough mode"""
+
+    @pytest.fixture
+    def transcriber(self, tmp_path):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.temp_dir = tmp_path
+        return transcriber
+
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_keeps_native_container(self, mock_ydl, transcriber):
+        native = transcriber.temp_dir / "test123.webm"
+        native.write_bytes(b"webm")
+        instance = MagicMock()
+        instance.extract_info.return_value = {
+            "title": "Test Video",
+            "requested_downloads": [{"filepath": str(native)}],
+        }
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        audio_path, title = transcriber.download_audio("https://youtu.be/test123", passthrough=True)
+
+        assert audio_path == native
+        assert "postprocessors" not in mock_ydl.call_args[0][0]
+
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_legacy_mode_reencodes(self, mock_ydl, transcriber):
+        (transcriber.temp_dir / "test123.mp3").write_bytes(b"mp3")
+        instance = MagicMock()
+        instance.extract_info.return_value = {"title": "Test Video"}
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        transcriber.download_audio("https://youtu.be/test123", passthrough=False)
+
+        postprocessors = mock_ydl.call_args[0][0]["postprocessors"]
+        assert postprocessors[0]["key"] == "FFmpegExtractAudio"
+
+    @patch("src.transcriber.transcode_audio")
+    def test_unsupported_container_is_transcoded(self, mock_transcode, transcriber):
+        native = transcriber.temp_dir / "test123.opus"
+        native.write_bytes(b"opus")
+        mock_transcode.return_value = transcriber.temp_dir / "test123.mp3"
+
+        result = transcriber._resolve_native_audio("test123", {})
+
+        assert result == transcriber.temp_dir / "test123.mp3"
+        mock_transcode.assert_called_once()
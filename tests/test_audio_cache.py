@@ -0,0 +1,121 @@
+"""
+Unit tests for the content-addressed audio cache
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.audio_cache import AudioCache
+from src.transcriber import YouTubeTranscriber
+
+
+@pytest.fixture
+def work_dir(tmp_path):
+    work = tmp_path / "work"
+    work.mkdir()
+    return work
+
+
+def _audio(directory, name, size):
+    path = directory / name
+    path.write_bytes(b"0" * size)
+    return path
+
+
+class TestAudioCache:
+    """Tests for AudioCache"""
+
+    def test_miss_then_hit(self, tmp_path, work_dir):
+        cache = AudioCache(tmp_path / "cache", max_bytes=1000)
+        assert cache.get("vid00000001", ["webm"], work_dir) is None
+
+        cache.put("vid00000001", _audio(work_dir, "vid00000001.webm", 100), "Title")
+        (work_dir / "vid00000001.webm").unlink()
+
+        path, title = cache.get("vid00000001", ["m4a", "webm"], work_dir)
+
+        assert path == work_dir / "vid00000001.webm"
+        assert path.stat().st_size == 100
+        assert title == "Title"
+        summary = cache.summary()
+        assert (summary["hits"], summary["misses"]) == (1, 1)
+        assert summary["bytes_saved"] == 100
+
+    def test_working_copy_deletion_keeps_cached_file(self, tmp_path, work_dir):
+        cache = AudioCache(tmp_path / "cache", max_bytes=1000)
+        cache.put("vid00000001", _audio(work_dir, "vid00000001.mp3", 100))
+
+        path, _ = cache.get("vid00000001", ["mp3"], work_dir)
+        path.unlink()
+
+        assert (tmp_path / "cache" / "vid00000001.mp3").exists()
+
+    def test_format_is_part_of_key(self, tmp_path, work_dir):
+        cache = AudioCache(tmp_path / "cache", max_bytes=1000)
+        cache.put("vid00000001", _audio(work_dir, "vid00000001.webm", 100))
+
+        assert cache.get("vid00000001", ["mp3"], work_dir) is None
+
+    def test_lru_eviction(self, tmp_path, work_dir):
+        cache = AudioCache(tmp_path / "cache", max_bytes=250)
+        cache.put("aaaaaaaaaaa", _audio(work_dir, "aaaaaaaaaaa.mp3", 100))
+        cache.put("bbbbbbbbbbb", _audio(work_dir, "bbbbbbbbbbb.mp3", 100))
+        cache.entries["aaaaaaaaaaa.mp3"]["last_access"] -= 10
+        cache.entries["bbbbbbbbbbb.mp3"]["last_access"] -= 20
+        cache.get("aaaaaaaaaaa", ["mp3"], work_dir)  # now most recently used
+
+        cache.put("ccccccccccc", _audio(work_dir, "ccccccccccc.mp3", 100))
+
+        assert set(cache.entries) == {"aaaaaaaaaaa.mp3", "ccccccccccc.mp3"}
+        assert not (tmp_path / "cache" / "bbbbbbbbbbb.mp3").exists()
+        assert cache.summary()["evictions"] == 1
+
+    def test_file_over_budget_is_not_cached(self, tmp_path, work_dir):
+        cache = AudioCache(tmp_path / "cache", max_bytes=50)
+        cache.put("vid00000001", _audio(work_dir, "vid00000001.mp3", 100))
+
+        assert cache.entries == {}
+
+    def test_index_persists(self, tmp_path, work_dir):
+        cache = AudioCache(tmp_path / "cache", max_bytes=1000)
+        cache.put("vid00000001", _audio(work_dir, "vid00000001.mp3", 100), "Title")
+        cache.get("vid00000001", ["mp3"], work_dir)
+
+        reloaded = AudioCache(tmp_path / "cache", max_bytes=1000)
+
+        assert "vid00000001.mp3" in reloaded.entries
+        assert reloaded.summary()["hits"] == 1
+
+
+class TestDownloadUsesCache:
+    """Tests for download_audio with the audio cache"""
+
+    @pytest.fixture
+    def transcriber(self, tmp_path):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.temp_dir = tmp_path
+        return transcriber
+
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_second_download_is_served_from_cache(self, mock_ydl, transcriber):
+        native = transcriber.temp_dir / "test1234567.webm"
+        native.write_bytes(b"webm")
+        instance = MagicMock()
+        instance.extract_info.return_value = {
+            "title": "Test Video",
+            "requested_downloads": [{"filepath": str(native)}],
+        }
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        url = "https://youtu.be/test1234567"
+        transcriber.download_audio(url, passthrough=True)
+        native.unlink()  # what a failed job's cleanup does
+
+        audio_path, title = transcriber.download_audio(url, passthrough=True)
+
+        assert audio_path == native
+        assert audio_path.exists()
+        assert title == "Test Video"
+        assert instance.extract_info.call_count == 1
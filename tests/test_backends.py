@@ -0,0 +1,158 @@
+"""
+Unit tests for transcription backends
+"""
+
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.audio import AudioChunk
+from src.backends import (
+    LocalWhisperBackend,
+    OpenAIWhisperBackend,
+    TranscriptionBackend,
+    create_backend,
+)
+from src.rate_limiter import RateLimiter
+from src.transcriber import YouTubeTranscriber
+
+
+@pytest.fixture
+def fake_faster_whisper(monkeypatch):
+    """Install a stand-in faster_whisper module that records how it is used"""
+    module = types.ModuleType("faster_whisper")
+    calls = {}
+
+    class WhisperModel:
+        def __init__(self, model_size, **kwargs):
+            calls["model"] = (model_size, kwargs)
+
+        def transcribe(self, path, **kwargs):
+            calls["transcribe"] = kwargs
+            segments = iter(
+                [
+                    MagicMock(start=0.0, end=1.5, text=" Hello "),
+                    MagicMock(start=1.5, end=3.0, text="world. "),
+                ]
+            )
+            return segments, MagicMock(duration=10.0, language="en")
+
+    class BatchedInferencePipeline:
+        def __init__(self, model):
+            self.model = model
+
+        def transcribe(self, path, **kwargs):
+            calls["batched"] = kwargs
+            return self.model.transcribe(path)
+
+    module.WhisperModel = WhisperModel
+    module.BatchedInferencePipeline = BatchedInferencePipeline
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    return calls
+
+
+class TestCreateBackend:
+    """Tests for backend selection"""
+
+    def test_openai_backend_uses_client_and_limiter(self):
+        client = MagicMock()
+        limiter = RateLimiter(enabled=False)
+
+        backend = create_backend("openai", client, limiter)
+
+        assert isinstance(backend, OpenAIWhisperBackend)
+        assert backend.client is client
+        assert backend.max_file_mb == 25
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class NoTranscribe(TranscriptionBackend):
+            def fingerprint(self):
+                return "partial"
+
+        with pytest.raises(TypeError):
+            NoTranscribe()
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown transcription backend"):
+            create_backend("cloud")
+
+    def test_local_backend_without_faster_whisper(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "faster_whisper", None)
+        with pytest.raises(RuntimeError, match="pip install faster-whisper"):
+            LocalWhisperBackend()
+
+
+class TestLocalWhisperBackend:
+    """Tests for the faster-whisper backend"""
+
+    def test_batched_transcription_reports_rtf(self, fake_faster_whisper, tmp_path):
+        backend = LocalWhisperBackend("tiny", "int8", cpu_threads=4, num_workers=2, batch_size=8)
+        stats = {}
+
+        text = backend.transcribe(tmp_path / "a.ogg", stats)
+
+        assert text == "Hello world."
+        assert fake_faster_whisper["model"] == (
+            "tiny",
+            {"device": "cpu", "compute_type": "int8", "cpu_threads": 4, "num_workers": 2},
+        )
+        assert fake_faster_whisper["batched"] == {"batch_size": 8}
+        assert stats["audio_seconds"] == 10.0
+        assert stats["language"] == "en"
+        assert stats["rtf"] is not None
+
+    def test_sequential_decoding_uses_vad(self, fake_faster_whisper, tmp_path):
+        backend = LocalWhisperBackend("tiny", batch_size=1)
+
+        backend.transcribe(tmp_path / "a.ogg")
+
+        assert "batched" not in fake_faster_whisper
+        assert fake_faster_whisper["transcribe"] == {"vad_filter": True}
+
+    def test_model_loaded_once(self, fake_faster_whisper, tmp_path):
+        backend = LocalWhisperBackend("tiny")
+
+        first = backend._load()
+        second = backend._load()
+
+        assert first[0] is second[0]
+
+
+class TestTranscriberBackendSelection:
+    """Tests for choosing the backend per job"""
+
+    @pytest.fixture
+    def transcriber(self):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.rate_limiter = RateLimiter(enabled=False)
+        return transcriber
+
+    def test_local_backend_does_not_split(self, transcriber, tmp_path):
+        audio_path = tmp_path / "long.ogg"
+        audio_path.write_bytes(b"0" * (26 * 1024 * 1024))
+        local = MagicMock(max_file_mb=None)
+
+        with patch("src.transcriber.create_backend", return_value=local):
+            chunks = transcriber._split_for_whisper(audio_path, backend="local")
+
+        assert [chunk.path for chunk in chunks] == [audio_path]
+
+    def test_single_file_goes_to_selected_backend(self, transcriber, tmp_path):
+        audio_path = tmp_path / "a.ogg"
+        audio_path.write_bytes(b"audio")
+        local = MagicMock(max_file_mb=None, label="local Whisper")
+        local.name = "local"
+        local.transcribe.return_value = "offline text"
+        stats = {}
+
+        with patch("src.transcriber.create_backend", return_value=local) as create:
+            text = transcriber._transcribe_chunks([AudioChunk(audio_path)], backend="local")
+            transcriber._transcribe_single_file(audio_path, stats=stats, backend="local")
+
+        assert text == "offline text"
+        create.assert_called_with("local", transcriber.client, transcriber.rate_limiter)
+        assert stats["backend"] == "local"
+        transcriber.client.audio.transcriptions.with_raw_response.create.assert_not_called()
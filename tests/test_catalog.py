@@ -0,0 +1,267 @@
+"""
+Unit tests for the transcript catalog
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.catalog import TranscriptCatalog, get_catalog, transcript_paths, video_id_from_path
+from src.transcriber import YouTubeTranscriber
+from src.utils import save_transcript
+
+
+def transcript(video_id, title="Talk", words=3):
+    return {
+        "video_id": video_id,
+        "url": f"https://youtu.be/{video_id}",
+        "title": title,
+        "language": "es",
+        "transcript": " ".join(["palabra"] * words),
+        "timestamp": "2025-10-12T10:00:00",
+        "index": 1,
+        "word_count": words,
+        "duration": 612.5,
+    }
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestTranscriptCatalog:
+    """Tests for TranscriptCatalog"""
+
+    def test_save_transcript_catalogs_the_files(self, tmp_path):
+        json_path, txt_path = save_transcript(transcript("vid00000001"), tmp_path)
+
+        entry = get_catalog(tmp_path).get("vid00000001")
+
+        assert entry["json_path"] == str(json_path.resolve())
+        assert entry["txt_path"] == str(txt_path.resolve())
+        assert entry["title"] == "Talk"
+        assert entry["word_count"] == 3
+        assert entry["duration"] == 612.5
+        assert entry["status"] == "complete"
+
+    def test_failed_write_is_not_cataloged(self, tmp_path):
+        with patch("src.utils._write_atomic", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                save_transcript(transcript("vid00000001"), tmp_path)
+
+        assert get_catalog(tmp_path).get("vid00000001") is None
+        assert not list(tmp_path.rglob("*.json"))
+
+    def test_resave_keeps_one_row_per_video(self, tmp_path):
+        save_transcript(transcript("vid00000001", words=3), tmp_path)
+        save_transcript(transcript("vid00000001", words=7), tmp_path)
+
+        catalog = get_catalog(tmp_path)
+
+        assert catalog.count() == 1
+        assert catalog.get("vid00000001")["word_count"] == 7
+
+    def test_new_catalog_indexes_existing_directory(self, tmp_path):
+        write_json(tmp_path / "01_Old.json", transcript("vid00000001", "Old"))
+        (tmp_path / "01_Old.txt").write_text("texto", encoding="utf-8")
+        (tmp_path / "02_Broken.json").write_text("{not json", encoding="utf-8")
+
+        catalog = TranscriptCatalog(tmp_path)
+
+        assert catalog.count() == 1
+        assert catalog.get("vid00000001")["title"] == "Old"
+
+    def test_files_changed_by_hand_are_picked_up(self, tmp_path):
+        catalog = TranscriptCatalog(tmp_path)
+        json_path, _ = save_transcript(transcript("vid00000001"), tmp_path)
+
+        copied, _ = transcript_paths(tmp_path, "vid00000002")
+        write_json(copied, transcript("vid00000002", "Copied"))
+        json_path.unlink()
+
+        assert catalog.get("vid00000002")["title"] == "Copied"
+        assert catalog.get("vid00000001") is None
+        assert catalog.count() == 1
+
+    def test_rebuild_prefers_newest_file(self, tmp_path):
+        catalog = TranscriptCatalog(tmp_path)
+        write_json(tmp_path / "01_Talk.json", transcript("vid00000001", "First"))
+        os.utime(tmp_path / "01_Talk.json", (1, 1))
+        write_json(tmp_path / "02_Talk.json", transcript("vid00000001", "Second"))
+        write_json(tmp_path / "03_NoId.json", {"title": "No id"})
+
+        report = catalog.rebuild()
+
+        assert report == {"files": 3, "indexed": 1, "unreadable": 1}
+        assert catalog.get("vid00000001")["title"] == "Second"
+
+    def test_remove(self, tmp_path):
+        save_transcript(transcript("vid00000001"), tmp_path)
+        catalog = get_catalog(tmp_path)
+
+        removed = catalog.remove("vid00000001")
+
+        assert removed["title"] == "Talk"
+        assert catalog.remove("vid00000001") is None
+        assert catalog.count() == 0
+
+    def test_video_id_at_does_not_read_the_file(self, tmp_path):
+        write_json(tmp_path / "01_Old.json", transcript("vid00000001", "Old"))
+        catalog = get_catalog(tmp_path)
+        corrupt, _ = transcript_paths(tmp_path, "dQw4w9WgXcQ")
+        corrupt.parent.mkdir()
+        corrupt.write_text("{half writ", encoding="utf-8")
+
+        assert catalog.video_id_at(tmp_path / "01_Old.json") == "vid00000001"
+        assert catalog.video_id_at(corrupt) == "dQw4w9WgXcQ"
+        assert catalog.video_id_at(tmp_path / "02_Unknown.json") is None
+
+
+class TestStorageLayout:
+    """Transcripts are stored by video ID in prefix shards"""
+
+    def test_paths_are_computed_from_the_video_id(self, tmp_path):
+        json_path, txt_path = save_transcript(transcript("dQw4w9WgXcQ"), tmp_path)
+
+        assert (json_path, txt_path) == transcript_paths(tmp_path, "dQw4w9WgXcQ")
+        assert json_path == tmp_path / "dq" / "dQw4w9WgXcQ.542.json"
+        assert txt_path.read_text(encoding="utf-8").startswith("Title: Talk")
+        assert video_id_from_path(json_path) == "dQw4w9WgXcQ"
+
+    def test_ids_differing_only_in_case_never_share_a_file(self, tmp_path):
+        first, _ = save_transcript(transcript("aBcdefghijk", "First"), tmp_path)
+        second, _ = save_transcript(transcript("AbCdefghijk", "Second"), tmp_path)
+
+        # Same shard, and different names even on a case-insensitive filesystem
+        assert first.parent == second.parent
+        assert first.name.lower() != second.name.lower()
+        assert video_id_from_path(str(second).lower()) == "AbCdefghijk"
+        assert get_catalog(tmp_path).get("aBcdefghijk")["title"] == "First"
+        assert get_catalog(tmp_path).get("AbCdefghijk")["title"] == "Second"
+
+    @pytest.mark.parametrize("video_id", ["", "../etc", "a/b", "id.json", None])
+    def test_unsafe_video_ids_are_rejected(self, tmp_path, video_id):
+        with pytest.raises(ValueError):
+            transcript_paths(tmp_path, video_id)
+
+    def test_parallel_saves_of_one_video(self, tmp_path):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(
+                pool.map(
+                    lambda words: save_transcript(transcript("vid00000001", words=words), tmp_path),
+                    range(1, 33),
+                )
+            )
+
+        files = sorted(path.name for path in (tmp_path / "vi").iterdir())
+        assert files == ["vid00000001.json", "vid00000001.txt"]
+        data = json.loads((tmp_path / "vi" / "vid00000001.json").read_text(encoding="utf-8"))
+        assert get_catalog(tmp_path).count() == 1
+        assert data["word_count"] == len(data["transcript"].split())
+
+    def test_migrate_flat_layout(self, tmp_path):
+        write_json(tmp_path / "01_Old.json", transcript("vid00000001", "Old"))
+        (tmp_path / "01_Old.txt").write_text("texto", encoding="utf-8")
+        write_json(tmp_path / "01_Other.json", transcript("vid00000002", "First try"))
+        os.utime(tmp_path / "01_Other.json", (1, 1))
+        write_json(tmp_path / "02_Other.json", transcript("vid00000002", "Second try"))
+        (tmp_path / "03_Broken.json").write_text("{not json", encoding="utf-8")
+        catalog = TranscriptCatalog(tmp_path)
+
+        preview = catalog.migrate_flat_layout(dry_run=True)
+        assert (tmp_path / "01_Old.json").exists()
+
+        report = catalog.migrate_flat_layout()
+
+        assert report == preview
+        assert sorted(report["moved"]) == [
+            ("01_Old.json", "vi/vid00000001.json"),
+            ("02_Other.json", "vi/vid00000002.json"),
+        ]
+        assert report["duplicates"] == ["01_Other.json"]
+        assert report["unreadable"] == ["03_Broken.json"]
+        assert (tmp_path / "vi" / "vid00000001.txt").read_text(encoding="utf-8") == "texto"
+        assert catalog.get("vid00000002")["title"] == "Second try"
+        assert catalog.get("vid00000001")["json_path"] == str(tmp_path / "vi" / "vid00000001.json")
+
+
+class TestListing:
+    """Metadata-only listing: sort, filter and pagination"""
+
+    @pytest.fixture
+    def catalog(self, tmp_path):
+        for i, (title, words, duration) in enumerate(
+            [
+                ("Python básico", 900, 600.0),
+                ("apuntes 100%", 120, None),
+                ("Rust avanzado", 400, 30.0),
+            ],
+            1,
+        ):
+            data = transcript(f"vid0000000{i}", title, words)
+            data["timestamp"] = f"2025-10-1{i}T10:00:00"
+            data["duration"] = duration
+            save_transcript(data, tmp_path)
+        return get_catalog(tmp_path)
+
+    def test_sort_orders(self, catalog):
+        def titles(**kwargs):
+            return [entry["title"] for entry in catalog.query(**kwargs)]
+
+        assert titles() == ["Rust avanzado", "apuntes 100%", "Python básico"]
+        assert titles(sort="title", descending=False) == [
+            "apuntes 100%",
+            "Python básico",
+            "Rust avanzado",
+        ]
+        assert titles(sort="word_count") == ["Python básico", "Rust avanzado", "apuntes 100%"]
+        # Unknown durations come last in either direction
+        assert titles(sort="duration", descending=False)[-1] == "apuntes 100%"
+        with pytest.raises(ValueError):
+            catalog.query(sort="transcript")
+
+    def test_search_and_pagination(self, catalog):
+        assert [e["video_id"] for e in catalog.query("AVANZADO")] == ["vid00000003"]
+        assert [e["video_id"] for e in catalog.query("vid00000001")] == ["vid00000001"]
+        assert [e["title"] for e in catalog.query("0%")] == ["apuntes 100%"]
+        assert catalog.query("_") == []
+        assert catalog.count("n") == 3
+
+        pages = [catalog.query(limit=2, offset=offset) for offset in (0, 2)]
+        assert [len(page) for page in pages] == [2, 1]
+        assert pages[1][0]["title"] == "Python básico"
+
+    def test_listing_never_reads_transcripts(self, catalog):
+        with patch("builtins.open", side_effect=AssertionError("transcripts must not be read")):
+            entries = catalog.query(limit=10)
+            totals = catalog.totals()
+
+        assert len(entries) == 3
+        assert totals == {"transcripts": 3, "words": 1420, "seconds": 630.0}
+
+
+class TestDuplicateCheck:
+    """The duplicate check is a catalog lookup"""
+
+    def test_check_if_already_transcribed(self, tmp_path):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.output_dir = tmp_path
+        json_path, txt_path = save_transcript(transcript("vid00000001"), tmp_path)
+
+        with patch("json.load", side_effect=AssertionError("transcripts must not be parsed")):
+            existing = transcriber._check_if_already_transcribed("vid00000001")
+            missing = transcriber._check_if_already_transcribed("vid00000002")
+
+        assert existing == {
+            "video_id": "vid00000001",
+            "title": "Talk",
+            "json_path": str(json_path.resolve()),
+            "txt_path": str(txt_path.resolve()),
+            "word_count": 3,
+            "timestamp": "2025-10-12T10:00:00",
+        }
+        assert missing is None
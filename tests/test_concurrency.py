@@ -0,0 +1,59 @@
+"""
+Unit tests for the adaptive concurrency limiter
+"""
+
+import threading
+import time
+
+from src.concurrency import AdaptiveConcurrency
+
+
+class TestAdaptiveConcurrency:
+    """Tests for AdaptiveConcurrency"""
+
+    def test_rate_limit_halves_limit(self):
+        limiter = AdaptiveConcurrency(8)
+
+        limiter.on_rate_limit()
+        assert limiter.limit == 4
+        limiter.on_rate_limit()
+        limiter.on_rate_limit()
+        limiter.on_rate_limit()
+        assert limiter.limit == 1
+        assert limiter.rate_limits == 4
+
+    def test_successes_grow_limit_back(self):
+        limiter = AdaptiveConcurrency(4, increase_after=2)
+        limiter.on_rate_limit()
+
+        for _ in range(4):
+            limiter.on_success()
+        assert limiter.limit == 4
+
+        limiter.on_success()
+        limiter.on_success()
+        assert limiter.limit == 4  # never above max_limit
+
+    def test_blocks_above_limit(self):
+        limiter = AdaptiveConcurrency(2)
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def work():
+            with limiter:
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 2
+        assert limiter.active == 0
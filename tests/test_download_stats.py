@@ -0,0 +1,150 @@
+"""
+Unit tests for the download strategy success cache
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.download_stats import DownloadStrategyStats
+from src.transcriber import YouTubeTranscriber
+
+STRATEGIES = [{"label": "first"}, {"label": "second"}, {"label": "third"}]
+
+
+class TestDownloadStrategyStats:
+    """Tests for DownloadStrategyStats class"""
+
+    @pytest.fixture
+    def stats(self, tmp_path):
+        return DownloadStrategyStats(tmp_path / "stats.json")
+
+    def test_untried_keeps_default_order(self, stats):
+        assert [s["label"] for s in stats.order(STRATEGIES)] == ["first", "second", "third"]
+
+    def test_successful_strategy_moves_first(self, stats):
+        stats.record_failure("first")
+        stats.record_success("third", 2.0)
+
+        assert [s["label"] for s in stats.order(STRATEGIES)] == ["third", "second", "first"]
+
+    def test_latency_breaks_ties(self, stats):
+        stats.record_success("first", 9.0)
+        stats.record_success("second", 1.0)
+
+        assert stats.order(STRATEGIES)[0]["label"] == "second"
+
+    def test_persists_across_instances(self, stats, tmp_path):
+        stats.record_success("second", 1.5)
+
+        reloaded = DownloadStrategyStats(tmp_path / "stats.json")
+
+        assert reloaded.order(STRATEGIES)[0]["label"] == "second"
+        assert reloaded.avg_latency("second") == 1.5
+
+    def test_unavailable_expires(self, tmp_path):
+        stats = DownloadStrategyStats(tmp_path / "stats.json", unavailable_ttl=0)
+        stats.mark_unavailable("first")
+        assert stats.is_unavailable("first") is False
+
+        stats.unavailable_ttl = 3600
+        stats.mark_unavailable("first")
+        assert stats.is_unavailable("first") is True
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        (tmp_path / "stats.json").write_text("{not json")
+
+        stats = DownloadStrategyStats(tmp_path / "stats.json")
+
+        assert stats.summary() == []
+
+
+class TestAdaptiveDownload:
+    """Tests for download_audio strategy selection"""
+
+    @pytest.fixture
+    def transcriber(self, tmp_path):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.temp_dir = tmp_path
+        transcriber.download_stats = DownloadStrategyStats(tmp_path / "stats.json")
+        return transcriber
+
+    @patch("src.transcriber.time.sleep")
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_learned_strategy_tried_first(self, mock_ydl, mock_sleep, transcriber):
+        """A strategy that succeeded before is tried first, with no backoff"""
+        transcriber.download_stats.record_success("Basic mode", 1.0)
+        (transcriber.temp_dir / "test123.mp3").touch()
+
+        instance = MagicMock()
+        instance.extract_info.return_value = {"title": "Test Video"}
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        transcriber.download_audio("https://youtu.be/test123")
+
+        opts = mock_ydl.call_args[0][0]
+        assert "http_headers" not in opts  # basic mode strips advanced options
+        assert mock_ydl.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("src.transcriber.time.sleep")
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_cookie_errors_skip_without_sleep(self, mock_ydl, mock_sleep, transcriber):
+        """Missing browser cookies are marked unavailable and never waited on"""
+        for label in ["Advanced headers (no cookies)", "Extended timeout", "Basic mode"]:
+            transcriber.download_stats.mark_unavailable(label)
+
+        instance = MagicMock()
+        instance.extract_info.side_effect = Exception("could not find chrome cookies database")
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        with pytest.raises(Exception):
+            transcriber.download_audio("https://youtu.be/test123")
+
+        mock_sleep.assert_not_called()
+        assert transcriber.download_stats.is_unavailable("Chrome cookies")
+        assert transcriber.download_stats.is_unavailable("Firefox cookies")
+
+    @patch("src.transcriber.time.sleep")
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_missing_cookies_file_skips_without_sleep(
+        self, mock_ydl, mock_sleep, transcriber, tmp_path
+    ):
+        """No ~/.youtube_cookies.txt: no backoff before the strategy, and nothing is remembered"""
+        for label in ["Extended timeout", "Basic mode", "Chrome cookies", "Firefox cookies"]:
+            transcriber.download_stats.mark_unavailable(label)
+
+        instance = MagicMock()
+        instance.extract_info.side_effect = Exception("HTTP Error 403")
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        with patch("src.transcriber.Path.home", return_value=tmp_path), pytest.raises(Exception):
+            transcriber.download_audio("https://youtu.be/test123")
+
+        assert mock_ydl.call_count == 1
+        mock_sleep.assert_not_called()
+        assert not transcriber.download_stats.is_unavailable("Local cookies file")
+
+    @patch("src.transcriber.time.sleep")
+    @patch("src.transcriber.yt_dlp.YoutubeDL")
+    def test_new_cookies_file_is_used_on_next_run(
+        self, mock_ydl, mock_sleep, transcriber, tmp_path
+    ):
+        """A cookies file exported after a run without one is used straight away"""
+        for label in ["Extended timeout", "Basic mode", "Chrome cookies", "Firefox cookies"]:
+            transcriber.download_stats.mark_unavailable(label)
+
+        instance = MagicMock()
+        instance.extract_info.side_effect = Exception("HTTP Error 403")
+        mock_ydl.return_value.__enter__.return_value = instance
+
+        with patch("src.transcriber.Path.home", return_value=tmp_path):
+            with pytest.raises(Exception):
+                transcriber.download_audio("https://youtu.be/test123")
+            (tmp_path / ".youtube_cookies.txt").write_text("# Netscape HTTP Cookie File\n")
+            with pytest.raises(Exception):
+                transcriber.download_audio("https://youtu.be/test123")
+
+        used = [call.args[0].get("cookiesfile") for call in mock_ydl.call_args_list]
+        assert used.count(str(tmp_path / ".youtube_cookies.txt")) == 1
@@ -0,0 +1,118 @@
+"""
+Unit tests for the persistent embedding cache
+"""
+
+import itertools
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.embedding_cache import EmbeddingCache
+from src.rag_engine import CachedEmbeddings, RAGEngine
+
+
+def vectors(*values, dim=4):
+    return [[value] * dim for value in values]
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return EmbeddingCache(tmp_path / "embeddings", max_bytes=1024 * 1024)
+
+    def test_roundtrip_with_normalised_text(self, cache):
+        cache.put_many("model-a", ["hola  mundo\n", "adiós"], vectors(0.25, -0.5))
+
+        found = cache.get_many("model-a", ["hola mundo", "otro", "adiós"])
+
+        assert np.allclose(found[0], [0.25] * 4)
+        assert found[1] is None
+        assert found[2].dtype == np.float32
+        assert cache.get_many("model-b", ["hola mundo"]) == [None]
+        assert cache.summary()["hits"] == 2
+        assert cache.summary()["misses"] == 2
+
+    def test_float16_rows_survive_a_restart(self, cache):
+        cache.put_many("model-a", ["uno", "dos"], vectors(0.1, 0.2))
+
+        reloaded = EmbeddingCache(cache.cache_dir)
+
+        assert (cache.cache_dir / "model-a.float16").stat().st_size == 2 * 4 * 2
+        assert np.allclose(reloaded.get_many("model-a", ["dos"])[0], [0.2] * 4, atol=1e-3)
+
+    def test_eviction_reuses_rows(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, max_bytes=2 * 4 * 4, dtype="float32")
+        with patch("src.embedding_cache.time.time", side_effect=itertools.count()):
+            cache.put_many("model-a", ["uno", "dos"], vectors(1, 2))
+            cache.get_many("model-a", ["uno"])
+
+            cache.put_many("model-a", ["tres"], vectors(3))
+
+        assert cache.get_many("model-a", ["dos"]) == [None]
+        assert cache.get_many("model-a", ["uno", "tres"])[1][0] == 3
+        assert cache.summary()["evictions"] == 1
+        assert (tmp_path / "model-a.float32").stat().st_size == 2 * 4 * 4
+
+    def test_compaction(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, max_bytes=4 * 4 * 4, dtype="float32")
+        cache.put_many("model-a", [f"t{i}" for i in range(4)], vectors(0, 1, 2, 3))
+        cache.max_bytes = 4 * 4
+
+        with patch("src.embedding_cache.COMPACT_MIN_ROWS", 1):
+            cache.put_many("model-a", ["t3"], vectors(3))
+
+        assert (tmp_path / "model-a.float32").stat().st_size == 4 * 4
+        assert EmbeddingCache(tmp_path).get_many("model-a", ["t3"])[0][0] == 3
+
+    def test_disabled_by_zero_budget(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, max_bytes=0)
+
+        cache.put_many("model-a", ["uno"], vectors(1))
+
+        assert cache.get_many("model-a", ["uno"]) == [None]
+
+
+class TestCachedEmbeddings:
+    """Re-indexing unchanged text makes no embedding calls"""
+
+    def test_only_misses_are_embedded(self, isolated_embedding_cache):
+        base = MagicMock()
+        base.embed_documents.side_effect = lambda texts: vectors(*range(len(texts)))
+        embeddings = CachedEmbeddings(base, "model-a", isolated_embedding_cache)
+
+        embeddings.embed_documents(["uno", "dos"])
+        result = embeddings.embed_documents(["dos", "tres"])
+
+        assert base.embed_documents.call_args.args == (["tres"],)
+        assert result == vectors(1, 0)
+        assert (embeddings.hits, embeddings.misses) == (1, 3)
+
+    def test_rebuilding_an_unchanged_library(self, tmp_path):
+        with patch("src.rag_engine.create_embeddings") as openai_embeddings, patch(
+            "src.rag_engine.ChatOpenAI"
+        ):
+            engine = RAGEngine()
+        base = openai_embeddings.return_value
+        base.embed_documents.side_effect = lambda texts: vectors(*range(len(texts)))
+        transcripts = [
+            {"video_id": "vid0", "title": "Video", "url": "https://youtu.be/vid0", "transcript": t}
+            for t in ["Una charla corta sobre Python"]
+        ]
+        messages = []
+
+        with patch("src.rag_engine.VECTOR_DB_DIR", tmp_path / "vector_db"), patch(
+            "src.rag_engine.Chroma"
+        ) as chroma, patch.object(engine, "load_transcripts", return_value=transcripts):
+            chroma.from_texts.side_effect = lambda texts, embedding, **kwargs: (
+                embedding.embed_documents(texts)
+            )
+            first = engine.index_transcripts()
+            second = engine.index_transcripts(progress_callback=messages.append, rebuild=True)
+
+        assert (first["cache_hits"], first["cache_misses"]) == (0, 1)
+        assert (second["cache_hits"], second["cache_misses"]) == (1, 0)
+        assert base.embed_documents.call_count == 1
+        assert "🧠 Embedding cache: 1 hits, 0 misses (embedded via API)" in messages
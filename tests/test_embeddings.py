@@ -0,0 +1,214 @@
+"""
+Unit tests for the embedding providers
+"""
+
+import sys
+import threading
+import time
+import types
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.embeddings import (
+    LocalEmbeddings,
+    OpenAIBatchEmbeddings,
+    create_embeddings,
+    embedding_tag,
+    pack_batches,
+)
+from src.rate_limiter import RateLimitedResource, RateLimiter
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeEmbeddingsResource:
+    """Embeddings resource returning [len(text)] for every input"""
+
+    def __init__(self, fail=lambda texts: None, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def create(self, model, input, encoding_format):
+        with self.lock:
+            self.calls.append(list(input))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            error = self.fail(input)
+            if error:
+                raise error
+            data = [SimpleNamespace(index=i, embedding=[len(t)]) for i, t in enumerate(input)]
+            return SimpleNamespace(data=list(reversed(data)))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestPackBatches:
+    """Tests for pack_batches"""
+
+    def test_token_budget(self):
+        texts = ["a" * 400, "b" * 400, "c" * 400, "d" * 2000]  # ~101, 101, 101, 501 tokens
+
+        assert pack_batches(texts, max_tokens=250) == [[0, 1], [2], [3]]
+
+    def test_input_limit(self):
+        assert pack_batches(["x"] * 5, max_tokens=1000, max_items=2) == [[0, 1], [2, 3], [4]]
+
+    def test_empty(self):
+        assert pack_batches([]) == []
+
+
+class TestOpenAIBatchEmbeddings:
+    """Tests for OpenAIBatchEmbeddings"""
+
+    def test_concurrent_batches_keep_input_order(self):
+        resource = FakeEmbeddingsResource(delay=0.05)
+        embeddings = OpenAIBatchEmbeddings(resource, concurrency=4, batch_tokens=1000)
+        messages = []
+        embeddings.progress_callback = messages.append
+        texts = ["x" * (n % 50 + 1) * 40 for n in range(40)]
+
+        vectors = embeddings.embed_documents(texts)
+
+        assert vectors == [[len(text)] for text in texts]
+        assert resource.max_in_flight > 1
+        assert len(messages) == len(resource.calls) > 1
+        assert messages[-1].startswith(f"🧠 Embedded batch {len(resource.calls)}/")
+
+    def test_failed_batch_is_retried_item_by_item(self):
+        resource = FakeEmbeddingsResource(
+            fail=lambda texts: ValueError("bad input") if len(texts) > 1 else None
+        )
+        embeddings = OpenAIBatchEmbeddings(resource, concurrency=1)
+
+        assert embeddings.embed_documents(["uno", "dos", "tres"]) == [[3], [3], [4]]
+        assert resource.calls == [["uno", "dos", "tres"], ["uno"], ["dos"], ["tres"]]
+
+    def test_rate_limited_batch_is_retried_whole(self):
+        attempts = iter([RateLimitError("429"), None])
+        resource = FakeEmbeddingsResource(fail=lambda texts: next(attempts))
+        embeddings = OpenAIBatchEmbeddings(resource, max_retries=3)
+
+        assert embeddings.embed_documents(["uno", "dos"]) == [[3], [3]]
+        assert resource.calls == [["uno", "dos"], ["uno", "dos"]]
+
+    def test_rate_limit_retry_waits_with_limiter_disabled(self):
+        """RATE_LIMIT_ENABLED=false still waits out Retry-After before retrying"""
+        calls = []
+        error = RateLimitError("429")
+        error.response = SimpleNamespace(headers={"retry-after-ms": "100"})
+
+        def fail(texts):
+            calls.append(time.monotonic())
+            return error if len(calls) == 1 else None
+
+        def raw_create(**kwargs):
+            response = resource.create(**kwargs)
+            return SimpleNamespace(headers={}, parse=lambda: response)
+
+        resource = FakeEmbeddingsResource(fail=fail)
+        resource.with_raw_response = SimpleNamespace(create=raw_create)
+        client = RateLimitedResource(resource, "embeddings", RateLimiter(enabled=False))
+        embeddings = OpenAIBatchEmbeddings(client, max_retries=3)
+
+        assert embeddings.embed_documents(["uno", "dos"]) == [[3], [3]]
+        assert calls[1] - calls[0] >= 0.1
+
+    def test_failing_chunk_fails_the_run(self):
+        resource = FakeEmbeddingsResource(
+            fail=lambda texts: ValueError("bad input") if "mala" in texts else None
+        )
+        embeddings = OpenAIBatchEmbeddings(resource, concurrency=2)
+
+        with pytest.raises(ValueError, match="bad input"):
+            embeddings.embed_documents(["buena", "mala"])
+
+
+@pytest.fixture
+def fake_fastembed(monkeypatch):
+    """Stand-in fastembed module recording the model calls"""
+    calls = {"embed": [], "query_embed": []}
+    module = types.ModuleType("fastembed")
+
+    class TextEmbedding:
+        def __init__(self, model_name, threads=None):
+            calls["model"] = (model_name, threads)
+
+        def embed(self, documents, batch_size=256):
+            calls["embed"].append((list(documents), batch_size))
+            return (np.array([len(d), 1.0]) for d in documents)
+
+        def query_embed(self, query):
+            calls["query_embed"].append(list(query))
+            return (np.array([len(q), 0.0]) for q in query)
+
+    module.TextEmbedding = TextEmbedding
+    monkeypatch.setitem(sys.modules, "fastembed", module)
+    return calls
+
+
+class TestLocalEmbeddings:
+    """Tests for the ONNX CPU provider"""
+
+    def test_documents_are_embedded_in_batches(self, fake_fastembed):
+        embeddings = LocalEmbeddings("minilm", threads=2, batch_size=2)
+        messages = []
+        embeddings.progress_callback = messages.append
+
+        vectors = embeddings.embed_documents(["a", "bb", "ccc"])
+
+        assert vectors == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert fake_fastembed["model"] == ("minilm", 2)
+        assert fake_fastembed["embed"] == [(["a", "bb"], 2), (["ccc"], 2)]
+        assert messages[-1] == "🧠 Embedded batch 2/2 (1 chunks)"
+
+    def test_repeated_queries_skip_the_model(self, fake_fastembed):
+        embeddings = LocalEmbeddings("minilm", threads=0)
+
+        first = embeddings.embed_query("python")
+        second = embeddings.embed_query("python")
+
+        assert first == second == [6.0, 0.0]
+        assert fake_fastembed["query_embed"] == [["python"]]
+        assert fake_fastembed["model"] == ("minilm", None)
+
+    def test_missing_fastembed(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "fastembed", None)
+        with pytest.raises(RuntimeError, match="pip install fastembed"):
+            LocalEmbeddings()
+
+
+class TestCreateEmbeddings:
+    """Tests for provider selection"""
+
+    def test_openai_provider(self):
+        client = MagicMock()
+
+        embeddings = create_embeddings("openai", client)
+
+        assert isinstance(embeddings, OpenAIBatchEmbeddings)
+        assert embedding_tag("openai").startswith("openai:")
+
+    def test_local_provider(self, fake_fastembed, monkeypatch):
+        monkeypatch.setattr("src.embeddings._local_embeddings", None)
+
+        embeddings = create_embeddings("local")
+
+        assert isinstance(embeddings, LocalEmbeddings)
+        assert create_embeddings("local") is embeddings
+        assert embedding_tag("local") == f"local:{embeddings.model}"
+
+    def test_unknown_provider(self):
+        with pytest.raises(ValueError, match="Unknown embedding provider"):
+            create_embeddings("cloud")
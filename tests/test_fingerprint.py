@@ -0,0 +1,216 @@
+"""
+Unit tests for acoustic fingerprint re-upload detection
+"""
+
+import json
+import shutil
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from src.fingerprint import FingerprintIndex, compute_fingerprint, similarity
+from src.transcriber import YouTubeTranscriber
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def make_talk(path, seed, *filters):
+    """80 s of speech-like pink noise with a seed-dependent loudness envelope"""
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"anoisesrc=seed={seed}:d=80:c=pink:r=16000",
+            "-af",
+            f"volume='0.3+0.7*abs(sin(t*1.3+{seed})*sin(t*0.37*{seed}+1))':eval=frame,"
+            "lowpass=3500",
+            "-ac",
+            "1",
+            str(path),
+            "-y",
+        ],
+        check=True,
+    )
+    for extra in filters:
+        subprocess.run(["ffmpeg", "-v", "error", "-i", str(path), *extra, "-y"], check=True)
+
+
+@pytest.fixture(scope="module")
+def talks(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("talks")
+    original = directory / "talk1.wav"
+    make_talk(
+        original,
+        1,
+        ["-af", "volume=0.5,highpass=300", "-b:a", "64k", str(directory / "talk1.mp3")],
+        ["-ss", "0.6", "-c:a", "libopus", "-b:a", "64k", str(directory / "talk1_late.ogg")],
+    )
+    make_talk(directory / "talk2.wav", 2)
+    return directory
+
+
+@needs_ffmpeg
+class TestComputeFingerprint:
+    """Tests for the fingerprint itself"""
+
+    def test_reencode_matches(self, talks):
+        original = compute_fingerprint(talks / "talk1.wav")
+        reencoded = compute_fingerprint(talks / "talk1.mp3")
+
+        best = max(similarity(probe, original["fingerprint"]) for probe in reencoded["probes"])
+        assert best >= 0.9
+
+    def test_trimmed_start_matches(self, talks):
+        original = compute_fingerprint(talks / "talk1.wav")
+        trimmed = compute_fingerprint(talks / "talk1_late.ogg")
+
+        best = max(similarity(probe, original["fingerprint"]) for probe in trimmed["probes"])
+        assert best >= 0.9
+
+    def test_different_audio_does_not_match(self, talks):
+        first = compute_fingerprint(talks / "talk1.wav")
+        second = compute_fingerprint(talks / "talk2.wav")
+
+        assert max(similarity(probe, first["fingerprint"]) for probe in second["probes"]) < 0.8
+
+    def test_undecodable_audio(self, tmp_path):
+        audio_path = tmp_path / "broken.ogg"
+        audio_path.write_bytes(b"not audio")
+
+        assert compute_fingerprint(audio_path) is None
+
+
+class TestFingerprintIndex:
+    """Tests for FingerprintIndex"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        return FingerprintIndex(tmp_path / "fingerprints.json", min_similarity=0.9)
+
+    def test_lookup_tolerates_flipped_bits(self, index):
+        index.add("original", 0x0123456789ABCDEF0123456789ABCDEF, duration=600, title="Talk")
+
+        match = index.lookup([0x0123456789ABCDEF0123456789ABCDEF ^ 0b1011], duration=603)
+
+        assert match["video_id"] == "original"
+        assert match["similarity"] == pytest.approx(1 - 3 / 128)
+
+    def test_duration_mismatch_is_not_a_match(self, index):
+        index.add("original", 0x0123456789ABCDEF0123456789ABCDEF, duration=600)
+
+        assert index.lookup([0x0123456789ABCDEF0123456789ABCDEF], duration=900) is None
+
+    def test_exclude_self(self, index):
+        index.add("original", 0xFFFF)
+
+        assert index.lookup([0xFFFF], exclude="original") is None
+
+    def test_persisted_with_aliases(self, index):
+        index.add("original", 0xABCDEF, duration=60)
+        index.add_alias("mirror", "original")
+
+        reloaded = FingerprintIndex(index.index_file)
+
+        assert reloaded.lookup([0xABCDEF])["video_id"] == "original"
+        assert reloaded.alias_of("mirror") == "original"
+        assert len(index.journal_file.read_text().splitlines()) == 2
+
+    def test_journal_is_compacted(self, index):
+        with patch("src.fingerprint.JOURNAL_COMPACT_EVERY", 3):
+            index.add("original", 0xABCDEF, duration=60)
+            index.add_alias("mirror", "original")
+            assert not index.index_file.exists()
+            index.add("other", 0x123456, duration=60)
+
+        assert not index.journal_file.exists()
+        data = json.loads(index.index_file.read_text())
+        assert sorted(data["entries"]) == ["original", "other"]
+        assert data["aliases"] == {"mirror": "original"}
+
+    def test_torn_journal_line_is_ignored(self, index):
+        index.add("original", 0xABCDEF, duration=60)
+        with open(index.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "video_id": "ha')
+
+        reloaded = FingerprintIndex(index.index_file)
+
+        assert reloaded.lookup([0xABCDEF])["video_id"] == "original"
+
+    def test_remove_drops_aliases(self, index):
+        index.add("original", 0xABCDEF)
+        index.add_alias("mirror", "original")
+
+        index.remove("original")
+
+        assert index.lookup([0xABCDEF]) is None
+        assert index.alias_of("mirror") is None
+
+
+@needs_ffmpeg
+class TestTranscriberLinksReuploads:
+    """A re-upload is linked to the existing transcript instead of transcribed"""
+
+    @pytest.fixture
+    def transcriber(self, tmp_path):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.output_dir = tmp_path / "out"
+        transcriber.temp_dir = tmp_path / "temp"
+        transcriber.output_dir.mkdir()
+        transcriber.temp_dir.mkdir()
+        transcriber._prepare_audio = lambda path, cb=None: {"path": path, "prepared": False}
+        transcriber.transcribe_audio = (
+            lambda path, cb=None, reports=None, backend=None, segments=None: "texto"
+        )
+        return transcriber
+
+    def test_reupload_is_linked(self, transcriber, talks, isolated_fingerprint_index):
+        def download(url, progress_callback=None):
+            source = "talk1.wav" if url.endswith("orig0000001") else "talk1.mp3"
+            audio_path = transcriber.temp_dir / source
+            shutil.copy(talks / source, audio_path)
+            return audio_path, "Talk"
+
+        transcriber.download_audio = download
+        messages = []
+
+        first = transcriber.process_video("https://youtu.be/orig0000001")
+        second = transcriber.process_video(
+            "https://youtu.be/copy0000001", progress_callback=messages.append
+        )
+
+        assert first["success"] and "duplicate_of" not in first
+        assert second["skipped"] is True
+        assert second["duplicate_of"] == "orig0000001"
+        assert second["json_path"] == first["json_path"]
+        assert "⏭️  Skipped: Talk (re-upload of orig0000001)" in messages
+        assert not (transcriber.temp_dir / "talk1.mp3").exists()
+        assert len(list(transcriber.output_dir.rglob("*.json"))) == 1
+
+        # The link is remembered, so the re-upload is skipped before downloading
+        assert transcriber._skip_result_if_exists("copy0000001")["duplicate_of"] == "orig0000001"
+
+    def test_force_transcribes_again(self, transcriber, talks):
+        def download(url, progress_callback=None):
+            audio_path = transcriber.temp_dir / f"{url[-11:]}.wav"
+            shutil.copy(talks / "talk1.wav", audio_path)
+            return audio_path, "Talk"
+
+        transcriber.download_audio = download
+
+        transcriber.process_video("https://youtu.be/orig0000001")
+        second = transcriber.process_video("https://youtu.be/copy0000001", skip_if_exists=False)
+
+        assert second["success"] and not second.get("skipped")
+
+    def test_disabled(self, transcriber, talks):
+        audio_path = transcriber.temp_dir / "talk1.wav"
+        shutil.copy(talks / "talk1.wav", audio_path)
+
+        with patch("src.transcriber.FINGERPRINT_ENABLED", False):
+            assert transcriber._match_reupload("vid", audio_path) == (None, None)
@@ -39,7 +39,7 @@ class TestRagEngineLogging:
 
         with patch.object(rag_mod, "TRANSCRIPTS_DIR", tmp_path), patch.object(
             rag_mod, "logger"
-        ) as mock_logger, patch.object(rag_mod, "OpenAIEmbeddings"), patch.object(
+        ) as mock_logger, patch.object(rag_mod, "create_embeddings"), patch.object(
             rag_mod, "ChatOpenAI"
         ), patch.object(
             rag_mod, "ConversationBufferMemory"
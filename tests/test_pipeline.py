@@ -0,0 +1,126 @@
+"""
+Unit tests for the pipelined batch engine
+"""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.pipeline import BatchPipeline
+from src.transcriber import YouTubeTranscriber
+
+
+class TestBatchPipeline:
+    """Tests for BatchPipeline class"""
+
+    @pytest.fixture
+    def transcriber(self, tmp_path):
+        """Create transcriber whose stage methods are fast fakes"""
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.temp_dir = tmp_path / "temp"
+        transcriber.output_dir = tmp_path / "out"
+        transcriber.temp_dir.mkdir()
+        transcriber.output_dir.mkdir()
+
+        def fake_download(url, progress_callback=None):
+            video_id = url.rsplit("/", 1)[-1]
+            audio_path = transcriber.temp_dir / f"{video_id}.mp3"
+            audio_path.write_bytes(b"audio")
+            return audio_path, f"Title {video_id}"
+
+        transcriber.download_audio = fake_download
+        transcriber._skip_result_if_exists = lambda video_id, cb=None: None
+        transcriber._prepare_audio = lambda path, cb=None: {"path": path, "prepared": False}
+        transcriber._match_reupload = lambda video_id, path, cb=None, link=True: (None, None)
+        transcriber._transcribe_chunks = (
+            lambda chunks, cb=None, reports=None, backend=None, segments=None: (
+                f"text of {chunks[0].path.stem}"
+            )
+        )
+        return transcriber
+
+    def test_results_keep_input_order(self, transcriber):
+        """Results come back in input order even if later videos finish first"""
+        delays = {"vid1": 0.1, "vid2": 0.0, "vid3": 0.05}
+
+        def slow_transcribe(chunks, cb=None, reports=None, backend=None, segments=None):
+            time.sleep(delays[chunks[0].path.stem])
+            return f"text of {chunks[0].path.stem}"
+
+        transcriber._transcribe_chunks = slow_transcribe
+        urls = [f"https://youtu.be/{vid}" for vid in delays]
+
+        results = BatchPipeline(transcriber, workers={"transcribe": 3}).run(urls)
+
+        assert [r["video_id"] for r in results] == ["vid1", "vid2", "vid3"]
+        assert all(r["success"] for r in results)
+
+    def test_download_overlaps_transcription(self, transcriber):
+        """Video N+1 is downloaded while video N is still transcribing"""
+        transcribing = threading.Event()
+        overlapped = []
+        original_download = transcriber.download_audio
+
+        def download(url, progress_callback=None):
+            overlapped.append(transcribing.is_set())
+            return original_download(url, progress_callback)
+
+        def transcribe(chunks, cb=None, reports=None, backend=None, segments=None):
+            transcribing.set()
+            time.sleep(0.1)
+            transcribing.clear()
+            return "text"
+
+        transcriber.download_audio = download
+        transcriber._transcribe_chunks = transcribe
+        urls = [f"https://youtu.be/vid{i}" for i in range(3)]
+
+        BatchPipeline(transcriber, workers={"download": 1, "transcribe": 1}).run(urls)
+
+        assert any(overlapped[1:])
+
+    def test_stage_failure_is_reported(self, transcriber):
+        """A failing stage produces an error result without stopping the batch"""
+
+        def transcribe(chunks, cb=None, reports=None, backend=None, segments=None):
+            if chunks[0].path.stem == "bad":
+                raise RuntimeError("whisper down")
+            return "text"
+
+        transcriber._transcribe_chunks = transcribe
+        urls = ["https://youtu.be/good", "https://youtu.be/bad"]
+
+        results = BatchPipeline(transcriber).run(urls)
+
+        assert results[0]["success"] is True
+        assert results[1] == {"success": False, "error": "whisper down", "url": urls[1]}
+        assert not (transcriber.temp_dir / "bad.mp3").exists()
+
+    def test_skipped_videos_bypass_stages(self, transcriber):
+        """Already transcribed videos are never downloaded"""
+        transcriber._skip_result_if_exists = lambda video_id, cb=None: {
+            "success": True,
+            "skipped": True,
+            "video_id": video_id,
+        }
+
+        with patch.object(transcriber, "download_audio") as mock_download:
+            results = BatchPipeline(transcriber).run(["https://youtu.be/vid1"])
+
+        assert results[0]["skipped"] is True
+        mock_download.assert_not_called()
+
+    def test_process_multiple_videos_pipelined(self, transcriber):
+        """process_multiple_videos routes through the pipeline when requested"""
+        urls = ["https://youtu.be/vid1", "https://youtu.be/vid1", "https://youtu.be/vid2"]
+
+        with patch.object(transcriber, "process_video") as mock_process:
+            results = transcriber.process_multiple_videos(urls, pipelined=True)
+
+        mock_process.assert_not_called()
+        assert [r["video_id"] for r in results] == ["vid1", "vid2"]
+        assert Path(results[0]["json_path"]).exists()
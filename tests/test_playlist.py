@@ -0,0 +1,156 @@
+"""
+Unit tests for playlist/channel expansion
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.playlist import FULL_WALK_EVERY, ExpansionCheckpoint, expand_collection, expand_urls
+
+PLAYLIST = "https://www.youtube.com/playlist?list=PLtest"
+
+
+def _playlist_info(video_ids):
+    return {
+        "_type": "playlist",
+        "entries": ({"ie_key": "Youtube", "id": video_id} for video_id in video_ids),
+    }
+
+
+@pytest.fixture
+def mock_ydl():
+    with patch("src.playlist.yt_dlp.YoutubeDL") as mock_class:
+        instance = MagicMock()
+        mock_class.return_value.__enter__.return_value = instance
+        yield instance
+
+
+class TestExpandCollection:
+    """Tests for expand_collection"""
+
+    def test_streams_watch_urls(self, mock_ydl, tmp_path):
+        mock_ydl.extract_info.return_value = _playlist_info(["aaaaaaaaaaa", "bbbbbbbbbbb"])
+
+        urls = list(expand_collection(PLAYLIST, cache_dir=tmp_path))
+
+        assert urls == [
+            "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+            "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+        ]
+        assert mock_ydl.extract_info.call_args.kwargs["process"] is False
+        assert ExpansionCheckpoint(PLAYLIST, tmp_path).complete is True
+
+    def test_is_lazy(self, mock_ydl, tmp_path):
+        pulled = []
+
+        def entries():
+            for video_id in ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]:
+                pulled.append(video_id)
+                yield {"ie_key": "Youtube", "id": video_id}
+
+        mock_ydl.extract_info.return_value = {"_type": "playlist", "entries": entries()}
+
+        stream = expand_collection(PLAYLIST, cache_dir=tmp_path)
+        next(stream)
+
+        assert pulled == ["aaaaaaaaaaa"]
+        stream.close()
+
+    def test_resumes_from_checkpoint(self, mock_ydl, tmp_path):
+        checkpoint = ExpansionCheckpoint(PLAYLIST, tmp_path)
+        checkpoint.video_ids = ["aaaaaaaaaaa"]
+        checkpoint.save()
+        mock_ydl.extract_info.return_value = _playlist_info(["aaaaaaaaaaa", "bbbbbbbbbbb"])
+
+        urls = list(expand_collection(PLAYLIST, cache_dir=tmp_path))
+
+        assert len(urls) == 2
+        assert ExpansionCheckpoint(PLAYLIST, tmp_path).video_ids == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+
+    def test_new_upload_between_runs_is_found(self, mock_ydl, tmp_path):
+        checkpoint = ExpansionCheckpoint(PLAYLIST, tmp_path)
+        checkpoint.video_ids = ["aaaaaaaaaaa"]
+        checkpoint.save()
+        mock_ydl.extract_info.return_value = _playlist_info(
+            ["nnnnnnnnnnn", "aaaaaaaaaaa", "bbbbbbbbbbb"]
+        )
+
+        urls = list(expand_collection(PLAYLIST, cache_dir=tmp_path))
+
+        assert [url[-11:] for url in urls] == ["aaaaaaaaaaa", "nnnnnnnnnnn", "bbbbbbbbbbb"]
+        assert ExpansionCheckpoint(PLAYLIST, tmp_path).video_ids == [
+            "aaaaaaaaaaa",
+            "nnnnnnnnnnn",
+            "bbbbbbbbbbb",
+        ]
+
+    def test_complete_checkpoint_walks_to_first_known_id(self, mock_ydl, tmp_path):
+        checkpoint = ExpansionCheckpoint(PLAYLIST, tmp_path)
+        checkpoint.video_ids = ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        checkpoint.complete = True
+        checkpoint.walked = time.time()
+        checkpoint.save()
+        pulled = []
+
+        def entries():
+            for video_id in ["nnnnnnnnnnn", "aaaaaaaaaaa", "bbbbbbbbbbb"]:
+                pulled.append(video_id)
+                yield {"ie_key": "Youtube", "id": video_id}
+
+        mock_ydl.extract_info.return_value = {"_type": "playlist", "entries": entries()}
+
+        urls = list(expand_collection(PLAYLIST, cache_dir=tmp_path))
+
+        assert [url[-11:] for url in urls] == ["aaaaaaaaaaa", "bbbbbbbbbbb", "nnnnnnnnnnn"]
+        assert pulled == ["nnnnnnnnnnn", "aaaaaaaaaaa"]
+
+    def test_old_complete_checkpoint_is_walked_in_full(self, mock_ydl, tmp_path):
+        checkpoint = ExpansionCheckpoint(PLAYLIST, tmp_path)
+        checkpoint.video_ids = ["aaaaaaaaaaa"]
+        checkpoint.complete = True
+        checkpoint.walked = time.time() - FULL_WALK_EVERY - 1
+        checkpoint.save()
+        mock_ydl.extract_info.return_value = _playlist_info(["aaaaaaaaaaa", "zzzzzzzzzzz"])
+
+        urls = list(expand_collection(PLAYLIST, cache_dir=tmp_path))
+
+        assert urls[-1] == "https://www.youtube.com/watch?v=zzzzzzzzzzz"
+        assert ExpansionCheckpoint(PLAYLIST, tmp_path).walked > checkpoint.walked
+
+    def test_recheck_failure_keeps_checkpoint(self, mock_ydl, tmp_path):
+        checkpoint = ExpansionCheckpoint(PLAYLIST, tmp_path)
+        checkpoint.video_ids = ["aaaaaaaaaaa"]
+        checkpoint.complete = True
+        checkpoint.walked = time.time()
+        checkpoint.save()
+        mock_ydl.extract_info.side_effect = Exception("network down")
+
+        urls = list(expand_collection(PLAYLIST, cache_dir=tmp_path))
+
+        assert urls == ["https://www.youtube.com/watch?v=aaaaaaaaaaa"]
+        assert ExpansionCheckpoint(PLAYLIST, tmp_path).complete is True
+
+
+class TestExpandUrls:
+    """Tests for expand_urls"""
+
+    def test_mixed_input_keeps_order(self, mock_ydl, tmp_path):
+        mock_ydl.extract_info.return_value = _playlist_info(["bbbbbbbbbbb"])
+
+        urls = list(expand_urls(["https://youtu.be/aaaaaaaaaaa", PLAYLIST], cache_dir=tmp_path))
+
+        assert urls == [
+            "https://youtu.be/aaaaaaaaaaa",
+            "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+        ]
+
+    def test_expansion_error_is_reported(self, mock_ydl, tmp_path):
+        mock_ydl.extract_info.side_effect = Exception("This playlist does not exist")
+        messages = []
+
+        urls = list(expand_urls([PLAYLIST], messages.append, cache_dir=tmp_path))
+
+        assert urls == []
+        assert any("Could not expand" in message for message in messages)
@@ -0,0 +1,103 @@
+"""
+Unit tests for the metadata preflight
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.preflight import MetadataCache, estimate_cost, fetch_metadata, run_preflight
+
+DURATIONS = {"short1": 120, "long1": 7200, "mid1": 1800}
+
+
+def fake_ydl_factory(calls):
+    """Build a YoutubeDL replacement that serves DURATIONS"""
+
+    def factory(opts):
+        instance = MagicMock()
+
+        def extract_info(url, download=True):
+            assert download is False
+            video_id = url.rsplit("/", 1)[-1]
+            calls.append(video_id)
+            if video_id not in DURATIONS:
+                raise Exception("Video unavailable")
+            return {"id": video_id, "title": f"Title {video_id}", "duration": DURATIONS[video_id]}
+
+        instance.extract_info.side_effect = extract_info
+        ctx = MagicMock()
+        ctx.__enter__.return_value = instance
+        return ctx
+
+    return factory
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MetadataCache(tmp_path / "metadata")
+
+
+@pytest.fixture
+def ydl_calls():
+    calls = []
+    with patch("src.preflight.yt_dlp.YoutubeDL", side_effect=fake_ydl_factory(calls)):
+        yield calls
+
+
+URLS = [f"https://youtu.be/{vid}" for vid in DURATIONS]
+
+
+def test_estimate_cost():
+    assert estimate_cost(600) == pytest.approx(0.06)
+    assert estimate_cost(None) == 0.0
+
+
+def test_metadata_is_cached(cache, ydl_calls):
+    first = fetch_metadata(URLS[0], cache)
+    second = fetch_metadata(URLS[0], cache)
+
+    assert first["duration"] == 120
+    assert second["cached"] is True
+    assert ydl_calls == ["short1"]
+
+
+def test_fetch_failure_is_not_fatal(cache, ydl_calls):
+    metadata = fetch_metadata("https://youtu.be/missing", cache)
+
+    assert metadata["duration"] is None
+    assert "error" in metadata
+    assert cache.get("missing") is None
+
+
+def test_duration_guard_rejects(cache, ydl_calls):
+    report = run_preflight(URLS, max_duration=3600, max_cost=0, order="input", cache=cache)
+
+    assert report["urls"] == [URLS[0], URLS[2]]
+    assert report["rejected"][0]["url"] == URLS[1]
+    assert report["rejected"][0]["success"] is False
+    assert report["total_duration"] == 1920
+
+
+def test_cost_guard_defers_to_end(cache, ydl_calls):
+    report = run_preflight(
+        URLS, max_duration=0, max_cost=0.5, over_limit="defer", order="input", cache=cache
+    )
+
+    assert report["urls"] == [URLS[0], URLS[2], URLS[1]]
+    assert report["rejected"] == []
+
+
+@pytest.mark.parametrize(
+    "order,expected",
+    [
+        ("shortest", ["short1", "mid1", "long1", "missing"]),
+        ("longest", ["long1", "mid1", "short1", "missing"]),
+    ],
+)
+def test_ordering_puts_unknown_last(cache, ydl_calls, order, expected):
+    urls = URLS + ["https://youtu.be/missing"]
+
+    report = run_preflight(urls, max_duration=0, max_cost=0, order=order, cache=cache)
+
+    assert [url.rsplit("/", 1)[-1] for url in report["urls"]] == expected
@@ -4,6 +4,7 @@ Script de prueba para el sistema RAG
 
 from pathlib import Path
 
+from src.catalog import transcript_files
 from src.rag_engine import RAGEngine
 
 print("=" * 60)
@@ -13,7 +14,7 @@ print()
 
 # Verificar que hay transcripciones
 transcripts_dir = Path("transcripts")
-json_files = list(transcripts_dir.glob("*.json"))
+json_files = list(transcript_files(transcripts_dir))
 
 if not json_files:
     print("❌ No hay transcripciones disponibles")
@@ -18,7 +18,7 @@ class TestRAGEngine:
     @pytest.fixture
     def rag_engine(self):
         """Create RAG engine instance for testing"""
-        with patch("src.rag_engine.OpenAIEmbeddings"), patch("src.rag_engine.ChatOpenAI"):
+        with patch("src.rag_engine.create_embeddings"), patch("src.rag_engine.ChatOpenAI"):
             return RAGEngine()
 
     @pytest.fixture
@@ -182,6 +182,166 @@ class TestRAGEngine:
         rag_engine.memory.clear.assert_called_once()
 
 
+def make_transcripts(*texts):
+    return [
+        {
+            "video_id": f"vid{i}",
+            "title": f"Video {i}",
+            "url": f"https://youtu.be/vid{i}",
+            "transcript": text,
+        }
+        for i, text in enumerate(texts)
+    ]
+
+
+def chunk_counts(report):
+    """(added, replaced, skipped, removed) chunks and indexed videos of a report"""
+    return tuple(report[key] for key in ("added", "replaced", "skipped", "removed", "videos"))
+
+
+class TestIncrementalIndexing:
+    """Only new or changed transcripts are embedded again"""
+
+    @pytest.fixture
+    def rag_engine(self, tmp_path):
+        with patch("src.rag_engine.create_embeddings"), patch("src.rag_engine.ChatOpenAI"):
+            engine = RAGEngine()
+        engine.text_splitter = MagicMock()
+        engine.text_splitter.split_text.side_effect = lambda text: text.split("|")
+        with patch("src.rag_engine.VECTOR_DB_DIR", tmp_path / "vector_db"), patch(
+            "src.rag_engine.Chroma"
+        ) as mock_chroma:
+            engine.mock_chroma = mock_chroma
+            yield engine
+
+    def index(self, rag_engine, transcripts, **kwargs):
+        with patch.object(rag_engine, "load_transcripts", return_value=transcripts):
+            return rag_engine.index_transcripts(**kwargs)
+
+    def test_first_run_builds_the_store(self, rag_engine, isolated_index_manifest):
+        report = self.index(rag_engine, make_transcripts("a|b", "c"))
+
+        assert chunk_counts(report) == (3, 0, 0, 0, 2)
+        kwargs = rag_engine.mock_chroma.from_texts.call_args.kwargs
+        assert kwargs["ids"] == ["vid0:0", "vid0:1", "vid1:0"]
+        assert isolated_index_manifest.get("vid0")["chunks"] == 2
+
+    def test_unchanged_library_embeds_nothing(self, rag_engine):
+        self.index(rag_engine, make_transcripts("a|b", "c"))
+
+        report = self.index(rag_engine, make_transcripts("a|b", "c"))
+
+        assert chunk_counts(report) == (0, 0, 3, 0, 2)
+        store = rag_engine.mock_chroma.return_value
+        store.add_texts.assert_not_called()
+        store.delete.assert_not_called()
+        rag_engine.mock_chroma.from_texts.assert_called_once()
+
+    def test_changed_new_and_deleted_transcripts(self, rag_engine, isolated_index_manifest):
+        self.index(rag_engine, make_transcripts("a|b|c", "d", "e"))
+        current = make_transcripts("a|x", "d")[:2] + [
+            {"video_id": "vid9", "title": "New", "url": "https://youtu.be/vid9", "transcript": "n"}
+        ]
+
+        report = self.index(rag_engine, current)
+
+        assert chunk_counts(report) == (1, 2, 1, 2, 3)
+        store = rag_engine.mock_chroma.return_value
+        store.delete.assert_called_once_with(ids=["vid0:2", "vid2:0"])
+        kwargs = store.add_texts.call_args.kwargs
+        assert kwargs["texts"] == ["a", "x", "n"]
+        assert kwargs["ids"] == ["vid0:0", "vid0:1", "vid9:0"]
+        assert sorted(isolated_index_manifest.video_ids()) == ["vid0", "vid1", "vid9"]
+
+    def test_full_rebuild(self, rag_engine, tmp_path):
+        self.index(rag_engine, make_transcripts("a|b", "c"))
+        (tmp_path / "vector_db" / "stale.bin").write_bytes(b"old")
+
+        report = self.index(rag_engine, make_transcripts("a|b", "c"), rebuild=True)
+
+        assert report["added"] == 3 and report["skipped"] == 0
+        assert not (tmp_path / "vector_db" / "stale.bin").exists()
+        assert rag_engine.mock_chroma.from_texts.call_count == 2
+
+    def test_embedding_model_change_forces_rebuild(self, rag_engine, isolated_index_manifest):
+        self.index(rag_engine, make_transcripts("a|b", "c"))
+        isolated_index_manifest.commit({}, [], "openai:text-embedding-3-small")
+
+        rag_engine.embedding_tag = "openai:text-embedding-3-large"
+        report = self.index(rag_engine, make_transcripts("a|b", "c"))
+
+        assert report["added"] == 3
+        assert rag_engine.mock_chroma.from_texts.call_count == 2
+
+    def test_vectors_are_tagged_with_provider_and_model(self, rag_engine, isolated_index_manifest):
+        rag_engine.embedding_tag = "local:minilm"
+
+        self.index(rag_engine, make_transcripts("a|b"))
+
+        metadatas = rag_engine.mock_chroma.from_texts.call_args.kwargs["metadatas"]
+        assert {m["embedding"] for m in metadatas} == {"local:minilm"}
+        assert isolated_index_manifest.embedding == "local:minilm"
+
+    def test_store_of_another_provider_is_not_loaded(self, rag_engine, isolated_index_manifest):
+        self.index(rag_engine, make_transcripts("a|b"))
+        rag_engine.embedding_tag = "local:minilm"
+
+        with pytest.raises(ValueError, match="rebuild the index"):
+            rag_engine.load_vector_store()
+
+    def test_legacy_manifest_keeps_the_store(self, rag_engine, isolated_index_manifest):
+        self.index(rag_engine, make_transcripts("a|b"))
+        manifest_file = isolated_index_manifest.manifest_file
+        data = json.loads(manifest_file.read_text())
+        data["embedding_model"] = data.pop("embedding").split(":", 1)[1]
+        manifest_file.write_text(json.dumps(data))
+
+        report = self.index(rag_engine, make_transcripts("a|b"))
+
+        assert report["skipped"] == 2
+        rag_engine.mock_chroma.from_texts.assert_called_once()
+
+
+class TestDeleteVideos:
+    """Deleted transcripts leave the vector store without re-indexing"""
+
+    @pytest.fixture
+    def rag_engine(self, tmp_path):
+        with patch("src.rag_engine.create_embeddings"), patch("src.rag_engine.ChatOpenAI"):
+            engine = RAGEngine()
+        transcripts = make_transcripts("a b", "c")
+        with patch("src.rag_engine.VECTOR_DB_DIR", tmp_path / "vector_db"), patch(
+            "src.rag_engine.Chroma"
+        ), patch.object(engine, "load_transcripts", return_value=transcripts):
+            engine.index_transcripts()
+            yield engine
+
+    def test_removes_the_video_chunks(self, rag_engine, isolated_index_manifest):
+        store = rag_engine.vector_store
+        store.get.return_value = {"ids": ["vid0:0"]}
+
+        assert rag_engine.delete_videos(["vid0"]) == 1
+
+        store.get.assert_called_once_with(where={"video_id": {"$in": ["vid0"]}}, include=[])
+        store.delete.assert_called_once_with(ids=["vid0:0"])
+        assert isolated_index_manifest.video_ids() == ["vid1"]
+
+    def test_unindexed_video_is_not_looked_up(self, rag_engine):
+        assert rag_engine.delete_videos(["other"]) == 0
+
+        rag_engine.vector_store.get.assert_not_called()
+
+    def test_no_vector_store(self, tmp_path):
+        from src.rag_engine import delete_video_vectors
+
+        with patch("src.rag_engine.VECTOR_DB_DIR", tmp_path / "missing"), patch(
+            "src.rag_engine.get_rag_engine"
+        ) as get_engine:
+            assert delete_video_vectors(["vid0"]) == 0
+
+        get_engine.assert_not_called()
+
+
 class TestRAGIntegration:
     """Integration tests for RAG workflow"""
 
@@ -0,0 +1,165 @@
+"""
+Unit tests for the process-wide OpenAI rate limiter
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.rate_limiter import (
+    RateLimitedResource,
+    RateLimiter,
+    TokenBucket,
+    is_rate_limit_error,
+    parse_reset,
+    retry_after_seconds,
+)
+
+
+class TestHeaderParsing:
+    """Tests for header parsing helpers"""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m3.5s", 3723.5), ("2.5", 2.5)],
+    )
+    def test_parse_reset(self, value, expected):
+        assert parse_reset(value) == pytest.approx(expected)
+
+    def test_parse_reset_invalid(self):
+        assert parse_reset(None) is None
+        assert parse_reset("soon") is None
+
+    def test_retry_after_prefers_milliseconds(self):
+        assert retry_after_seconds({"retry-after": "2", "retry-after-ms": "1500"}) == 1.5
+        assert retry_after_seconds({"retry-after": "2"}) == 2.0
+        assert retry_after_seconds({}) is None
+
+    def test_is_rate_limit_error(self):
+        error = Exception("boom")
+        error.status_code = 429
+        assert is_rate_limit_error(error)
+        assert is_rate_limit_error(Exception("Error code: 429"))
+        assert not is_rate_limit_error(Exception("Error code: 500"))
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket"""
+
+    def test_unlimited_never_waits(self):
+        assert TokenBucket(None).wait_time(10**6, now=0) == 0.0
+
+    def test_wait_time_when_empty(self):
+        bucket = TokenBucket(60)  # one token per second
+        bucket.updated = 0.0
+        bucket.tokens = 0.0
+
+        assert bucket.wait_time(1, now=0.0) == pytest.approx(1.0)
+        assert bucket.wait_time(1, now=1.0) == 0.0
+
+    def test_sync_adopts_server_budget(self):
+        bucket = TokenBucket(None)
+        bucket.sync(limit=100, remaining=10, now=bucket.updated)
+
+        assert bucket.capacity == 100
+        assert bucket.tokens == pytest.approx(10, abs=0.1)
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter"""
+
+    @patch("src.rate_limiter.time.sleep")
+    def test_acquire_waits_for_request_budget(self, mock_sleep):
+        limiter = RateLimiter({"whisper": 60})
+        limiter.update(
+            "whisper",
+            {"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0"},
+        )
+
+        limiter.acquire("whisper")
+
+        assert mock_sleep.called
+        assert limiter.metrics()["whisper"]["throttle_seconds"] > 0
+
+    @patch("src.rate_limiter.time.sleep")
+    def test_retry_after_blocks_all_callers(self, mock_sleep):
+        limiter = RateLimiter()
+
+        delay = limiter.on_rate_limit("embeddings", {"retry-after": "3"}, fallback=30)
+
+        assert delay == 3.0
+        metrics = limiter.metrics()["embeddings"]
+        assert metrics["rate_limited"] == 1
+        assert 0 < metrics["blocked_for"] <= 3
+        assert limiter.metrics()["chat"]["blocked_for"] == 0
+
+    def test_fallback_without_headers(self):
+        limiter = RateLimiter()
+
+        assert limiter.on_rate_limit("whisper", None, fallback=12) == 12
+
+    def test_headroom_from_headers(self):
+        limiter = RateLimiter()
+        limiter.update(
+            "chat",
+            {
+                "x-ratelimit-limit-requests": "500",
+                "x-ratelimit-remaining-requests": "250",
+                "x-ratelimit-limit-tokens": "1000",
+                "x-ratelimit-remaining-tokens": "100",
+            },
+        )
+
+        metrics = limiter.metrics()["chat"]
+        assert metrics["request_headroom"] == pytest.approx(0.5, abs=0.01)
+        assert metrics["token_headroom"] == pytest.approx(0.1, abs=0.01)
+
+    def test_disabled_limiter_does_not_budget(self):
+        limiter = RateLimiter({"whisper": 1}, enabled=False)
+
+        with patch("src.rate_limiter.time.sleep") as mock_sleep:
+            for _ in range(3):
+                limiter.acquire("whisper")
+
+        mock_sleep.assert_not_called()
+
+    def test_disabled_limiter_honours_retry_after(self):
+        limiter = RateLimiter(enabled=False)
+        start = time.monotonic()
+        limiter.on_rate_limit("whisper", {"retry-after-ms": "50"})
+
+        limiter.acquire("whisper")
+
+        assert time.monotonic() - start >= 0.05
+
+
+class TestRateLimitedResource:
+    """Tests for the LangChain client wrapper"""
+
+    def test_create_updates_limiter_and_parses(self):
+        limiter = RateLimiter()
+        resource = MagicMock()
+        resource.with_raw_response.create.return_value = MagicMock(
+            headers={"x-ratelimit-limit-requests": "100", "x-ratelimit-remaining-requests": "99"},
+            parse=MagicMock(return_value="parsed"),
+        )
+
+        wrapped = RateLimitedResource(resource, "embeddings", limiter)
+
+        assert wrapped.create(model="m", input=["hello"]) == "parsed"
+        assert limiter.metrics()["embeddings"]["calls"] == 1
+        assert limiter.apis["embeddings"].requests.capacity == 100
+
+    def test_rate_limit_error_is_recorded_and_raised(self):
+        limiter = RateLimiter()
+        error = Exception("Rate limit reached")
+        error.status_code = 429
+        error.response = MagicMock(headers={"retry-after": "1"})
+        resource = MagicMock()
+        resource.with_raw_response.create.side_effect = error
+
+        with pytest.raises(Exception, match="Rate limit"):
+            RateLimitedResource(resource, "chat", limiter).create(model="m", messages=[])
+
+        assert limiter.metrics()["chat"]["rate_limited"] == 1
@@ -0,0 +1,94 @@
+"""
+Unit tests for segment timing storage
+"""
+
+import json
+from unittest.mock import patch
+
+from src.audio import TimeMap
+from src.segments import (
+    detected_language,
+    load_segments,
+    map_segments,
+    parse_segments,
+    segment_columns,
+    shift_segments,
+)
+from src.transcriber import YouTubeTranscriber
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": "Hola a todos."},
+    {"start": 2.5, "end": 6.0, "text": "Hoy hablamos de audio."},
+    {"start": 6.0, "end": 7.25, "text": "Empecemos."},
+]
+TRANSCRIPT = "Hola a todos. Hoy hablamos de audio. Empecemos."
+
+
+class TestSegmentColumns:
+    """Tests for the columnar segment form"""
+
+    def test_round_trip_through_transcript_offsets(self):
+        columns = segment_columns(TRANSCRIPT, SEGMENTS)
+
+        assert columns == {
+            "start": [0.0, 2.5, 6.0],
+            "end": [2.5, 6.0, 7.25],
+            "offset": [0, 14, 37],
+        }
+        data = {"transcript": TRANSCRIPT, "segments": columns}
+        assert load_segments(data) == SEGMENTS
+
+    def test_transcript_without_timing(self):
+        assert load_segments({"transcript": TRANSCRIPT, "segments": None}) == []
+        assert load_segments({"transcript": TRANSCRIPT}) == []
+
+    def test_parse_sdk_objects(self):
+        class Segment:
+            start, end, text = 1.234, 2.0, " Hola "
+
+        assert parse_segments([Segment()]) == [{"start": 1.23, "end": 2.0, "text": "Hola"}]
+        assert parse_segments(None) == []
+
+    def test_shift_and_map_to_original_timeline(self):
+        time_map = TimeMap([(0.0, 3.0), (10.0, 20.0)], tempo=2.0, duration=20.0)
+        shifted = shift_segments([{"start": 1.0, "end": 2.0, "text": "x"}], 1.0)
+
+        mapped = map_segments(shifted, time_map)
+
+        # The first 1.5 s of compressed audio is 0-3 s of the original (x2), then 10 s onwards
+        assert mapped == [{"start": 11.0, "end": 13.0, "text": "x"}]
+        assert map_segments(shifted, None) is shifted
+
+    def test_detected_language_is_majority(self):
+        reports = [{"language": "es"}, {"language": "en"}, {"language": "es"}, {}]
+
+        assert detected_language(reports) == "es"
+        assert detected_language([{}]) is None
+
+
+class TestSavedTranscript:
+    """Saved transcripts carry language and columnar segments"""
+
+    def test_save_video_result(self, tmp_path):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.output_dir = tmp_path
+        audio_path = tmp_path / "vid.ogg"
+        audio_path.write_bytes(b"audio")
+
+        result = transcriber._save_video_result(
+            "https://youtu.be/vid",
+            "vid",
+            1,
+            "Charla",
+            TRANSCRIPT,
+            audio_path,
+            segments=SEGMENTS,
+            language="spanish",
+        )
+
+        with open(result["json_path"], encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["language"] == "spanish"
+        assert load_segments(data) == SEGMENTS
+        assert result["segment_count"] == 3
@@ -3,11 +3,15 @@ Unit tests for transcriber module
 """
 
 import tempfile
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
+from src.audio import AudioChunk
+from src.rate_limiter import RateLimiter
 from src.transcriber import YouTubeTranscriber
 
 
@@ -113,3 +117,141 @@ class TestYouTubeTranscriber:
 
             assert len(results) == 2
             assert mock_process.call_count == 2
+
+
+class TestChunkTranscription:
+    """Tests for concurrent chunk transcription"""
+
+    @pytest.fixture
+    def transcriber(self):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.rate_limiter = RateLimiter(enabled=False)
+        return transcriber
+
+    @staticmethod
+    def _whisper(transcriber, create):
+        """Route Whisper calls to create(), wrapped like a raw SDK response"""
+
+        def raw_create(**kwargs):
+            text = create(**kwargs)
+            return MagicMock(headers={}, parse=MagicMock(return_value=text))
+
+        transcriber.client.audio.transcriptions.with_raw_response.create.side_effect = raw_create
+
+    @pytest.fixture
+    def chunks(self, tmp_path):
+        chunks = []
+        for i in range(4):
+            path = tmp_path / f"vid_chunk{i:03d}.mp3"
+            path.write_bytes(path.stem.encode())
+            chunks.append(AudioChunk(path, i * 100.0, (i + 1) * 100.0, i))
+        return chunks
+
+    def test_chunks_run_concurrently_and_keep_order(self, transcriber, chunks):
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def create(model, file, response_format):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return file.read().decode()
+
+        self._whisper(transcriber, create)
+        reports = []
+
+        with patch("src.transcriber.CHUNK_CONCURRENCY", 3):
+            text = transcriber._transcribe_chunks(chunks, chunk_reports=reports)
+
+        assert text == "vid_chunk000 vid_chunk001 vid_chunk002 vid_chunk003"
+        assert peak[0] > 1
+        assert [report["start"] for report in reports] == [0.0, 100.0, 200.0, 300.0]
+        assert all(report["retries"] == 0 for report in reports)
+        assert all(report["latency"] is not None for report in reports)
+        assert not any(chunk.path.exists() for chunk in chunks)
+
+    @patch("src.transcriber.RETRY_DELAY", 0.01)
+    @patch("src.transcriber.time.sleep")
+    def test_rate_limit_is_retried_and_reported(self, mock_sleep, transcriber, chunks):
+        failed = set()
+
+        def create(model, file, response_format):
+            name = file.read().decode()
+            if name == "vid_chunk001" and name not in failed:
+                failed.add(name)
+                raise Exception("Error code: 429 - Rate limit reached")
+            return name
+
+        self._whisper(transcriber, create)
+        reports = []
+
+        text = transcriber._transcribe_chunks(chunks, chunk_reports=reports)
+
+        assert text.split() == [chunk.path.stem for chunk in chunks]
+        assert reports[1]["retries"] == 1
+        assert reports[1]["rate_limited"] == 1
+        assert reports[0]["retries"] == 0
+
+    def test_rate_limit_retry_waits_with_limiter_disabled(self, transcriber, chunks):
+        """RATE_LIMIT_ENABLED=false still waits out Retry-After before retrying"""
+        calls = []
+
+        def create(model, file, response_format):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                error = Exception("Error code: 429 - Rate limit reached")
+                error.status_code = 429
+                error.response = MagicMock(headers={"retry-after-ms": "100"})
+                raise error
+            return file.read().decode()
+
+        self._whisper(transcriber, create)
+
+        text = transcriber._transcribe_chunks(chunks[:1])
+
+        assert text == "vid_chunk000"
+        assert calls[1] - calls[0] >= 0.1
+
+    @patch("src.transcriber.time.sleep")
+    def test_failed_chunk_removes_all_chunk_files(self, mock_sleep, transcriber, chunks):
+        transcriber.client.audio.transcriptions.with_raw_response.create.side_effect = Exception(
+            "boom"
+        )
+
+        with pytest.raises(Exception, match="Transcription failed"):
+            transcriber._transcribe_chunks(chunks)
+
+        assert not any(chunk.path.exists() for chunk in chunks)
+
+    def test_segments_are_shifted_by_chunk_start(self, transcriber, chunks):
+        def create(model, file, response_format):
+            assert response_format == "verbose_json"
+            name = file.read().decode()
+            return {
+                "text": f" {name} ",
+                "language": "spanish",
+                "duration": 100.0,
+                "segments": [{"start": 1.5, "end": 4.0, "text": f" {name}"}],
+            }
+
+        self._whisper(transcriber, create)
+        reports = []
+        segments = []
+
+        text = transcriber._transcribe_chunks(chunks, chunk_reports=reports, segments=segments)
+
+        assert text == "vid_chunk000 vid_chunk001 vid_chunk002 vid_chunk003"
+        assert [(s["start"], s["end"]) for s in segments] == [
+            (1.5, 4.0),
+            (101.5, 104.0),
+            (201.5, 204.0),
+            (301.5, 304.0),
+        ]
+        assert [s["text"] for s in segments] == [chunk.path.stem for chunk in chunks]
+        assert all(report["language"] == "spanish" for report in reports)
+        assert not any("segments" in report for report in reports)
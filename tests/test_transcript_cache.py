@@ -0,0 +1,154 @@
+"""
+Unit tests for the content-addressed transcription cache
+"""
+
+import shutil
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.audio import prepare_for_speech, segment_audio
+from src.rate_limiter import RateLimiter
+from src.transcriber import YouTubeTranscriber
+from src.transcript_cache import TranscriptCache, hash_audio
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranscriptCache(tmp_path / "whisper", max_bytes=1024)
+
+
+class TestTranscriptCache:
+    """Tests for TranscriptCache"""
+
+    def test_hash_depends_on_content_only(self, tmp_path):
+        first = tmp_path / "a.ogg"
+        second = tmp_path / "b.webm"
+        first.write_bytes(b"same audio")
+        second.write_bytes(b"same audio")
+
+        assert hash_audio(first) == hash_audio(second)
+
+    def test_key_includes_backend_fingerprint(self):
+        assert TranscriptCache.key("abc", "openai|whisper-1|text") != TranscriptCache.key(
+            "abc", "local|small|int8|batch8|vad"
+        )
+
+    def test_miss_then_hit_reports_savings(self, cache):
+        key = cache.key("abc", "openai|whisper-1|text")
+
+        assert cache.get(key) is None
+        cache.put(key, "hola mundo", "openai", audio_seconds=600)
+
+        assert cache.get(key) == "hola mundo"
+        summary = cache.summary()
+        assert summary["hits"] == 1
+        assert summary["misses"] == 1
+        assert summary["hit_rate"] == 0.5
+        assert summary["audio_seconds_saved"] == 600
+        assert summary["dollars_saved"] == pytest.approx(0.06)
+
+    def test_local_hits_save_no_dollars(self, cache):
+        key = cache.key("abc", "local|small|int8|batch8|vad")
+        cache.put(key, "text", "local", audio_seconds=600)
+
+        cache.get(key)
+
+        assert cache.summary()["dollars_saved"] == 0
+
+    def test_lru_eviction(self, cache):
+        cache.put("old", "a" * 400, "openai")
+        cache.put("used", "b" * 400, "openai")
+        cache.entries["old"]["last_access"] -= 10
+        cache.entries["used"]["last_access"] -= 5
+        cache.get("used")
+
+        cache.put("new", "c" * 400, "openai")
+
+        assert set(cache.entries) == {"used", "new"}
+        assert not (cache.cache_dir / "old.txt").exists()
+        assert cache.summary()["evictions"] == 1
+
+    def test_segments_and_language_are_kept(self, cache):
+        segments = [{"start": 0.0, "end": 1.5, "text": "hola"}]
+        cache.put("key", "hola", "openai", 60, segments=segments, language="spanish")
+
+        assert cache.timing("key") == {"segments": segments, "language": "spanish"}
+        assert cache.timing("missing") == {}
+
+    def test_index_survives_restart(self, cache):
+        cache.put("key", "persisted", "openai", audio_seconds=60)
+
+        reloaded = TranscriptCache(cache.cache_dir, max_bytes=1024)
+
+        assert reloaded.get("key") == "persisted"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+class TestPreparedAudioIsReproducible:
+    """The real prepare and segment steps must give byte-identical files for the same input"""
+
+    def prepare(self, source, path):
+        path.parent.mkdir()
+        shutil.copy(source, path)
+        prepared = prepare_for_speech(path, compress=False)["path"]
+        chunks = segment_audio(prepared, max_size_mb=0.02, duration=30.0, on_silence=False)
+        return [hash_audio(chunk.path) for chunk in chunks]
+
+    def test_repeat_prepare_hits_cache(self, cache, tmp_path):
+        source = tmp_path / "source.mp3"
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "anoisesrc=d=30:c=pink", str(source)],
+            check=True,
+        )
+
+        first = self.prepare(source, tmp_path / "run1" / "dQw4w9WgXcQ.mp3")
+        second = self.prepare(source, tmp_path / "run2" / "reupload.mp3")
+
+        assert len(first) > 1
+        assert first == second
+        cache.put(cache.key(first[0], "openai|whisper-1|text"), "hola", "openai")
+        assert cache.get(cache.key(second[0], "openai|whisper-1|text")) == "hola"
+
+
+class TestTranscriberUsesCache:
+    """Repeat audio is not sent to Whisper again"""
+
+    @pytest.fixture
+    def transcriber(self):
+        with patch("src.transcriber.OpenAI"):
+            transcriber = YouTubeTranscriber()
+        transcriber.rate_limiter = RateLimiter(enabled=False)
+        create = transcriber.client.audio.transcriptions.with_raw_response.create
+        create.return_value = MagicMock(headers={}, parse=MagicMock(return_value="transcribed"))
+        return transcriber
+
+    def test_repeat_audio_is_served_from_cache(
+        self, transcriber, tmp_path, isolated_transcript_cache
+    ):
+        first = tmp_path / "first.ogg"
+        repeat = tmp_path / "reupload.ogg"
+        first.write_bytes(b"identical audio")
+        repeat.write_bytes(b"identical audio")
+        stats = {}
+
+        with patch("src.transcriber.probe_duration", return_value=120.0):
+            assert transcriber._transcribe_single_file(first) == "transcribed"
+            assert transcriber._transcribe_single_file(repeat, stats=stats) == "transcribed"
+
+        create = transcriber.client.audio.transcriptions.with_raw_response.create
+        assert create.call_count == 1
+        assert stats["cached"] is True
+        assert isolated_transcript_cache.summary()["dollars_saved"] == pytest.approx(0.012)
+
+    def test_disabled_cache_always_calls_whisper(self, transcriber, tmp_path):
+        audio_path = tmp_path / "a.ogg"
+        audio_path.write_bytes(b"audio")
+
+        with patch("src.transcriber.TRANSCRIPT_CACHE_ENABLED", False):
+            transcriber._transcribe_single_file(audio_path)
+            transcriber._transcribe_single_file(audio_path)
+
+        create = transcriber.client.audio.transcriptions.with_raw_response.create
+        assert create.call_count == 2
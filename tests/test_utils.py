@@ -12,6 +12,8 @@ from src.utils import (
     count_words,
     extract_video_id,
     format_timestamp,
+    is_collection_url,
+    normalize_collection_url,
     parse_urls_input,
     sanitize_filename,
     save_transcript,
@@ -108,6 +110,45 @@ https://youtu.be/abc123def45
         urls = parse_urls_input(text)
         assert len(urls) == 2
 
+    def test_accepts_playlists_and_channels(self):
+        text = """https://www.youtube.com/playlist?list=PLabc123
+https://www.youtube.com/@somechannel
+https://youtu.be/dQw4w9WgXcQ"""
+        urls = parse_urls_input(text)
+        assert len(urls) == 3
+
+
+class TestCollectionUrls:
+    """Tests for playlist/channel URL helpers"""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/playlist?list=PLabc123",
+            "https://www.youtube.com/@somechannel",
+            "https://www.youtube.com/channel/UC1234567890",
+            "https://www.youtube.com/c/SomeName/videos",
+        ],
+    )
+    def test_is_collection_url(self, url):
+        assert is_collection_url(url) is True
+
+    def test_single_video_is_not_collection(self):
+        assert is_collection_url("https://youtu.be/dQw4w9WgXcQ") is False
+
+    def test_channel_root_gets_videos_tab(self):
+        assert (
+            normalize_collection_url("https://www.youtube.com/@somechannel")
+            == "https://www.youtube.com/@somechannel/videos"
+        )
+
+    def test_explicit_tab_and_playlist_are_kept(self):
+        for url in [
+            "https://www.youtube.com/@somechannel/streams",
+            "https://www.youtube.com/playlist?list=PLabc123",
+        ]:
+            assert normalize_collection_url(url) == url
+
 
 class TestCountWords:
     """Tests for count_words function"""
@@ -154,7 +195,7 @@ class TestSaveTranscript:
                 "word_count": 5,
             }
 
-            json_path, txt_path = save_transcript(data, output_dir, 1)
+            json_path, txt_path = save_transcript(data, output_dir)
 
             assert json_path.exists()
             assert txt_path.exists()
@@ -170,7 +211,7 @@ class TestSaveTranscript:
                 "word_count": 2,
             }
 
-            json_path, _ = save_transcript(data, output_dir, 1)
+            json_path, _ = save_transcript(data, output_dir)
 
             with open(json_path, "r", encoding="utf-8") as f:
                 loaded_data = json.load(f)
@@ -190,7 +231,7 @@ class TestSaveTranscript:
                 "word_count": 3,
             }
 
-            _, txt_path = save_transcript(data, output_dir, 1)
+            _, txt_path = save_transcript(data, output_dir)
 
             with open(txt_path, "r", encoding="utf-8") as f:
                 content = f.read()